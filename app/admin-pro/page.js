@@ -18,6 +18,7 @@ export default function AdminDashboard() {
   const [fiscalRules, setFiscalRules] = useState(null);
   const [settings, setSettings] = useState({});
   const [leads, setLeads] = useState([]);
+  const [leadsCursor, setLeadsCursor] = useState(null);
   const [holidays, setHolidays] = useState([]);
   const [newHoliday, setNewHoliday] = useState({ date: '', name: '', type: 'legal' });
   const [activeTab, setActiveTab] = useState('fiscal');
@@ -62,6 +63,7 @@ export default function AdminDashboard() {
       setFiscalRules(fiscalData);
       setSettings(settingsData);
       setLeads(leadsData);
+      setLeadsCursor(leadsRes.headers.get('X-Next-Cursor'));
       setHolidays(holidaysData.holidays || []);
     } catch (error) {
       toast.error('Eroare la încărcarea datelor');
@@ -168,6 +170,18 @@ export default function AdminDashboard() {
     }
   };
 
+  const loadMoreLeads = async () => {
+    if (!leadsCursor) return;
+    try {
+      const res = await fetch(`/api/leads?cursor=${encodeURIComponent(leadsCursor)}`);
+      const more = await res.json();
+      setLeads(prev => [...prev, ...more]);
+      setLeadsCursor(res.headers.get('X-Next-Cursor'));
+    } catch (error) {
+      toast.error('Eroare la încărcarea lead-urilor');
+    }
+  };
+
   const exportLeads = () => {
     window.open('/api/leads/export', '_blank');
   };
@@ -293,7 +307,7 @@ export default function AdminDashboard() {
             </TabsTrigger>
             <TabsTrigger value="leads">
               <Users className="h-4 w-4 mr-2" />
-              Leads ({leads.length})
+              Leads ({leads.length}{leadsCursor ? '+' : ''})
             </TabsTrigger>
           </TabsList>
 
@@ -1785,6 +1799,13 @@ export default function AdminDashboard() {
                     </tbody>
                   </table>
                 </div>
+                {leadsCursor && (
+                  <div className="flex justify-center mt-4">
+                    <Button onClick={loadMoreLeads} variant="outline">
+                      Încarcă mai multe
+                    </Button>
+                  </div>
+                )}
               </CardContent>
             </Card>
           </TabsContent>
@@ -1,8 +1,11 @@
 
-import { MongoClient } from 'mongodb';
+import { MongoClient, ObjectId } from 'mongodb';
 import { NextResponse } from 'next/server';
 import bcrypt from 'bcryptjs';
 import { v4 as uuidv4 } from 'uuid';
+import { createHash } from 'crypto';
+import { countRoundTrips, metrics, metricsSnapshot, recordRequest, resetMetrics } from '@/lib/metrics';
+import { loadClimatologyStore } from '@/lib/climatology-store';
 
 const uri = process.env.MONGO_URL;
 const dbName = process.env.DB_NAME || 'ecalc_ro';
@@ -27,6 +30,55 @@ async function connectToDatabase() {
     return { client, db };
 }
 
+// Read-through cache for documents that change a few times a year (fiscal_rules, settings, holidays).
+// Invalidated by the PUT handlers of this process; the TTL bounds staleness across instances.
+const CACHE_TTL_MS = Number(process.env.API_CACHE_TTL_MS ?? 60000);
+const responseCache = new Map(); // key -> { body, etag, expires }
+let cacheGeneration = 0;
+let initPromise = null;
+
+function invalidateCache(prefix) {
+    cacheGeneration++;
+    for (const key of responseCache.keys()) {
+        if (key.startsWith(prefix)) responseCache.delete(key);
+    }
+}
+
+async function cachedJson(request, key, loader) {
+    let entry = responseCache.get(key);
+    const hit = Boolean(entry && entry.expires > Date.now());
+    if (!hit) {
+        const generation = cacheGeneration;
+        const body = JSON.stringify(await loader());
+        entry = {
+            body,
+            etag: `W/"${createHash('sha1').update(body).digest('base64url')}"`,
+            expires: Date.now() + CACHE_TTL_MS
+        };
+        // A PUT that landed while we were reading makes this body stale: serve it, don't keep it
+        if (generation === cacheGeneration && CACHE_TTL_MS > 0) responseCache.set(key, entry);
+    }
+
+    const headers = { ETag: entry.etag, 'Cache-Control': 'no-cache', 'X-Cache': hit ? 'HIT' : 'MISS' };
+    const ifNoneMatch = request.headers.get('if-none-match');
+    if (ifNoneMatch && ifNoneMatch.split(',').some(tag => tag.trim() === entry.etag)) {
+        return new NextResponse(null, { status: 304, headers });
+    }
+    return new NextResponse(entry.body, { headers: { ...headers, 'Content-Type': 'application/json' } });
+}
+
+// One-time seeding per process instead of two findOne round trips on every GET
+function ensureInitialized(db) {
+    if (!initPromise) {
+        initPromise = Promise.all([initializeFiscalRules(db), initializeSettings(db), initializeIndexes(db)])
+            .catch(error => {
+                initPromise = null;
+                throw error;
+            });
+    }
+    return initPromise;
+}
+
 // Initialize fiscal rules for multi-year architecture
 async function initializeFiscalRules(db) {
     const fiscalRules = db.collection('fiscal_rules');
@@ -83,25 +135,32 @@ async function initializeSettings(db) {
     }
 }
 
+// Index behind the leads cursor pagination and the streamed export (idempotent)
+async function initializeIndexes(db) {
+    await db.collection('leads').createIndex({ createdAt: -1, _id: -1 });
+}
+
 // GET /api/fiscal-rules/:year
 async function handleFiscalRulesGet(year, db, request) {
     const requestedYear = parseInt(year);
-    const rules = await db.collection('fiscal_rules')
-        .find({ year: requestedYear })
-        .sort({ effectiveDate: -1 })
-        .toArray();
-
     const url = new URL(request.url);
     const showHistory = url.searchParams.get('history') === '1';
 
-    if (rules.length > 0) {
-        return NextResponse.json(showHistory ? rules : rules[0]);
-    }
+    return cachedJson(request, `fiscal-rules/${requestedYear}${showHistory ? '?history=1' : ''}`, async () => {
+        const rules = await db.collection('fiscal_rules')
+            .find({ year: requestedYear })
+            .sort({ effectiveDate: -1 })
+            .toArray();
 
-    return NextResponse.json({
-        year: requestedYear,
-        effectiveDate: `${requestedYear}-01-01`,
-        salary: { minimum_salary: 0, cas_rate: 0, cass_rate: 0, income_tax_rate: 0 }
+        if (rules.length > 0) {
+            return showHistory ? rules : rules[0];
+        }
+
+        return {
+            year: requestedYear,
+            effectiveDate: `${requestedYear}-01-01`,
+            salary: { minimum_salary: 0, cas_rate: 0, cass_rate: 0, income_tax_rate: 0 }
+        };
     });
 }
 
@@ -123,6 +182,7 @@ async function handleFiscalRulesPut(year, request, db) {
             },
             { upsert: true }
         );
+        invalidateCache('fiscal-rules/');
 
         return NextResponse.json({ success: true, message: 'Reguli fiscale actualizate' });
     } catch (error) {
@@ -131,9 +191,9 @@ async function handleFiscalRulesPut(year, request, db) {
 }
 
 // GET /api/fiscal-rules (all years)
-async function handleFiscalRulesGetAll(db) {
-    const rules = await db.collection('fiscal_rules').find({}).sort({ year: -1 }).toArray();
-    return NextResponse.json(rules);
+async function handleFiscalRulesGetAll(db, request) {
+    return cachedJson(request, 'fiscal-rules/all', () =>
+        db.collection('fiscal_rules').find({}).sort({ year: -1 }).toArray());
 }
 
 // POST /api/leads
@@ -143,20 +203,87 @@ async function handleLeadPost(body, db) {
     return NextResponse.json({ success: true, message: 'Lead salvat cu succes' });
 }
 
-// GET /api/leads
-async function handleLeadsGet(db) {
-    const leads = await db.collection('leads').find({}).sort({ createdAt: -1 }).toArray();
-    return NextResponse.json(leads);
+// Leads: newest first, (createdAt, _id) keeps the order stable for cursor pagination
+const LEADS_SORT = { createdAt: -1, _id: -1 };
+const LEADS_PAGE_SIZE = 100;
+const LEADS_PAGE_MAX = 1000;
+const EXPORT_BATCH_SIZE = 1000;
+
+// Leads without createdAt (null / missing) sort after every dated lead: their cursor has a null date
+const encodeLeadsCursor = (lead) => {
+    const createdAt = lead.createdAt == null ? null : new Date(lead.createdAt).toISOString();
+    return Buffer.from(JSON.stringify([createdAt, String(lead._id)])).toString('base64url');
+};
+
+function decodeLeadsCursor(token) {
+    const [createdAt, id] = JSON.parse(Buffer.from(token, 'base64url').toString('utf8'));
+    if (!ObjectId.isValid(id)) throw new Error('Invalid cursor');
+    const _id = new ObjectId(id);
+    if (createdAt === null) return { createdAt: null, _id: { $lt: _id } };
+    const date = new Date(createdAt);
+    if (Number.isNaN(date.getTime())) throw new Error('Invalid cursor');
+    return { $or: [{ createdAt: { $lt: date } }, { createdAt: date, _id: { $lt: _id } }, { createdAt: null }] };
 }
 
-// GET /api/leads/export
+// GET /api/leads?limit=100&cursor=<token> - one page, next page token in X-Next-Cursor
+async function handleLeadsGet(db, request) {
+    const url = new URL(request.url);
+    const limit = Math.min(Math.max(parseInt(url.searchParams.get('limit')) || LEADS_PAGE_SIZE, 1), LEADS_PAGE_MAX);
+    const cursor = url.searchParams.get('cursor');
+
+    let filter = {};
+    if (cursor) {
+        try {
+            filter = decodeLeadsCursor(cursor);
+        } catch (error) {
+            return NextResponse.json({ error: 'Cursor invalid' }, { status: 400 });
+        }
+    }
+
+    const leads = await db.collection('leads').find(filter).sort(LEADS_SORT).limit(limit + 1).toArray();
+    const hasMore = leads.length > limit;
+    const page = hasMore ? leads.slice(0, limit) : leads;
+    const headers = hasMore ? { 'X-Next-Cursor': encodeLeadsCursor(page[page.length - 1]) } : {};
+    return NextResponse.json(page, { headers });
+}
+
+const leadCsvRow = (lead) =>
+    `${lead.id},"${lead.name}","${lead.email}","${lead.phone}","${lead.calculatorType}","${lead.createdAt}"\n`;
+
+// GET /api/leads/export - streamed from the Mongo cursor, one batch of rows per chunk
 async function handleLeadsExport(db) {
-    const leads = await db.collection('leads').find({}).sort({ createdAt: -1 }).toArray();
-    let csv = 'ID,Nume,Email,Telefon,Calculator,Data Creării\n';
-    leads.forEach(lead => {
-        csv += `${lead.id},"${lead.name}","${lead.email}","${lead.phone}","${lead.calculatorType}","${lead.createdAt}"\n`;
+    const cursor = db.collection('leads').find({}).sort(LEADS_SORT).batchSize(EXPORT_BATCH_SIZE);
+    const encoder = new TextEncoder();
+
+    const stream = new ReadableStream({
+        start(controller) {
+            controller.enqueue(encoder.encode('ID,Nume,Email,Telefon,Calculator,Data Creării\n'));
+        },
+        async pull(controller) {
+            try {
+                let chunk = '';
+                for (let i = 0; i < EXPORT_BATCH_SIZE; i++) {
+                    const lead = await cursor.next();
+                    if (!lead) {
+                        if (chunk) controller.enqueue(encoder.encode(chunk));
+                        controller.close();
+                        await cursor.close();
+                        return;
+                    }
+                    chunk += leadCsvRow(lead);
+                }
+                controller.enqueue(encoder.encode(chunk));
+            } catch (error) {
+                controller.error(error);
+                await cursor.close();
+            }
+        },
+        async cancel() {
+            await cursor.close();
+        }
     });
-    return new NextResponse(csv, {
+
+    return new NextResponse(stream, {
         headers: {
             'Content-Type': 'text/csv',
             'Content-Disposition': 'attachment; filename=leads.csv',
@@ -193,19 +320,21 @@ async function handleLogin(body, db) {
 }
 
 // GET /api/holidays/:year
-async function handleHolidaysGet(db, year) {
+async function handleHolidaysGet(db, year, request) {
     const requestedYear = parseInt(year);
-    const data = await db.collection('holidays').findOne({ year: requestedYear });
+    return cachedJson(request, `holidays/${requestedYear}`, async () => {
+        const data = await db.collection('holidays').findOne({ year: requestedYear });
 
-    if (data) {
-        return NextResponse.json(data);
-    }
+        if (data) {
+            return data;
+        }
 
-    return NextResponse.json({
-        year: requestedYear,
-        holidays: [],
-        weather: {},
-        message: 'No holidays found in database'
+        return {
+            year: requestedYear,
+            holidays: [],
+            weather: {},
+            message: 'No holidays found in database'
+        };
     });
 }
 
@@ -226,6 +355,7 @@ async function handleHolidaysPut(request, db, year) {
             },
             { upsert: true }
         );
+        invalidateCache('holidays/');
 
         return NextResponse.json({ success: true, message: 'Holidays updated' });
     } catch (error) {
@@ -234,57 +364,188 @@ async function handleHolidaysPut(request, db, year) {
 }
 
 // GET /api/settings
-async function handleSettingsGet(db) {
-    const settingsArray = await db.collection('settings').find({}).toArray();
-    const settings = {};
-    settingsArray.forEach(s => {
-        settings[s.key] = s.value;
+async function handleSettingsGet(db, request) {
+    return cachedJson(request, 'settings', async () => {
+        const settingsArray = await db.collection('settings').find({}).toArray();
+        const settings = {};
+        settingsArray.forEach(s => {
+            settings[s.key] = s.value;
+        });
+        return settings;
     });
-    return NextResponse.json(settings);
 }
 
 // PUT /api/settings
 async function handleSettingsPut(request, db) {
     try {
         const body = await request.json();
-        const settingsCollection = db.collection('settings');
-        for (const [key, value] of Object.entries(body)) {
-            await settingsCollection.updateOne(
-                { key },
-                { $set: { key, value } },
-                { upsert: true }
-            );
-        }
+        await bulkUpsertSettings(db, body);
+        invalidateCache('settings');
         return NextResponse.json({ success: true, message: 'Settings updated' });
     } catch (error) {
         return NextResponse.json({ error: error.message }, { status: 500 });
     }
 }
 
+// One bulkWrite for all keys instead of one awaited updateOne per key
+async function bulkUpsertSettings(db, settings) {
+    const ops = Object.entries(settings || {}).map(([key, value]) => ({
+        updateOne: { filter: { key }, update: { $set: { key, value } }, upsert: true }
+    }));
+    if (ops.length) await db.collection('settings').bulkWrite(ops, { ordered: false });
+    return ops.length;
+}
+
+// PUT /api/batch - { fiscal_rules: [{ year, ... }], holidays: [{ year, ... }], settings: { key: value } }
+// One bulkWrite per collection, same upsert semantics as the per-year PUT handlers
+async function handleBatchPut(request, db) {
+    try {
+        const body = await request.json();
+        const fiscalRules = Array.isArray(body.fiscal_rules) ? body.fiscal_rules : [];
+        const holidays = Array.isArray(body.holidays) ? body.holidays : [];
+        const invalid = [...fiscalRules, ...holidays].find(doc => !Number.isInteger(parseInt(doc?.year)));
+        if (invalid !== undefined) {
+            return NextResponse.json({ error: 'Fiecare document trebuie să aibă un an valid' }, { status: 400 });
+        }
+
+        const now = new Date();
+        const fiscalOps = fiscalRules.map(({ _id, ...doc }) => {
+            const year = parseInt(doc.year);
+            return {
+                updateOne: {
+                    filter: { year, effectiveDate: doc.effectiveDate || `${year}-01-01` },
+                    update: { $set: { ...doc, year, updatedAt: now } },
+                    upsert: true
+                }
+            };
+        });
+        const holidayOps = holidays.map(({ _id, ...doc }) => {
+            const year = parseInt(doc.year);
+            return {
+                updateOne: {
+                    filter: { year },
+                    update: { $set: { ...doc, year, lastUpdated: now } },
+                    upsert: true
+                }
+            };
+        });
+
+        const settingsCount = Object.keys(body.settings || {}).length;
+        // allSettled: if one bulkWrite fails after another committed (or part of an unordered one did),
+        // every touched prefix is still invalidated before the error is returned
+        const results = await Promise.allSettled([
+            bulkUpsertSettings(db, body.settings),
+            fiscalOps.length ? db.collection('fiscal_rules').bulkWrite(fiscalOps, { ordered: false }) : null,
+            holidayOps.length ? db.collection('holidays').bulkWrite(holidayOps, { ordered: false }) : null
+        ]);
+
+        if (fiscalOps.length) invalidateCache('fiscal-rules/');
+        if (holidayOps.length) invalidateCache('holidays/');
+        if (settingsCount) invalidateCache('settings');
+        const failed = results.find(result => result.status === 'rejected');
+        if (failed) throw failed.reason;
+
+        return NextResponse.json({
+            success: true,
+            message: 'Actualizare în lot salvată',
+            counts: { fiscal_rules: fiscalOps.length, holidays: holidayOps.length, settings: settingsCount }
+        });
+    } catch (error) {
+        return NextResponse.json({ error: error.message }, { status: 500 });
+    }
+}
+
+// Route name for the metrics: the year segment is collapsed so every year shares one histogram
+function metricsRoute(method, slug) {
+    const parts = slug.split('/').filter(Boolean).slice(0, 2)
+        .map((part, i) => (/^\d+$/.test(part) ? ':year' : i === 1 && slug.startsWith('climatology/') ? ':slug' : part));
+    return `${method} /api/${parts.join('/')}`;
+}
+
+// Latency (time until the response object is ready, streamed bodies excluded) and Mongo round trips per request
+async function observed(method, request, context, handler) {
+    if (!metrics.enabled) return handler(request, context, null);
+    const probe = { dbRoundTrips: 0 };
+    const started = performance.now();
+    let status = 500;
+    try {
+        const response = await handler(request, context, probe);
+        status = response.status;
+        return response;
+    } finally {
+        recordRequest(metricsRoute(method, context?.params?.slug?.join('/') || ''),
+            performance.now() - started, status, probe.dbRoundTrips);
+    }
+}
+
+// GET /api/metrics (?reset=1 clears the counters after reading them) - 404 unless ECALC_METRICS=1
+function handleMetricsGet(request) {
+    if (!metrics.enabled) {
+        return NextResponse.json({ error: 'Metrics disabled (ECALC_METRICS=1)' }, { status: 404 });
+    }
+    const snapshot = metricsSnapshot();
+    if (new URL(request.url).searchParams.get('reset') === '1') resetMetrics();
+    return NextResponse.json(snapshot, { headers: { 'Cache-Control': 'no-store' } });
+}
+
+// GET /api/climatology/:slug?month=M&day=D - one cell of the climatology store (no DB, no network)
+async function handleClimatologyGet(request, { params }) {
+    const slug = params.slug.slice(1).join('/');
+    const query = new URL(request.url).searchParams;
+    const month = Number(query.get('month'));
+    const day = Number(query.get('day'));
+    if (!slug || !Number.isInteger(month) || !Number.isInteger(day)) {
+        return NextResponse.json({ error: 'Expected /api/climatology/:slug?month=M&day=D' }, { status: 400 });
+    }
+    const store = await loadClimatologyStore();
+    if (!store) {
+        return NextResponse.json({ error: 'Climatology store not built (npm run climatology)' }, { status: 503 });
+    }
+    const stats = store.lookup(slug, month, day);
+    if (!stats) {
+        return NextResponse.json({ error: 'No climatology for this location and day' }, { status: 404 });
+    }
+    // The store only changes on a new build
+    return NextResponse.json(stats, { headers: { 'Cache-Control': 'public, max-age=86400' } });
+}
+
 // Main handler
-export async function GET(request, { params }) {
+export async function GET(request, context) {
+    if (context?.params?.slug?.join('/') === 'metrics') return handleMetricsGet(request);
+    if (context?.params?.slug?.[0] === 'climatology') return observed('GET', request, context, handleClimatologyGet);
+    return observed('GET', request, context, handleGet);
+}
+
+export async function POST(request, context) {
+    return observed('POST', request, context, handlePost);
+}
+
+export async function PUT(request, context) {
+    return observed('PUT', request, context, handlePut);
+}
+
+async function handleGet(request, { params }, probe) {
     try {
-        const { db } = await connectToDatabase();
-        await initializeFiscalRules(db);
-        await initializeSettings(db);
+        const db = countRoundTrips((await connectToDatabase()).db, probe);
+        await ensureInitialized(db);
 
         const slug = params?.slug?.join('/') || '';
 
         if (slug.startsWith('fiscal-rules/')) {
             const year = slug.split('/')[1];
             if (year === 'all' || !year) {
-                return handleFiscalRulesGetAll(db);
+                return handleFiscalRulesGetAll(db, request);
             }
             return handleFiscalRulesGet(year, db, request);
         } else if (slug === 'fiscal-rules') {
-            return handleFiscalRulesGetAll(db);
+            return handleFiscalRulesGetAll(db, request);
         } else if (slug.startsWith('holidays/')) {
             const year = slug.split('/')[1];
-            return handleHolidaysGet(db, year);
+            return handleHolidaysGet(db, year, request);
         } else if (slug === 'settings') {
-            return handleSettingsGet(db);
+            return handleSettingsGet(db, request);
         } else if (slug === 'leads') {
-            return handleLeadsGet(db);
+            return handleLeadsGet(db, request);
         } else if (slug === 'leads/export') {
             return handleLeadsExport(db);
         }
@@ -292,7 +553,7 @@ export async function GET(request, { params }) {
         return NextResponse.json({
             message: 'eCalc RO API - Professional Edition',
             version: '2.0',
-            endpoints: ['/api/fiscal-rules/:year', '/api/holidays/:year', '/api/leads', '/api/settings', '/api/auth/login']
+            endpoints: ['/api/fiscal-rules/:year', '/api/holidays/:year', '/api/leads', '/api/settings', '/api/batch', '/api/auth/login', '/api/metrics', '/api/climatology/:slug']
         });
     } catch (error) {
         console.error('API Error:', error);
@@ -300,7 +561,7 @@ export async function GET(request, { params }) {
     }
 }
 
-export async function POST(request, { params }) {
+async function handlePost(request, { params }, probe) {
     const slug = params?.slug?.join('/') || '';
     let body = {};
     try {
@@ -308,7 +569,7 @@ export async function POST(request, { params }) {
     } catch (err) { }
 
     try {
-        const { db } = await connectToDatabase();
+        const db = countRoundTrips((await connectToDatabase()).db, probe);
 
         if (slug === 'leads') {
             return handleLeadPost(body, db);
@@ -323,9 +584,9 @@ export async function POST(request, { params }) {
     }
 }
 
-export async function PUT(request, { params }) {
+async function handlePut(request, { params }, probe) {
     try {
-        const { db } = await connectToDatabase();
+        const db = countRoundTrips((await connectToDatabase()).db, probe);
         const slug = params?.slug?.join('/') || '';
 
         if (slug.startsWith('fiscal-rules/')) {
@@ -336,6 +597,8 @@ export async function PUT(request, { params }) {
             return handleHolidaysPut(request, db, year);
         } else if (slug === 'settings') {
             return handleSettingsPut(request, db);
+        } else if (slug === 'batch') {
+            return handleBatchPut(request, db);
         }
 
         return NextResponse.json({ error: 'Not Found' }, { status: 404 });
@@ -38,6 +38,7 @@ export default function RealEstateCalculatorPage() {
   // Results
   const [yieldResult, setYieldResult] = useState(null);
   const [mortgageResult, setMortgageResult] = useState(null);
+  const [scenarioGrid, setScenarioGrid] = useState(null);
   const [investmentResult, setInvestmentResult] = useState(null);
 
   useEffect(() => {
@@ -90,7 +91,18 @@ export default function RealEstateCalculatorPage() {
       type: mortgageType,
     });
 
+    // Grilă comparativă: dobânda ±1% × perioade uzuale, același avans
+    const rate = parseFloat(mortgageRate);
+    const grid = calculator.evaluateScenarios({
+      propertyValue: parseFloat(propertyValue),
+      rates: [rate - 1, rate, rate + 1].filter(r => r >= 0),
+      downPayments: [parseFloat(downPayment)],
+      terms: [15, 20, 25, 30],
+      type: mortgageType,
+    });
+
     setMortgageResult(result);
+    setScenarioGrid(grid);
   };
 
   const calculateFullAnalysis = () => {
@@ -467,6 +479,42 @@ export default function RealEstateCalculatorPage() {
                       </CardContent>
                     </Card>
 
+                    {scenarioGrid && (
+                      <Card>
+                        <CardHeader>
+                          <CardTitle>Comparație Scenarii</CardTitle>
+                          <CardDescription>Rata lunară (și total dobânzi) pentru alte dobânzi și perioade</CardDescription>
+                        </CardHeader>
+                        <CardContent>
+                          <div className="overflow-x-auto">
+                            <table className="w-full text-sm">
+                              <thead>
+                                <tr className="border-b bg-slate-50">
+                                  <th className="text-left p-2">Perioadă</th>
+                                  {[...new Set(scenarioGrid.scenarios.map(s => s.annualRate))].map(rate => (
+                                    <th key={rate} className="text-right p-2">{rate.toFixed(2)}%</th>
+                                  ))}
+                                </tr>
+                              </thead>
+                              <tbody>
+                                {[...new Set(scenarioGrid.scenarios.map(s => s.years))].map(term => (
+                                  <tr key={term} className="border-b hover:bg-slate-50">
+                                    <td className="p-2">{term} ani</td>
+                                    {scenarioGrid.scenarios.filter(s => s.years === term).map(s => (
+                                      <td key={s.annualRate} className={`p-2 text-right ${s === scenarioGrid.cheapest ? 'font-semibold text-green-700' : ''}`}>
+                                        {formatCurrency(s.monthlyPayment)}
+                                        <span className="block text-xs text-red-600">{formatCurrency(s.totalInterest)}</span>
+                                      </td>
+                                    ))}
+                                  </tr>
+                                ))}
+                              </tbody>
+                            </table>
+                          </div>
+                        </CardContent>
+                      </Card>
+                    )}
+
                     <Card>
                       <CardHeader>
                         <CardTitle>Grafic Rambursare</CardTitle>
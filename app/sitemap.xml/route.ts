@@ -0,0 +1,13 @@
+import { getSitemapShards, renderSitemapIndex, SITEMAP_BASE_URL } from '../../lib/sitemap-shards'
+
+// Indexul se generează la build (datele sunt în lib/) și se servește din cache
+export const dynamic = 'force-static'
+
+export function GET() {
+  return new Response(renderSitemapIndex(getSitemapShards(SITEMAP_BASE_URL), SITEMAP_BASE_URL), {
+    headers: {
+      'Content-Type': 'application/xml; charset=utf-8',
+      'Cache-Control': 'public, max-age=3600, s-maxage=86400',
+    },
+  })
+}
@@ -0,0 +1,24 @@
+import { getSitemapShards, renderUrlSet, SITEMAP_BASE_URL } from '../../../lib/sitemap-shards'
+
+// Un fișier per secțiune și an (/sitemaps/salarii-2026.xml), pre-generat la build
+export const dynamic = 'force-static'
+export const dynamicParams = false
+
+export function generateStaticParams() {
+  return getSitemapShards(SITEMAP_BASE_URL).map(shard => ({ shard: `${shard.id}.xml` }))
+}
+
+export function GET(_request: Request, { params }: { params: { shard: string } }) {
+  const id = params.shard.replace(/\.xml$/, '')
+  const shard = getSitemapShards(SITEMAP_BASE_URL).find(s => s.id === id)
+  if (!shard) {
+    return new Response('Not Found', { status: 404 })
+  }
+
+  return new Response(renderUrlSet(shard), {
+    headers: {
+      'Content-Type': 'application/xml; charset=utf-8',
+      'Cache-Control': 'public, max-age=3600, s-maxage=86400',
+    },
+  })
+}
@@ -4,6 +4,7 @@ import Footer from '@/components/Footer';
 import WeatherView from './WeatherView';
 
 import { MOUNTAIN_RESORTS_ZONES, ALL_COASTAL_RESORTS, ROMANIAN_MOUNTAIN_PEAKS } from '@/lib/resorts-data';
+import { geocodeLocation, nearbyPlaces, resolveLocation } from '@/lib/gazetteer';
 
 const ORASE_PRINCIPALE = ['Alba Iulia', 'Alexandria', 'Arad', 'Bacau', 'Baia Mare', 'Bistrita', 'Botosani', 'Braila', 'Brasov', 'Bucuresti', 'Buzau', 'Calarasi', 'Cluj-Napoca', 'Constanta', 'Craiova', 'Deva', 'Drobeta-Turnu Severin', 'Focsani', 'Galati', 'Giurgiu', 'Iasi', 'Miercurea Ciuc', 'Oradea', 'Piatra Neamt', 'Pitesti', 'Ploiesti', 'Ramnicu Valcea', 'Resita', 'Satu Mare', 'Sfantu Gheorghe', 'Sibiu', 'Slatina', 'Slobozia', 'Suceava', 'Targoviste', 'Targu Jiu', 'Targu Mures', 'Timisoara', 'Tulcea', 'Vaslui', 'Zalau'].sort();
 
@@ -11,7 +12,7 @@ const VARFURI_MUNTE = ROMANIAN_MOUNTAIN_PEAKS;
 
 // SEO: Generam titlu si descriere unica pentru fiecare oras/sat
 export async function generateMetadata({ params }) {
-  const city = params.slug.charAt(0).toUpperCase() + params.slug.slice(1).replace(/-/g, ' ');
+  const city = resolveLocation(params.slug)?.name ?? params.slug.charAt(0).toUpperCase() + params.slug.slice(1).replace(/-/g, ' ');
   return {
     title: `Vremea in ${city} - Prognoza Meteo Detaliata 2026`,
     description: `Afla starea vremii in ${city}. Temperatura reala, sanse de precipitatii si prognoza pe 14 zile. Date actualizate pentru ${city}.`,
@@ -21,57 +22,19 @@ export async function generateMetadata({ params }) {
   };
 }
 
-async function getWeatherData(cityName) {
+async function getWeatherData(slug) {
   try {
-    // Curatam numele orasului pentru cautare (ex: "baia-mare" -> "Baia Mare")
-    const searchName = cityName.split('-').map(word => word.charAt(0).toUpperCase() + word.slice(1)).join(' ');
+    // Coordonatele vin din indexul generat la build; geocoderul doar pentru slug-uri lipsă din index
+    const location = await geocodeLocation(slug);
+    if (!location) return null;
+    const { latitude, longitude, name, region } = location;
 
-    // First attempt: direct search
-    let geoRes = await fetch(`https://geocoding-api.open-meteo.com/v1/search?name=${encodeURIComponent(searchName)}&count=1&language=ro&format=json`);
-    let geoData = await geoRes.json();
-
-    // Check if it's a known peak from our list to improve discovery
-    const isPeak = ROMANIAN_MOUNTAIN_PEAKS.some(p => p.slug === cityName);
-
-    // Fallback 1: Append "Romania"
-    if (!geoData.results) {
-      geoRes = await fetch(`https://geocoding-api.open-meteo.com/v1/search?name=${encodeURIComponent(searchName + ', Romania')}&count=1&language=ro&format=json`);
-      geoData = await geoRes.json();
-    }
-
-    // Fallback 2: For peaks, try "Varful [Name], Romania"
-    if (!geoData.results && isPeak) {
-      geoRes = await fetch(`https://geocoding-api.open-meteo.com/v1/search?name=${encodeURIComponent('Varful ' + searchName + ', Romania')}&count=1&language=ro&format=json`);
-      geoData = await geoRes.json();
-    }
-
-    // Fallback 3: Generic "Varful [Name]"
-    if (!geoData.results && isPeak) {
-      geoRes = await fetch(`https://geocoding-api.open-meteo.com/v1/search?name=${encodeURIComponent('Varful ' + searchName)}&count=1&language=ro&format=json`);
-      geoData = await geoRes.json();
-    }
-
-    if (!geoData.results) return null;
-    const { latitude, longitude, name, admin1 } = geoData.results[0];
-
-    const [weatherRes, nearbyRes] = await Promise.all([
-      fetch(`https://api.open-meteo.com/v1/forecast?latitude=${latitude}&longitude=${longitude}&current=temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m,surface_pressure,visibility,dew_point_2m,cloud_cover&hourly=temperature_2m,pm10,weather_code,precipitation_probability&daily=weather_code,temperature_2m_max,temperature_2m_min,uv_index_max,precipitation_sum,precipitation_probability_max,sunrise,sunset&timezone=auto&forecast_days=14`, { next: { revalidate: 3600 } }),
-      // Cautam localitati in acelasi judet (admin1)
-      fetch(`https://geocoding-api.open-meteo.com/v1/search?name=${encodeURIComponent(admin1 || name)}&count=40&language=ro&format=json`, { next: { revalidate: 86400 } })
-    ]);
-
-    const nearbyResults = await nearbyRes.json();
-    // Filtram sa fie doar localitati din ROMANIA si din acelasi judet
-    const countyPlaces = nearbyResults.results?.filter(p =>
-      p.country_code === 'RO' &&
-      p.admin1 === admin1 &&
-      p.name !== name &&
-      (p.feature_code === 'PPL' || p.feature_code === 'PPLA' || p.feature_code === 'PPLA2')
-    ).slice(0, 20) || [];
+    const weatherRes = await fetch(`https://api.open-meteo.com/v1/forecast?latitude=${latitude}&longitude=${longitude}&current=temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m,surface_pressure,visibility,dew_point_2m,cloud_cover&hourly=temperature_2m,pm10,weather_code,precipitation_probability&daily=weather_code,temperature_2m_max,temperature_2m_min,uv_index_max,precipitation_sum,precipitation_probability_max,sunrise,sunset&timezone=auto&forecast_days=14`, { next: { revalidate: 3600 } });
 
     return {
-      weather: { ...(await weatherRes.json()), cityName: name, region: admin1 },
-      nearbyPlaces: countyPlaces
+      weather: { ...(await weatherRes.json()), cityName: name, region },
+      // Localitati din acelasi judet, din index (fara cautarea count=40 dupa admin1)
+      nearbyPlaces: nearbyPlaces(resolveLocation(slug))
     };
   } catch (e) { return null; }
 }
@@ -1,17 +1,17 @@
 import Link from 'next/link';
-import { CITIES_ROMANIA } from '@/lib/cities-data';
 import { ROMANIA_COUNTIES } from '@/lib/counties-data';
+import { countyLocalities, geocodeLocation } from '@/lib/gazetteer';
+import { normalizeSlug } from '@/lib/sitemap-shards';
 import NavigationHeader from '@/components/NavigationHeader';
 import Footer from '@/components/Footer';
 import { MapPin, ChevronRight, Search, CloudSun, Thermometer, Wind, Droplets } from 'lucide-react';
 
-async function getCountyWeather(cityName) {
+async function getCountyWeather(capitalSlug) {
     try {
-        const geoRes = await fetch(`https://geocoding-api.open-meteo.com/v1/search?name=${encodeURIComponent(cityName + ', Romania')}&count=1&language=ro&format=json`);
-        const geoData = await geoRes.json();
-        if (!geoData.results) return null;
+        const location = await geocodeLocation(capitalSlug);
+        if (!location) return null;
 
-        const { latitude, longitude } = geoData.results[0];
+        const { latitude, longitude } = location;
         const weatherRes = await fetch(`https://api.open-meteo.com/v1/forecast?latitude=${latitude}&longitude=${longitude}&current=temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m&timezone=auto`, { next: { revalidate: 3600 } });
         return await weatherRes.json();
     } catch (e) { return null; }
@@ -32,25 +32,10 @@ export default async function CountyPage({ params }) {
     if (!countyInfo) return <div>Judetul nu a fost gasit.</div>;
 
     // Fetch weather for the county seat (capital)
-    const capitalName = countyInfo.capital || countyInfo.name;
-    const countyWeather = await getCountyWeather(capitalName);
-
-    // Filter cities with a more robust check (normalized county name)
-    const normalize = (str) => str.toLowerCase().normalize("NFD").replace(/[\u0300-\u036f]/g, "").replace(/\s+/g, '-');
-    const slugCounty = normalize(countyInfo.name);
-
-    const citiesInCounty = CITIES_ROMANIA.filter(c => {
-        const normalizedItemCounty = normalize(c.county);
-        // Robust matching for county names
-        return normalizedItemCounty === slugCounty ||
-            normalizedItemCounty.includes(slugCounty) ||
-            slugCounty.includes(normalizedItemCounty) ||
-            c.county === countyInfo.name;
-    }).sort((a, b) => {
-        // Sort by population if available, then by name
-        if (b.population !== a.population) return (b.population || 0) - (a.population || 0);
-        return a.name.localeCompare(b.name);
-    });
+    const countyWeather = await getCountyWeather(normalizeSlug(countyInfo.capital || countyInfo.name));
+
+    // Localitatile judetului din gazetteer (acelasi slug ca /vreme/[slug] si sitemap), dupa populatie
+    const citiesInCounty = countyLocalities(countyInfo.slug);
 
     // Categorize
     const urbanCenters = citiesInCounty.filter(c => c.population > 15000 || c.name === countyInfo.capital);
@@ -123,7 +108,7 @@ export default async function CountyPage({ params }) {
                             </div>
                             <div className="grid grid-cols-2 md:grid-cols-4 lg:grid-cols-5 gap-4">
                                 {urbanCenters.map(city => {
-                                    const citySlug = normalize(city.name);
+                                    const citySlug = city.slug;
                                     return (
                                         <Link key={city.name} href={`/vreme/${citySlug}`} className="group p-4 bg-slate-50 border border-slate-100 rounded-[4px] hover:bg-white hover:border-blue-400 hover:shadow-md transition-all">
                                             <p className="text-sm font-black text-slate-800 group-hover:text-blue-700 truncate">{city.name}</p>
@@ -146,7 +131,7 @@ export default async function CountyPage({ params }) {
                             </div>
                             <div className="grid grid-cols-2 md:grid-cols-4 lg:grid-cols-6 gap-x-4 gap-y-3">
                                 {ruralLocalities.map(city => {
-                                    const citySlug = normalize(city.name);
+                                    const citySlug = city.slug;
                                     return (
                                         <Link key={city.name} href={`/vreme/${citySlug}`} className="group p-1 hover:bg-slate-50 rounded transition-colors">
                                             <p className="text-[13px] font-bold text-slate-600 group-hover:text-blue-600 truncate">{city.name}</p>
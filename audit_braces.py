@@ -1,23 +1,7 @@
-import re
+"""Brace audit - delegates to js_audit.py"""
 import sys
 
-filepath = r"c:\Users\40768\.gemini\antigravity\scratch\ecalcOLD\app\calculator-salarii-pro\[year]\page.js"
-with open(filepath, 'r', encoding='utf-8') as f:
-    content = f.read()
+from js_audit import main
 
-lines = content.split('\n')
-stack = []
-for i, line in enumerate(lines):
-    for char in line:
-        if char == '{':
-            stack.append(i + 1)
-        elif char == '}':
-            if stack:
-                stack.pop()
-            else:
-                print(f"Extra closing brace at line {i + 1}")
-
-if stack:
-    print(f"Unclosed braces opened at lines: {stack}")
-else:
-    print("All braces are balanced.")
+if __name__ == "__main__":
+    sys.exit(main((sys.argv[1:] or ['--tree']) + ['--only', 'brace']))
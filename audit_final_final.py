@@ -1,49 +1,7 @@
-import re
+"""Brace, paren and bracket audit - delegates to js_audit.py"""
 import sys
 
-filepath = r"c:\Users\40768\.gemini\antigravity\scratch\ecalcOLD\app\calculator-salarii-pro\[year]\page.js"
-with open(filepath, 'r', encoding='utf-8') as f:
-    content = f.read()
+from js_audit import main
 
-lines = content.split('\n')
-brace_stack = []
-paren_stack = []
-bracket_stack = []
-for i, line in enumerate(lines):
-    for char in line:
-        if char == '{':
-            brace_stack.append(i + 1)
-        elif char == '}':
-            if brace_stack:
-                brace_stack.pop()
-            else:
-                print(f"Extra closing brace at line {i + 1}")
-        elif char == '(':
-            paren_stack.append(i + 1)
-        elif char == ')':
-            if paren_stack:
-                paren_stack.pop()
-            else:
-                print(f"Extra closing paren at line {i + 1}")
-        elif char == '[':
-            bracket_stack.append(i + 1)
-        elif char == ']':
-            if bracket_stack:
-                bracket_stack.pop()
-            else:
-                print(f"Extra closing bracket at line {i + 1}")
-
-if brace_stack:
-    print(f"Unclosed braces opened at lines: {brace_stack}")
-else:
-    print("All braces are balanced.")
-
-if paren_stack:
-    print(f"Unclosed parens opened at lines: {paren_stack}")
-else:
-    print("All parens are balanced.")
-
-if bracket_stack:
-    print(f"Unclosed brackets opened at lines: {bracket_stack}")
-else:
-    print("All brackets are balanced.")
+if __name__ == "__main__":
+    sys.exit(main((sys.argv[1:] or ['--tree']) + ['--only', 'brace,paren,bracket']))
@@ -4,16 +4,21 @@ Backend API Test Suite for eCalc RO - Professional Edition
 Tests the fiscal rules API endpoints as requested.
 """
 
+import argparse
 import requests
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class FiscalRulesAPITester:
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None, allow_writes: bool = False):
         # Get base URL from environment - this is the external URL for production
-        self.base_url = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://dynamic-payroll-calc.preview.emergentagent.com')
+        self.base_url = base_url or os.getenv('NEXT_PUBLIC_BASE_URL', 'https://dynamic-payroll-calc.preview.emergentagent.com')
         self.api_url = f"{self.base_url}/api"
+        # One pooled keep-alive session instead of a new TCP/TLS connection per call
+        self.session = requests.Session()
+        # PUT /api/batch rewrites holidays and settings: only against the local mock or on request
+        self.allow_writes = allow_writes
         
         self.results = {
             'total_tests': 0,
@@ -41,7 +46,7 @@ class FiscalRulesAPITester:
     def test_get_fiscal_rules_2026(self) -> bool:
         """Test GET /api/fiscal-rules/2026"""
         try:
-            response = requests.get(f"{self.api_url}/fiscal-rules/2026", timeout=10)
+            response = self.session.get(f"{self.api_url}/fiscal-rules/2026", timeout=10)
             
             if response.status_code != 200:
                 self.log_result("GET /api/fiscal-rules/2026", False, f"Status code: {response.status_code}")
@@ -128,7 +133,7 @@ class FiscalRulesAPITester:
     def test_get_fiscal_rules_2025(self) -> bool:
         """Test GET /api/fiscal-rules/2025 for comparison with 2026"""
         try:
-            response = requests.get(f"{self.api_url}/fiscal-rules/2025", timeout=10)
+            response = self.session.get(f"{self.api_url}/fiscal-rules/2025", timeout=10)
             
             if response.status_code != 200:
                 self.log_result("GET /api/fiscal-rules/2025", False, f"Status code: {response.status_code}")
@@ -174,7 +179,7 @@ class FiscalRulesAPITester:
         """Test PUT /api/fiscal-rules/2026 - update child_deduction from 100 to 150 and back to 100"""
         try:
             # First, get current data
-            response = requests.get(f"{self.api_url}/fiscal-rules/2026", timeout=10)
+            response = self.session.get(f"{self.api_url}/fiscal-rules/2026", timeout=10)
             if response.status_code != 200:
                 self.log_result("PUT /api/fiscal-rules/2026", False, "Cannot get current data for update test")
                 return False
@@ -189,7 +194,7 @@ class FiscalRulesAPITester:
                 del update_data['_id']
             update_data['salary']['child_deduction'] = 150
             
-            response = requests.put(
+            response = self.session.put(
                 f"{self.api_url}/fiscal-rules/2026",
                 json=update_data,
                 headers={'Content-Type': 'application/json'},
@@ -201,7 +206,7 @@ class FiscalRulesAPITester:
                 return False
             
             # Verify the update
-            verify_response = requests.get(f"{self.api_url}/fiscal-rules/2026", timeout=10)
+            verify_response = self.session.get(f"{self.api_url}/fiscal-rules/2026", timeout=10)
             if verify_response.status_code != 200:
                 self.log_result("PUT /api/fiscal-rules/2026", False, "Cannot verify update to 150")
                 return False
@@ -214,7 +219,7 @@ class FiscalRulesAPITester:
             # Test 2: Update child_deduction back to 100
             update_data['salary']['child_deduction'] = 100
             
-            response = requests.put(
+            response = self.session.put(
                 f"{self.api_url}/fiscal-rules/2026",
                 json=update_data,
                 headers={'Content-Type': 'application/json'},
@@ -226,7 +231,7 @@ class FiscalRulesAPITester:
                 return False
             
             # Verify the rollback
-            verify_response = requests.get(f"{self.api_url}/fiscal-rules/2026", timeout=10)
+            verify_response = self.session.get(f"{self.api_url}/fiscal-rules/2026", timeout=10)
             if verify_response.status_code != 200:
                 self.log_result("PUT /api/fiscal-rules/2026", False, "Cannot verify rollback to 100")
                 return False
@@ -246,6 +251,68 @@ class FiscalRulesAPITester:
             self.log_result("PUT /api/fiscal-rules/2026", False, f"Unexpected error: {str(e)}")
             return False
     
+    def test_etag_revalidation(self) -> bool:
+        """Test GET /api/settings with If-None-Match - cached responses revalidate to 304"""
+        try:
+            response = self.session.get(f"{self.api_url}/settings", timeout=10)
+            etag = response.headers.get('ETag')
+            if response.status_code != 200 or not etag:
+                self.log_result("ETag /api/settings", False, f"Status {response.status_code}, ETag: {etag}")
+                return False
+
+            response = self.session.get(f"{self.api_url}/settings", headers={'If-None-Match': etag}, timeout=10)
+            if response.status_code != 304 or response.content:
+                self.log_result("ETag /api/settings", False, f"Expected empty 304, got {response.status_code}")
+                return False
+
+            self.log_result("ETag /api/settings", True, f"304 Not Modified for {etag} (X-Cache: {response.headers.get('X-Cache')})")
+            return True
+
+        except requests.exceptions.RequestException as e:
+            self.log_result("ETag /api/settings", False, f"Request error: {str(e)}")
+            return False
+
+    def test_batch_update(self) -> bool:
+        """Test PUT /api/batch - several years of holidays + settings in one request"""
+        try:
+            docs = []
+            for year in (2025, 2026):
+                response = self.session.get(f"{self.api_url}/holidays/{year}", timeout=10)
+                if response.status_code != 200 or not response.json():
+                    self.log_result("PUT /api/batch", False, f"Cannot get holidays {year} for batch test")
+                    return False
+                doc = response.json()
+                doc.pop('_id', None)
+                docs.append(doc)
+            settings = self.session.get(f"{self.api_url}/settings", timeout=10).json()
+
+            # Re-send the current documents: the batch must not change them
+            response = self.session.put(f"{self.api_url}/batch", json={'holidays': docs, 'settings': settings}, timeout=10)
+            if response.status_code != 200:
+                self.log_result("PUT /api/batch", False, f"Batch update failed with status: {response.status_code}")
+                return False
+            counts = response.json().get('counts', {})
+            if counts.get('holidays') != 2 or counts.get('settings') != len(settings):
+                self.log_result("PUT /api/batch", False, f"Unexpected counts: {counts}")
+                return False
+
+            verify = self.session.get(f"{self.api_url}/holidays/2025", timeout=10).json()
+            if verify.get('holidays') != docs[0].get('holidays'):
+                self.log_result("PUT /api/batch", False, "Holidays 2025 changed after batch update")
+                return False
+
+            response = self.session.put(f"{self.api_url}/batch", json={'fiscal_rules': [{'salary': {}}]}, timeout=10)
+            if response.status_code != 400:
+                self.log_result("PUT /api/batch", False, f"Document without year accepted ({response.status_code})")
+                return False
+
+            self.log_result("PUT /api/batch", True, f"Upserted {counts} in one request, rejected a document without year")
+            return True
+
+        except requests.exceptions.RequestException as e:
+            self.log_result("PUT /api/batch", False, f"Request error: {str(e)}")
+            return False
+
     def run_all_tests(self):
         """Run all fiscal rules API tests"""
         print(f"🚀 Starting Fiscal Rules API Tests")
@@ -257,8 +324,13 @@ class FiscalRulesAPITester:
         test_methods = [
             self.test_get_fiscal_rules_2026,
             self.test_get_fiscal_rules_2025, 
-            self.test_put_fiscal_rules_2026
+            self.test_put_fiscal_rules_2026,
+            self.test_etag_revalidation,
         ]
+        if self.allow_writes:
+            test_methods.append(self.test_batch_update)
+        else:
+            print("⏭️  PUT /api/batch: SKIPPED - rewrites holidays and settings (use --local or --allow-writes)")
         
         for test_method in test_methods:
             try:
@@ -285,9 +357,54 @@ class FiscalRulesAPITester:
 
 def main():
     """Main test execution"""
+    parser = argparse.ArgumentParser(description="eCalc RO backend API test suite")
+    parser.add_argument('--base-url', default=None, help="override NEXT_PUBLIC_BASE_URL")
+    parser.add_argument('--local', action='store_true',
+                        help="run against an in-process mock of the API (mock_api_server.py)")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="local mode: injected latency")
+    parser.add_argument('--fault-rate', type=float, default=0.0, help="local mode: injected failure rate")
+    parser.add_argument('--db-latency-ms', type=float, default=0.0, help="local mode: delay per Mongo round trip")
+    parser.add_argument('--load', action='store_true', help="run the concurrent load harness instead")
+    parser.add_argument('--concurrency', type=int, default=20, help="load mode: parallel in-flight requests")
+    parser.add_argument('--duration', type=float, default=10.0, help="load mode: seconds to run")
+    parser.add_argument('--cache', action='store_true', help="measure the API response cache (hit rate, latency)")
+    parser.add_argument('--rounds', type=int, default=5, help="cache mode: invalidations per endpoint")
+    parser.add_argument('--reads', type=int, default=20, help="cache mode: warm reads per invalidation")
+    parser.add_argument('--report', default=None, help="load/cache mode: write JSON results to this path")
+    parser.add_argument('--metrics', action='store_true', help="load mode: scrape GET /api/metrics into the report")
+    parser.add_argument('--allow-writes', action='store_true',
+                        help="also run PUT /api/batch against --base-url (always on with --local)")
+    args = parser.parse_args()
+
+    if args.local:
+        from mock_api_server import MockAPIServer
+        with MockAPIServer(latency_ms=args.latency_ms, fault_rate=args.fault_rate,
+                           db_latency_ms=args.db_latency_ms, metrics=True) as server:
+            args.base_url = server.base_url
+            return run(args)
+    return run(args)
+
+
+def run(args) -> int:
+    """Run the functional suite, the load harness or the cache harness against args.base_url"""
+    if args.load:
+        from load_test import FiscalRulesLoadTester
+        print("=== eCalc RO - Backend API Load Test ===")
+        tester = FiscalRulesLoadTester(args.base_url)
+        results = tester.run_load(concurrency=args.concurrency, duration=args.duration, report_path=args.report,
+                                  metrics_interval=1.0 if args.metrics else None)
+        return 0 if results['errors'] == 0 else 1
+
+    if args.cache:
+        from cache_bench import FiscalRulesCacheTester
+        print("=== eCalc RO - Backend API Cache Benchmark ===")
+        tester = FiscalRulesCacheTester(args.base_url)
+        results = tester.run_cache_bench(rounds=args.rounds, reads=args.reads, report_path=args.report)
+        return 0 if results['totals']['errors'] == 0 else 1
+
     print("=== eCalc RO - Backend API Test Suite ===")
     
-    tester = FiscalRulesAPITester()
+    tester = FiscalRulesAPITester(args.base_url, allow_writes=args.local or args.allow_writes)
     success = tester.run_all_tests()
     
     return 0 if success else 1
@@ -0,0 +1,82 @@
+import { CarTaxCalculator, EURO_NORMS, LOCATION_COEFFICIENTS, VEHICLE_TYPES } from './lib/car-tax-calculator.js';
+import { CarTaxFleet } from './lib/car-tax-fleet.js';
+
+// Benchmark: impozit auto pentru o flotă, modul flotă (tabel precompilat) vs calculate() în buclă
+// Usage: node bench_car_tax_fleet.mjs [vehicles] [--json]
+//   node bench_car_tax_fleet.mjs 50000
+
+const count = Number(process.argv[2]) || 50000;
+const types = Object.keys(VEHICLE_TYPES);
+const norms = Object.keys(EURO_NORMS);
+const locations = [...Object.keys(LOCATION_COEFFICIENTS), 'București', 'Vaslui', 'Comuna Nouă'];
+const fuels = ['benzina', 'motorina', 'gpl', 'hibrid_benzina'];
+
+// Flotă sintetică deterministă: capacități 600-4400 cm³, ~1% mașini de lux
+const fleetVehicles = Array.from({ length: count }, (_, i) => ({
+    vehicle_id: `V${i + 1}`,
+    engineCC: 600 + ((i * 7919) % 3800),
+    vehicleType: types[(i * 31) % types.length],
+    euroNorm: norms[(i * 17) % norms.length],
+    fuelType: fuels[i % fuels.length],
+    location: locations[(i * 13) % locations.length],
+    purchasePrice: i % 97 === 0 ? 400000 + (i % 50) * 1000 : 0
+}));
+
+// ms per pass over the whole fleet, best of 5 runs (after a warm-up run)
+const measure = fn => {
+    let best = Infinity;
+    let total = 0;
+    for (let run = 0; run < 6; run++) {
+        const t0 = performance.now();
+        total = fn();
+        const ms = performance.now() - t0;
+        if (run > 0) best = Math.min(best, ms);
+    }
+    return { ms: best, total };
+};
+
+const single = new CarTaxCalculator();
+const loop = measure(() => {
+    let total = 0;
+    for (const vehicle of fleetVehicles) total += single.calculate(vehicle).finalTax;
+    return total;
+});
+const fleet = measure(() => {
+    const calculator = new CarTaxFleet();
+    let total = 0;
+    for (const vehicle of fleetVehicles) total += calculator.taxFor(vehicle).finalTax;
+    return total;
+});
+// Flota completă (validare + totaluri pe localitate / tip / normă), cu fiecare cale de calcul
+const pipeline = taxFor => measure(() => {
+    const calculator = new CarTaxFleet();
+    if (taxFor) calculator.taxFor = taxFor;
+    return calculator.calculateFleet(fleetVehicles).totals.finalTax;
+});
+const loopPipeline = pipeline(vehicle => single.calculate(vehicle));
+const fleetPipeline = pipeline(null);
+
+const results = {
+    vehicles: count,
+    calculateLoopMs: loop.ms,
+    fleetMs: fleet.ms,
+    calculateLoopWithTotalsMs: loopPipeline.ms,
+    fleetWithTotalsMs: fleetPipeline.ms,
+    speedup: loop.ms / fleet.ms,
+    speedupWithTotals: loopPipeline.ms / fleetPipeline.ms,
+    totalsMatch: [fleet, loopPipeline, fleetPipeline].every(r => r.total === loop.total),
+    finalTax: fleet.total
+};
+
+if (process.argv.includes('--json')) {
+    console.log(JSON.stringify(results));
+} else {
+    console.log(`⏱️  ${count} vehicule, ms per flotă (best of 5)`);
+    const row = (name, ms, baseline) => console.log(`${name.padEnd(40)}${ms.toFixed(1).padStart(10)}`
+        + (baseline ? `${(baseline / ms).toFixed(2)}x`.padStart(10) : ''));
+    row('calculate() în buclă', loop.ms);
+    row('CarTaxFleet.taxFor', fleet.ms, loop.ms);
+    row('calculateFleet cu calculate()', loopPipeline.ms);
+    row('calculateFleet (tabel precompilat)', fleetPipeline.ms, loopPipeline.ms);
+    console.log(results.totalsMatch ? `✅ Același total: ${results.finalTax} RON` : '❌ Totalurile diferă');
+}
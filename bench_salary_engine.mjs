@@ -0,0 +1,97 @@
+import { execFileSync } from 'child_process';
+import { unlinkSync, writeFileSync } from 'fs';
+import * as current from './lib/salary-engine.js';
+
+// Micro-benchmark: cost per call of the salary engine, optionally against an older revision
+// Usage: node bench_salary_engine.mjs [baselineRev] [iterations]
+//   node bench_salary_engine.mjs HEAD~1 200000
+
+const rules2026 = {
+    year: 2026,
+    effectiveDate: '2026-01-01',
+    salary: {
+        minimum_salary: 4050,
+        minimum_gross_construction: 4582,
+        minimum_gross_agriculture: 3436,
+        minimum_gross_it: 4050,
+        cas_rate: 25,
+        pilon2_rate: 4.75,
+        cass_rate: 10,
+        income_tax_rate: 10,
+        cam_rate: 2.25,
+        untaxed_amount: 300,
+        personal_deduction_base: 810,
+        personal_deduction_range: 2000,
+        it_threshold: 10000,
+        it_tax_exempt: false,
+        it_pilon2_optional: true,
+        construction_cas_rate: 21.25,
+        construction_tax_exempt: true,
+        construction_cass_exempt: false,
+        agriculture_cas_rate: 21.25,
+        agriculture_tax_exempt: true,
+        tax_exemption_threshold: 10000
+    }
+};
+
+const sectors = ['standard', 'it', 'construction', 'agriculture'];
+const options = { mealVouchers: 40, voucherDays: 21, isBasicFunction: true };
+const baselineRev = process.argv[2] && process.argv[2] !== '-' ? process.argv[2] : null;
+const iterations = Number(process.argv[3]) || 200000;
+
+const cases = {
+    'calculateSalaryResults brut-net': engine => i =>
+        engine.calculateSalaryResults(3000 + (i % 20000), 'brut-net', sectors[i & 3], rules2026, options),
+    'calculateSalaryResults net-brut': engine => i =>
+        engine.calculateSalaryResults(2000 + (i % 12000), 'net-brut', sectors[i & 3], rules2026, options),
+    '_calculateForSector': engine => {
+        const calc = new engine.SalaryCalculator(rules2026);
+        return i => calc._calculateForSector(3000 + (i % 20000), sectors[i & 3], options);
+    },
+    'calculateNetToGross': engine => {
+        const calc = new engine.SalaryCalculator(rules2026);
+        return i => calc.calculateNetToGross(2000 + (i % 12000), sectors[i & 3], options);
+    },
+    'new SalaryCalculator': engine => () => new engine.SalaryCalculator(rules2026)
+};
+
+// ns per call, best of 5 runs (after a warm-up run)
+const measure = fn => {
+    let sink = 0;
+    let best = Infinity;
+    for (let run = 0; run < 6; run++) {
+        const t0 = performance.now();
+        for (let i = 0; i < iterations; i++) sink += fn(i) ? 1 : 0;
+        const ns = (performance.now() - t0) * 1e6 / iterations;
+        if (run > 0) best = Math.min(best, ns);
+    }
+    if (sink < 0) console.log(sink);
+    return best;
+};
+
+const loadBaseline = async rev => {
+    // Same folder as the engine, so the relative imports of the old revision resolve
+    const path = new URL(`./lib/.salary-engine.bench-baseline.js`, import.meta.url);
+    writeFileSync(path, execFileSync('git', ['show', `${rev}:lib/salary-engine.js`]));
+    try {
+        return await import(path.href);
+    } finally {
+        unlinkSync(path);
+    }
+};
+
+const baseline = baselineRev ? await loadBaseline(baselineRev) : null;
+
+console.log(`⏱️  ${iterations} calls per case, ns/call (best of 5)`);
+console.log(`${'case'.padEnd(34)}${baseline ? baselineRev.padStart(12) : ''}${'current'.padStart(12)}${baseline ? 'speedup'.padStart(10) : ''}`);
+for (const [name, make] of Object.entries(cases)) {
+    const after = measure(make(current));
+    let line = name.padEnd(34);
+    if (baseline) {
+        const before = measure(make(baseline));
+        line += before.toFixed(0).padStart(12) + after.toFixed(0).padStart(12) + `${(before / after).toFixed(2)}x`.padStart(10);
+    } else {
+        line += after.toFixed(0).padStart(12);
+    }
+    console.log(line);
+}
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Bulk Write Harness for eCalc RO
+Shows how Mongo round trips and save latency grow with the payload of an admin
+save, before and after batching:
+
+    settings     PUT /api/settings with N keys: one updateOne per key (legacy)
+                 vs one bulkWrite
+    multi-year   N years of fiscal_rules + holidays: 2N per-year PUTs
+                 vs one PUT /api/batch (one bulkWrite per collection)
+
+Round trips are counted by the local stand-in (mock_api_server.py), which also
+emulates the legacy per-key loop, so the settings comparison and the round-trip
+columns are local-only; against a deployment only latency is measured. Remote
+runs write throw-away keys (bench_setting_*) and years from 2100 on - use a
+staging database.
+
+Usage:
+    python bulk_write_bench.py --local --db-latency-ms 5
+    python bulk_write_bench.py --base-url http://localhost:3000 --sizes 1,10,50 --years 1,5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from backend_test import FiscalRulesAPITester
+from load_test import percentile
+
+SETTINGS_SIZES = (1, 10, 50, 200)
+YEAR_COUNTS = (1, 3, 5, 10)
+BENCH_YEAR = 2100
+
+
+class BulkWriteTester(FiscalRulesAPITester):
+    """Time one admin save per payload size, legacy vs batched"""
+
+    def __init__(self, base_url: Optional[str] = None, server=None):
+        super().__init__(base_url)
+        self.server = server  # MockAPIServer in local mode: round-trip counter + legacy switch
+        self.errors = 0
+
+    def _put(self, path: str, body: Dict[str, Any]) -> int:
+        response = self.session.put(f"{self.api_url}{path}", json=body, timeout=30)
+        if response.status_code != 200:
+            self.errors += 1
+        return len(response.request.body or b'')
+
+    def _measure(self, save: Callable[[], List[int]], repeats: int) -> Dict[str, Any]:
+        """Run save() `repeats` times; latency per save, requests/bytes/round trips per save"""
+        latencies, sizes = [], []
+        before = self.server.db_round_trips if self.server else None
+        for _ in range(repeats):
+            started = time.perf_counter()
+            sizes = save()
+            latencies.append(time.perf_counter() - started)
+        ordered = sorted(latencies)
+        return {
+            'requests': len(sizes),
+            'payload_bytes': sum(sizes),
+            'db_round_trips': (self.server.db_round_trips - before) / repeats if self.server else None,
+            'p50_ms': percentile(ordered, 50) * 1000,
+            'p95_ms': percentile(ordered, 95) * 1000,
+        }
+
+    def _year_docs(self, count: int):
+        rules = self.session.get(f"{self.api_url}/fiscal-rules/2026", timeout=10).json()
+        holidays = self.session.get(f"{self.api_url}/holidays/2026", timeout=10).json() or {}
+        for key in ('_id', 'createdAt', 'updatedAt', 'lastUpdated'):
+            rules.pop(key, None)
+            holidays.pop(key, None)
+        years = range(BENCH_YEAR, BENCH_YEAR + count)
+        return ([dict(rules, year=y, effectiveDate=f"{y}-01-01") for y in years],
+                [dict(holidays, year=y) for y in years])
+
+    def bench_settings(self, size: int, repeats: int) -> Dict[str, Any]:
+        body = {f"bench_setting_{i}": f"value-{i}" for i in range(size)}
+        row = {'keys': size}
+        if self.server:
+            self.server.bulk_writes = False
+            row['legacy'] = self._measure(lambda: [self._put('/settings', body)], repeats)
+            self.server.bulk_writes = True
+        row['bulk'] = self._measure(lambda: [self._put('/settings', body)], repeats)
+        return row
+
+    def bench_years(self, count: int, repeats: int) -> Dict[str, Any]:
+        rules, holidays = self._year_docs(count)
+
+        def per_year():
+            sizes = []
+            for r, h in zip(rules, holidays):
+                sizes.append(self._put(f"/fiscal-rules/{r['year']}", r))
+                sizes.append(self._put(f"/holidays/{h['year']}", h))
+            return sizes
+
+        return {
+            'years': count,
+            'legacy': self._measure(per_year, repeats),
+            'bulk': self._measure(lambda: [self._put('/batch', {'fiscal_rules': rules, 'holidays': holidays})], repeats),
+        }
+
+    def run_bench(self, sizes=SETTINGS_SIZES, year_counts=YEAR_COUNTS, repeats: int = 5,
+                  report_path: Optional[str] = None) -> Dict[str, Any]:
+        print(f"📦 Bulk write benchmark: {repeats} save(s) per payload")
+        print(f"📍 API URL: {self.api_url}")
+        print("-" * 80)
+        print(f"{'payload':<18}{'mode':<10}{'requests':>9}{'KB':>9}{'round trips':>13}{'p50 ms':>10}{'p95 ms':>10}")
+
+        def show(label: str, row: Dict[str, Any]):
+            for mode in ('legacy', 'bulk'):
+                if mode not in row:
+                    continue
+                m = row[mode]
+                trips = '-' if m['db_round_trips'] is None else f"{m['db_round_trips']:g}"
+                print(f"{label:<18}{mode:<10}{m['requests']:>9}{m['payload_bytes'] / 1024:>9.1f}"
+                      f"{trips:>13}{m['p50_ms']:>10.2f}{m['p95_ms']:>10.2f}")
+                label = ''
+
+        settings = []
+        for size in sizes:
+            settings.append(self.bench_settings(size, repeats))
+            show(f"settings x{size}", settings[-1])
+        years = []
+        for count in year_counts:
+            years.append(self.bench_years(count, repeats))
+            show(f"{count} year(s)", years[-1])
+
+        results = {'base_url': self.base_url, 'repeats': repeats, 'settings': settings,
+                   'years': years, 'errors': self.errors}
+        print("-" * 80)
+        largest = years[-1] if years else None
+        if largest:
+            speedup = largest['legacy']['p50_ms'] / largest['bulk']['p50_ms'] if largest['bulk']['p50_ms'] else 0
+            print(f"📊 {largest['years']} year(s): {largest['legacy']['requests']} requests -> 1, "
+                  f"p50 {speedup:.1f}x faster, {self.errors} error(s)")
+
+        if report_path:
+            folder = os.path.dirname(report_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"📝 Report written to {report_path}")
+        return results
+
+
+def _counts(value: str) -> List[int]:
+    return [int(n) for n in value.split(',') if n.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="eCalc RO bulk write harness")
+    parser.add_argument('--base-url', default=None, help="override NEXT_PUBLIC_BASE_URL")
+    parser.add_argument('--local', action='store_true', help="run against mock_api_server.py")
+    parser.add_argument('--db-latency-ms', type=float, default=2.0, help="local mode: delay per Mongo round trip")
+    parser.add_argument('--sizes', type=_counts, default=list(SETTINGS_SIZES), help="settings keys per save")
+    parser.add_argument('--years', type=_counts, default=list(YEAR_COUNTS), help="years per multi-year save")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--report', default=None, help="write JSON results to this path")
+    args = parser.parse_args()
+
+    if args.local:
+        from mock_api_server import MockAPIServer
+        with MockAPIServer(db_latency_ms=args.db_latency_ms) as server:
+            results = BulkWriteTester(server.base_url, server).run_bench(args.sizes, args.years, args.repeats, args.report)
+    else:
+        results = BulkWriteTester(args.base_url).run_bench(args.sizes, args.years, args.repeats, args.report)
+    return 0 if results['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
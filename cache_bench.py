@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+API Cache Harness for eCalc RO
+Measures the read-through cache of route.js: hit rate, miss vs hit latency
+and conditional (If-None-Match -> 304) revalidation.
+
+Each round invalidates one cached resource by re-sending its current document
+through the PUT handler (no data change), then reads it: the first GET is a
+miss, the following ones should be hits, and a GET with the last ETag should
+come back as 304 without a body.
+
+Usage:
+    python backend_test.py --cache --local --db-latency-ms 5
+    python cache_bench.py --base-url http://localhost:3000 --rounds 10 --reads 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from backend_test import FiscalRulesAPITester
+from load_test import percentile
+
+# (name, GET path, invalidation group)
+CACHED_ENDPOINTS = [
+    ('GET /api/fiscal-rules/:year', '/fiscal-rules/2026', 'fiscal-rules'),
+    ('GET /api/fiscal-rules/all', '/fiscal-rules/all', 'fiscal-rules'),
+    ('GET /api/holidays/:year', '/holidays/2026', 'holidays'),
+    ('GET /api/settings', '/settings', 'settings'),
+]
+
+
+def _summary(latencies: List[float]) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'p50_ms': percentile(ordered, 50) * 1000,
+        'p95_ms': percentile(ordered, 95) * 1000,
+    }
+
+
+class FiscalRulesCacheTester(FiscalRulesAPITester):
+    """Cache mode: invalidate, read cold, read warm, revalidate"""
+
+    def invalidate(self, group: str):
+        """Re-PUT the current document of a group so the server drops its cache entries"""
+        if group == 'settings':
+            settings = self.session.get(f"{self.api_url}/settings", timeout=10).json()
+            key = 'ad_header' if 'ad_header' in settings else next(iter(settings), 'initialized')
+            body = {key: settings.get(key, True)}
+            path = '/settings'
+        else:
+            path = '/fiscal-rules/2026' if group == 'fiscal-rules' else '/holidays/2026'
+            body = self.session.get(f"{self.api_url}{path}", timeout=10).json()
+            body.pop('_id', None)
+        response = self.session.put(f"{self.api_url}{path}", json=body, timeout=10)
+        response.raise_for_status()
+
+    def _timed_get(self, path: str, headers: Optional[Dict[str, str]] = None):
+        started = time.perf_counter()
+        response = self.session.get(f"{self.api_url}{path}", headers=headers, timeout=10)
+        return response, time.perf_counter() - started
+
+    def run_cache_bench(self, rounds: int = 5, reads: int = 20,
+                        report_path: Optional[str] = None) -> Dict[str, Any]:
+        """Measure hit rate and latency per endpoint, print a table and return the results"""
+        print(f"🗄️  Cache benchmark: {rounds} round(s) x {reads} warm read(s) per endpoint")
+        print(f"📍 API URL: {self.api_url}")
+        print("-" * 80)
+
+        endpoints = {}
+        all_miss, all_hit = [], []
+        totals = {'HIT': 0, 'MISS': 0, 'not_modified': 0, 'bytes_saved': 0, 'errors': 0}
+        for name, path, group in CACHED_ENDPOINTS:
+            miss, hit, revalidated = [], [], []
+            for _ in range(rounds):
+                self.invalidate(group)
+                etag, size = None, 0
+                for i in range(reads + 1):
+                    response, elapsed = self._timed_get(path)
+                    if response.status_code != 200:
+                        totals['errors'] += 1
+                        continue
+                    state = response.headers.get('X-Cache', 'MISS' if i == 0 else 'HIT')
+                    totals[state] = totals.get(state, 0) + 1
+                    (miss if state == 'MISS' else hit).append(elapsed)
+                    etag, size = response.headers.get('ETag'), len(response.content)
+                if etag:
+                    response, elapsed = self._timed_get(path, {'If-None-Match': etag})
+                    if response.status_code == 304:
+                        totals['not_modified'] += 1
+                        totals['bytes_saved'] += size
+                        revalidated.append(elapsed)
+                    else:
+                        totals['errors'] += 1
+            endpoints[name] = {'miss': _summary(miss), 'hit': _summary(hit), 'not_modified': _summary(revalidated)}
+            all_miss += miss
+            all_hit += hit
+
+        lookups = totals['HIT'] + totals['MISS']
+        miss_p50 = percentile(sorted(all_miss), 50)
+        hit_p50 = percentile(sorted(all_hit), 50)
+        results = {
+            'base_url': self.base_url,
+            'rounds': rounds,
+            'reads': reads,
+            'hit_rate': totals['HIT'] / lookups if lookups else 0.0,
+            'speedup_p50': miss_p50 / hit_p50 if hit_p50 else None,
+            'totals': totals,
+            'endpoints': endpoints,
+        }
+
+        print(f"{'Endpoint':<32}{'miss p50':>10}{'hit p50':>10}{'hit p95':>10}{'304 p50':>10}")
+        for name, e in endpoints.items():
+            print(f"{name:<32}{e['miss']['p50_ms']:>10.2f}{e['hit']['p50_ms']:>10.2f}"
+                  f"{e['hit']['p95_ms']:>10.2f}{e['not_modified']['p50_ms']:>10.2f}")
+        print("-" * 80)
+        speedup = f"{results['speedup_p50']:.1f}x" if results['speedup_p50'] else "n/a"
+        print(f"📊 Hit rate {results['hit_rate'] * 100:.1f}% ({totals['HIT']} hits, {totals['MISS']} misses), "
+              f"p50 miss->hit {speedup}, {totals['not_modified']} x 304 saved {totals['bytes_saved']} bytes, "
+              f"{totals['errors']} error(s)")
+
+        if report_path:
+            folder = os.path.dirname(report_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"📝 Report written to {report_path}")
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="eCalc RO API cache harness")
+    parser.add_argument('--base-url', default=None, help="override NEXT_PUBLIC_BASE_URL")
+    parser.add_argument('--local', action='store_true', help="run against mock_api_server.py")
+    parser.add_argument('--db-latency-ms', type=float, default=2.0, help="local mode: delay per Mongo round trip")
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--reads', type=int, default=20)
+    parser.add_argument('--report', default=None, help="write JSON results to this path")
+    args = parser.parse_args()
+
+    if args.local:
+        from mock_api_server import MockAPIServer
+        with MockAPIServer(db_latency_ms=args.db_latency_ms) as server:
+            results = FiscalRulesCacheTester(server.base_url).run_cache_bench(args.rounds, args.reads, args.report)
+    else:
+        results = FiscalRulesCacheTester(args.base_url).run_cache_bench(args.rounds, args.reads, args.report)
+    return 0 if results['totals']['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Calendar Index - Python reference of lib/calendar-index.js
+Companion of lib/holidays-calculator.js / lib/efactura-calculator.js.
+
+Per-year working-day bitmaps and prefix sums: "working days between A and B"
+is a difference of prefix values and "add N working days" a bisect on them.
+The day-by-day loops that HolidaysCalculator and EFacturaCalculator used
+before the index are kept here as reference, and the benchmark cross-checks
+index vs loops (and, with node, the JS calculators) on HOLIDAYS_2025_2030.
+
+Usage:
+    python calendar_index.py --queries 5000
+    python calendar_index.py --start-year 2025 --end-year 2030 --js --report test_reports/calendar_index.json
+"""
+
+import argparse
+import bisect
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+DateLike = Union[str, date]
+
+# HolidaysCalculator.FIXED_HOLIDAYS
+FIXED_HOLIDAYS = [
+    (1, 1, 'Anul Nou'),
+    (1, 2, 'Anul Nou'),
+    (1, 24, 'Unirea Principatelor Române'),
+    (5, 1, 'Ziua Muncii'),
+    (6, 1, 'Ziua Copilului'),
+    (8, 15, 'Adormirea Maicii Domnului'),
+    (11, 30, 'Sfântul Andrei'),
+    (12, 1, 'Ziua Națională a României'),
+    (12, 25, 'Crăciunul'),
+    (12, 26, 'Crăciunul'),
+]
+
+JS_CHECK = """
+import { readFileSync } from 'fs';
+import { HolidaysCalculator } from './lib/holidays-calculator.js';
+
+const queries = JSON.parse(readFileSync(0, 'utf-8'));
+const iso = d => d.toISOString().split('T')[0];
+const started = process.hrtime.bigint();
+const between = queries.map(([a, b, year]) => HolidaysCalculator.getWorkingDaysBetween(a, b, year));
+const added = queries.map(([a, , year, n]) => iso(HolidaysCalculator.addWorkingDays(a, n, year)));
+const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+console.log(JSON.stringify({ between, added, seconds }));
+"""
+
+
+def _to_date(value: DateLike) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value[:10])
+
+
+def orthodox_easter(year: int) -> date:
+    """Meeus Julian algorithm + 13 days, as HolidaysCalculator.calculateOrthodoxEaster"""
+    a, b, c = year % 4, year % 7, year % 19
+    d = (19 * c + 15) % 30
+    e = (2 * a + 4 * b - d + 34) % 7
+    month = (d + e + 114) // 31
+    day = (d + e + 114) % 31 + 1
+    return date(year, month, day) + timedelta(days=13)
+
+
+def holidays_for_year(year: int) -> List[Dict[str, str]]:
+    """HolidaysCalculator.getHolidaysForYear: fixed + Easter/Pentecost based holidays, sorted"""
+    holidays = [{'date': date(year, m, d).isoformat(), 'name': name, 'type': 'fixed'}
+                for m, d, name in FIXED_HOLIDAYS]
+    easter = orthodox_easter(year)
+    pentecost = easter + timedelta(days=49)
+    for day, name in ((easter - timedelta(days=2), 'Vinerea Mare'), (easter, 'Paștele'),
+                      (easter + timedelta(days=1), 'A doua zi de Paște'), (pentecost, 'Rusaliile'),
+                      (pentecost + timedelta(days=1), 'A doua zi de Rusalii')):
+        holidays.append({'date': day.isoformat(), 'name': name, 'type': 'mobile'})
+    return sorted(holidays, key=lambda h: h['date'])  # stable, like Array.prototype.sort
+
+
+HOLIDAYS_2025_2030 = {year: holidays_for_year(year) for year in range(2025, 2031)}
+
+
+# ---------------------------------------------------------------- loop reference
+
+def _loop_is_working(day: date, holidays) -> bool:
+    return day.weekday() < 5 and day.isoformat() not in holidays
+
+
+def loop_working_days_between(start: DateLike, end: DateLike, holidays: Iterable[str]) -> int:
+    """Day-by-day count over [start, end], as the original getWorkingDaysBetween"""
+    holidays = list(holidays)  # the JS loop used Array.includes
+    current, end = _to_date(start), _to_date(end)
+    count = 0
+    while current <= end:
+        if _loop_is_working(current, holidays):
+            count += 1
+        current += timedelta(days=1)
+    return count
+
+
+def loop_add_working_days(start: DateLike, n: float, holidays: Iterable[str]) -> date:
+    """Day-by-day walk, as the original addWorkingDays / calculateDeadline"""
+    holidays = list(holidays)
+    current = _to_date(start)
+    added = 0
+    while added < n:
+        current += timedelta(days=1)
+        if _loop_is_working(current, holidays):
+            added += 1
+    return current
+
+
+# ---------------------------------------------------------------- index
+
+class CalendarIndex:
+    """Working-day bitmap + prefix sums per year, built lazily for one holiday list"""
+
+    def __init__(self, holiday_dates: Iterable[str] = ()):
+        self.holidays = {_to_date(d).toordinal() for d in holiday_dates}
+        self.years: Dict[int, Dict[str, Any]] = {}
+
+    def _year(self, year: int) -> Dict[str, Any]:
+        entry = self.years.get(year)
+        if entry is None:
+            start = date(year, 1, 1).toordinal()
+            length = date(year + 1, 1, 1).toordinal() - start
+            bitmap = bytearray(length)
+            prefix = [0] * (length + 1)
+            for i in range(length):
+                day = start + i
+                # date.fromordinal(1) is a Monday: weekday = (ordinal - 1) % 7
+                bitmap[i] = 0 if (day - 1) % 7 >= 5 or day in self.holidays else 1
+                prefix[i + 1] = prefix[i] + bitmap[i]
+            entry = {'start': start, 'bitmap': bitmap, 'prefix': prefix, 'total': prefix[length]}
+            self.years[year] = entry
+        return entry
+
+    def is_working_day(self, day: DateLike) -> bool:
+        day = _to_date(day)
+        entry = self._year(day.year)
+        return entry['bitmap'][day.toordinal() - entry['start']] == 1
+
+    def count_working_days(self, start: DateLike, end: DateLike) -> int:
+        """Working days in [start, end], both included"""
+        first, last = _to_date(start), _to_date(end)
+        if first > last:
+            return 0
+        a = self._year(first.year)
+        if first.year == last.year:
+            return a['prefix'][last.toordinal() - a['start'] + 1] - a['prefix'][first.toordinal() - a['start']]
+        count = a['total'] - a['prefix'][first.toordinal() - a['start']]
+        for year in range(first.year + 1, last.year):
+            count += self._year(year)['total']
+        b = self._year(last.year)
+        return count + b['prefix'][last.toordinal() - b['start'] + 1]
+
+    def add_working_days(self, start: DateLike, n: float) -> date:
+        """The day on which the n-th working day after start (excluded) falls"""
+        start = _to_date(start)
+        remaining = -(-n // 1)  # Math.ceil
+        if not remaining > 0:
+            return start
+        year = start.year
+        entry = self._year(year)
+        base = entry['prefix'][start.toordinal() - entry['start'] + 1]
+        while entry['total'] - base < remaining:
+            remaining -= entry['total'] - base
+            year += 1
+            entry = self._year(year)
+            base = 0
+        i = bisect.bisect_left(entry['prefix'], base + remaining, 1)
+        return date.fromordinal(entry['start'] + i - 1)
+
+
+# ---------------------------------------------------------------- benchmark
+
+def make_queries(start_year: int, end_year: int, count: int, seed: int = 0,
+                 max_add: int = 60) -> List[List[Any]]:
+    """[start, end, holiday year, n] with start <= end, both in start_year..end_year"""
+    rng = random.Random(seed)
+    first = date(start_year, 1, 1).toordinal()
+    last = date(end_year, 12, 31).toordinal()
+    queries = []
+    for _ in range(count):
+        a, b = sorted(rng.randint(first, last) for _ in range(2))
+        queries.append([date.fromordinal(a).isoformat(), date.fromordinal(b).isoformat(),
+                        rng.randint(start_year, end_year), rng.randint(0, max_add)])
+    return queries
+
+
+def _run_js(queries: List[List[Any]]) -> Optional[Dict[str, Any]]:
+    node = shutil.which('node')
+    if node is None:
+        return None
+    root = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run([node, '--input-type=module', '-e', JS_CHECK], input=json.dumps(queries),
+                          capture_output=True, text=True, cwd=root, timeout=600, env=dict(os.environ, TZ='UTC'))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    return json.loads(proc.stdout)
+
+
+def run_bench(start_year: int = 2025, end_year: int = 2030, queries: int = 5000, seed: int = 0,
+              js: bool = False, report_path: Optional[str] = None) -> Dict[str, Any]:
+    plan = make_queries(start_year, end_year, queries, seed)
+    holidays = {year: [h['date'] for h in holidays_for_year(year)] for year in range(start_year, end_year + 1)}
+    print(f"📅 Calendar index benchmark: {queries:,} queries, {start_year}-{end_year}")
+    print("-" * 80)
+
+    started = time.perf_counter()
+    loop_between = [loop_working_days_between(a, b, holidays[y]) for a, b, y, _ in plan]
+    loop_added = [loop_add_working_days(a, n, holidays[y]).isoformat() for a, _, y, n in plan]
+    loop_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    indexes = {year: CalendarIndex(dates) for year, dates in holidays.items()}
+    index_between = [indexes[y].count_working_days(a, b) for a, b, y, _ in plan]
+    index_added = [indexes[y].add_working_days(a, n).isoformat() for a, _, y, n in plan]
+    index_s = time.perf_counter() - started
+
+    mismatches = (sum(x != y for x, y in zip(loop_between, index_between)) +
+                  sum(x != y for x, y in zip(loop_added, index_added)))
+    results = {
+        'years': [start_year, end_year], 'queries': queries, 'seed': seed,
+        'loop': {'seconds': loop_s, 'queries_per_sec': 2 * queries / loop_s if loop_s else 0.0},
+        'index': {'seconds': index_s, 'queries_per_sec': 2 * queries / index_s if index_s else 0.0},
+        'mismatches': mismatches,
+    }
+    print(f"{'python loops':<18}{loop_s:>10.3f}s{results['loop']['queries_per_sec']:>14,.0f} q/s")
+    print(f"{'python index':<18}{index_s:>10.3f}s{results['index']['queries_per_sec']:>14,.0f} q/s"
+          f"   ({loop_s / index_s if index_s else 0:.0f}x)")
+
+    if js:
+        out = _run_js(plan)
+        if out is None:
+            print("⚠️  node is not installed, skipping the JS cross-check")
+        else:
+            js_mismatches = (sum(x != y for x, y in zip(loop_between, out['between'])) +
+                             sum(x != y for x, y in zip(loop_added, out['added'])))
+            results['js'] = {'seconds': out['seconds'], 'mismatches': js_mismatches,
+                             'queries_per_sec': 2 * queries / out['seconds'] if out['seconds'] else 0.0}
+            print(f"{'js index':<18}{out['seconds']:>10.3f}s{results['js']['queries_per_sec']:>14,.0f} q/s"
+                  f"   {js_mismatches} mismatch(es) vs loops")
+            mismatches += js_mismatches
+
+    print("-" * 80)
+    print(f"{'✅' if mismatches == 0 else '❌'} {mismatches} mismatch(es) between the index and the day-by-day loops")
+    results['ok'] = mismatches == 0
+
+    if report_path:
+        folder = os.path.dirname(report_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"📝 Report written to {report_path}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Working-day calendar index: reference + benchmark")
+    parser.add_argument('--start-year', type=int, default=2025)
+    parser.add_argument('--end-year', type=int, default=2030)
+    parser.add_argument('--queries', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--js', action='store_true', help="also run the queries through lib/holidays-calculator.js")
+    parser.add_argument('--report', default=None, help="write JSON results to this path")
+    args = parser.parse_args()
+
+    results = run_bench(args.start_year, args.end_year, args.queries, args.seed, args.js, args.report)
+    return 0 if results['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import { createWriteStream, mkdirSync, readFileSync, writeFileSync } from 'fs';
+import { dirname } from 'path';
+import { finished } from 'stream/promises';
+import { streamFleetCsv } from './lib/car-tax-fleet.js';
+
+// Impozit auto pentru o flotă: CSV de vehicule -> CSV cu impozitul per vehicul + totaluri
+// Coloane: vehicle_id, engineCC, vehicleType, euroNorm, fuelType, location, purchasePrice
+// Usage: node car_tax_fleet.mjs fleet.csv [--out taxes.csv] [--rules rules_2026.json] [--report test_reports/fleet.json]
+
+const args = process.argv.slice(2);
+const option = name => {
+    const i = args.indexOf(name);
+    return i >= 0 ? args[i + 1] : null;
+};
+const input = args.find((arg, i) => !arg.startsWith('--') && !(i > 0 && args[i - 1].startsWith('--')));
+if (!input) {
+    console.error('Usage: node car_tax_fleet.mjs fleet.csv [--out taxes.csv] [--rules rules.json] [--report report.json]');
+    process.exit(2);
+}
+
+const rulesPath = option('--rules');
+const fiscalRules = rulesPath ? JSON.parse(readFileSync(rulesPath, 'utf8')) : undefined;
+const outPath = option('--out');
+const output = outPath ? createWriteStream(outPath) : null;
+
+const t0 = performance.now();
+const totals = await streamFleetCsv(input, output, { fiscalRules });
+if (output) {
+    output.end();
+    await finished(output);
+}
+const seconds = (performance.now() - t0) / 1000;
+
+const rows = totals.vehicles + totals.errors;
+console.log(`🚗 ${totals.vehicles} vehicule, impozit total ${Math.round(totals.finalTax).toLocaleString('ro-RO')} RON/an`
+    + (totals.luxuryTax ? ` (din care suprataxă lux ${Math.round(totals.luxuryTax).toLocaleString('ro-RO')} RON)` : ''));
+const topLocations = Object.entries(totals.byLocation).sort((a, b) => b[1].tax - a[1].tax).slice(0, 10);
+for (const [location, entry] of topLocations) {
+    console.log(`   ${location.padEnd(24)}${String(entry.vehicles).padStart(8)} vehicule${String(Math.round(entry.tax)).padStart(12)} RON`);
+}
+if (totals.errors) console.log(`⚠️  ${totals.errors} rând(uri) cu erori (vezi coloana error)`);
+const unknown = Object.keys(totals.unknownLocations);
+if (unknown.length) console.log(`⚠️  Localități fără coeficient (1.00): ${unknown.slice(0, 10).join(', ')}${unknown.length > 10 ? ', ...' : ''}`);
+console.log(`⚡ ${rows} rânduri în ${seconds.toFixed(2)}s (${Math.round(rows / seconds).toLocaleString('ro-RO')} vehicule/s)`);
+if (outPath) console.log(`📝 Rezultate scrise în ${outPath}`);
+
+const reportPath = option('--report');
+if (reportPath) {
+    mkdirSync(dirname(reportPath), { recursive: true });
+    writeFileSync(reportPath, JSON.stringify({ input, output: outPath, seconds, vehiclesPerSecond: rows / seconds, totals }, null, 2));
+    console.log(`📝 Raport scris în ${reportPath}`);
+}
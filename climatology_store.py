@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Climatology Store - offline batch job behind lib/climatology-store.js
+Ingests the Open-Meteo archive in bulk for every city in lib/cities-data.js and
+every resort / peak in lib/resorts-data.js, and writes the multi-year mean of
+each day of the year into one compact file that lookups read without network.
+
+Each archive request covers a batch of locations (comma-separated coordinates)
+over the whole year range, in parallel with retries and backoff on 429/5xx.
+Coordinates come from the geocoding API once; a refresh reuses those stored in
+the previous file, so only new locations are geocoded. The file is replaced
+atomically (rename), so readers never see a half-written store.
+
+Format (little endian), shared with lib/climatology-store.js:
+    b'ECLIMA01' | uint32 header length | JSON header | zero padding to 8 bytes
+    int16[locations][366][2] = (mean temperature x 10, precipitation x 10), -32768 = missing
+The 366 slots are calendar days of a leap year, so 1 March has the same slot
+every year; 29 February falls back to the mean of 28 February and 1 March
+when the range has no leap year.
+
+Runs before every `next build` (npm prebuild -> prebuild.mjs, which skips it
+when python3, numpy or requests is missing: pip install -r requirements.txt);
+the pages look the store up on the server, through GET /api/climatology/:slug.
+
+Usage:
+    npm run climatology
+    python climatology_store.py --years 2016-2025
+    python climatology_store.py --local --only bucuresti,sinaia --out /tmp/climatology.bin
+    python climatology_store.py --lookup bucuresti:2025-12-01
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b'ECLIMA01'
+DAYS = 366
+SCALE = 10
+MISSING = -32768
+FEB_29 = 59
+FIELDS = ('temperature_2m_mean', 'precipitation_sum')
+LEAP_MONTH_START = np.array([0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335])
+
+DEFAULT_OUT = os.path.join('public', 'data', 'climatology.bin')
+ARCHIVE_URL = 'https://archive-api.open-meteo.com'
+GEOCODING_URL = 'https://geocoding-api.open-meteo.com'
+BATCH_SIZE = 20
+RETRIES = 4
+
+# Same list and slugs as the /vreme pages (normalizeSlug of lib/sitemap-shards.js)
+EXPORT_SCRIPT = """
+import { CITIES_ROMANIA } from './lib/cities-data.js';
+import { MOUNTAIN_RESORTS_ZONES, ALL_COASTAL_RESORTS, ROMANIAN_MOUNTAIN_PEAKS } from './lib/resorts-data.js';
+import { normalizeSlug } from './lib/sitemap-shards.js';
+
+const locations = new Map();
+const add = location => { if (!locations.has(location.slug)) locations.set(location.slug, location); };
+CITIES_ROMANIA.forEach(city => add({ slug: normalizeSlug(city.name), name: city.name, kind: 'city', county: city.county }));
+[...MOUNTAIN_RESORTS_ZONES.flatMap(z => z.items), ...ALL_COASTAL_RESORTS]
+    .forEach(({ slug, name }) => add({ slug, name, kind: 'resort' }));
+ROMANIAN_MOUNTAIN_PEAKS.forEach(({ slug, name }) => add({ slug, name, kind: 'peak' }));
+console.log(JSON.stringify([...locations.values()]));
+"""
+
+
+def export_locations() -> List[Dict[str, Any]]:
+    """Cities, resorts and peaks from lib/ with node: [{slug, name, kind, county?}]"""
+    node = shutil.which('node')
+    if node is None:
+        raise RuntimeError("node is not installed")
+    root = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run([node, '--input-type=module', '-e', EXPORT_SCRIPT],
+                          capture_output=True, text=True, cwd=root, timeout=120)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    return json.loads(proc.stdout)
+
+
+def day_slots(days: np.ndarray) -> np.ndarray:
+    """Slot 0..365 of each datetime64[D] (calendar day of a leap year)"""
+    months = days.astype('datetime64[M]')
+    month_index = months.astype(int) % 12
+    day_of_month = (days - months).astype(int)
+    return LEAP_MONTH_START[month_index] + day_of_month
+
+
+def aggregate(temps: np.ndarray, precip: np.ndarray, slots: np.ndarray) -> np.ndarray:
+    """(locations, days) daily values (NaN = missing) -> int16 (locations, 366, 2) day-of-year means"""
+    onehot = np.zeros((len(slots), DAYS))
+    onehot[np.arange(len(slots)), slots] = 1.0
+    out = np.full((temps.shape[0], DAYS, 2), MISSING, dtype='<i2')
+    for field, values in enumerate((temps, precip)):
+        valid = ~np.isnan(values)
+        counts = valid.astype(float) @ onehot
+        sums = np.where(valid, values, 0.0) @ onehot
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+        # 29 February without a leap year in the range: mean of its neighbours
+        leap_missing = counts[:, FEB_29] == 0
+        means[leap_missing, FEB_29] = (means[leap_missing, FEB_29 - 1] + means[leap_missing, FEB_29 + 1]) / 2
+        ok = ~np.isnan(means)
+        out[:, :, field][ok] = np.round(means[ok] * SCALE).astype('<i2')
+    return out
+
+
+def write_store(path: str, header: Dict[str, Any], data: np.ndarray) -> int:
+    """Write header + int16 data atomically; returns the file size"""
+    raw = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    prefix = MAGIC + len(raw).to_bytes(4, 'little') + raw
+    prefix += b'\0' * (-len(prefix) % 8)
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix='.climatology-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(prefix)
+            f.write(np.ascontiguousarray(data, dtype='<i2').tobytes())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return len(prefix) + data.size * 2
+
+
+class ClimatologyStore:
+    """Memory-mapped reader: only the pages of the looked-up cells are read from disk"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            prefix = f.read(12)
+            if prefix[:8] != MAGIC:
+                raise ValueError(f"{path} is not a climatology store")
+            length = int.from_bytes(prefix[8:12], 'little')
+            self.header = json.loads(f.read(length))
+        offset = -(-(12 + length) // 8) * 8
+        self.locations: List[Dict[str, Any]] = self.header['locations']
+        self.index = {location['slug']: i for i, location in enumerate(self.locations)}
+        self.scale = self.header.get('scale', SCALE)
+        self.data = np.memmap(path, dtype='<i2', mode='r', offset=offset, shape=(len(self.locations), DAYS, 2))
+
+    def lookup(self, slug: str, month: int, day: int) -> Optional[Dict[str, Any]]:
+        i = self.index.get(slug)
+        if i is None:
+            return None
+        temp, precip = (int(v) for v in self.data[i, LEAP_MONTH_START[month - 1] + day - 1])
+        if temp == MISSING:
+            return None
+        return {'temp': temp / self.scale, 'precip': 0.0 if precip == MISSING else precip / self.scale,
+                'years': self.header['years']}
+
+    def series(self, slug: str) -> Optional[np.ndarray]:
+        """(366, 2) float array of the location, NaN where missing"""
+        i = self.index.get(slug)
+        if i is None:
+            return None
+        values = self.data[i].astype(float)
+        values[self.data[i] == MISSING] = np.nan
+        return values / self.scale
+
+
+def _ascii(text: str) -> str:
+    return unicodedata.normalize('NFD', text).encode('ascii', 'ignore').decode('ascii')
+
+
+class ArchiveClient:
+    """Open-Meteo archive + geocoding over keep-alive sessions (one per thread), with retries.
+    fail_fast: connection / DNS errors raise at once instead of being retried (offline builds)"""
+
+    def __init__(self, archive_url: str = ARCHIVE_URL, geocoding_url: str = GEOCODING_URL,
+                 retries: int = RETRIES, backoff: float = 1.0, timeout: float = 120.0, fail_fast: bool = False):
+        self.archive_url = archive_url.rstrip('/')
+        self.geocoding_url = geocoding_url.rstrip('/')
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.fail_fast = fail_fast
+        self._local = threading.local()
+        self.lock = threading.Lock()
+        self.requests = {'archive': 0, 'geocoding': 0, 'retries': 0}
+
+    def _session(self):
+        import requests
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _get(self, kind: str, url: str, params: Dict[str, Any]) -> Any:
+        import requests
+        for attempt in range(self.retries + 1):
+            with self.lock:
+                self.requests[kind] += 1
+            try:
+                response = self._session().get(url, params=params, timeout=self.timeout)
+                if response.status_code != 429 and response.status_code < 500:
+                    response.raise_for_status()
+                    return response.json()
+                error = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if self.fail_fast and isinstance(e, requests.ConnectionError):
+                    raise RuntimeError(f"{url}: {e}") from e
+                error = str(e)
+            if attempt == self.retries:
+                raise RuntimeError(f"{url}: {error} after {self.retries + 1} attempts")
+            with self.lock:
+                self.requests['retries'] += 1
+            time.sleep(self.backoff * 2 ** attempt)
+
+    def unreachable(self, timeout: float = 5.0) -> Optional[str]:
+        """One quick geocoding request, no retries: None if the API answers, else the error"""
+        import requests
+        try:
+            response = self._session().get(f"{self.geocoding_url}/v1/search", params={'name': 'Bucuresti', 'count': 1},
+                                           timeout=timeout)
+            return None if response.status_code < 500 else f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            return str(e)
+
+    def geocode(self, location: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+        """Coordinates of a location, trying the same fallbacks as the /vreme page"""
+        place = self.place(location)
+        return (place['lat'], place['lon']) if place else None
+
+    def place(self, location: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Best geocoder match for a location: {lat, lon, admin1}"""
+        name = location['name']
+        queries = [name, f"{name}, Romania"]
+        if location.get('kind') == 'peak':
+            bare = name.replace('Vârful ', '').replace('Varful ', '')
+            queries += [f"Varful {_ascii(bare)}, Romania", bare]
+        county = _ascii(location.get('county') or '').lower()
+        for query in queries:
+            data = self._get('geocoding', f"{self.geocoding_url}/v1/search",
+                             {'name': query, 'count': 10, 'language': 'ro', 'format': 'json', 'countryCode': 'RO'})
+            results = data.get('results') or []
+            if not results:
+                continue
+            # Homonyms (e.g. several "Sântana"): prefer the one in the location's county
+            best = next((r for r in results if county and county in _ascii(r.get('admin1') or '').lower()), results[0])
+            return {'lat': round(float(best['latitude']), 4), 'lon': round(float(best['longitude']), 4),
+                    'admin1': best.get('admin1')}
+        return None
+
+    def daily(self, coords: Sequence[Tuple[float, float]], start: date, end: date) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """One archive request for several locations: (days, temps, precip), NaN where missing"""
+        data = self._get('archive', f"{self.archive_url}/v1/archive", {
+            'latitude': ','.join(f"{lat:.4f}" for lat, _ in coords),
+            'longitude': ','.join(f"{lon:.4f}" for _, lon in coords),
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'daily': ','.join(FIELDS),
+            'timezone': 'Europe/Bucharest',
+        })
+        items = data if isinstance(data, list) else [data]
+        if len(items) != len(coords):
+            raise RuntimeError(f"archive answered {len(items)} location(s) for {len(coords)}")
+        days = np.array(items[0]['daily']['time'], dtype='datetime64[D]')
+        values = [np.array([item['daily'][field] for item in items], dtype=float) for field in FIELDS]
+        return days, values[0], values[1]
+
+
+def build_store(out: str, locations: List[Dict[str, Any]], years: Tuple[int, int],
+                archive_url: str = ARCHIVE_URL, geocoding_url: str = GEOCODING_URL,
+                batch_size: int = BATCH_SIZE, workers: int = 4, previous: Optional[ClimatologyStore] = None,
+                backoff: float = 1.0) -> Dict[str, Any]:
+    """Geocode (new locations only), fetch the archive in batches and write the store"""
+    started = time.perf_counter()
+    client = ArchiveClient(archive_url, geocoding_url, backoff=backoff)
+    known = {loc['slug']: loc for loc in previous.locations} if previous else {}
+
+    coords: Dict[str, Tuple[float, float]] = {}
+    to_geocode = []
+    for location in locations:
+        stored = known.get(location['slug'])
+        if stored and stored.get('lat') is not None:
+            coords[location['slug']] = (stored['lat'], stored['lon'])
+        else:
+            to_geocode.append(location)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for location, found in zip(to_geocode, pool.map(client.geocode, to_geocode)):
+            if found:
+                coords[location['slug']] = found
+    resolved = [loc for loc in locations if loc['slug'] in coords]
+    unresolved = [loc['slug'] for loc in locations if loc['slug'] not in coords]
+
+    start, end = date(years[0], 1, 1), date(years[1], 12, 31)
+    data = np.full((len(resolved), DAYS, 2), MISSING, dtype='<i2')
+    batches = [list(range(i, min(i + batch_size, len(resolved)))) for i in range(0, len(resolved), batch_size)]
+
+    def fetch(rows: List[int]):
+        days, temps, precip = client.daily([coords[resolved[r]['slug']] for r in rows], start, end)
+        return rows, aggregate(temps, precip, day_slots(days))
+
+    failed: List[str] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fetch, rows) for rows in batches]
+        for rows, future in zip(batches, futures):
+            try:
+                rows, values = future.result()
+                data[rows] = values
+            except RuntimeError as e:
+                print(f"⚠️  {e}")
+                for r in rows:
+                    slug = resolved[r]['slug']
+                    # A failed batch keeps the values of the previous store rather than losing the location
+                    if previous and slug in previous.index:
+                        data[r] = previous.data[previous.index[slug]]
+                    failed.append(slug)
+    if batches and len(failed) == len(resolved):
+        raise RuntimeError("every archive batch failed, store not written")
+
+    header = {
+        'version': 1,
+        'days': DAYS,
+        'fields': list(FIELDS),
+        'scale': SCALE,
+        'missing': MISSING,
+        'years': [years[0], years[1]],
+        'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z'),
+        'source': client.archive_url,
+        'locations': [{'slug': loc['slug'], 'name': loc['name'], 'kind': loc.get('kind'),
+                       'lat': coords[loc['slug']][0], 'lon': coords[loc['slug']][1]} for loc in resolved],
+    }
+    size = write_store(out, header, data)
+    return {
+        'out': out,
+        'years': header['years'],
+        'locations': len(resolved),
+        'geocoded': len(to_geocode),
+        'reused_coordinates': len(locations) - len(to_geocode),
+        'unresolved': unresolved,
+        'failed': failed,
+        'requests': dict(client.requests),
+        'bytes': size,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def _parse_years(value: Optional[str]) -> Tuple[int, int]:
+    if not value:
+        last = date.today().year - 1
+        return last - 9, last  # the last 10 complete years
+    first, _, last = value.partition('-')
+    return int(first), int(last or first)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the local climatology store from the Open-Meteo archive")
+    parser.add_argument('--out', default=DEFAULT_OUT, help="store file (served as /data/climatology.bin)")
+    parser.add_argument('--years', default=None, help="year range, e.g. 2016-2025 (default: last 10 complete years)")
+    parser.add_argument('--only', default=None, help="comma separated slugs to ingest (default: every location)")
+    parser.add_argument('--archive-url', default=ARCHIVE_URL)
+    parser.add_argument('--geocoding-url', default=GEOCODING_URL)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="locations per archive request")
+    parser.add_argument('--workers', type=int, default=4, help="parallel requests")
+    parser.add_argument('--full-refresh', action='store_true', help="geocode again instead of reusing stored coordinates")
+    parser.add_argument('--local', action='store_true', help="ingest from an in-process mock_archive_server.py")
+    parser.add_argument('--lookup', default=None, help="print slug:YYYY-MM-DD from the store and exit")
+    parser.add_argument('--allow-failures', action='store_true',
+                        help="exit 0 when archive batches fail (npm prebuild): the pages fall back to the live archive")
+    parser.add_argument('--report', default=None, help="write JSON build summary to this path")
+    args = parser.parse_args()
+
+    if args.lookup:
+        slug, _, day = args.lookup.partition(':')
+        day = date.fromisoformat(day)
+        print(json.dumps(ClimatologyStore(args.out).lookup(slug, day.month, day.day)))
+        return 0
+
+    locations = export_locations()
+    if args.only:
+        wanted = set(args.only.split(','))
+        locations = [loc for loc in locations if loc['slug'] in wanted]
+    previous = None
+    if os.path.exists(args.out) and not args.full_refresh:
+        previous = ClimatologyStore(args.out)
+    years = _parse_years(args.years)
+    print(f"🌦️  Ingesting {len(locations)} location(s), {years[0]}-{years[1]}, "
+          f"{args.batch_size} per request, {args.workers} worker(s)")
+
+    try:
+        if args.local:
+            from mock_archive_server import MockArchiveServer
+            with MockArchiveServer() as server:
+                summary = build_store(args.out, locations, years, server.base_url, server.base_url,
+                                      args.batch_size, args.workers, previous)
+        else:
+            summary = build_store(args.out, locations, years, args.archive_url, args.geocoding_url,
+                                  args.batch_size, args.workers, previous)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 0 if args.allow_failures else 1
+
+    requests = summary['requests']
+    print(f"📍 {summary['locations']} location(s): {summary['geocoded']} geocoded, "
+          f"{summary['reused_coordinates']} reused from the previous store")
+    print(f"🌐 {requests['archive']} archive + {requests['geocoding']} geocoding request(s), "
+          f"{requests['retries']} retried")
+    if summary['unresolved']:
+        print(f"⚠️  Not found by the geocoder: {', '.join(summary['unresolved'])}")
+    if summary['failed']:
+        print(f"❌ Archive failed for {len(summary['failed'])} location(s) (previous values kept where available)")
+    print(f"💾 {summary['out']}: {summary['bytes'] / 1024:.0f} KiB in {summary['seconds']:.1f}s")
+
+    if args.report:
+        folder = os.path.dirname(args.report)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+    return 1 if summary['failed'] and not args.allow_failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
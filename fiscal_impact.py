@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Fiscal Impact - what-if analysis of a fiscal_rules change before it goes live
+Companion of salary_engine.py / payroll_batch.py.
+
+Takes the current and the proposed fiscal_rules documents (the body an admin
+would PUT to /api/fiscal-rules/:year), normalizes both exactly like the
+calculators do (map_db_to_fiscal_rules = mapDbToFiscalRules of
+lib/data-mapper.js) and evaluates them over the same salary distribution,
+synthetic or uploaded, in every sector. Each rule set is one vectorized pass
+per sector over the whole distribution, so a million salaries take well
+under a second.
+
+The report gives, per sector and in total, the change in net, income tax,
+CAS, CASS, CAM and total cost, winners and losers, and the rows that cross a
+cliff: gaining or losing the untaxed amount (gross <= minimum wage), the
+personal deduction, a zero income tax (IT / construction / youth
+exemptions), or falling below the sector minimum.
+
+Usage:
+    python fiscal_impact.py --current rules_2026.json --set minimum_salary=5000
+    python fiscal_impact.py --current rules_2026.json --proposed rules_2026_v2.json --rows 1000000 --report test_reports/impact.json
+    python fiscal_impact.py --base-url http://localhost:3000 --year 2026 --set cas_rate=21 --salaries payroll.csv --out crossers.csv
+"""
+
+import argparse
+import copy
+import csv
+import json
+import math
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from payroll_batch import TRUE_VALUES, read_chunks
+from salary_engine import SECTORS, calculate_salary_results, load_rules, map_db_to_fiscal_rules, sector_minimum
+
+IMPACT_FIELDS = ('net', 'incomeTax', 'cas', 'cass', 'cam', 'totalCost', 'untaxedAmount', 'personalDeduction')
+DELTA_FIELDS = ('net', 'incomeTax', 'cas', 'cass', 'cam', 'totalCost')
+OPTION_FIELDS = ('isBasicFunction', 'mealVouchers', 'voucherDays', 'isTaxExempt', 'isYouthExempt')
+CLIFFS = ('untaxed_amount', 'personal_deduction', 'income_tax_free', 'below_minimum')
+# Synthetic payroll: sector mix, share paid exactly the sector minimum, meal vouchers
+SECTOR_SHARES = (0.78, 0.07, 0.10, 0.05)
+MINIMUM_SHARE = 0.12
+NET_DELTA_QUANTILES = (0.01, 0.5, 0.99)
+
+
+def synthetic_distribution(rows: int, rules: Dict[str, Any], seed: int = 0) -> Dict[str, np.ndarray]:
+    """Lognormal gross salaries (median ~5.5k) with a spike at each sector's minimum wage"""
+    rng = np.random.default_rng(seed)
+    mapped = map_db_to_fiscal_rules(rules)
+    sector = rng.choice(len(SECTORS), size=rows, p=SECTOR_SHARES).astype(np.int8)
+    gross = np.clip(np.round(rng.lognormal(math.log(5500), 0.55, rows)), 1000, 100000)
+    minimums = np.array([sector_minimum(mapped, s) for s in SECTORS])
+    at_minimum = rng.random(rows) < MINIMUM_SHARE
+    gross[at_minimum] = minimums[sector[at_minimum]]
+    vouchers = rng.random(rows) < 0.4
+    return {
+        'gross': gross,
+        'sector': sector,
+        'isBasicFunction': rng.random(rows) < 0.92,
+        'mealVouchers': np.where(vouchers, 40.0, 0.0),
+        'voucherDays': np.where(vouchers, 21.0, 0.0),
+        'isTaxExempt': rng.random(rows) < 0.01,
+        'isYouthExempt': rng.random(rows) < 0.03,
+    }
+
+
+def load_distribution(path: str) -> Dict[str, Any]:
+    """Salaries from CSV/JSONL: gross (required), sector and the option columns of payroll_batch.py"""
+    columns: Dict[str, List[Any]] = {name: [] for name in ('gross', 'sector') + OPTION_FIELDS}
+    skipped = 0
+    for header, rows in read_chunks(path):
+        for row in rows:
+            record = json.loads(row) if header is None else dict(zip(header, row))
+            sector = str(record.get('sector') or 'standard').strip().lower()
+            try:
+                gross = float(record.get('gross'))
+            except (TypeError, ValueError):
+                gross = float('nan')
+            if sector not in SECTORS or not gross > 0:
+                skipped += 1
+                continue
+            columns['gross'].append(gross)
+            columns['sector'].append(SECTORS.index(sector))
+            for field in OPTION_FIELDS:
+                value = record.get(field)
+                if field.startswith('is'):
+                    default = field == 'isBasicFunction'
+                    text = str(value).strip().lower() if value is not None else ''
+                    columns[field].append(default if text == '' else text in TRUE_VALUES or value is True)
+                else:
+                    try:
+                        columns[field].append(float(value or 0))
+                    except (TypeError, ValueError):
+                        columns[field].append(0.0)
+    dist: Dict[str, Any] = {
+        'gross': np.array(columns['gross'], dtype=np.float64),
+        'sector': np.array(columns['sector'], dtype=np.int8),
+    }
+    for field in OPTION_FIELDS:
+        dist[field] = np.array(columns[field], dtype=bool if field.startswith('is') else np.float64)
+    dist['skipped'] = skipped
+    return dist
+
+
+def sector_groups(dist: Dict[str, np.ndarray]) -> List[np.ndarray]:
+    """Row indices per sector, computed once and shared by both rule sets"""
+    return [np.flatnonzero(dist['sector'] == code) for code in range(len(SECTORS))]
+
+
+def evaluate(mapped_rules: Dict[str, Any], dist: Dict[str, np.ndarray],
+             groups: Optional[List[np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """One vectorized calculate_salary_results pass per sector; full-length result columns"""
+    groups = groups if groups is not None else sector_groups(dist)
+    rows = len(dist['gross'])
+    out = {field: np.empty(rows) for field in IMPACT_FIELDS}
+    for sector, idx in zip(SECTORS, groups):
+        if not idx.size:
+            continue
+        options = {field: dist[field][idx] for field in OPTION_FIELDS}
+        res = calculate_salary_results(dist['gross'][idx], sector, mapped_rules, **options)
+        for field in IMPACT_FIELDS:
+            out[field][idx] = res[field]
+    minimums = np.array([sector_minimum(mapped_rules, s) for s in SECTORS])
+    out['below_minimum'] = dist['gross'] < minimums[dist['sector']]
+    return out
+
+
+def cliff_states(result: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    return {
+        'untaxed_amount': result['untaxedAmount'] > 0,
+        'personal_deduction': result['personalDeduction'] > 0,
+        'income_tax_free': result['incomeTax'] == 0,
+        'below_minimum': result['below_minimum'],
+    }
+
+
+def changed_rules(current: Dict[str, Any], proposed: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Normalized salary fields that differ: {field: [current, proposed]}"""
+    changes = {}
+    for field in sorted(set(current['salary']) | set(proposed['salary'])):
+        before, after = current['salary'].get(field), proposed['salary'].get(field)
+        same = before == after or (isinstance(before, float) and isinstance(after, float)
+                                   and math.isnan(before) and math.isnan(after))
+        if not same:
+            changes[field] = [before, after]
+    return changes
+
+
+def _summary(before: Dict[str, np.ndarray], after: Dict[str, np.ndarray],
+             delta_net: np.ndarray, mask: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    pick = (lambda a: a) if mask is None else (lambda a: a[mask])
+    net_delta = pick(delta_net)
+    rows = int(net_delta.size)
+    summary: Dict[str, Any] = {'rows': rows}
+    for field in DELTA_FIELDS:
+        b, a = float(pick(before[field]).sum()), float(pick(after[field]).sum())
+        summary[field] = {'current': b, 'proposed': a, 'delta': a - b}
+    if rows:
+        quantiles = np.quantile(net_delta, NET_DELTA_QUANTILES)
+        summary['net_delta'] = {'mean': float(net_delta.mean()), 'min': float(net_delta.min()),
+                                'max': float(net_delta.max()),
+                                **{f"p{round(q * 100)}": float(v) for q, v in zip(NET_DELTA_QUANTILES, quantiles)}}
+    summary['winners'] = int((net_delta > 0).sum())
+    summary['losers'] = int((net_delta < 0).sum())
+    return summary
+
+
+def impact(current_doc: Dict[str, Any], proposed_doc: Dict[str, Any],
+           dist: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """Evaluate both documents over the distribution; the report and the per-row crossing mask"""
+    started = time.perf_counter()
+    current, proposed = map_db_to_fiscal_rules(current_doc), map_db_to_fiscal_rules(proposed_doc)
+    groups = sector_groups(dist)
+    before = evaluate(current, dist, groups)
+    after = evaluate(proposed, dist, groups)
+    delta_net = after['net'] - before['net']
+
+    states_before, states_after = cliff_states(before), cliff_states(after)
+    crossing = np.zeros(len(dist['gross']), dtype=bool)
+    cliffs = {}
+    for name in CLIFFS:
+        entered = ~states_before[name] & states_after[name]
+        left = states_before[name] & ~states_after[name]
+        crossing |= entered | left
+        cliffs[name] = {'entered': int(entered.sum()), 'left': int(left.sum()),
+                        'by_sector': {s: [int(entered[idx].sum()), int(left[idx].sum())]
+                                      for s, idx in zip(SECTORS, groups)}}
+
+    sectors = {s: _summary(before, after, delta_net, dist['sector'] == code)
+               for code, s in enumerate(SECTORS)}
+    total = _summary(before, after, delta_net)
+    elapsed = time.perf_counter() - started
+    rows = len(dist['gross'])
+    report = {
+        'current': {'year': current['year'], 'effectiveDate': current['effectiveDate']},
+        'proposed': {'year': proposed['year'], 'effectiveDate': proposed['effectiveDate']},
+        'changed_rules': changed_rules(current, proposed),
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_second': rows / elapsed if elapsed else 0.0,
+        'sectors': sectors,
+        'total': total,
+        'cliffs': cliffs,
+        'crossing_rows': int(crossing.sum()),
+    }
+    return {'report': report, 'before': before, 'after': after, 'crossing': crossing,
+            'states': (states_before, states_after)}
+
+
+def write_crossers(path: str, dist: Dict[str, np.ndarray], result: Dict[str, Any]):
+    """Rows that cross a cliff: row, sector, gross, net before / after and the cliffs crossed"""
+    rows = np.flatnonzero(result['crossing'])
+    states_before, states_after = result['states']
+    changed = {name: states_before[name][rows] != states_after[name][rows] for name in CLIFFS}
+    columns = [rows, dist['sector'][rows], dist['gross'][rows], result['before']['net'][rows],
+               result['after']['net'][rows]]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(('row', 'sector', 'gross', 'net_current', 'net_proposed', 'net_delta', 'cliffs'))
+        for i, (row, code, gross, net_b, net_a) in enumerate(zip(*(c.tolist() for c in columns))):
+            crossed = '|'.join(name for name in CLIFFS if changed[name][i])
+            writer.writerow((row, SECTORS[code], f"{gross:g}", f"{net_b:g}", f"{net_a:g}", f"{net_a - net_b:g}", crossed))
+
+
+def _parse_value(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def apply_overrides(doc: Dict[str, Any], overrides: List[str]) -> Dict[str, Any]:
+    """key=value pairs on the salary section (or section.key=value elsewhere) of a copy of doc"""
+    doc = copy.deepcopy(doc)
+    for item in overrides:
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"--set expects key=value, got {item!r}")
+        section, _, field = key.rpartition('.')
+        target = doc.setdefault(section or 'salary', {})
+        target[field] = _parse_value(value)
+    return doc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="What-if impact of a fiscal_rules change over a salary distribution")
+    parser.add_argument('--current', default=None, help="current fiscal_rules JSON document")
+    parser.add_argument('--base-url', default='http://localhost:3000', help="API to fetch the current rules from when --current is not given")
+    parser.add_argument('--year', type=int, default=2026)
+    parser.add_argument('--proposed', default=None, help="proposed fiscal_rules JSON document (default: the current one)")
+    parser.add_argument('--set', dest='overrides', action='append', default=[],
+                        help="override on the proposed rules, e.g. minimum_salary=5000 (repeatable)")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="synthetic distribution size")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--salaries', default=None, help="uploaded distribution (.csv or .jsonl) instead of a synthetic one")
+    parser.add_argument('--out', default=None, help="write the rows that cross a cliff as CSV")
+    parser.add_argument('--report', default=None, help="write JSON report to this path")
+    args = parser.parse_args()
+
+    current_doc = load_rules(args.current, args.base_url, args.year)
+    proposed_doc = load_rules(args.proposed, None, args.year) if args.proposed else current_doc
+    proposed_doc = apply_overrides(proposed_doc, args.overrides)
+
+    if args.salaries:
+        dist = load_distribution(args.salaries)
+        print(f"📂 {len(dist['gross'])} salaries from {args.salaries}"
+              + (f" ({dist['skipped']} row(s) skipped)" if dist['skipped'] else ''))
+    else:
+        dist = synthetic_distribution(args.rows, current_doc, args.seed)
+        print(f"🧪 {args.rows} synthetic salaries (seed {args.seed})")
+
+    result = impact(current_doc, proposed_doc, dist)
+    report = result['report']
+    if not report['changed_rules']:
+        print("ℹ️  The proposed rules normalize to the current ones")
+    for field, (before, after) in report['changed_rules'].items():
+        print(f"🔧 {field}: {before} -> {after}")
+
+    print(f"\n{'Sector':<13} {'Rows':>9} {'Δ Net':>15} {'Δ Tax':>13} {'Δ CAS+CASS':>13} {'Δ CAM':>11}"
+          f" {'Δ Cost':>14} {'Winners':>9} {'Losers':>9}")
+    for name, s in list(report['sectors'].items()) + [('TOTAL', report['total'])]:
+        contributions = s['cas']['delta'] + s['cass']['delta']
+        print(f"{name:<13} {s['rows']:>9} {s['net']['delta']:>15,.0f} {s['incomeTax']['delta']:>13,.0f}"
+              f" {contributions:>13,.0f} {s['cam']['delta']:>11,.0f} {s['totalCost']['delta']:>14,.0f}"
+              f" {s['winners']:>9} {s['losers']:>9}")
+    print()
+    for name, cliff in report['cliffs'].items():
+        if cliff['entered'] or cliff['left']:
+            print(f"⚠️  {name}: {cliff['entered']} row(s) entered, {cliff['left']} left")
+    print(f"⚡ {report['rows']:,} rows x 2 rule sets in {report['seconds']:.2f}s "
+          f"({report['rows_per_second']:,.0f} rows/s)")
+
+    if args.out:
+        write_crossers(args.out, dist, result)
+        print(f"📝 {report['crossing_rows']} crossing row(s) written to {args.out}")
+    if args.report:
+        folder = os.path.dirname(args.report)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Gazetteer Index - build-time coordinates behind lib/gazetteer.js
+The /vreme pages resolve slugs in memory from lib/gazetteer.js (names, counties
+and same-county places come straight from lib/cities-data.js, counties-data.js
+and resorts-data.js); the only thing the data files lack is coordinates. This
+job geocodes every indexed slug once and writes them to
+lib/gazetteer-coordinates.js, so page renders no longer cascade through the
+geocoding API before fetching the forecast.
+
+A rebuild reuses the coordinates already in the module (and, with
+--climatology, those stored in the climatology store, which geocodes the same
+list), so only new slugs hit the geocoder. Slugs the geocoder cannot place are
+left out and keep the remote fallback of lib/gazetteer.js.
+
+The module is committed and refreshed on demand (npm run gazetteer, then
+commit the diff), not in npm prebuild: builds never rewrite a tracked file and
+never wait on the geocoder. The job probes the geocoder once before geocoding
+and does not retry connection / DNS errors, so offline it finishes in seconds;
+the module is only rewritten when the coordinates change.
+
+Usage:
+    npm run gazetteer
+    python gazetteer_index.py
+    python gazetteer_index.py --climatology public/data/climatology.bin
+    python gazetteer_index.py --check
+    python gazetteer_index.py --local --out /tmp/gazetteer-coordinates.js --report test_reports/gazetteer.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from climatology_store import GEOCODING_URL, ArchiveClient, ClimatologyStore
+
+DEFAULT_OUT = os.path.join('lib', 'gazetteer-coordinates.js')
+EXPORT_NAME = 'GAZETTEER_COORDINATES'
+
+EXPORT_SCRIPT = """
+import { gazetteerEntries } from './lib/gazetteer.js';
+console.log(JSON.stringify(gazetteerEntries()));
+"""
+
+MODULE_HEADER = """// Generat de gazetteer_index.py - nu se editează manual.
+// slug -> [latitudine, longitudine, regiune (admin1 de la geocoder)]; regenerare: npm run gazetteer
+"""
+
+
+def export_entries() -> List[Dict[str, Any]]:
+    """Index entries of lib/gazetteer.js with node: [{slug, name, kind, county, ...}]"""
+    node = shutil.which('node')
+    if node is None:
+        raise RuntimeError("node is not installed")
+    root = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run([node, '--input-type=module', '-e', EXPORT_SCRIPT],
+                          capture_output=True, text=True, cwd=root, timeout=120)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    return json.loads(proc.stdout)
+
+
+def read_coordinates(path: str) -> Dict[str, List[Any]]:
+    """slug -> [lat, lon, admin1] from a generated module (empty if missing)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    marker = f"export const {EXPORT_NAME} = "
+    start = source.index(marker) + len(marker)
+    return json.loads(source[start:source.index(';', source.rindex('}'))])
+
+
+def write_coordinates(path: str, coordinates: Dict[str, List[Any]], source: str) -> int:
+    """Write the module atomically (rename), one slug per line so rebuilds diff cleanly"""
+    generated = datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+    lines = [f"  {json.dumps(slug)}: {json.dumps(value, ensure_ascii=False)}" for slug, value in sorted(coordinates.items())]
+    body = "{\n" + ",\n".join(lines) + "\n}" if lines else "{}"
+    text = (MODULE_HEADER
+            + f"export const GAZETTEER_GENERATED_AT = {json.dumps(generated)};\n"
+            + f"export const GAZETTEER_SOURCE = {json.dumps(source)};\n"
+            + f"export const {EXPORT_NAME} = {body};\n")
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix='.gazetteer-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return len(text.encode('utf-8'))
+
+
+def build_index(out: str, entries: List[Dict[str, Any]], geocoding_url: str = GEOCODING_URL,
+                workers: int = 4, previous: Optional[Dict[str, List[Any]]] = None,
+                climatology: Optional[ClimatologyStore] = None, backoff: float = 1.0) -> Dict[str, Any]:
+    """Geocode the entries missing from previous / climatology and write the module"""
+    started = time.perf_counter()
+    previous = previous or {}
+    stored = {loc['slug']: loc for loc in climatology.locations} if climatology else {}
+
+    coordinates: Dict[str, List[Any]] = {}
+    to_geocode = []
+    reused = {'module': 0, 'climatology': 0}
+    for entry in entries:
+        slug = entry['slug']
+        if slug in previous:
+            coordinates[slug] = previous[slug]
+            reused['module'] += 1
+        elif stored.get(slug, {}).get('lat') is not None:
+            coordinates[slug] = [stored[slug]['lat'], stored[slug]['lon'], None]
+            reused['climatology'] += 1
+        else:
+            to_geocode.append(entry)
+
+    client = ArchiveClient(geocoding_url=geocoding_url, backoff=backoff, fail_fast=True)
+    failed: List[str] = []
+    error = client.unreachable() if to_geocode else None
+    if error:
+        # Offline: no point trying each slug; they keep the render-time fallback
+        print(f"⚠️  Geocoder unreachable ({error}), {len(to_geocode)} slug(s) left unindexed")
+        failed = [entry['slug'] for entry in to_geocode]
+        to_geocode = []
+
+    def place(entry: Dict[str, Any]):
+        try:
+            return client.place(entry)
+        except RuntimeError as e:
+            print(f"⚠️  {entry['slug']}: {e}")
+            failed.append(entry['slug'])
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for entry, found in zip(to_geocode, pool.map(place, to_geocode)):
+            if found:
+                coordinates[entry['slug']] = [found['lat'], found['lon'], found['admin1']]
+    unresolved = [e['slug'] for e in entries if e['slug'] not in coordinates and e['slug'] not in failed]
+
+    # Same coordinates: the module (and its GAZETTEER_GENERATED_AT) stays untouched
+    written = not os.path.exists(out) or read_coordinates(out) != coordinates
+    size = write_coordinates(out, coordinates, client.geocoding_url) if written else os.path.getsize(out)
+    return {
+        'out': out,
+        'entries': len(entries),
+        'indexed': len(coordinates),
+        'geocoded': len(to_geocode),
+        'written': written,
+        'reused': reused,
+        'unresolved': unresolved,
+        'failed': failed,
+        'requests': dict(client.requests),
+        'bytes': size,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Geocode the /vreme gazetteer into the committed lib/gazetteer-coordinates.js")
+    parser.add_argument('--out', default=DEFAULT_OUT, help="generated module imported by lib/gazetteer.js")
+    parser.add_argument('--geocoding-url', default=GEOCODING_URL)
+    parser.add_argument('--workers', type=int, default=4, help="parallel geocoding requests")
+    parser.add_argument('--climatology', default=None, help="reuse coordinates from this climatology store")
+    parser.add_argument('--full-refresh', action='store_true', help="geocode every slug again")
+    parser.add_argument('--local', action='store_true', help="geocode against an in-process mock_archive_server.py")
+    parser.add_argument('--check', action='store_true', help="only list indexed slugs without coordinates (no network)")
+    parser.add_argument('--allow-failures', action='store_true',
+                        help="exit 0 when some slugs fail to geocode: they keep the render-time fallback")
+    parser.add_argument('--report', default=None, help="write JSON build summary to this path")
+    args = parser.parse_args()
+
+    entries = export_entries()
+    previous = {} if args.full_refresh else read_coordinates(args.out)
+
+    if args.check:
+        missing = [e['slug'] for e in entries if e['slug'] not in previous]
+        print(f"📍 {len(entries) - len(missing)}/{len(entries)} slug(s) indexed with coordinates")
+        if missing:
+            print(f"⚠️  Resolved by the remote geocoder at render time: {', '.join(missing)}")
+        return 1 if missing else 0
+
+    climatology = None
+    if args.climatology and os.path.exists(args.climatology):
+        climatology = ClimatologyStore(args.climatology)
+    elif args.climatology:
+        print(f"⚠️  {args.climatology} not found, geocoding without it")
+    print(f"🗺️  Indexing {len(entries)} slug(s), {args.workers} worker(s)")
+    if args.local:
+        from mock_archive_server import MockArchiveServer
+        with MockArchiveServer() as server:
+            summary = build_index(args.out, entries, server.base_url, args.workers, previous, climatology)
+    else:
+        summary = build_index(args.out, entries, args.geocoding_url, args.workers, previous, climatology)
+
+    reused = summary['reused']
+    print(f"📍 {summary['indexed']}/{summary['entries']} slug(s) indexed: {summary['geocoded']} geocoded, "
+          f"{reused['module']} kept, {reused['climatology']} from the climatology store")
+    print(f"🌐 {summary['requests']['geocoding']} geocoding request(s), {summary['requests']['retries']} retried")
+    if summary['unresolved']:
+        print(f"⚠️  Not found by the geocoder: {', '.join(summary['unresolved'])}")
+    if summary['failed']:
+        print(f"❌ Geocoding failed for {len(summary['failed'])} slug(s), left to the render-time fallback")
+    state = 'written' if summary['written'] else 'unchanged'
+    print(f"💾 {summary['out']} {state}: {summary['bytes'] / 1024:.0f} KiB in {summary['seconds']:.1f}s")
+
+    if args.report:
+        folder = os.path.dirname(args.report)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+    return 1 if summary['failed'] and not args.allow_failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,662 @@
+#!/usr/bin/env python3
+"""
+JS/JSX Structure Auditor for eCalc RO
+Single-pass tokenizer that checks braces, parens, brackets and JSX tags.
+
+Line and column are tracked incrementally while scanning, and the contents of
+strings, template literals, regex literals and comments are skipped, so the
+cost is linear in the size of the file. This module replaces the regex based
+audit_*.py / final_check.py / find_unclosed.py scripts, which now delegate here.
+
+Usage:
+    python js_audit.py path/to/page.js [more files...] [--only brace,tag]
+    python js_audit.py --tree [--root .] [--workers 8] [--no-cache]
+
+Findings are cached in .audit_cache/findings.json keyed by content hash and
+AUDITOR_VERSION, so reruns only rescan files that changed.
+"""
+
+import argparse
+import codecs
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+AUDITOR_VERSION = "1.1"
+
+LABELS = ('brace', 'paren', 'bracket', 'template', 'tag')
+
+# Tree mode: source folders of the Next.js app and the extensions we audit
+TREE_DIRS = ('app', 'lib', 'components')
+SOURCE_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+SKIP_DIRS = {'node_modules', '.next', '.git', '.audit_cache'}
+
+# Files are decoded and scanned in fixed-size chunks so memory stays flat
+CHUNK_SIZE = 64 * 1024
+
+# Findings cache: bump AUDITOR_VERSION whenever the tokenizer output changes
+CACHE_PATH = os.path.join('.audit_cache', 'findings.json')
+CACHE_MAX_ENTRIES = 2000
+CACHE_MAX_AGE_DAYS = 30
+
+# Frame kinds kept on the scanner stack
+#   '{' '(' '['  - plain JS brackets
+#   '${'         - template literal interpolation, '}' returns to the template
+#   'jsx{'       - JSX expression container, '}' returns to the tag/children
+#   '`'          - template literal body
+#   'tag'        - inside an opening JSX tag (attributes)
+#   'elem'       - inside a JSX element (children)
+FRAME_LABELS = {
+    '{': 'brace', '${': 'brace', 'jsx{': 'brace',
+    '(': 'paren', '[': 'bracket',
+    '`': 'template', 'tag': 'tag', 'elem': 'tag',
+}
+JS_BRACKETS = ('{', '(', '[')
+OPENERS = {'}': ('{', '${', 'jsx{'), ')': ('(',), ']': ('[',)}
+
+# Tokens after which '/' starts a regex literal and '<' starts a JSX element
+EXPR_PREV = frozenset('([{},;:=!&|?+-*%~^<>') | frozenset([
+    '=>', 'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete',
+    'void', 'throw', 'case', 'do', 'else', 'yield', 'await', 'default',
+])
+
+_JS_TOKEN = re.compile(r'''
+    (?P<nl>\n)
+  | (?P<ws>[^\S\n]+)
+  | (?P<word>[A-Za-z_$\u0080-￿][\w$\u0080-￿]*)
+  | (?P<num>\.?\d[\w.]*)
+  | (?P<lcom>//[^\n]*)
+  | (?P<bcom>/\*.*?(?:\*/|\Z))
+  | (?P<str>'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")
+  | (?P<arrow>=>)
+  | (?P<punct>.)
+''', re.X | re.S)
+
+_TEMPLATE_TOKEN = re.compile(r'''
+    (?P<text>(?:[^`\\$]|\$(?!\{))+)
+  | (?P<esc>\\.)
+  | (?P<interp>\$\{)
+  | (?P<end>`)
+  | (?P<other>.)
+''', re.X | re.S)
+
+_TAG_TOKEN = re.compile(r'''
+    (?P<nl>\n)
+  | (?P<ws>[^\S\n]+)
+  | (?P<str>"[^"]*"|'[^']*')
+  | (?P<selfclose>/>)
+  | (?P<punct>[{>])
+  | (?P<other>[^\s{}>/"']+|.)
+''', re.X | re.S)
+
+_CHILD_TOKEN = re.compile(r'(?P<text>[^{}<\n]+)|(?P<nl>\n)|(?P<punct>[{}<])')
+
+_REGEX_LITERAL = re.compile(r'/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+_JSX_START = re.compile(r'<(?:[A-Za-z_$]|>)')
+_TAG_HEAD = re.compile(r'<\s*(/)?\s*([A-Za-z_$][\w$.:\-]*)?')
+_TAG_END = re.compile(r'[^>\n]*>')
+
+
+@dataclass(frozen=True)
+class Finding:
+    """A single structural problem at a 1-based line/column"""
+    kind: str    # 'unclosed' | 'unexpected'
+    label: str   # one of LABELS
+    token: str
+    line: int
+    col: int
+
+    def message(self) -> str:
+        if self.kind == 'unclosed':
+            return f"Unclosed {self.label} {self.token} opened at line {self.line}"
+        return f"Extra closing {self.label} {self.token} at line {self.line}"
+
+
+@dataclass
+class FileReport:
+    """Findings for one audited file"""
+    path: str
+    findings: List[Finding] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.findings
+
+
+class Tokenizer:
+    """Linear JS/JSX scanner that tracks bracket and tag nesting
+
+    Text can be given whole to scan() or in pieces through feed()/close().
+    A token that touches the end of a fed piece (or needs lookahead past it)
+    is held back and completed by the next piece, so the scanner state -
+    stack, line, column - carries across chunk boundaries unchanged.
+    """
+
+    def __init__(self, jsx: bool = True):
+        self.jsx = jsx
+        self.stack = []      # frames: [kind, line, col, name]
+        self.findings = []
+        self.line = 1
+        self.line_start = 0  # absolute offset of the current line
+        self.prev = None     # last significant JS token (for regex/JSX detection)
+        self.base = 0        # absolute offset of the text being scanned
+        self.final = False
+        self.stalled = False
+        self._pending = ''
+
+    # ------------------------------------------------------------------ helpers
+
+    def _col(self, pos: int) -> int:
+        return self.base + pos - self.line_start + 1
+
+    def _newline(self, end: int):
+        self.line += 1
+        self.line_start = self.base + end
+
+    def _newlines(self, text: str, start: int, end: int):
+        count = text.count('\n', start, end)
+        if count:
+            self.line += count
+            self.line_start = self.base + text.rfind('\n', start, end) + 1
+
+    def _stall(self, pos: int) -> int:
+        """Hold back an incomplete token until more text arrives"""
+        self.stalled = True
+        return pos
+
+    def _push(self, kind: str, pos: int, name: str = ''):
+        self.stack.append([kind, self.line, self._col(pos), name])
+
+    def _unclosed(self, frame):
+        kind, line, col, name = frame
+        if kind in ('tag', 'elem'):
+            token = f"<{name}>"
+        elif kind == 'jsx{' or kind == '${':
+            token = "'{'"
+        else:
+            token = f"'{kind}'"
+        self.findings.append(Finding('unclosed', FRAME_LABELS[kind], token, line, col))
+
+    def _unexpected(self, label: str, token: str, pos: int):
+        self.findings.append(Finding('unexpected', label, token, self.line, self._col(pos)))
+
+    def _expr_allowed(self) -> bool:
+        return self.prev is None or self.prev in EXPR_PREV
+
+    # ------------------------------------------------------------------ closing
+
+    def _close_bracket(self, char: str, pos: int):
+        wanted = OPENERS[char]
+        stack = self.stack
+        for idx in range(len(stack) - 1, -1, -1):
+            kind = stack[idx][0]
+            if kind in wanted:
+                for frame in stack[idx + 1:]:
+                    self._unclosed(frame)
+                del stack[idx:]
+                return
+            if kind not in JS_BRACKETS:
+                break
+        self._unexpected(FRAME_LABELS[wanted[0]], f"'{char}'", pos)
+
+    def _close_tag(self, name: str, pos: int):
+        stack = self.stack
+        for idx in range(len(stack) - 1, -1, -1):
+            kind, _, _, frame_name = stack[idx]
+            if kind != 'elem':
+                break
+            if frame_name == name:
+                for frame in stack[idx + 1:]:
+                    self._unclosed(frame)
+                del stack[idx:]
+                return
+        self._unexpected('tag', f"</{name}>", pos)
+
+    def _open_tag(self, text: str, pos: int) -> int:
+        """Handle '<' at pos that starts a JSX opening or closing tag"""
+        head = _TAG_HEAD.match(text, pos)
+        if head.end() == len(text) and not self.final:
+            return self._stall(pos)
+        name = head.group(2) or ''
+        if head.group(1):
+            tail = _TAG_END.match(text, head.end())
+            if tail is None and not self.final and text.find('\n', head.end()) == -1:
+                return self._stall(pos)
+            end = tail.end() if tail else head.end()
+            self._close_tag(name, pos)
+            self._newlines(text, pos, end)
+            self.prev = 'jsx'
+            return end
+        self._push('tag', pos, name)
+        self._newlines(text, pos, head.end())
+        return head.end()
+
+    # ------------------------------------------------------------------ modes
+
+    def _scan_js(self, text: str, pos: int) -> int:
+        match = _JS_TOKEN.match
+        stack = self.stack
+        depth = len(stack)
+        size = len(text)
+        while pos < size:
+            m = match(text, pos)
+            kind = m.lastgroup
+            end = m.end()
+            if end == size and not self.final:
+                return self._stall(pos)
+            if kind == 'nl':
+                self._newline(end)
+            elif kind == 'ws' or kind == 'lcom':
+                pass
+            elif kind == 'word':
+                self.prev = m.group()
+            elif kind == 'num':
+                self.prev = '0'
+            elif kind == 'str':
+                self._newlines(text, pos, end)
+                self.prev = '0'
+            elif kind == 'bcom':
+                self._newlines(text, pos, end)
+            elif kind == 'arrow':
+                self.prev = '=>'
+            else:
+                char = m.group()
+                if char in JS_BRACKETS:
+                    self._push(char, pos)
+                    self.prev = char
+                elif char in OPENERS:
+                    self._close_bracket(char, pos)
+                    self.prev = char
+                    if len(stack) < depth:
+                        return end
+                elif char == '`':
+                    self._push('`', pos)
+                    return end
+                elif char == '/' and self._expr_allowed():
+                    regex = _REGEX_LITERAL.match(text, pos)
+                    if not self.final and (regex.end() == size if regex else text.find('\n', pos) == -1):
+                        return self._stall(pos)
+                    if regex:
+                        end = regex.end()
+                        self.prev = '0'
+                    else:
+                        self.prev = char
+                elif char == '<' and self.jsx and self._expr_allowed() and _JSX_START.match(text, pos):
+                    return self._open_tag(text, pos)
+                else:
+                    if char in '\'"' and not self.final and text.find('\n', pos) == -1:
+                        return self._stall(pos)
+                    self.prev = char
+            pos = end
+        return pos
+
+    def _scan_template(self, text: str, pos: int) -> int:
+        match = _TEMPLATE_TOKEN.match
+        size = len(text)
+        while pos < size:
+            m = match(text, pos)
+            kind = m.lastgroup
+            end = m.end()
+            if end == size and not self.final:
+                return self._stall(pos)
+            if kind == 'interp':
+                self._push('${', pos)
+                self.prev = '{'
+                return end
+            if kind == 'end':
+                self.stack.pop()
+                self.prev = '0'
+                return end
+            self._newlines(text, pos, end)
+            pos = end
+        return pos
+
+    def _scan_tag(self, text: str, pos: int) -> int:
+        match = _TAG_TOKEN.match
+        size = len(text)
+        while pos < size:
+            m = match(text, pos)
+            kind = m.lastgroup
+            end = m.end()
+            if end == size and not self.final:
+                return self._stall(pos)
+            if kind == 'nl':
+                self._newline(end)
+            elif kind == 'str':
+                self._newlines(text, pos, end)
+            elif kind == 'selfclose':
+                self.stack.pop()
+                self.prev = 'jsx'
+                return end
+            elif kind == 'punct':
+                if m.group() == '{':
+                    self._push('jsx{', pos)
+                    self.prev = '{'
+                else:
+                    self.stack[-1][0] = 'elem'
+                return end
+            elif text[pos] in '\'"' and not self.final:
+                # attribute string not closed yet, it may continue in the next chunk
+                return self._stall(pos)
+            pos = end
+        return pos
+
+    def _scan_children(self, text: str, pos: int) -> int:
+        match = _CHILD_TOKEN.match
+        size = len(text)
+        while pos < size:
+            m = match(text, pos)
+            kind = m.lastgroup
+            end = m.end()
+            if end == size and not self.final:
+                return self._stall(pos)
+            if kind == 'nl':
+                self._newline(end)
+            elif kind == 'punct':
+                char = m.group()
+                if char == '{':
+                    self._push('jsx{', pos)
+                    self.prev = '{'
+                    return end
+                if char == '}':
+                    self._unexpected('brace', "'}'", pos)
+                elif text.startswith('</', pos) or _JSX_START.match(text, pos):
+                    return self._open_tag(text, pos)
+            pos = end
+        return pos
+
+    def _run(self, text: str) -> int:
+        """Scan as far as possible, return the offset of the first unconsumed char"""
+        pos = 0
+        self.stalled = False
+        while pos < len(text) and not self.stalled:
+            top = self.stack[-1][0] if self.stack else None
+            if top == '`':
+                pos = self._scan_template(text, pos)
+            elif top == 'tag':
+                pos = self._scan_tag(text, pos)
+            elif top == 'elem':
+                pos = self._scan_children(text, pos)
+            else:
+                pos = self._scan_js(text, pos)
+        return pos
+
+    # ------------------------------------------------------------------ public
+
+    def feed(self, chunk: str):
+        """Scan the next piece of a source text"""
+        text = self._pending + chunk if self._pending else chunk
+        pos = self._run(text)
+        self._pending = text[pos:]
+        self.base += pos
+
+    def close(self) -> List[Finding]:
+        """Finish the text (including any held back token) and return all findings"""
+        self.final = True
+        self._run(self._pending)
+        self._pending = ''
+        for frame in self.stack:
+            self._unclosed(frame)
+        self.stack = []
+        return self.findings
+
+    def scan(self, text: str) -> List[Finding]:
+        """Scan a complete source text and return all findings"""
+        self._pending = text
+        return self.close()
+
+
+def audit_source(text: str, jsx: bool = True) -> List[Finding]:
+    """Audit JS/JSX source text in one linear pass"""
+    return Tokenizer(jsx=jsx).scan(text)
+
+
+def is_jsx_path(path: str) -> bool:
+    """Plain .ts files use '<T>' for type syntax, everything else may hold JSX"""
+    return not path.endswith('.ts')
+
+
+def detect_encoding(head: bytes) -> str:
+    """Some exported admin pages are UTF-16 (e.g. original_admin_from_git.js)"""
+    if head.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return 'utf-16'
+    return 'utf-8-sig'
+
+
+def iter_source_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Decode a file piece by piece; multi-byte sequences split across reads are kept intact"""
+    with open(path, 'rb') as f:
+        raw = f.read(max(chunk_size, 2))  # the whole BOM, whatever the chunk size
+        decoder = codecs.getincrementaldecoder(detect_encoding(raw[:2]))(errors='replace')
+        while raw:
+            yield decoder.decode(raw)
+            raw = f.read(chunk_size)
+        yield decoder.decode(b'', final=True)
+
+
+def audit_file(path: str, chunk_size: int = CHUNK_SIZE) -> FileReport:
+    """Audit one file from disk without holding the whole file in memory"""
+    tokenizer = Tokenizer(jsx=is_jsx_path(path))
+    try:
+        for chunk in iter_source_chunks(path, chunk_size):
+            tokenizer.feed(chunk)
+    except OSError as e:
+        return FileReport(path, error=str(e))
+    return FileReport(path, tokenizer.close())
+
+
+def filter_findings(findings: Iterable[Finding], only: Optional[Iterable[str]]) -> List[Finding]:
+    if not only:
+        return list(findings)
+    wanted = set(only)
+    return [f for f in findings if f.label in wanted]
+
+
+def content_key(path: str) -> str:
+    """Cache key: auditor version + JSX mode + SHA-256 of the file bytes"""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            digest = hashlib.file_digest(f, 'sha256').hexdigest()
+        else:
+            sha = hashlib.sha256()
+            for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+                sha.update(block)
+            digest = sha.hexdigest()
+    mode = 'jsx' if is_jsx_path(path) else 'ts'
+    return f"{AUDITOR_VERSION}:{mode}:{digest}"
+
+
+class AuditCache:
+    """Persistent findings cache with LRU + max-age eviction"""
+
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = CACHE_MAX_ENTRIES,
+                 max_age_days: float = CACHE_MAX_AGE_DAYS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.entries = data.get('entries', {}) if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, key: str) -> Optional[List[Finding]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry['used'] = time.time()
+        return [Finding(**f) for f in entry['findings']]
+
+    def put(self, key: str, findings: List[Finding]):
+        self.entries[key] = {'used': time.time(), 'findings': [asdict(f) for f in findings]}
+
+    def evict(self):
+        """Drop other auditor versions, entries unused for max_age, then the least recently used"""
+        cutoff = time.time() - self.max_age
+        prefix = f"{AUDITOR_VERSION}:"
+        kept = [(k, v) for k, v in self.entries.items() if k.startswith(prefix) and v['used'] >= cutoff]
+        kept.sort(key=lambda item: item[1]['used'], reverse=True)
+        self.entries = dict(kept[:self.max_entries])
+
+    def save(self):
+        self.evict()
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'auditor_version': AUDITOR_VERSION, 'entries': self.entries}, f)
+        os.replace(tmp_path, self.path)
+
+
+def discover_sources(root: str, dirs: Iterable[str] = TREE_DIRS) -> List[str]:
+    """Find every JS/TS source file under the given folders of root"""
+    found = []
+    for folder in dirs:
+        base = os.path.join(root, folder)
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+            for name in sorted(filenames):
+                if name.endswith(SOURCE_EXTENSIONS):
+                    found.append(os.path.join(dirpath, name))
+    return found
+
+
+def audit_paths(paths: List[str], workers: Optional[int] = None,
+                cache: Optional[AuditCache] = None) -> List[FileReport]:
+    """Audit files across a process pool and merge the reports in path order"""
+    reports = []
+    keys = {}
+    pending = paths
+    if cache is not None:
+        pending = []
+        for path in paths:
+            try:
+                key = content_key(path)
+            except OSError as e:
+                reports.append(FileReport(path, error=str(e)))
+                continue
+            findings = cache.get(key)
+            if findings is None:
+                keys[path] = key
+                pending.append(path)
+            else:
+                reports.append(FileReport(path, findings))
+
+    fresh = _audit_uncached(pending, workers or os.cpu_count() or 1)
+    if cache is not None:
+        for report in fresh:
+            if report.error is None:
+                cache.put(keys[report.path], report.findings)
+    reports.extend(fresh)
+    reports.sort(key=lambda r: r.path)
+    return reports
+
+
+def _audit_uncached(paths: List[str], workers: int) -> List[FileReport]:
+    if workers <= 1 or len(paths) <= 1:
+        return [audit_file(p) for p in paths]
+
+    # Largest files first so a big page does not end up alone at the tail
+    ordered = sorted(paths, key=_file_size, reverse=True)
+    chunksize = max(1, len(ordered) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=min(workers, len(ordered))) as pool:
+        return list(pool.map(audit_file, ordered, chunksize=chunksize))
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def print_report(reports: List[FileReport], only: Optional[List[str]] = None) -> int:
+    """Print findings per file, return the number of problems"""
+    problems = 0
+    for report in reports:
+        if report.error:
+            problems += 1
+            print(f"❌ {report.path}: {report.error}")
+            continue
+        findings = filter_findings(report.findings, only)
+        if not findings:
+            continue
+        problems += len(findings)
+        for finding in findings:
+            print(f"❌ {report.path}:{finding.line}:{finding.col}: {finding.message()}")
+
+    checked = ', '.join(only) if only else ', '.join(LABELS)
+    if problems:
+        print(f"⚠️  {problems} problem(s) in {len(reports)} file(s) [{checked}]")
+    else:
+        print(f"✅ {len(reports)} file(s) balanced [{checked}]")
+    return problems
+
+
+def parse_only(value: Optional[str]) -> Optional[List[str]]:
+    if not value:
+        return None
+    labels = [v.strip() for v in value.split(',') if v.strip()]
+    unknown = [v for v in labels if v not in LABELS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown check(s): {', '.join(unknown)}")
+    return labels
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Audit JS/JSX files for unbalanced brackets and tags")
+    parser.add_argument('paths', nargs='*', help="files to audit")
+    parser.add_argument('--only', type=parse_only, default=None,
+                        help=f"comma separated subset of: {', '.join(LABELS)}")
+    parser.add_argument('--tree', action='store_true',
+                        help=f"audit every source file under {', '.join(TREE_DIRS)}")
+    parser.add_argument('--root', default=os.path.dirname(os.path.abspath(__file__)),
+                        help="project root for --tree (default: folder of this script)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument('--cache', default=None,
+                        help=f"findings cache file (default: <root>/{CACHE_PATH})")
+    parser.add_argument('--no-cache', action='store_true', help="rescan every file")
+    args = parser.parse_args(argv)
+
+    paths = [os.path.normpath(p) for p in args.paths]
+    if args.tree:
+        paths += [os.path.relpath(p) for p in discover_sources(args.root)]
+    if not paths:
+        parser.error("give file paths or --tree")
+
+    cache = None
+    if not args.no_cache:
+        cache = AuditCache(args.cache or os.path.join(args.root, CACHE_PATH))
+
+    started = time.perf_counter()
+    reports = audit_paths(paths, args.workers, cache)
+    problems = print_report(reports, args.only)
+    elapsed = time.perf_counter() - started
+    if cache is not None:
+        cache.save()
+        print(f"⏱️  {elapsed:.2f}s (cache: {cache.hits} hit(s), {cache.misses} rescanned)")
+    else:
+        print(f"⏱️  {elapsed:.2f}s")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
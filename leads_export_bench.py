@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Leads Export Benchmark for eCalc RO
+Seeds the local stand-in (mock_api_server.py) with a growing number of leads
+and checks that the streamed /api/leads/export and the cursor-paginated
+/api/leads keep peak memory flat while the table grows.
+
+Peak memory is the tracemalloc high-water mark of the whole process during
+the run (server threads + streaming client), above what was allocated before
+it. The seeded leads are generated on demand, so the "database" itself does
+not count.
+
+Usage:
+    python leads_export_bench.py --leads 1000000
+    python leads_export_bench.py --sizes 10000,100000 --page-size 500 --report test_reports/leads_export.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from load_test import percentile
+from mock_api_server import MockAPIServer
+
+# Peak at the largest size may be at most this many times the peak at the smallest (+ slack)
+FLAT_RATIO = 2.0
+FLAT_SLACK_BYTES = 1024 * 1024
+
+
+def _measure(fn):
+    """Run fn under tracemalloc, return (result, seconds, peak bytes above the starting point)"""
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    return result, elapsed, max(0, tracemalloc.get_traced_memory()[1] - baseline)
+
+
+def stream_export(session: requests.Session, api_url: str) -> Dict[str, int]:
+    """Consume the CSV in fixed-size chunks without keeping it"""
+    rows = size = 0
+    with session.get(f"{api_url}/leads/export", stream=True, timeout=600) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(64 * 1024):
+            rows += chunk.count(b'\n')
+            size += len(chunk)
+    return {'rows': rows - 1, 'bytes': size}
+
+
+def walk_pages(session: requests.Session, api_url: str, page_size: int) -> Dict[str, Any]:
+    """Follow X-Next-Cursor to the end, timing every page"""
+    latencies: List[float] = []
+    leads = 0
+    cursor = None
+    while True:
+        params = {'limit': page_size}
+        if cursor:
+            params['cursor'] = cursor
+        started = time.perf_counter()
+        response = session.get(f"{api_url}/leads", params=params, timeout=60)
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+        leads += len(response.json())
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+    head, tail = sorted(latencies[:10]), sorted(latencies[-10:])
+    return {'leads': leads, 'pages': len(latencies),
+            'first_pages_p50_ms': percentile(head, 50) * 1000,
+            'last_pages_p50_ms': percentile(tail, 50) * 1000}
+
+
+def run_bench(sizes: List[int], page_size: int = 1000, report_path: Optional[str] = None) -> Dict[str, Any]:
+    print(f"📦 Leads export benchmark: {', '.join(f'{n:,}' for n in sizes)} leads")
+    print("-" * 80)
+    print(f"{'leads':>10}{'export s':>10}{'rows/s':>11}{'MB':>8}{'peak MB':>9}"
+          f"{'pages':>7}{'page p50 ms (first/last)':>27}{'peak MB':>9}")
+
+    runs = []
+    tracemalloc.start()
+    try:
+        with MockAPIServer() as server:
+            api_url = f"{server.base_url}/api"
+            session = requests.Session()
+            for size in sizes:
+                server.store.seed_leads(size)
+                export, export_s, export_peak = _measure(lambda: stream_export(session, api_url))
+                pages, pages_s, pages_peak = _measure(lambda: walk_pages(session, api_url, page_size))
+                ok = export['rows'] == size and pages['leads'] == size
+                runs.append({'leads': size, 'complete': ok,
+                             'export': dict(export, seconds=export_s, rows_per_sec=size / export_s if export_s else 0.0,
+                                            peak_bytes=export_peak),
+                             'pagination': dict(pages, seconds=pages_s, peak_bytes=pages_peak)})
+                print(f"{size:>10,}{export_s:>10.2f}{size / export_s if export_s else 0:>11,.0f}"
+                      f"{export['bytes'] / 1e6:>8.1f}{export_peak / 1e6:>9.2f}{pages['pages']:>7}"
+                      f"{pages['first_pages_p50_ms']:>14.2f} / {pages['last_pages_p50_ms']:<10.2f}"
+                      f"{pages_peak / 1e6:>9.2f}{'' if ok else '  ❌ incomplete'}")
+    finally:
+        tracemalloc.stop()
+
+    first, last = runs[0], runs[-1]
+    flat = all(
+        last[kind]['peak_bytes'] <= first[kind]['peak_bytes'] * FLAT_RATIO + FLAT_SLACK_BYTES
+        for kind in ('export', 'pagination'))
+    results = {'sizes': sizes, 'page_size': page_size, 'flat_memory': flat,
+               'complete': all(r['complete'] for r in runs), 'runs': runs}
+
+    print("-" * 80)
+    growth = last['leads'] / first['leads']
+    print(f"{'✅' if flat else '❌'} Peak memory {'flat' if flat else 'NOT flat'} over {growth:,.0f}x more leads "
+          f"(export {first['export']['peak_bytes'] / 1e6:.2f} -> {last['export']['peak_bytes'] / 1e6:.2f} MB, "
+          f"pages {first['pagination']['peak_bytes'] / 1e6:.2f} -> {last['pagination']['peak_bytes'] / 1e6:.2f} MB)")
+
+    if report_path:
+        folder = os.path.dirname(report_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"📝 Report written to {report_path}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming leads export / pagination memory benchmark")
+    parser.add_argument('--leads', type=int, default=1000000, help="largest table size")
+    parser.add_argument('--sizes', default=None, help="comma separated table sizes (default: leads/100, leads/10, leads)")
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--report', default=None, help="write JSON results to this path")
+    args = parser.parse_args()
+
+    if args.sizes:
+        sizes = [int(n) for n in args.sizes.split(',') if n.strip()]
+    else:
+        sizes = sorted({max(1, args.leads // 100), max(1, args.leads // 10), args.leads})
+    results = run_bench(sizes, args.page_size, args.report)
+    return 0 if results['flat_memory'] and results['complete'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
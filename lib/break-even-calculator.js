@@ -1,6 +1,9 @@
 // Break-even Point Calculator for Decision Maker
 // Calculează pragurile exacte la care devine mai avantajoasă o formă juridică față de alta
 
+import { findFirstCrossing } from './crossover-solver.js';
+import { instrumentMethods } from './metrics.js';
+
 export class BreakEvenCalculator {
   constructor(fiscalRules) {
     this.rules = fiscalRules;
@@ -8,29 +11,12 @@ export class BreakEvenCalculator {
 
   // Calculează break-even între Salariu și PFA Sistem Real
   calculateSalaryToPFABreakeven(expenseRate = 30) {
-    // Incrementăm venitul până găsim punctul de break-even
-    let income = 10000; // Start la 10k
-    const step = 1000;
-    const maxIncome = 500000;
-    
-    let breakEvenPoint = null;
-    let previousDiff = null;
-
-    while (income <= maxIncome) {
-      const salaryNet = this.calculateSalaryNet(income);
-      const pfaNet = this.calculatePFARealNet(income, income * (expenseRate / 100));
-      
-      const diff = pfaNet - salaryNet;
-      
-      if (previousDiff !== null && previousDiff < 0 && diff > 0) {
-        // Am trecut punctul de break-even
-        breakEvenPoint = income;
-        break;
-      }
-      
-      previousDiff = diff;
-      income += step;
-    }
+    // Pragul exact (rezoluție 1 RON): primul venit la care PFA trece peste Salariu
+    const breakEvenPoint = findFirstCrossing(
+      income => this.calculatePFARealNet(income, income * (expenseRate / 100)) - this.calculateSalaryNet(income),
+      10000, 500000,
+      [...this.pfaRealBreakpoints(expenseRate), this.salaryBreakpoint()]
+    );
 
     return {
       breakEvenIncome: breakEvenPoint,
@@ -43,27 +29,11 @@ export class BreakEvenCalculator {
 
   // Calculează break-even între PFA Sistem Real și Normă de Venit
   calculateRealToNormBreakeven(normValue, expenseRate = 30) {
-    let income = 10000;
-    const step = 1000;
-    const maxIncome = 300000;
-    
-    let breakEvenPoint = null;
-    let previousDiff = null;
-
-    while (income <= maxIncome) {
-      const realNet = this.calculatePFARealNet(income, income * (expenseRate / 100));
-      const normNet = this.calculatePFANormNet(income, normValue);
-      
-      const diff = normNet - realNet;
-      
-      if (previousDiff !== null && previousDiff < 0 && diff > 0) {
-        breakEvenPoint = income;
-        break;
-      }
-      
-      previousDiff = diff;
-      income += step;
-    }
+    const breakEvenPoint = findFirstCrossing(
+      income => this.calculatePFANormNet(income, normValue) - this.calculatePFARealNet(income, income * (expenseRate / 100)),
+      10000, 300000,
+      this.pfaRealBreakpoints(expenseRate)
+    );
 
     return {
       breakEvenIncome: breakEvenPoint,
@@ -78,28 +48,15 @@ export class BreakEvenCalculator {
   // Calculează break-even între PFA și SRL Micro
   calculatePFAToSRLBreakeven(expenseRate = 30, employees = 0) {
     const microTaxRate = employees > 0 ? 1 : 3;
-    
-    let income = 10000;
-    const step = 1000;
-    const maxIncome = 500000;
-    
-    let breakEvenPoint = null;
-    let previousDiff = null;
-
-    while (income <= maxIncome) {
-      const pfaNet = this.calculatePFARealNet(income, income * (expenseRate / 100));
-      const srlNet = this.calculateSRLNet(income, income * (expenseRate / 100), microTaxRate);
-      
-      const diff = srlNet - pfaNet;
-      
-      if (previousDiff !== null && previousDiff < 0 && diff > 0) {
-        breakEvenPoint = income;
-        break;
-      }
-      
-      previousDiff = diff;
-      income += step;
-    }
+
+    const breakEvenPoint = findFirstCrossing(
+      income => {
+        const expenses = income * (expenseRate / 100);
+        return this.calculateSRLNet(income, expenses, microTaxRate) - this.calculatePFARealNet(income, expenses);
+      },
+      10000, 500000,
+      [...this.pfaRealBreakpoints(expenseRate), ...this.srlBreakpoints(expenseRate, microTaxRate)]
+    );
 
     return {
       breakEvenIncome: breakEvenPoint,
@@ -111,6 +68,32 @@ export class BreakEvenCalculator {
     };
   }
 
+  // Pragurile CASS / CAS ale PFA (pe venitul net) exprimate în venit, cu cheltuieli = venit * expenseRate
+  pfaRealBreakpoints(expenseRate) {
+    const share = 1 - expenseRate / 100;
+    if (!(share > 0)) return [];
+    const minSalary = this.rules.pfa?.minimum_salary || 4050;
+    return [
+      minSalary * (this.rules.pfa?.cass_min_threshold || 6),
+      minSalary * (this.rules.pfa?.cass_max_threshold || 60),
+      minSalary * 12,
+      minSalary * 24,
+    ].map(threshold => threshold / share);
+  }
+
+  // Venitul anual de la care baza de impozit a salariului devine pozitivă
+  salaryBreakpoint() {
+    const share = 1 - (this.rules.salary?.cas_rate || 25) / 100 - (this.rules.salary?.cass_rate || 10) / 100;
+    return share > 0 ? 12 * (this.rules.salary?.personal_deduction_base || 510) / share : null;
+  }
+
+  // Pragul CASS pe dividende exprimat în venit
+  srlBreakpoints(expenseRate, microTaxRate) {
+    const share = 1 - expenseRate / 100 - microTaxRate / 100;
+    const minSalary = this.rules.pfa?.minimum_salary || 4050;
+    return share > 0 ? [minSalary * 24 / share] : [];
+  }
+
   // Calculează net pentru salariu
   calculateSalaryNet(annualGross) {
     const monthlyGross = annualGross / 12;
@@ -249,3 +232,7 @@ export class BreakEvenCalculator {
     }).format(value);
   }
 }
+
+instrumentMethods(BreakEvenCalculator, 'BreakEvenCalculator', [
+  'calculateSalaryToPFABreakeven', 'calculateRealToNormBreakeven', 'calculatePFAToSRLBreakeven', 'generateBreakEvenTable'
+]);
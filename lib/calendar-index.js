@@ -0,0 +1,134 @@
+/**
+ * Calendar Index - Working-day arithmetic without day-by-day loops
+ * Shared by HolidaysCalculator and EFacturaCalculator.
+ *
+ * For every year touched the index keeps a bitmap of working days (Mon-Fri,
+ * not a holiday of the given list) and its prefix sums, built once per holiday
+ * list. "Working days between A and B" is then a difference of two prefix
+ * values (plus one total per year crossed) and "add N working days" is a
+ * binary search on the prefix sums.
+ *
+ * Days are UTC calendar days: 'YYYY-MM-DD' strings parse as UTC midnight, the
+ * same day the calculators' toISOString() holiday check sees.
+ */
+
+export const DAY_MS = 24 * 60 * 60 * 1000;
+
+// Indexes are rebuilt only when the holiday list changes (custom holidays from admin)
+const INDEX_CACHE_SIZE = 32;
+const indexCache = new Map();
+
+export const toDayNumber = (date) => Math.floor(new Date(date).getTime() / DAY_MS);
+
+const yearOf = (day) => new Date(day * DAY_MS).getUTCFullYear();
+
+// 1970-01-01 a fost joi (4)
+const isWeekend = (day) => {
+  const dayOfWeek = (((day + 4) % 7) + 7) % 7;
+  return dayOfWeek === 0 || dayOfWeek === 6;
+};
+
+export class CalendarIndex {
+  /**
+   * @param {string[]} holidayDates - 'YYYY-MM-DD' dates that are not working days
+   */
+  constructor(holidayDates = []) {
+    this.holidays = new Set(holidayDates.map(toDayNumber).filter(Number.isFinite));
+    this.years = new Map();
+  }
+
+  // bitmap[i] = 1 dacă ziua i a anului e lucrătoare; prefix[i] = zile lucrătoare înainte de ziua i
+  _year(year) {
+    let entry = this.years.get(year);
+    if (!entry) {
+      const start = Date.UTC(year, 0, 1) / DAY_MS;
+      const length = Date.UTC(year + 1, 0, 1) / DAY_MS - start;
+      const bitmap = new Uint8Array(length);
+      const prefix = new Uint16Array(length + 1);
+      for (let i = 0; i < length; i++) {
+        bitmap[i] = isWeekend(start + i) || this.holidays.has(start + i) ? 0 : 1;
+        prefix[i + 1] = prefix[i] + bitmap[i];
+      }
+      entry = { start, bitmap, prefix, total: prefix[length] };
+      this.years.set(year, entry);
+    }
+    return entry;
+  }
+
+  isWorkingDay(date) {
+    const day = toDayNumber(date);
+    if (!Number.isFinite(day)) return false;
+    const entry = this._year(yearOf(day));
+    return entry.bitmap[day - entry.start] === 1;
+  }
+
+  // Zile lucrătoare între două numere de zi UTC, ambele incluse
+  countWorkingDayRange(first, last) {
+    if (!Number.isFinite(first) || !Number.isFinite(last) || first > last) return 0;
+
+    const firstYear = yearOf(first);
+    const lastYear = yearOf(last);
+    const a = this._year(firstYear);
+    if (firstYear === lastYear) {
+      return a.prefix[last - a.start + 1] - a.prefix[first - a.start];
+    }
+    let count = a.total - a.prefix[first - a.start];
+    for (let year = firstYear + 1; year < lastYear; year++) count += this._year(year).total;
+    const b = this._year(lastYear);
+    return count + b.prefix[last - b.start + 1];
+  }
+
+  // Zile lucrătoare în intervalul [startDate, endDate], ambele incluse
+  countWorkingDays(startDate, endDate) {
+    return this.countWorkingDayRange(toDayNumber(startDate), toDayNumber(endDate));
+  }
+
+  // Ziua (număr de zi UTC) în care se împlinesc n zile lucrătoare după startDay (exclusiv)
+  addWorkingDaysToDay(startDay, n) {
+    let remaining = Math.ceil(n);
+    if (!(remaining > 0)) return startDay;
+
+    let year = yearOf(startDay);
+    let entry = this._year(year);
+    let base = entry.prefix[startDay - entry.start + 1];
+    while (entry.total - base < remaining) {
+      remaining -= entry.total - base;
+      entry = this._year(++year);
+      base = 0;
+    }
+
+    // Primul i cu prefix[i] >= base + remaining; ziua căutată este i - 1
+    const target = base + remaining;
+    let lo = 1;
+    let hi = entry.prefix.length - 1;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (entry.prefix[mid] >= target) hi = mid;
+      else lo = mid + 1;
+    }
+    return entry.start + lo - 1;
+  }
+
+  // Adaugă n zile lucrătoare; păstrează ora din startDate
+  addWorkingDays(startDate, n) {
+    const result = new Date(startDate);
+    const day = toDayNumber(result);
+    if (!Number.isFinite(day)) return result;
+    result.setUTCDate(result.getUTCDate() + this.addWorkingDaysToDay(day, n) - day);
+    return result;
+  }
+}
+
+// Index comun pentru aceeași listă de sărbători (ordinea și duplicatele nu contează)
+export function getCalendarIndex(holidayDates = []) {
+  const key = [...new Set(holidayDates)].sort().join(',');
+  let index = indexCache.get(key);
+  if (!index) {
+    index = new CalendarIndex(holidayDates);
+    if (indexCache.size >= INDEX_CACHE_SIZE) indexCache.delete(indexCache.keys().next().value);
+  } else {
+    indexCache.delete(key);
+  }
+  indexCache.set(key, index);
+  return index;
+}
@@ -2,6 +2,8 @@
 // Calculează impozitul auto bazat pe Art. 470 Cod Fiscal 2026
 // Formula: (CMC / 200, rotunjit în sus) × Rata pe normă Euro × Coeficient localitate
 
+import { instrumentMethods } from './metrics.js';
+
 export class CarTaxCalculator {
   constructor(fiscalRules) {
     this.rules = fiscalRules?.car_tax || {};
@@ -393,6 +395,8 @@ export class CarTaxCalculator {
   }
 }
 
+instrumentMethods(CarTaxCalculator, 'CarTaxCalculator', ['calculate', 'compareLocations', 'compareEuroNorms', 'estimateTCO']);
+
 // Export constante pentru UI
 export const VEHICLE_TYPES = CarTaxCalculator.VEHICLE_TYPES;
 export const LOCATION_COEFFICIENTS = CarTaxCalculator.LOCATION_COEFFICIENTS;
@@ -0,0 +1,289 @@
+// Car Tax Fleet - impozit auto pentru flote (zeci de mii de vehicule, mai multe localități)
+// Aceeași formulă ca CarTaxCalculator.calculate (Art. 470 Cod Fiscal), dar tabelele
+// (VEHICLE_TYPES, EURO_NORMS, RATES_2026 / MOTORCYCLE_RATES, LOCATION_COEFFICIENTS) sunt
+// compilate o singură dată într-un tabel plat de rate indexat (tip, normă, interval capacitate)
+// și un tabel de coeficienți per localitate. Per vehicul rămân doar 3 lookup-uri și calculul,
+// fără breakdown-ul text al calculatorului. Combustibilul nu intră în formula Art. 470:
+// e validat și copiat în rezultat, dar nu indexează tabelul.
+
+import { createReadStream } from 'fs';
+import { createInterface } from 'readline';
+import { once } from 'events';
+import { CarTaxCalculator } from './car-tax-calculator.js';
+
+// Intervalele de capacitate ale autoturismelor; motocicletele folosesc doar sub_1600 / peste_1600
+export const CAPACITY_BANDS = ['sub_1600', '1601_2000', '2001_2600', '2601_3000', 'peste_3000'];
+const ELECTRIC_TAX = 40;
+const DEFAULT_LUXURY_THRESHOLD = 375000;
+
+export const FLEET_OUTPUT_FIELDS = [
+  'vehicle_id', 'vehicleType', 'engineCC', 'euroNorm', 'fuelType', 'location',
+  'fractions', 'ratePerFraction', 'baseTax', 'locationCoefficient', 'luxuryTax',
+  'finalTax', 'quarterly', 'monthly', 'error'
+];
+
+// Denumiri de coloane acceptate în CSV -> câmpul din calculate()
+const COLUMN_ALIASES = {
+  vehicle_id: 'vehicle_id', id: 'vehicle_id', nr_inmatriculare: 'vehicle_id',
+  enginecc: 'engineCC', engine_cc: 'engineCC', cmc: 'engineCC', capacitate: 'engineCC',
+  vehicletype: 'vehicleType', vehicle_type: 'vehicleType', tip: 'vehicleType',
+  euronorm: 'euroNorm', euro_norm: 'euroNorm', norma: 'euroNorm',
+  fueltype: 'fuelType', fuel_type: 'fuelType', combustibil: 'fuelType',
+  location: 'location', localitate: 'location', locality: 'location',
+  purchaseprice: 'purchasePrice', purchase_price: 'purchasePrice', pret: 'purchasePrice'
+};
+
+export const capacityBand = engineCC => (engineCC <= 1600 ? 0 : engineCC <= 2000 ? 1 : engineCC <= 2600 ? 2 : engineCC <= 3000 ? 3 : 4);
+
+/**
+ * Compilează tabelele calculatorului pentru regulile date (fiscal_rules.car_tax, cu fallback pe RATES_2026).
+ * rates[(type * norms + norm) * bands + band] = lei per 200 cm³; ultimul tip / ultima normă = necunoscut
+ */
+export function compileCarTaxTable(fiscalRules) {
+  const calculator = new CarTaxCalculator(fiscalRules);
+  const rules = calculator.rules;
+  const types = Object.keys(CarTaxCalculator.VEHICLE_TYPES);
+  const norms = Object.keys(CarTaxCalculator.EURO_NORMS);
+  const typeCount = types.length + 1;
+  const normCount = norms.length + 1;
+  const rates = new Float64Array(typeCount * normCount * CAPACITY_BANDS.length);
+  const electricType = new Uint8Array(typeCount);
+
+  types.forEach((type, t) => { electricType[t] = type === 'electric' ? 1 : 0; });
+  for (let t = 0; t < typeCount; t++) {
+    // Tipul necunoscut (ultimul) cade pe ratele autoturismelor, ca în getRate
+    const vehicleType = types[t] ?? '';
+    for (let n = 0; n < normCount; n++) {
+      const euroNorm = norms[n] ?? '';
+      CAPACITY_BANDS.forEach((band, b) => {
+        // Capacitatea reprezentativă a intervalului dă aceeași rată ca orice capacitate din el
+        const engineCC = [1600, 2000, 2600, 3000, 3001][b];
+        rates[(t * normCount + n) * CAPACITY_BANDS.length + b] = calculator.getRate(engineCC, euroNorm, vehicleType).rate;
+      });
+    }
+  }
+
+  const locations = new Map(Object.entries(CarTaxCalculator.LOCATION_COEFFICIENTS));
+  return {
+    typeIndex: new Map(types.map((type, t) => [type, t])),
+    normIndex: new Map(norms.map((norm, n) => [norm, n])),
+    typeCount,
+    normCount,
+    rates,
+    electricType,
+    locations,
+    fuels: new Set(Object.keys(CarTaxCalculator.FUEL_TYPES)),
+    luxuryThreshold: rules?.luxury_threshold || DEFAULT_LUXURY_THRESHOLD
+  };
+}
+
+const NUMBER_FIELDS = ['engineCC', 'purchasePrice'];
+
+// Celulă goală -> undefined (valoarea implicită din calculate())
+const cell = (record, field) => {
+  const value = record[field];
+  if (value == null || value === '') return undefined;
+  return typeof value === 'string' ? (value.trim() || undefined) : value;
+};
+
+const addGroup = (group, key, tax) => {
+  const entry = group[key] ??= { vehicles: 0, tax: 0 };
+  entry.vehicles++;
+  entry.tax += tax;
+};
+
+export class CarTaxFleet {
+  constructor(fiscalRules) {
+    this.table = compileCarTaxTable(fiscalRules);
+    this.normalized = { vehicleType: new Map(), euroNorm: new Map(), fuelType: new Map() };
+    this.resetTotals();
+  }
+
+  resetTotals() {
+    this.totals = {
+      vehicles: 0, errors: 0, baseTax: 0, luxuryTax: 0, finalTax: 0,
+      byLocation: {}, byVehicleType: {}, byEuroNorm: {},
+      unknownLocations: {}, unknownFuelTypes: {}
+    };
+  }
+
+  /**
+   * Același rezultat numeric ca CarTaxCalculator.calculate(vehicle), fără breakdown / note
+   */
+  taxFor(vehicle) {
+    const {
+      engineCC = 1600,
+      vehicleType = 'autoturism',
+      euroNorm = 'euro_6',
+      location = 'bucurești',
+      fuelType = 'benzina',
+      purchasePrice = 0
+    } = vehicle;
+    const table = this.table;
+    const t = table.typeIndex.get(vehicleType) ?? table.typeCount - 1;
+    const result = {
+      vehicle_id: vehicle.vehicle_id ?? '', vehicleType, engineCC, euroNorm, fuelType, location,
+      fractions: 0, ratePerFraction: 0, baseTax: ELECTRIC_TAX, locationCoefficient: 1, luxuryTax: 0,
+      finalTax: ELECTRIC_TAX, quarterly: ELECTRIC_TAX / 4, monthly: Math.round(ELECTRIC_TAX / 12), error: ''
+    };
+    // Vehicule electrice - taxă fixă, fără coeficient de localitate și fără suprataxă
+    if (table.electricType[t] || euroNorm === 'electric') return result;
+
+    const n = table.normIndex.get(euroNorm) ?? table.normCount - 1;
+    const rate = table.rates[(t * table.normCount + n) * CAPACITY_BANDS.length + capacityBand(engineCC)];
+    const fractions = Math.ceil(engineCC / 200);
+    const baseTax = Math.round(fractions * rate * 100) / 100;
+    const locationCoefficient = table.locations.get(location.toLowerCase()) || 1.0;
+    let finalTax = Math.round(baseTax * locationCoefficient);
+    let luxuryTax = 0;
+    if (purchasePrice > table.luxuryThreshold) {
+      luxuryTax = Math.round((purchasePrice - table.luxuryThreshold) * 0.009);
+      finalTax += luxuryTax;
+    }
+    result.fractions = fractions;
+    result.ratePerFraction = rate;
+    result.baseTax = baseTax;
+    result.locationCoefficient = locationCoefficient;
+    result.luxuryTax = luxuryTax;
+    result.finalTax = finalTax;
+    result.quarterly = Math.round(finalTax / 4);
+    result.monthly = Math.round(finalTax / 12);
+    return result;
+  }
+
+  // Tip / normă / combustibil scrise liber ("Euro 6", "SUV") -> cheile tabelelor; o flotă are
+  // puține valori distincte, deci fiecare e normalizată o singură dată
+  normalize(field, value) {
+    if (typeof value !== 'string') return value;
+    const cache = this.normalized[field];
+    let key = cache.get(value);
+    if (key === undefined) {
+      key = value.toLowerCase();
+      if (field === 'euroNorm') key = key.replace(/[\s-]+/g, '_');
+      cache.set(value, key);
+    }
+    return key;
+  }
+
+  // Vehicul cu câmpurile din calculate() (valori text sau numerice) -> vehicul validat + eroare.
+  // Câmpurile lipsă rămân undefined, deci primesc valorile implicite ale calculate()
+  parseVehicle(record) {
+    const vehicle = {
+      vehicle_id: cell(record, 'vehicle_id'),
+      engineCC: cell(record, 'engineCC'),
+      vehicleType: this.normalize('vehicleType', cell(record, 'vehicleType')),
+      euroNorm: this.normalize('euroNorm', cell(record, 'euroNorm')),
+      fuelType: this.normalize('fuelType', cell(record, 'fuelType')),
+      location: cell(record, 'location'),
+      purchasePrice: cell(record, 'purchasePrice')
+    };
+    for (const field of NUMBER_FIELDS) {
+      const value = typeof vehicle[field] === 'string' ? Number(vehicle[field].replace(',', '.')) : vehicle[field];
+      if (value === undefined) continue;
+      if (!Number.isFinite(value) || value < 0) return { vehicle, error: `${field} invalid: ${record[field]}` };
+      vehicle[field] = value;
+    }
+    const electric = vehicle.vehicleType === 'electric' || vehicle.euroNorm === 'electric';
+    if (!electric && !(vehicle.engineCC > 0)) return { vehicle, error: 'engineCC lipsă' };
+    return { vehicle, error: '' };
+  }
+
+  // Acumulează un rezultat în totalurile flotei
+  addToTotals(result) {
+    const totals = this.totals;
+    if (result.error) {
+      totals.errors++;
+      return;
+    }
+    totals.vehicles++;
+    totals.baseTax += result.baseTax;
+    totals.luxuryTax += result.luxuryTax || 0;
+    totals.finalTax += result.finalTax;
+    addGroup(totals.byLocation, result.location, result.finalTax);
+    addGroup(totals.byVehicleType, result.vehicleType, result.finalTax);
+    addGroup(totals.byEuroNorm, result.euroNorm, result.finalTax);
+    if (!this.table.locations.has(String(result.location).toLowerCase())) {
+      totals.unknownLocations[result.location] = (totals.unknownLocations[result.location] || 0) + 1;
+    }
+    if (!this.table.fuels.has(result.fuelType)) {
+      totals.unknownFuelTypes[result.fuelType] = (totals.unknownFuelTypes[result.fuelType] || 0) + 1;
+    }
+  }
+
+  // Un rând (obiect) -> rezultat complet, contabilizat în totaluri
+  processRecord(record) {
+    const { vehicle, error } = this.parseVehicle(record);
+    const result = error
+      ? { ...Object.fromEntries(FLEET_OUTPUT_FIELDS.map(f => [f, ''])), ...vehicle, error }
+      : this.taxFor(vehicle);
+    this.addToTotals(result);
+    return result;
+  }
+
+  // Flotă în memorie (obiecte cu câmpurile din calculate()): { vehicles: [...], totals }
+  calculateFleet(records) {
+    this.resetTotals();
+    const vehicles = records.map(record => this.processRecord(record));
+    return { vehicles, totals: this.totals };
+  }
+}
+
+// Un rând CSV, cu câmpuri între ghilimele ("a, b" și "" pentru ghilimele)
+export function parseCsvLine(line) {
+  const fields = [];
+  let field = '';
+  let quoted = false;
+  for (let i = 0; i < line.length; i++) {
+    const ch = line[i];
+    if (quoted) {
+      if (ch === '"' && line[i + 1] === '"') { field += '"'; i++; }
+      else if (ch === '"') quoted = false;
+      else field += ch;
+    } else if (ch === '"') quoted = true;
+    else if (ch === ',') { fields.push(field); field = ''; }
+    else field += ch;
+  }
+  fields.push(field);
+  return fields;
+}
+
+const csvValue = value => {
+  const text = value == null ? '' : String(value);
+  return /[",\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+/**
+ * Streaming CSV -> CSV: citește vehiculele linie cu linie, scrie rezultatele în loturi
+ * (cu backpressure pe output) și întoarce totalurile flotei. output poate lipsi (doar totaluri).
+ */
+export async function streamFleetCsv(inputPath, output, { fiscalRules, batchRows = 4096 } = {}) {
+  const fleet = new CarTaxFleet(fiscalRules);
+  const lines = createInterface({ input: createReadStream(inputPath, { encoding: 'utf8' }), crlfDelay: Infinity });
+  let header = null;
+  let columns = [];
+  let batch = [];
+  const flush = async () => {
+    if (output && batch.length && !output.write(batch.join('\n') + '\n')) await once(output, 'drain');
+    batch = [];
+  };
+
+  if (output) batch.push(FLEET_OUTPUT_FIELDS.join(','));
+  for await (const raw of lines) {
+    const line = header === null ? raw.replace(/^\uFEFF/, '') : raw;
+    if (!line.trim()) continue;
+    const cells = parseCsvLine(line);
+    if (header === null) {
+      header = cells;
+      // Coloanele CSV -> câmpurile din calculate(), rezolvate o singură dată
+      columns = header.map(column => COLUMN_ALIASES[column.trim().toLowerCase()] || null);
+      continue;
+    }
+    const record = {};
+    for (let i = 0; i < columns.length; i++) if (columns[i]) record[columns[i]] = cells[i];
+    const result = fleet.processRecord(record);
+    if (output) batch.push(FLEET_OUTPUT_FIELDS.map(f => csvValue(result[f])).join(','));
+    if (batch.length >= batchRows) await flush();
+  }
+  await flush();
+  return fleet.totals;
+}
@@ -0,0 +1,136 @@
+// Climatology Store - medii multianuale per locație și zi din an, fără rețea la lookup
+// Fișierul e generat de climatology_store.py la fiecare build (npm prebuild -> npm run climatology),
+// prin ingestie în lot din archive-api.open-meteo.com pentru toate orașele din cities-data.js și
+// stațiunile / vârfurile din resorts-data.js.
+//
+// Format (little endian):
+//   'ECLIMA01' | uint32 lungime header | header JSON (locații, ani, scară) | padding la 8 octeți
+//   int16[locații][366][2] = [temperatură medie × 10, precipitații × 10], -32768 = lipsă
+// Ziua din an e ziua calendaristică dintr-un an bisect (29 februarie are slotul ei), deci
+// 1 martie are același slot în orice an. Store-ul se citește doar pe server: cei 4 octeți ai
+// celulei (citire pozițională din fișier, servită din page cache). Browserul cere o singură
+// celulă prin GET /api/climatology/:slug?month=&day=, nu descarcă fișierul.
+
+export const CLIMATOLOGY_MAGIC = 'ECLIMA01';
+export const CLIMATOLOGY_FILE = 'public/data/climatology.bin';
+export const CLIMATOLOGY_API = '/api/climatology';
+export const CLIMATOLOGY_DAYS = 366;
+export const CLIMATOLOGY_MISSING = -32768;
+
+const CELL_BYTES = 4; // 2 × int16
+const LEAP_MONTH_START = [0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335];
+
+// Slotul zilei (0..365) pentru luna 1..12 și ziua 1..31
+export const dayOfYearSlot = (month, day) => LEAP_MONTH_START[month - 1] + day - 1;
+
+export class ClimatologyStore {
+  /**
+   * @param {Uint8Array} head - începutul fișierului (cel puțin magic + header)
+   * @param {(offset: number) => DataView} readCell - cei 4 octeți ai unei celule
+   */
+  constructor(head, readCell) {
+    const view = new DataView(head.buffer, head.byteOffset, head.byteLength);
+    const magic = new TextDecoder().decode(head.subarray(0, 8));
+    if (magic !== CLIMATOLOGY_MAGIC) throw new Error(`Not a climatology store (${magic})`);
+    const headerLength = view.getUint32(8, true);
+    this.header = JSON.parse(new TextDecoder().decode(head.subarray(12, 12 + headerLength)));
+    this.dataOffset = Math.ceil((12 + headerLength) / 8) * 8;
+    this.scale = this.header.scale || 10;
+    this.index = new Map(this.header.locations.map((location, i) => [location.slug, i]));
+    this.readCell = readCell;
+  }
+
+  // Tot fișierul în memorie (teste, unelte)
+  static fromBuffer(buffer) {
+    const bytes = buffer instanceof Uint8Array ? buffer : new Uint8Array(buffer);
+    return new ClimatologyStore(bytes, offset => new DataView(bytes.buffer, bytes.byteOffset + offset, CELL_BYTES));
+  }
+
+  // Node: header citit o dată, apoi o citire pozițională de 4 octeți per lookup
+  static openFile(fs, path) {
+    const fd = fs.openSync(path, 'r');
+    const prefix = Buffer.alloc(12);
+    fs.readSync(fd, prefix, 0, 12, 0);
+    const head = Buffer.alloc(12 + prefix.readUInt32LE(8));
+    fs.readSync(fd, head, 0, head.length, 0);
+    const cell = Buffer.alloc(CELL_BYTES);
+    const store = new ClimatologyStore(head, offset => {
+      fs.readSync(fd, cell, 0, CELL_BYTES, offset);
+      return new DataView(cell.buffer, cell.byteOffset, CELL_BYTES);
+    });
+    // Jobul offline înlocuiește fișierul atomic (rename): descriptorul deschis vede în continuare versiunea veche
+    const opened = fs.fstatSync(fd);
+    store.isStale = () => {
+      try {
+        const current = fs.statSync(path);
+        return current.ino !== opened.ino || current.mtimeMs !== opened.mtimeMs;
+      } catch (error) {
+        return false;
+      }
+    };
+    store.close = () => fs.closeSync(fd);
+    return store;
+  }
+
+  has(slug) {
+    return this.index.has(slug);
+  }
+
+  /**
+   * Media multianuală pentru locație și zi: { temp, precip, years } sau null
+   */
+  lookup(slug, month, day) {
+    const i = this.index.get(slug);
+    if (i === undefined || !(month >= 1 && month <= 12 && day >= 1 && day <= 31)) return null;
+    const cell = this.readCell(this.dataOffset + (i * CLIMATOLOGY_DAYS + dayOfYearSlot(month, day)) * CELL_BYTES);
+    const temp = cell.getInt16(0, true);
+    const precip = cell.getInt16(2, true);
+    if (temp === CLIMATOLOGY_MISSING) return null;
+    return {
+      temp: temp / this.scale,
+      precip: precip === CLIMATOLOGY_MISSING ? 0 : precip / this.scale,
+      years: this.header.years
+    };
+  }
+}
+
+const RECHECK_MS = 60000;
+let storePromise = null;
+let checkedAt = 0;
+
+async function openStore() {
+  if (typeof window !== 'undefined') throw new Error('the climatology store is read on the server only');
+  const fs = await import(/* webpackIgnore: true */ 'fs');
+  const path = process.env.CLIMATOLOGY_PATH || `${process.cwd()}/${CLIMATOLOGY_FILE}`;
+  return ClimatologyStore.openFile(fs, path);
+}
+
+/**
+ * Store-ul deschis o singură dată per proces (server); null dacă fișierul lipsește
+ */
+export function loadClimatologyStore() {
+  if (storePromise && typeof window === 'undefined' && Date.now() - checkedAt > RECHECK_MS) {
+    checkedAt = Date.now();
+    storePromise = storePromise.then(store => {
+      // Fișier lipsă la pornire sau înlocuit între timp: se redeschide
+      if (store && !store.isStale()) return store;
+      store?.close();
+      return openStore().catch(() => null);
+    });
+  }
+  if (!storePromise) {
+    checkedAt = Date.now();
+    storePromise = openStore().catch(error => {
+      console.error('Climatology store unavailable:', error.message);
+      return null;
+    });
+  }
+  return storePromise;
+}
+
+// Pentru teste și după reîmprospătarea fișierului de către jobul offline
+export function resetClimatologyStore() {
+  const previous = storePromise;
+  storePromise = null;
+  return previous?.then(store => store?.close?.());
+}
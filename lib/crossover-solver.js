@@ -0,0 +1,100 @@
+/**
+ * Crossover Solver - first income where one regime overtakes another
+ * Companion of lib/break-even-calculator.js and lib/pfa-calculator.js.
+ *
+ * The yearly net of every regime (salary, PFA sistem real / normă, SRL micro) is
+ * piecewise linear in income: level or slope only change at the CAS / CASS /
+ * dividend thresholds and where a tax base reaches 0. The difference of two regimes
+ * is split into linear pieces (known thresholds first, a chord test catches the
+ * rest) and the crossing is solved analytically on its piece, so break-evens are
+ * exact at 1 RON resolution after a few dozen evaluations instead of a scan in
+ * 1000 RON steps.
+ */
+
+import { addIterations, metrics } from './metrics.js';
+
+const MAX_SPLIT_DEPTH = 40;
+const RELATIVE_TOLERANCE = 1e-9;
+
+// Chord test at 1/3 and 2/3 of the piece (a single midpoint misses symmetric kinks)
+const isLinear = (f, a, b, fa, fb) => {
+    const tolerance = RELATIVE_TOLERANCE * (Math.abs(fa) + Math.abs(fb) + 1);
+    for (const k of [Math.floor(a + (b - a) / 3), Math.floor(a + 2 * (b - a) / 3)]) {
+        if (k <= a || k >= b) continue;
+        const chord = fa + (fb - fa) * (k - a) / (b - a);
+        if (Math.abs(f(k) - chord) > tolerance) return false;
+    }
+    return true;
+};
+
+/**
+ * Smallest income start + k (k = 0, 1, 2, ... while <= end) where diff(income) > 0.
+ * With afterNegative (default), only after diff was < 0 at a lower income: a regime
+ * that is already better at `start` has no break-even in the interval.
+ *
+ * @param {(income: number) => number} diff - net(regime B) - net(regime A)
+ * @param {number[]} breakpoints - incomes where diff may jump or change slope
+ * @returns {number|null}
+ */
+export function findFirstCrossing(diff, start, end, breakpoints = [], options = {}) {
+    if (!metrics.enabled) return firstCrossing(diff, start, end, breakpoints, options);
+    // Metrics: evaluations of diff count as the iterations of the calling break-even
+    let evaluations = 0;
+    const counted = income => {
+        evaluations++;
+        return diff(income);
+    };
+    try {
+        return firstCrossing(counted, start, end, breakpoints, options);
+    } finally {
+        addIterations(evaluations);
+    }
+}
+
+function firstCrossing(diff, start, end, breakpoints, { afterNegative = true } = {}) {
+    const n = Math.floor(end - start);
+    if (!(n >= 0)) return null;
+    const f = k => diff(start + k);
+
+    // Every breakpoint gets its own one-income piece, so `>=` and `>` thresholds both land on a piece edge
+    const cuts = new Set();
+    for (const b of breakpoints) {
+        if (!Number.isFinite(b)) continue;
+        const k = Math.floor(b - start);
+        for (const c of [k - 1, k]) if (c >= 0 && c < n) cuts.add(c);
+    }
+    const pieces = [];
+    let from = 0;
+    for (const c of [...cuts].sort((x, y) => x - y)) {
+        pieces.push([from, c, 0]);
+        from = c + 1;
+    }
+    pieces.push([from, n, 0]);
+
+    // Leftmost piece first: the first crossing found is the lowest income
+    const stack = pieces.reverse();
+    let seenNegative = !afterNegative;
+    while (stack.length) {
+        const [a, b, depth] = stack.pop();
+        const fa = f(a);
+        const fb = b === a ? fa : f(b);
+        if (b - a >= 2 && depth < MAX_SPLIT_DEPTH && !isLinear(f, a, b, fa, fb)) {
+            const mid = Math.floor((a + b) / 2);
+            stack.push([mid + 1, b, depth + 1], [a, mid, depth + 1]);
+            continue;
+        }
+
+        if (fa > 0 && seenNegative) return start + a;
+        if (fa < 0) seenNegative = true;
+        if (fb > 0 && seenNegative) {
+            // Root of the linear piece, then the exact integer step around it
+            let k = Math.max(a + 1, Math.floor(a + (-fa) * (b - a) / (fb - fa)) + 1);
+            k = Math.min(k, b);
+            while (k > a + 1 && f(k - 1) > 0) k--;
+            while (k < b && f(k) <= 0) k++;
+            return start + k;
+        }
+        if (fb < 0) seenNegative = true;
+    }
+    return null;
+}
@@ -1,6 +1,8 @@
 // e-Factura Calculator - Termene, Sancțiuni și Verificare Conformitate
 // Conform Codului Fiscal, OUG 89/2025 și reglementărilor ANAF
 
+import { DAY_MS, getCalendarIndex, toDayNumber } from './calendar-index.js';
+
 export class EFacturaCalculator {
   constructor(fiscalRules) {
     this.rules = fiscalRules?.efactura || {};
@@ -65,18 +67,8 @@ export class EFacturaCalculator {
   calculateDeadline(invoiceDate, customHolidays = []) {
     const year = new Date(invoiceDate).getFullYear();
     const holidays = this.getHolidays(year, customHolidays);
-
-    const deadline = new Date(invoiceDate);
-    let workingDays = 0;
     const targetDays = this.rules.working_days_deadline || 5;
-
-    while (workingDays < targetDays) {
-      deadline.setDate(deadline.getDate() + 1);
-
-      if (this.isWorkingDay(deadline, holidays)) {
-        workingDays++;
-      }
-    }
+    const deadline = getCalendarIndex(holidays).addWorkingDays(invoiceDate, targetDays);
 
     return {
       deadline,
@@ -101,16 +93,10 @@ export class EFacturaCalculator {
       return { delayed: false, delayDays: 0, deadline: deadlineInfo };
     }
 
-    // Calculează zilele lucrătoare de întârziere
-    let delayDays = 0;
-    const current = new Date(deadlineInfo.deadline);
-
-    while (current < transmission) {
-      current.setDate(current.getDate() + 1);
-      if (this.isWorkingDay(current, holidays)) {
-        delayDays++;
-      }
-    }
+    // Zilele lucrătoare de întârziere: de a doua zi după termen până la ziua transmiterii
+    const firstDay = toDayNumber(deadlineInfo.deadline) + 1;
+    const days = Math.ceil((transmission - deadlineInfo.deadline) / DAY_MS);
+    const delayDays = getCalendarIndex(holidays).countWorkingDayRange(firstDay, firstDay + days - 1);
 
     return {
       delayed: true,
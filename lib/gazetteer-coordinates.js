@@ -0,0 +1,5 @@
+// Generat de gazetteer_index.py - nu se editează manual.
+// slug -> [latitudine, longitudine, regiune (admin1 de la geocoder)]; regenerare: npm run gazetteer
+export const GAZETTEER_GENERATED_AT = null;
+export const GAZETTEER_SOURCE = null;
+export const GAZETTEER_COORDINATES = {};
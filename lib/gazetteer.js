@@ -0,0 +1,127 @@
+// Gazetteer - indexul locațiilor /vreme (orașe, reședințe de județ, stațiuni, vârfuri)
+// Cheia e slug-ul din URL (normalizeSlug din lib/sitemap-shards.js, același ca în sitemap), deci
+// numele, județul și localitățile din același județ se rezolvă în memorie. Coordonatele vin din
+// lib/gazetteer-coordinates.js, generat la cerere de gazetteer_index.py (npm run gazetteer, apoi commit);
+// geocoderul Open-Meteo rămâne doar fallback pentru slug-urile care lipsesc din index.
+
+import { CITIES_ROMANIA } from './cities-data.js';
+import { ROMANIA_COUNTIES } from './counties-data.js';
+import { MOUNTAIN_RESORTS_ZONES, ALL_COASTAL_RESORTS, ROMANIAN_MOUNTAIN_PEAKS } from './resorts-data.js';
+import { EXTRA_LOCATION_SLUGS, normalizeSlug } from './sitemap-shards.js';
+import { GAZETTEER_COORDINATES } from './gazetteer-coordinates.js';
+
+export const GEOCODING_URL = 'https://geocoding-api.open-meteo.com';
+export const NEARBY_PLACES_LIMIT = 20;
+
+const COUNTIES_BY_SLUG = new Map(ROMANIA_COUNTIES.map(county => [county.slug, county]));
+
+// "baia-mare" -> "Baia Mare" (pentru slug-uri fără nume în date)
+const titleFromSlug = (slug) => slug.split('-').map(word => word.charAt(0).toUpperCase() + word.slice(1)).join(' ');
+
+/**
+ * Locațiile din lib/, fără coordonate: { slug, name, kind, county, countySlug, region, zone, population }.
+ * La slug-uri duplicate câștigă prima apariție (orașele înaintea stațiunilor), ca în sitemap.
+ */
+export function gazetteerEntries() {
+  const entries = new Map();
+  const add = (entry) => {
+    if (!entries.has(entry.slug)) entries.set(entry.slug, { county: null, countySlug: null, region: null, zone: null, population: null, ...entry });
+  };
+  const city = (name, county, extra = {}) => {
+    const countySlug = normalizeSlug(county);
+    add({ slug: normalizeSlug(name), name, kind: 'city', county: COUNTIES_BY_SLUG.get(countySlug)?.name ?? county, countySlug, ...extra });
+  };
+
+  CITIES_ROMANIA.forEach(c => city(c.name, c.county, { region: c.region, population: c.population }));
+  // Reședințele de județ lipsă din CITIES_ROMANIA (ex. Călărași)
+  ROMANIA_COUNTIES.forEach(county => city(county.capital, county.name));
+  MOUNTAIN_RESORTS_ZONES.forEach(({ zone, items }) => items.forEach(({ slug, name }) => add({ slug, name, kind: 'resort', zone })));
+  ALL_COASTAL_RESORTS.forEach(({ slug, name }) => add({ slug, name, kind: 'resort', county: 'Constanța', countySlug: 'constanta', zone: 'Litoral' }));
+  ROMANIAN_MOUNTAIN_PEAKS.forEach(({ slug, name }) => add({ slug, name, kind: 'peak' }));
+  EXTRA_LOCATION_SLUGS.forEach(slug => add({ slug, name: titleFromSlug(slug), kind: 'place' }));
+  return [...entries.values()];
+}
+
+let index = null;
+let byCounty = null;
+
+// Indexul complet (cu coordonatele generate), construit o dată per proces
+export function getGazetteer() {
+  if (!index) {
+    index = new Map();
+    byCounty = new Map();
+    for (const entry of gazetteerEntries()) {
+      const [latitude = null, longitude = null, admin1 = null] = GAZETTEER_COORDINATES[entry.slug] || [];
+      const full = { ...entry, latitude, longitude, admin1 };
+      // Stațiunile și vârfurile primesc județul din regiunea geocodată la build
+      const admin1Slug = admin1 && normalizeSlug(admin1.replace(/^Jude[țţ]ul /, ''));
+      if (!full.countySlug && COUNTIES_BY_SLUG.has(admin1Slug)) {
+        full.countySlug = admin1Slug;
+        full.county = COUNTIES_BY_SLUG.get(admin1Slug).name;
+      }
+      index.set(entry.slug, full);
+      if (full.kind === 'city') {
+        if (!byCounty.has(full.countySlug)) byCounty.set(full.countySlug, []);
+        byCounty.get(full.countySlug).push(full);
+      }
+    }
+    // Descrescător după populație, apoi alfabetic
+    byCounty.forEach(list => list.sort((a, b) => (b.population || 0) - (a.population || 0) || a.name.localeCompare(b.name)));
+  }
+  return index;
+}
+
+export function resolveLocation(slug) {
+  return getGazetteer().get(slug) || null;
+}
+
+// Orașele și comunele unui județ (slug din counties-data.js), după populație
+export function countyLocalities(countySlug) {
+  getGazetteer();
+  return byCounty.get(countySlug) || [];
+}
+
+/**
+ * Localitățile din același județ, fără locația însăși (înlocuiește căutarea count=40 după admin1)
+ */
+export function nearbyPlaces(location, limit = NEARBY_PLACES_LIMIT) {
+  if (!location?.countySlug) return [];
+  return countyLocalities(location.countySlug)
+    .filter(place => place.slug !== location.slug)
+    .slice(0, limit)
+    .map(({ slug, name, county, population, latitude, longitude }) => ({ slug, name, county, population, latitude, longitude }));
+}
+
+// Variantele de căutare, în ordine (aceleași ca pagina /vreme înainte de index)
+function geocodingQueries(slug, entry) {
+  const name = entry?.name || titleFromSlug(slug);
+  const queries = [name, `${name}, Romania`];
+  if (entry?.kind === 'peak' || slug.startsWith('varful-')) {
+    const bare = name.replace(/^V[âa]rful /, '');
+    queries.push(`Varful ${bare}, Romania`, `Varful ${bare}`);
+  }
+  return [...new Set(queries)];
+}
+
+/**
+ * Coordonatele unei locații: { latitude, longitude, name, region, source }.
+ * Din index fără rețea; geocoderul se apelează doar pentru slug-urile neindexate / fără coordonate.
+ */
+export async function geocodeLocation(slug, { fetchImpl = fetch, geocodingUrl = GEOCODING_URL } = {}) {
+  const entry = resolveLocation(slug);
+  if (entry && entry.latitude !== null) {
+    return { latitude: entry.latitude, longitude: entry.longitude, name: entry.name, region: entry.county || entry.admin1, source: 'index' };
+  }
+
+  // Doar rezultate din România (Alexandria, Teleorman != Alexandria, Egipt); la omonime, cel din județul locației,
+  // ca jobul de build (climatology_store.py ArchiveClient.place)
+  for (const query of geocodingQueries(slug, entry)) {
+    const response = await fetchImpl(`${geocodingUrl}/v1/search?name=${encodeURIComponent(query)}&count=10&language=ro&format=json&countryCode=RO`, { next: { revalidate: 86400 } });
+    const data = await response.json();
+    if (!data.results?.length) continue;
+    const best = (entry?.countySlug && data.results.find(r => normalizeSlug(r.admin1 || '').includes(entry.countySlug))) || data.results[0];
+    const { latitude, longitude, name, admin1 } = best;
+    return { latitude, longitude, name: entry?.name || name, region: entry?.county || admin1, source: 'geocoder' };
+  }
+  return null;
+}
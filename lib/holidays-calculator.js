@@ -1,6 +1,8 @@
 // Calculator Sărbători Legale România
 // Generare automată sărbători fixe și mobile (Paște, Rusalii)
 
+import { getCalendarIndex } from './calendar-index.js';
+
 export class HolidaysCalculator {
   // Sărbători fixe în România
   static FIXED_HOLIDAYS = [
@@ -107,53 +109,26 @@ export class HolidaysCalculator {
     return holidays.some(h => h.date === dateStr);
   }
 
-  // Calculează numărul de zile lucrătoare între două date
-  static getWorkingDaysBetween(startDate, endDate, year) {
-    const start = new Date(startDate);
-    const end = new Date(endDate);
-    const holidays = this.getHolidaysForYear(year);
-    const holidayDates = holidays.map(h => h.date);
-    
-    let workingDays = 0;
-    let currentDate = new Date(start);
-
-    while (currentDate <= end) {
-      const dayOfWeek = currentDate.getDay();
-      const dateStr = currentDate.toISOString().split('T')[0];
-      
-      // Nu este weekend și nu este sărbătoare
-      if (dayOfWeek !== 0 && dayOfWeek !== 6 && !holidayDates.includes(dateStr)) {
-        workingDays++;
-      }
-      
-      currentDate.setDate(currentDate.getDate() + 1);
+  // Index de zile lucrătoare (bitmap + sume prefix) pentru sărbătorile unui an
+  static calendarIndexes = new Map();
+
+  static getCalendarIndex(year) {
+    let index = this.calendarIndexes.get(year);
+    if (!index) {
+      index = getCalendarIndex(this.getHolidaysForYear(year).map(h => h.date));
+      this.calendarIndexes.set(year, index);
     }
+    return index;
+  }
 
-    return workingDays;
+  // Calculează numărul de zile lucrătoare între două date (inclusiv capetele)
+  static getWorkingDaysBetween(startDate, endDate, year) {
+    return this.getCalendarIndex(year).countWorkingDays(startDate, endDate);
   }
 
   // Adaugă zile lucrătoare la o dată
   static addWorkingDays(startDate, workingDaysToAdd, year) {
-    const start = new Date(startDate);
-    const holidays = this.getHolidaysForYear(year);
-    const holidayDates = holidays.map(h => h.date);
-    
-    let workingDaysAdded = 0;
-    let currentDate = new Date(start);
-
-    while (workingDaysAdded < workingDaysToAdd) {
-      currentDate.setDate(currentDate.getDate() + 1);
-      
-      const dayOfWeek = currentDate.getDay();
-      const dateStr = currentDate.toISOString().split('T')[0];
-      
-      // Este zi lucrătoare
-      if (dayOfWeek !== 0 && dayOfWeek !== 6 && !holidayDates.includes(dateStr)) {
-        workingDaysAdded++;
-      }
-    }
-
-    return currentDate;
+    return this.getCalendarIndex(year).addWorkingDays(startDate, workingDaysToAdd);
   }
 
   // Generează calendar vizual pentru un an
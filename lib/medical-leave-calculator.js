@@ -1,6 +1,8 @@
 // Medical Leave Calculator Engine - OUG 158/2005
 // Calculează indemnizație concediu medical cu toate codurile de boală
 
+import { instrumentMethods } from './metrics.js';
+
 export class MedicalLeaveCalculator {
   constructor(fiscalRules) {
     this.rules = fiscalRules.medical_leave;
@@ -255,6 +257,8 @@ export class MedicalLeaveCalculator {
   }
 }
 
+instrumentMethods(MedicalLeaveCalculator, 'MedicalLeaveCalculator', ['calculate', 'simulateYear', 'calculateMaternity']);
+
 // Helper: Generează istoric salarii
 export function generateSalaryHistory(averageSalary, months = 6) {
   const history = [];
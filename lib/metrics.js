@@ -0,0 +1,231 @@
+/**
+ * Opt-in instrumentation - latency histograms, Mongo round trips, calculator counters
+ * Read by GET /api/metrics (app/api/[[...slug]]/route.js) and scraped by load_test.py --metrics.
+ *
+ * Off unless ECALC_METRICS=1 (or enableMetrics() is called). While off, the API handlers
+ * skip the timing entirely, the calculators pay one boolean check on their aggregate
+ * paths and their methods are not wrapped at all: instrumentMethods() only installs the
+ * timing wrappers when metrics get enabled and removes them again when disabled.
+ * Counters are per process; calculators running in the browser are not seen here.
+ */
+
+// Upper bounds (ms) of the histogram buckets, the last bucket is open (+Inf)
+export const LATENCY_BUCKETS_MS = [0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000];
+export const CALL_BUCKETS_MS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 10, 100];
+
+// Collection methods that are one round trip to Mongo; cursors are counted per batch fetched
+const ROUND_TRIP_METHODS = new Set([
+    'findOne', 'insertOne', 'insertMany', 'updateOne', 'updateMany', 'replaceOne', 'deleteOne',
+    'deleteMany', 'bulkWrite', 'countDocuments', 'estimatedDocumentCount', 'createIndex',
+    'findOneAndUpdate', 'findOneAndReplace', 'findOneAndDelete', 'distinct'
+]);
+const CURSOR_METHODS = new Set(['find', 'aggregate']);
+// Unknown slugs are user input: past this many routes they share one entry
+const MAX_ROUTES = 64;
+
+const env = typeof process !== 'undefined' && process.env ? process.env : {};
+const now = () => performance.now();
+
+// Read directly on the hot paths: `if (metrics.enabled) ...`
+export const metrics = { enabled: false };
+
+let endpoints = new Map();
+let calculators = new Map();
+let startedAt = new Date();
+let pendingIterations = 0;
+const instrumented = []; // { target, label, methods, originals }
+
+class Histogram {
+    constructor(bounds) {
+        this.bounds = bounds;
+        this.counts = new Array(bounds.length + 1).fill(0);
+        this.sum = 0;
+        this.max = 0;
+    }
+
+    observe(value) {
+        const { bounds } = this;
+        let i = 0;
+        while (i < bounds.length && value > bounds[i]) i++;
+        this.counts[i]++;
+        this.sum += value;
+        if (value > this.max) this.max = value;
+    }
+
+    toJSON() {
+        return { sum: this.sum, max: this.max, buckets: this.bounds, counts: this.counts };
+    }
+}
+
+const entry = (map, name, create) => {
+    let e = map.get(name);
+    if (!e) {
+        e = create();
+        map.set(name, e);
+    }
+    return e;
+};
+
+export function enableMetrics(enabled = true) {
+    metrics.enabled = Boolean(enabled);
+    for (const item of instrumented) (metrics.enabled ? wrapMethods : unwrapMethods)(item);
+}
+
+export function resetMetrics() {
+    endpoints = new Map();
+    calculators = new Map();
+    startedAt = new Date();
+    pendingIterations = 0;
+}
+
+/**
+ * One API request: route is the normalized name ('GET /api/fiscal-rules/:year')
+ */
+export function recordRequest(route, durationMs, status, dbRoundTrips = 0) {
+    if (endpoints.size >= MAX_ROUTES && !endpoints.has(route)) route = `${route.split(' ')[0]} /api/*`;
+    const e = entry(endpoints, route, () => ({
+        count: 0, errors: 0, status: {}, latencyMs: new Histogram(LATENCY_BUCKETS_MS), dbRoundTrips: { sum: 0, max: 0 }
+    }));
+    e.count++;
+    if (status >= 500) e.errors++;
+    e.status[status] = (e.status[status] || 0) + 1;
+    e.latencyMs.observe(durationMs);
+    e.dbRoundTrips.sum += dbRoundTrips;
+    e.dbRoundTrips.max = Math.max(e.dbRoundTrips.max, dbRoundTrips);
+}
+
+/**
+ * One calculator call; iterations = engine evaluations / search steps it needed (null when not tracked)
+ */
+export function recordCall(name, durationMs, iterations = null, failed = false) {
+    const e = entry(calculators, name, () => ({
+        calls: 0, errors: 0, durationMs: new Histogram(CALL_BUCKETS_MS), iterations: { calls: 0, sum: 0, max: 0 }
+    }));
+    e.calls++;
+    if (failed) e.errors++;
+    e.durationMs.observe(durationMs);
+    if (iterations !== null) {
+        e.iterations.calls++;
+        e.iterations.sum += iterations;
+        e.iterations.max = Math.max(e.iterations.max, iterations);
+    }
+}
+
+// Search loops report their steps here; the innermost instrumented call in progress collects them
+export function addIterations(n) {
+    pendingIterations += n;
+}
+
+/**
+ * Time `fn` as calculator call `name` (iterations reported through addIterations() are attached)
+ */
+export function timeCall(name, fn) {
+    if (!metrics.enabled) return fn();
+    const outer = pendingIterations;
+    pendingIterations = 0;
+    const started = now();
+    let failed = true;
+    try {
+        const result = fn();
+        failed = false;
+        return result;
+    } finally {
+        const iterations = pendingIterations;
+        recordCall(name, now() - started, iterations || null, failed);
+        // Nested calls count towards the caller as well
+        pendingIterations = outer + iterations;
+    }
+}
+
+function wrapMethods(item) {
+    if (item.originals) return;
+    item.originals = {};
+    for (const method of item.methods) {
+        const original = item.target.prototype[method];
+        if (typeof original !== 'function') continue;
+        item.originals[method] = original;
+        const name = `${item.label}.${method}`;
+        item.target.prototype[method] = function (...args) {
+            return timeCall(name, () => original.apply(this, args));
+        };
+    }
+}
+
+function unwrapMethods(item) {
+    if (!item.originals) return;
+    Object.assign(item.target.prototype, item.originals);
+    item.originals = null;
+}
+
+/**
+ * Register public methods of a calculator class; they are timed only while metrics are enabled
+ */
+export function instrumentMethods(target, label, methods) {
+    const item = { target, label, methods, originals: null };
+    instrumented.push(item);
+    if (metrics.enabled) wrapMethods(item);
+}
+
+// Cursor id is a Long once the first batch arrived, null before
+const isExhausted = id => id != null && (typeof id.isZero === 'function' ? id.isZero() : Number(id) === 0);
+
+const countingCursor = (cursor, probe) => {
+    const proxy = new Proxy(cursor, {
+        get(target, prop) {
+            const value = Reflect.get(target, prop, target);
+            if (typeof value !== 'function') return value;
+            return (...args) => {
+                if (prop === 'toArray') probe.dbRoundTrips++;
+                // next()/hasNext() only go to the server when the current batch is used up
+                // and the server still holds the cursor (id 0: the last batch was already fetched)
+                else if ((prop === 'next' || prop === 'hasNext' || prop === 'tryNext')
+                    && !target.closed && !(target.bufferedCount?.() > 0) && !isExhausted(target.id)) probe.dbRoundTrips++;
+                const result = value.apply(target, args);
+                return result === target ? proxy : result;
+            };
+        }
+    });
+    return proxy;
+};
+
+const countingCollection = (collection, probe) => new Proxy(collection, {
+    get(target, prop) {
+        const value = Reflect.get(target, prop, target);
+        if (typeof value !== 'function') return value;
+        if (ROUND_TRIP_METHODS.has(prop)) {
+            return (...args) => {
+                probe.dbRoundTrips++;
+                return value.apply(target, args);
+            };
+        }
+        if (CURSOR_METHODS.has(prop)) return (...args) => countingCursor(value.apply(target, args), probe);
+        return value.bind(target);
+    }
+});
+
+/**
+ * Db whose collections count their round trips into probe.dbRoundTrips (db itself when probe is null)
+ */
+export function countRoundTrips(db, probe) {
+    if (!probe) return db;
+    return new Proxy(db, {
+        get(target, prop) {
+            const value = Reflect.get(target, prop, target);
+            if (prop === 'collection') return (...args) => countingCollection(value.apply(target, args), probe);
+            return typeof value === 'function' ? value.bind(target) : value;
+        }
+    });
+}
+
+export function metricsSnapshot() {
+    const toObject = map => Object.fromEntries([...map].map(([name, e]) => [name, JSON.parse(JSON.stringify(e))]));
+    return {
+        enabled: metrics.enabled,
+        startedAt: startedAt.toISOString(),
+        uptimeMs: Date.now() - startedAt.getTime(),
+        endpoints: toObject(endpoints),
+        calculators: toObject(calculators)
+    };
+}
+
+if (env.ECALC_METRICS === '1' || env.ECALC_METRICS === 'true') enableMetrics(true);
@@ -0,0 +1,121 @@
+/**
+ * Net -> Gross Inverter - Piecewise Linear Solver
+ * Companion of lib/salary-engine.js (Sandbox Isolation architecture).
+ *
+ * Net is piecewise linear in gross: the slope only changes at the rule breakpoints
+ * (sector minimum / untaxed amount cliff, end of the regressive deduction range,
+ * IT / construction tax thresholds, the point where the tax base reaches 0).
+ * The segments are precomputed once per rules + sector + options; each query then
+ * picks its segment in O(log segments), jumps to the analytic solution and only
+ * walks the last 1-2 RON that integer rounding introduces.
+ */
+
+const LINEAR_TOLERANCE = 3;   // RON - max deviation from the chord before a segment is split
+const MAX_SPLIT_DEPTH = 24;
+const MAX_WALK_STEPS = 64;    // safety net for the local correction walk
+
+export class PiecewiseInverter {
+    /**
+     * @param {(gross: number) => object} evaluate - full calculation for an integer gross
+     * @param {number[]} breakpoints - grosses after which the formula changes (e.g. minimum wage)
+     * @param {string} field - result field to invert ('net')
+     */
+    constructor(evaluate, breakpoints, field = 'net') {
+        this.evaluate = evaluate;
+        this.field = field;
+        this.segments = [];
+        this.envelope = [];
+        this.lastSteps = 0; // walk steps of the last solve() (metrics)
+
+        const points = [...new Set(breakpoints.filter(b => Number.isFinite(b) && b >= 1).map(Math.floor))].sort((a, b) => a - b);
+        const upper = Math.max(1000, ...points) * 4;
+        let start = 1;
+        for (const point of [...points, upper]) {
+            if (point >= start) {
+                this._addSegment(start, point, 0);
+                start = point + 1;
+            }
+        }
+        // Last segment is open-ended: beyond `upper` nothing changes, extrapolate its slope
+        this.segments[this.segments.length - 1].end = Infinity;
+
+        let max = -Infinity;
+        for (const seg of this.segments) {
+            max = Math.max(max, seg.fStart, seg.fEnd);
+            this.envelope.push(max);
+        }
+    }
+
+    _value(gross) {
+        return this.evaluate(gross)[this.field];
+    }
+
+    _addSegment(start, end, depth) {
+        const fStart = this._value(start);
+        const fEnd = this._value(end);
+        if (end - start >= 2 && depth < MAX_SPLIT_DEPTH) {
+            const mid = Math.floor((start + end) / 2);
+            const chord = fStart + (fEnd - fStart) * (mid - start) / (end - start);
+            if (Math.abs(this._value(mid) - chord) > LINEAR_TOLERANCE) {
+                this._addSegment(start, mid, depth + 1);
+                this._addSegment(mid + 1, end, depth + 1);
+                return;
+            }
+        }
+        const slope = end > start ? (fEnd - fStart) / (end - start) : 0;
+        this.segments.push({ start, end, fStart, fEnd, slope });
+    }
+
+    // Lowest-gross segment that reaches the target (keeps the "below the cliff first" rule)
+    _segmentFor(target) {
+        const { envelope, segments } = this;
+        let lo = 0;
+        let hi = envelope.length - 1;
+        if (envelope[hi] < target) return segments[hi];
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (envelope[mid] >= target) hi = mid; else lo = mid + 1;
+        }
+        return segments[lo];
+    }
+
+    /**
+     * Gross whose value is closest to target (ties -> the one reaching the target),
+     * or null when the target is below everything the domain can produce or the
+     * correction walk runs out of steps (the caller then falls back to its search).
+     */
+    solve(target) {
+        if (!Number.isFinite(target)) return null;
+        const seg = this._segmentFor(target);
+        const field = this.field;
+
+        let gross = seg.slope > 0 ? Math.round(seg.start + (target - seg.fStart) / seg.slope) : seg.start;
+        gross = Math.min(Math.max(gross, seg.start), seg.end);
+        let res = this.evaluate(gross);
+        this.lastSteps = 0;
+
+        // Integer rounding: walk up until the target is reached...
+        while (res[field] < target && gross < seg.end && this.lastSteps++ < MAX_WALK_STEPS) {
+            gross += 1;
+            res = this.evaluate(gross);
+        }
+        // Still below: the top of the domain is the closest, unless the walk gave up before it
+        if (res[field] < target) return gross < seg.end ? null : res;
+
+        // ...then down to the smallest gross that still reaches it
+        while (gross > seg.start && this.lastSteps++ < MAX_WALK_STEPS) {
+            const prev = this.evaluate(gross - 1);
+            if (prev[field] < target) {
+                return (target - prev[field] < res[field] - target) ? prev : res;
+            }
+            gross -= 1;
+            res = prev;
+        }
+        if (this.lastSteps > MAX_WALK_STEPS) return null;
+        return (gross === 1 && res[field] > target + 1) ? null : res;
+    }
+
+    solveMany(targets) {
+        return Array.from(targets, target => this.solve(target));
+    }
+}
@@ -0,0 +1,83 @@
+// Payslip Batch - fluturași randați pe server (Node), în lot, cu layout-ul din pdf-export.js
+// Un proces worker (payslip_worker.mjs, pornit de payslip_pdf.py) rămâne activ pe tot lotul:
+// jsPDF, fonturile standard și template-ul static (per an / curs) se încarcă o singură dată,
+// apoi fiecare job (un chunk de rezultate) scrie PDF-urile direct pe disc.
+
+import { createInterface } from 'readline';
+import { mkdirSync, writeFileSync } from 'fs';
+import { join } from 'path';
+import { createSalaryPDFTemplate, payslipFilename, renderSalaryPDFBatch } from './pdf-export.js';
+
+export const DEFAULT_EXCHANGE_RATE = 4.98;
+
+export class PayslipRenderer {
+  constructor({ year = 2026, exchangeRate = DEFAULT_EXCHANGE_RATE } = {}) {
+    this.year = year;
+    this.exchangeRate = exchangeRate;
+    this.templates = new Map();
+  }
+
+  // Template-ul anului din luna rezultatului (YYYY-MM), altfel anul implicit
+  template(result) {
+    const year = Number(String(result.month || '').slice(0, 4)) || this.year;
+    if (!this.templates.has(year)) this.templates.set(year, createSalaryPDFTemplate(year, this.exchangeRate));
+    return this.templates.get(year);
+  }
+
+  // Un document per fluturaș: [{ name, bytes, pages }]
+  renderFiles(results) {
+    return results.map(result => {
+      const doc = renderSalaryPDFBatch([result], this.template(result));
+      return { name: payslipFilename(result), bytes: new Uint8Array(doc.output('arraybuffer')), pages: 1 };
+    });
+  }
+
+  // Tot chunk-ul într-un document, o pagină per fluturaș
+  renderMerged(results) {
+    const doc = renderSalaryPDFBatch(results, result => this.template(result));
+    return { bytes: new Uint8Array(doc.output('arraybuffer')), pages: results.length };
+  }
+
+  /**
+   * Job: { id, dir, mode: 'files' | 'merged', name?, results } -> { id, files: [{ name, file, bytes, pages }], pages, bytes, ms }
+   */
+  runJob(job) {
+    const started = performance.now();
+    mkdirSync(job.dir, { recursive: true });
+    const rendered = job.mode === 'merged'
+      ? [{ name: job.name || `fluturasi_${job.id}.pdf`, ...this.renderMerged(job.results) }]
+      : this.renderFiles(job.results);
+    // Pe disc după poziția în chunk (nume unice), numele fluturașului îl aplică procesul părinte
+    const files = rendered.map(({ name, bytes, pages }, i) => {
+      const file = `${i}.pdf`;
+      writeFileSync(join(job.dir, file), bytes);
+      return { name, file, bytes: bytes.length, pages };
+    });
+    return {
+      id: job.id,
+      files,
+      pages: files.reduce((sum, f) => sum + f.pages, 0),
+      bytes: files.reduce((sum, f) => sum + f.bytes, 0),
+      ms: performance.now() - started
+    };
+  }
+}
+
+/**
+ * Bucla worker-ului: un job JSON per linie pe stdin, un răspuns JSON per linie pe stdout
+ */
+export async function runPayslipWorker(input = process.stdin, output = process.stdout) {
+  const renderers = new Map();
+  for await (const line of createInterface({ input, crlfDelay: Infinity })) {
+    if (!line.trim()) continue;
+    let job;
+    try {
+      job = JSON.parse(line);
+      const key = `${job.year}|${job.exchangeRate}`;
+      if (!renderers.has(key)) renderers.set(key, new PayslipRenderer(job));
+      output.write(JSON.stringify(renderers.get(key).runJob(job)) + '\n');
+    } catch (error) {
+      output.write(JSON.stringify({ id: job?.id ?? null, error: error.message }) + '\n');
+    }
+  }
+}
@@ -0,0 +1,217 @@
+// Layout-ul fluturașului de salariu (A4, mm), fără dependența de jsPDF: desenează pe orice
+// document cu API-ul jsPDF (setFont, text, line ...). Folosit de pdf-export.js și de lotul de pe server.
+
+// Helper pentru eliminarea diacriticelor
+export const removeDiacritics = (str) => {
+  const diacriticsMap = {
+    'ă': 'a', 'â': 'a', 'î': 'i', 'ș': 's', 'ț': 't',
+    'Ă': 'A', 'Â': 'A', 'Î': 'I', 'Ș': 'S', 'Ț': 'T',
+  };
+  return str.replace(/[ăâîșțĂÂÎȘȚ]/g, match => diacriticsMap[match] || match);
+};
+
+// Funcție de formatare numere (un singur formatter, refolosit)
+const numberFormat = new Intl.NumberFormat('ro-RO', {
+  minimumFractionDigits: 0,
+  maximumFractionDigits: 2,
+});
+
+export const formatNumber = (num) => numberFormat.format(num);
+
+// Constante de layout pentru fluturaș (A4, mm)
+const SALARY_LAYOUT = {
+  // Margini ajustate pentru indosariere (Sina/Binder safety)
+  // Folosim 30mm stanga si 20mm dreapta pentru un aspect "ingust" si sigur
+  marginL: 30,
+  marginR: 20,
+  // Culori - Stil MD3 minimalist / Simplist
+  primaryColor: [37, 99, 235], // blue-600
+  darkColor: [30, 41, 59], // slate-800
+  grayColor: [71, 85, 105], // slate-600 (Mai inchis decat slate-500)
+  borderColor: [226, 232, 240], // slate-200
+  footerContact: 'www.ecalc.ro  -  Calculator Salarii PRO   |   contact@ecalc.ro',
+  footerServices: 'Brut -> Net, Net -> Brut   -   IT/Constructii/Agricultura   -   Tichete masa   -   Part-time   -   Zile lucratoare   -   Zile libere   -   Concediu medical',
+};
+
+/**
+ * Partea fixă a fluturașului pentru un an și un curs: pozițiile coloanelor și textele statice,
+ * calculate o singură dată și refolosite pentru fiecare pagină (în browser și în lotul de pe server).
+ */
+export const createSalaryPDFTemplate = (year = 2026, exchangeRate = 4.98) => {
+  // A4 în mm, exact ca doc.internal.pageSize din jsPDF (595.28 x 841.89 pt)
+  const pageWidth = 595.28 * 25.4 / 72;
+  const pageHeight = 841.89 * 25.4 / 72;
+  const { marginL, marginR } = SALARY_LAYOUT;
+  return {
+    ...SALARY_LAYOUT,
+    year,
+    exchangeRate,
+    pageWidth,
+    pageHeight,
+    printableCenterX: (marginL + (pageWidth - marginR)) / 2,
+    col1X: marginL,
+    col2X: pageWidth - marginR - 35, // Lei
+    col3X: pageWidth - marginR,      // Euro
+    rateText: `1 Euro = ${exchangeRate.toFixed(4)} lei`,
+    titleText: removeDiacritics(`Anul ${year}`),
+    footerServicesText: removeDiacritics(SALARY_LAYOUT.footerServices),
+  };
+};
+
+/**
+ * Desenează fluturașul pe pagina curentă a documentului (fără salvare)
+ */
+export const drawSalaryPage = (doc, result, template) => {
+  const { marginL, marginR, pageWidth, pageHeight, printableCenterX, col1X, col2X, col3X, exchangeRate,
+    primaryColor, darkColor, grayColor, borderColor } = template;
+  let y = 20;
+
+  // 1. Top Header - Exchange Rate Only (plus angajatul și luna în fluturașii din lot)
+  doc.setFont('helvetica', 'normal');
+  doc.setFontSize(10);
+  doc.setTextColor(...grayColor);
+  doc.text(template.rateText, pageWidth - marginR, y, { align: 'right' });
+  if (result.employee_id || result.month) {
+    doc.text(removeDiacritics([result.employee_id, result.month].filter(Boolean).join('  -  ')), marginL, y);
+  }
+
+  y += 10;
+
+  // 2. Main Title - Centered relative to the printable area
+  doc.setFont('helvetica', 'bold');
+  doc.setFontSize(14);
+  doc.setTextColor(...darkColor);
+  doc.text(template.titleText, printableCenterX, y, { align: 'center' });
+
+  y += 15;
+
+  // Helper function for table headers
+  const renderTableHeader = (title) => {
+    doc.setFont('helvetica', 'bold');
+    doc.setFontSize(11);
+    doc.setTextColor(...darkColor);
+    doc.text(removeDiacritics(title), col1X, y);
+    doc.text('Lei', col2X, y, { align: 'right' });
+    doc.text('Euro', col3X, y, { align: 'right' });
+
+    y += 2;
+    doc.setDrawColor(...primaryColor);
+    doc.setLineWidth(0.5);
+    doc.line(col1X, y, col3X, y);
+    y += 5;
+  };
+
+  // Helper function for table rows
+  const renderTableRow = (label, ronValue, isBold = false, indent = 0) => {
+    if (isBold) {
+      doc.setFont('helvetica', 'bold');
+      doc.setTextColor(...darkColor);
+      doc.setFontSize(10.5);
+    } else {
+      doc.setFont('helvetica', 'normal');
+      doc.setTextColor(...grayColor);
+      doc.setFontSize(10);
+    }
+
+    doc.text(removeDiacritics(label), col1X + indent, y);
+    doc.text(formatNumber(ronValue), col2X, y, { align: 'right' });
+    doc.text(formatNumber(ronValue / exchangeRate), col3X, y, { align: 'right' });
+
+    y += 1.5;
+    doc.setDrawColor(...borderColor);
+    doc.setLineWidth(0.1);
+    doc.line(col1X, y, col3X, y);
+    y += 5.5;
+  };
+
+  // Procentul din breakdown; fără breakdown (ex. rezultate importate) eticheta rămâne fără procent
+  const withPercent = (label, percent) => (Number.isFinite(percent) ? `${label}  ${percent}%` : label);
+
+  // --- SECTION: ANGAJAT ---
+  renderTableHeader('ANGAJAT');
+  renderTableRow('Salariu Brut', result.gross, true);
+
+  if (result.untaxedAmount > 0) {
+    renderTableRow('Suma Netaxabila', result.untaxedAmount);
+  }
+
+  renderTableRow(withPercent('Asigurari Sociale (CAS)', result.breakdown?.casPercent), result.cas);
+  renderTableRow(withPercent('Asigurari Sociale de Sanatate (CASS)', result.breakdown?.cassPercent), result.cass);
+
+  if (result.personalDeduction > 0) {
+    renderTableRow('Deducere personala (DP)', result.personalDeduction);
+  }
+
+  if (result.childDeduction > 0) {
+    renderTableRow('Deducere copii', result.childDeduction);
+  }
+
+  renderTableRow(withPercent('Impozit pe venit (IV)', result.breakdown?.taxPercent), result.incomeTax);
+
+  renderTableRow('Salariu Net', result.net, true);
+
+  y += 5;
+
+  // --- SECTION: ANGAJATOR ---
+  renderTableHeader('ANGAJATOR');
+  renderTableRow(withPercent('Contributie Asiguratorie pentru Munca (CAM)', result.breakdown?.camPercent), result.cam);
+
+  if (result.employerExtraCAS > 0) {
+    renderTableRow('Extra CAS (part-time)', result.employerExtraCAS);
+  }
+  if (result.employerExtraCASS > 0) {
+    renderTableRow('Extra CASS (part-time)', result.employerExtraCASS);
+  }
+  if (result.voucherValue > 0) {
+    renderTableRow('Tichete masa', result.voucherValue);
+  }
+
+  renderTableRow('Salariu Complet (Cost Total)', result.totalCost, true);
+
+  y += 5;
+
+  // --- SECTION: TOTAL TAXE ---
+  const employeePay = result.cas + result.cass + result.incomeTax;
+  const employerPay = result.cam + (result.employerExtraCAS || 0) + (result.employerExtraCASS || 0);
+  const totalTax = employeePay + employerPay;
+
+  renderTableHeader('TOTAL TAXE');
+  renderTableRow('Angajatul plateste statului', employeePay);
+  renderTableRow('Angajatorul plateste statului', employerPay);
+  renderTableRow('Total taxe incasate de stat', totalTax, true);
+
+  y += 8;
+
+  // --- NARRATIVE TEXT ---
+  doc.setFont('helvetica', 'normal');
+  doc.setFontSize(11);
+  doc.setTextColor(...darkColor);
+  const summaryText = `Pentru a plati un salariu net de ${formatNumber(result.net)} lei, angajatorul cheltuie ${formatNumber(result.totalCost)} lei`;
+  doc.text(removeDiacritics(summaryText), printableCenterX, y, { align: 'center' });
+
+  // 4. Footer - subtle style from user reference
+  y = pageHeight - 25; // Raised to avoid overflow
+  doc.setDrawColor(...borderColor);
+  doc.setLineWidth(0.2);
+  doc.line(marginL, y, pageWidth - marginR, y);
+  y += 6;
+
+  doc.setFontSize(8.5);
+  doc.setFont('helvetica', 'normal');
+  doc.setTextColor(...grayColor);
+  doc.text(template.footerContact, marginL, y);
+
+  y += 4.5;
+  doc.setFontSize(7);
+  doc.setTextColor(...grayColor);
+  doc.text(template.footerServicesText, marginL, y);
+};
+
+// Numele fișierului pentru un fluturaș
+export const payslipFilename = (result, date = new Date().toISOString().slice(0, 10)) => {
+  if (result.employee_id || result.month) {
+    const id = [result.employee_id, result.month].filter(Boolean).join('_').replace(/[^A-Za-z0-9_-]/g, '_');
+    return `fluturas_${id}.pdf`;
+  }
+  return `fluturas_salariu_${result.gross}_RON_${date}.pdf`;
+};
@@ -1,15 +1,9 @@
 // PDF Export pentru Calculator de Salarii
 // Genereaza un PDF stilizat in format A4 - Stil Fintech
 import { jsPDF } from 'jspdf';
+import { createSalaryPDFTemplate, drawSalaryPage, formatNumber, payslipFilename, removeDiacritics } from './payslip-layout.js';
 
-// Helper pentru eliminarea diacriticelor
-const removeDiacritics = (str) => {
-  const diacriticsMap = {
-    'ă': 'a', 'â': 'a', 'î': 'i', 'ș': 's', 'ț': 't',
-    'Ă': 'A', 'Â': 'A', 'Î': 'I', 'Ș': 'S', 'Ț': 'T',
-  };
-  return str.replace(/[ăâîșțĂÂÎȘȚ]/g, match => diacriticsMap[match] || match);
-};
+export { createSalaryPDFTemplate, drawSalaryPage, payslipFilename };
 
 // Helper detectie si salvare
 const saveOrOpenPDF = (doc, filename) => {
@@ -25,185 +19,38 @@ const saveOrOpenPDF = (doc, filename) => {
   }
 };
 
-export const generateSalaryPDF = (result, year = 2026, exchangeRate = 4.98) => {
-  // Cream un document A4
-  const doc = new jsPDF({
-    orientation: 'portrait',
-    unit: 'mm',
-    format: 'a4',
+const createA4 = () => new jsPDF({
+  orientation: 'portrait',
+  unit: 'mm',
+  format: 'a4',
+});
+
+/**
+ * Fluturașii unui lot într-un singur document, o pagină per rezultat (fonturi și resurse comune).
+ * template poate fi și o funcție result => template (ex. un template per an).
+ */
+export const renderSalaryPDFBatch = (results, template) => {
+  const templateFor = typeof template === 'function' ? template : () => template;
+  const doc = createA4();
+  results.forEach((result, i) => {
+    if (i > 0) doc.addPage();
+    drawSalaryPage(doc, result, templateFor(result));
   });
+  return doc;
+};
 
-  const pageWidth = doc.internal.pageSize.getWidth();
-  const pageHeight = doc.internal.pageSize.getHeight();
-
-  // Margini ajustate pentru indosariere (Sina/Binder safety)
-  // Folosim 30mm stanga si 20mm dreapta pentru un aspect "ingust" si sigur
-  const marginL = 30;
-  const marginR = 20;
-  let y = 20;
-
-  // Culori - Stil MD3 minimalist / Simplist
-  const primaryColor = [37, 99, 235]; // blue-600
-  const darkColor = [30, 41, 59]; // slate-800
-  const grayColor = [71, 85, 105]; // slate-600 (Mai inchis decat slate-500)
-  const borderColor = [226, 232, 240]; // slate-200
-
-  // 1. Top Header - Exchange Rate Only
-  doc.setFont('helvetica', 'normal');
-  doc.setFontSize(10);
-  doc.setTextColor(...grayColor);
-  doc.text(`1 Euro = ${exchangeRate.toFixed(4)} lei`, pageWidth - marginR, y, { align: 'right' });
-
-  y += 10;
-
-  // 2. Main Title - Centered relative to the printable area
-  const printableCenterX = (marginL + (pageWidth - marginR)) / 2;
-
-  doc.setFont('helvetica', 'bold');
-  doc.setFontSize(14);
-  doc.setTextColor(...darkColor);
-  doc.text(removeDiacritics(`Anul ${year}`), printableCenterX, y, { align: 'center' });
-
-  y += 15;
-
-  const col1X = marginL;
-  const col2X = pageWidth - marginR - 35; // Lei
-  const col3X = pageWidth - marginR;      // Euro
-
-  // Helper function for table headers
-  const renderTableHeader = (title) => {
-    doc.setFont('helvetica', 'bold');
-    doc.setFontSize(11);
-    doc.setTextColor(...darkColor);
-    doc.text(removeDiacritics(title), col1X, y);
-    doc.text('Lei', col2X, y, { align: 'right' });
-    doc.text('Euro', col3X, y, { align: 'right' });
-
-    y += 2;
-    doc.setDrawColor(...primaryColor);
-    doc.setLineWidth(0.5);
-    doc.line(col1X, y, col3X, y);
-    y += 5;
-  };
-
-  // Helper function for table rows
-  const renderTableRow = (label, ronValue, isBold = false, indent = 0) => {
-    if (isBold) {
-      doc.setFont('helvetica', 'bold');
-      doc.setTextColor(...darkColor);
-      doc.setFontSize(10.5);
-    } else {
-      doc.setFont('helvetica', 'normal');
-      doc.setTextColor(...grayColor);
-      doc.setFontSize(10);
-    }
-
-    doc.text(removeDiacritics(label), col1X + indent, y);
-    doc.text(formatNumber(ronValue), col2X, y, { align: 'right' });
-    doc.text(formatNumber(ronValue / exchangeRate), col3X, y, { align: 'right' });
-
-    y += 1.5;
-    doc.setDrawColor(...borderColor);
-    doc.setLineWidth(0.1);
-    doc.line(col1X, y, col3X, y);
-    y += 5.5;
-  };
-
-  // --- SECTION: ANGAJAT ---
-  renderTableHeader('ANGAJAT');
-  renderTableRow('Salariu Brut', result.gross, true);
-
-  if (result.untaxedAmount > 0) {
-    renderTableRow('Suma Netaxabila', result.untaxedAmount);
-  }
-
-  renderTableRow(`Asigurari Sociale (CAS)  ${result.breakdown?.casPercent || 25}%`, result.cas);
-  renderTableRow(`Asigurari Sociale de Sanatate (CASS)  ${result.breakdown?.cassPercent || 10}%`, result.cass);
-
-  if (result.personalDeduction > 0) {
-    renderTableRow('Deducere personala (DP)', result.personalDeduction);
-  }
-
-  if (result.childDeduction > 0) {
-    renderTableRow('Deducere copii', result.childDeduction);
-  }
-
-  renderTableRow(`Impozit pe venit (IV)  ${result.breakdown?.taxPercent || 10}%`, result.incomeTax);
-
-  renderTableRow('Salariu Net', result.net, true);
-
-  y += 5;
-
-  // --- SECTION: ANGAJATOR ---
-  renderTableHeader('ANGAJATOR');
-  renderTableRow(`Contributie Asiguratorie pentru Munca (CAM)  ${result.breakdown?.camPercent || 2.25}%`, result.cam);
-
-  if (result.employerExtraCAS > 0) {
-    renderTableRow('Extra CAS (part-time)', result.employerExtraCAS);
-  }
-  if (result.employerExtraCASS > 0) {
-    renderTableRow('Extra CASS (part-time)', result.employerExtraCASS);
-  }
-  if (result.voucherValue > 0) {
-    renderTableRow('Tichete masa', result.voucherValue);
-  }
-
-  renderTableRow('Salariu Complet (Cost Total)', result.totalCost, true);
-
-  y += 5;
-
-  // --- SECTION: TOTAL TAXE ---
-  const employeePay = result.cas + result.cass + result.incomeTax;
-  const employerPay = result.cam + (result.employerExtraCAS || 0) + (result.employerExtraCASS || 0);
-  const totalTax = employeePay + employerPay;
-
-  renderTableHeader('TOTAL TAXE');
-  renderTableRow('Angajatul plateste statului', employeePay);
-  renderTableRow('Angajatorul plateste statului', employerPay);
-  renderTableRow('Total taxe incasate de stat', totalTax, true);
-
-  y += 8;
-
-  // --- NARRATIVE TEXT ---
-  doc.setFont('helvetica', 'normal');
-  doc.setFontSize(11);
-  doc.setTextColor(...darkColor);
-  const summaryText = `Pentru a plati un salariu net de ${formatNumber(result.net)} lei, angajatorul cheltuie ${formatNumber(result.totalCost)} lei`;
-  doc.text(removeDiacritics(summaryText), printableCenterX, y, { align: 'center' });
-
-  // 4. Footer - subtle style from user reference
-  y = pageHeight - 25; // Raised to avoid overflow
-  doc.setDrawColor(...borderColor);
-  doc.setLineWidth(0.2);
-  doc.line(marginL, y, pageWidth - marginR, y);
-  y += 6;
-
-  doc.setFontSize(8.5);
-  doc.setFont('helvetica', 'normal');
-  doc.setTextColor(...grayColor);
-  doc.text('www.ecalc.ro  -  Calculator Salarii PRO   |   contact@ecalc.ro', marginL, y);
-
-  y += 4.5;
-  doc.setFontSize(7);
-  doc.setTextColor(...grayColor);
-  const footerServices = 'Brut -> Net, Net -> Brut   -   IT/Constructii/Agricultura   -   Tichete masa   -   Part-time   -   Zile lucratoare   -   Zile libere   -   Concediu medical';
-  doc.text(removeDiacritics(footerServices), marginL, y);
+export const generateSalaryPDF = (result, year = 2026, exchangeRate = 4.98) => {
+  // Cream un document A4
+  const doc = createA4();
+  drawSalaryPage(doc, result, createSalaryPDFTemplate(year, exchangeRate));
 
   // Salvam PDF-ul
-  const filename = `fluturas_salariu_${result.gross}_RON_${new Date().toISOString().slice(0, 10)}.pdf`;
+  const filename = payslipFilename(result);
   saveOrOpenPDF(doc, filename);
 
   return filename;
 };
 
-// Funcție de formatare numere
-const formatNumber = (num) => {
-  return new Intl.NumberFormat('ro-RO', {
-    minimumFractionDigits: 0,
-    maximumFractionDigits: 2,
-  }).format(num);
-};
-
 // Export pentru alte calculatoare
 export const generateGenericPDF = (title, data, year = 2026) => {
   const doc = new jsPDF({
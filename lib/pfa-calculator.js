@@ -1,6 +1,9 @@
 // PFA (Persoană Fizică Autorizată) Calculator Engine
 // Compară Sistem Real vs. Normă de Venit conform Cod Fiscal 2025-2026
 
+import { findFirstCrossing } from './crossover-solver.js';
+import { instrumentMethods } from './metrics.js';
+
 export class PFACalculator {
   constructor(fiscalRules) {
     this.rules = fiscalRules.pfa;
@@ -193,26 +196,23 @@ export class PFACalculator {
 
   // Calculează pragul de rentabilitate (break-even)
   calculateBreakEven(normAmount, expenseRate = 0) {
-    const taxRate = (this.rules.income_tax_rate || 10) / 100;
-
     // La ce venit anual devine Sistemul Real mai avantajos?
     // Depinde de cheltuieli și normă
 
     // Normă taxe fixe
     const normaTaxes = this.calculateNormaVenit(normAmount).totalTaxes;
 
-    // Iterăm pentru a găsi pragul
-    let breakEvenIncome = normAmount;
-    for (let income = normAmount; income <= normAmount * 10; income += 1000) {
-      const expenses = income * expenseRate;
-      const sistemReal = this.calculateSistemReal(income, expenses);
-      const normaNet = income - expenses - normaTaxes;
-
-      if (sistemReal.finalNet > normaNet) {
-        breakEvenIncome = income;
-        break;
-      }
-    }
+    // Primul venit (rezoluție 1 RON) la care Sistemul Real trece peste Normă
+    const crossing = findFirstCrossing(
+      income => {
+        const expenses = income * expenseRate;
+        return this.calculateSistemReal(income, expenses).finalNet - (income - expenses - normaTaxes);
+      },
+      normAmount, normAmount * 10,
+      this.sistemRealBreakpoints(expenseRate),
+      { afterNegative: false }
+    );
+    const breakEvenIncome = crossing ?? normAmount;
 
     return {
       breakEvenIncome,
@@ -222,6 +222,19 @@ export class PFACalculator {
     };
   }
 
+  // Pragurile CASS / CAS (pe venitul net) exprimate în venit, cu cheltuieli = venit * expenseRate
+  sistemRealBreakpoints(expenseRate = 0) {
+    const share = 1 - expenseRate;
+    if (!(share > 0)) return [];
+    const minSalary = this.rules.minimum_salary || 4050;
+    return [
+      minSalary * (this.rules.cass_min_threshold || 6),
+      minSalary * (this.rules.cass_max_threshold || 60),
+      minSalary * 12 * (this.rules.cas_obligatory_12 || 12),
+      minSalary * 12 * (this.rules.cas_obligatory_24 || 24),
+    ].map(threshold => threshold / share);
+  }
+
   // Simulare SRL (Microîntreprindere) pentru comparație
   calculateSRL(yearlyRevenue, yearlyExpenses = 0, employeesCount = 0, options = {}) {
     // Impozit microîntreprindere
@@ -297,6 +310,10 @@ export class PFACalculator {
   }
 }
 
+instrumentMethods(PFACalculator, 'PFACalculator', [
+  'calculateSistemReal', 'calculateNormaVenit', 'calculateSRL', 'compare', 'calculateBreakEven', 'fullComparison'
+]);
+
 // Utilitar: Calculează norma de venit pentru diferite activități
 export const NORME_VENIT_2026 = {
   'it_programare': 45000,
@@ -1,6 +1,60 @@
 // Real Estate Calculator Engine - Romania
 // Calculează randamente, ROI, simulare credit ipotecar
 
+import { instrumentMethods } from './metrics.js';
+
+// Rata lunară și dobânda totală per unitate împrumutată (formulă închisă)
+const loanFactors = (monthlyRate, totalMonths, type) => {
+  if (type === 'anuitate') {
+    const growth = Math.pow(1 + monthlyRate, totalMonths);
+    const paymentFactor = monthlyRate === 0
+      ? 1 / totalMonths
+      : monthlyRate * growth / (growth - 1);
+    return { paymentFactor, interestFactor: paymentFactor * totalMonths - 1 };
+  }
+  return {
+    paymentFactor: 1 / totalMonths + monthlyRate,
+    interestFactor: monthlyRate * (totalMonths + 1) / 2,
+  };
+};
+
+// Lunile afișate în grafic: primul an, apoi fiecare an încheiat și ultima lună
+const scheduleMonths = (totalMonths, full) => {
+  const months = [];
+  for (let month = 1; month <= (full ? totalMonths : Math.min(12, totalMonths)); month++) months.push(month);
+  if (full) return months;
+  for (let month = 24; month <= totalMonths; month += 12) months.push(month);
+  if (totalMonths > 12 && totalMonths % 12 !== 0) months.push(totalMonths);
+  return months;
+};
+
+// Sold rămas după k luni
+const balanceAfter = (loanAmount, monthlyRate, totalMonths, monthlyPayment, type, k) => {
+  if (type !== 'anuitate') return loanAmount - (loanAmount / totalMonths) * k;
+  if (monthlyRate === 0) return loanAmount - monthlyPayment * k;
+  const growth = Math.pow(1 + monthlyRate, k);
+  return loanAmount * growth - monthlyPayment * (growth - 1) / monthlyRate;
+};
+
+const scheduleRow = (loanAmount, monthlyRate, totalMonths, monthlyPayment, type, month) => {
+  const interest = balanceAfter(loanAmount, monthlyRate, totalMonths, monthlyPayment, type, month - 1) * monthlyRate;
+  const principal = type === 'anuitate' ? monthlyPayment - interest : loanAmount / totalMonths;
+  return {
+    month,
+    payment: principal + interest,
+    principal,
+    interest,
+    balance: Math.max(0, balanceAfter(loanAmount, monthlyRate, totalMonths, monthlyPayment, type, month)),
+  };
+};
+
+// Capital inițial + depunere la sfârșitul fiecărei luni, capitalizare lunară
+const futureValue = (initial, monthlyDeposit, monthlyRate, months) => {
+  const growth = Math.pow(1 + monthlyRate, months);
+  const deposits = monthlyRate === 0 ? monthlyDeposit * months : monthlyDeposit * (growth - 1) / monthlyRate;
+  return initial * growth + deposits;
+};
+
 export class RealEstateCalculator {
   constructor(fiscalRules) {
     this.rules = fiscalRules?.real_estate || {};
@@ -152,74 +206,32 @@ export class RealEstateCalculator {
     };
   }
 
-  // Simulare credit ipotecar
+  // Simulare credit ipotecar - totaluri în formulă închisă; graficul se construiește
+  // doar pentru lunile afișate (includeSchedule: false îl omite, fullSchedule: true dă toate lunile)
   simulateMortgage(options) {
     const {
       loanAmount,
       annualRate, // Dobândă anuală %
       years,
       type = 'anuitate', // 'anuitate' sau 'rate_egale'
+      includeSchedule = true,
+      fullSchedule = false,
     } = options;
 
     const monthlyRate = annualRate / 100 / 12;
     const totalMonths = years * 12;
+    const { paymentFactor, interestFactor } = loanFactors(monthlyRate, totalMonths, type);
 
-    let monthlyPayment;
-    let schedule = [];
-    let totalInterest = 0;
-    let totalPayment = 0;
-
-    if (type === 'anuitate') {
-      // Rate lunare egale (anuitate)
-      monthlyPayment = loanAmount * (monthlyRate * Math.pow(1 + monthlyRate, totalMonths)) /
-        (Math.pow(1 + monthlyRate, totalMonths) - 1);
-
-      let balance = loanAmount;
-      for (let month = 1; month <= totalMonths; month++) {
-        const interest = balance * monthlyRate;
-        const principal = monthlyPayment - interest;
-        balance -= principal;
-
-        totalInterest += interest;
-
-        // Adăugăm doar câteva luni reprezentative pentru performanță
-        if (month <= 12 || month % 12 === 0 || month === totalMonths) {
-          schedule.push({
-            month,
-            payment: monthlyPayment,
-            principal,
-            interest,
-            balance: Math.max(0, balance),
-          });
-        }
-      }
-    } else {
-      // Rate egale la principal
-      const monthlyPrincipal = loanAmount / totalMonths;
-      let balance = loanAmount;
-
-      for (let month = 1; month <= totalMonths; month++) {
-        const interest = balance * monthlyRate;
-        const payment = monthlyPrincipal + interest;
-        balance -= monthlyPrincipal;
-
-        totalInterest += interest;
-
-        if (month === 1) monthlyPayment = payment; // Prima rată
-
-        if (month <= 12 || month % 12 === 0 || month === totalMonths) {
-          schedule.push({
-            month,
-            payment,
-            principal: monthlyPrincipal,
-            interest,
-            balance: Math.max(0, balance),
-          });
-        }
-      }
-    }
+    // Anuitate: rată constantă; rate egale: prima rată (principal + dobânda pe tot soldul)
+    const monthlyPayment = loanAmount * paymentFactor;
+    const totalInterest = loanAmount * interestFactor;
+    const totalPayment = type === 'anuitate' ? monthlyPayment * totalMonths : loanAmount + totalInterest;
 
-    totalPayment = type === 'anuitate' ? monthlyPayment * totalMonths : loanAmount + totalInterest;
+    const schedule = includeSchedule
+      ? scheduleMonths(totalMonths, fullSchedule).map(month =>
+        scheduleRow(loanAmount, monthlyRate, totalMonths, monthlyPayment, type, month))
+      : [];
+    const lastPayment = type === 'anuitate' ? monthlyPayment : (loanAmount / totalMonths) * (1 + monthlyRate);
 
     return {
       loanAmount,
@@ -233,12 +245,65 @@ export class RealEstateCalculator {
       schedule,
       summary: {
         firstPayment: schedule[0]?.payment || monthlyPayment,
-        lastPayment: schedule[schedule.length - 1]?.payment,
+        lastPayment: includeSchedule ? schedule[schedule.length - 1]?.payment : lastPayment,
         yearlyPayment: monthlyPayment * 12,
       },
     };
   }
 
+  // Grilă de scenarii (dobânzi × avansuri × perioade) evaluate împreună, fără grafic lunar.
+  // Factorii depind doar de dobândă și perioadă, deci se calculează o singură dată pentru toate avansurile.
+  evaluateScenarios(options) {
+    const {
+      propertyValue,
+      rates = [],
+      downPayments = [],
+      terms = [],
+      type = 'anuitate',
+      monthlyRent = 0,
+      monthlyExpenses = 0,
+      closingCosts = 0,
+    } = options;
+
+    const scenarios = [];
+    for (const annualRate of rates) {
+      for (const years of terms) {
+        const totalMonths = years * 12;
+        const { paymentFactor, interestFactor } = loanFactors(annualRate / 100 / 12, totalMonths, type);
+
+        for (const downPayment of downPayments) {
+          const loanAmount = propertyValue - downPayment;
+          const monthlyPayment = loanAmount * paymentFactor;
+          const totalInterest = loanAmount * interestFactor;
+          const scenario = {
+            annualRate,
+            downPayment,
+            years,
+            loanAmount,
+            monthlyPayment,
+            totalPayment: loanAmount + totalInterest,
+            totalInterest,
+            interestRatio: interestFactor * 100,
+          };
+
+          if (monthlyRent) {
+            const annualCashFlow = (monthlyRent - monthlyPayment - monthlyExpenses) * 12;
+            scenario.monthlyCashFlow = annualCashFlow / 12;
+            scenario.cashOnCash = (annualCashFlow / (downPayment + closingCosts)) * 100;
+          }
+          scenarios.push(scenario);
+        }
+      }
+    }
+
+    return {
+      propertyValue,
+      type,
+      scenarios,
+      cheapest: scenarios.reduce((best, s) => (!best || s.totalPayment < best.totalPayment ? s : best), null),
+    };
+  }
+
   // Comparație: cumpărare vs închiriere
   compareBuyVsRent(options) {
     const {
@@ -272,15 +337,9 @@ export class RealEstateCalculator {
 
       // Închiriere + investiții
       const rentPaid = monthlyRentAlternative * 12 * year;
-      // Dacă închiriezi, investești avansul + diferența dintre rată și chirie
-      const monthlyDifference = mortgage.monthlyPayment - monthlyRentAlternative;
-      let investedValue = downPayment;
-      for (let m = 1; m <= year * 12; m++) {
-        investedValue = investedValue * (1 + investmentReturn / 100 / 12);
-        if (monthlyDifference > 0) {
-          investedValue += monthlyDifference;
-        }
-      }
+      // Dacă închiriezi, investești avansul + diferența dintre rată și chirie (valoare viitoare, lunar)
+      const monthlyDifference = Math.max(0, mortgage.monthlyPayment - monthlyRentAlternative);
+      const investedValue = futureValue(downPayment, monthlyDifference, investmentReturn / 100 / 12, year * 12);
       const netRent = investedValue - rentPaid;
 
       comparison.push({
@@ -383,6 +442,10 @@ export class RealEstateCalculator {
   }
 }
 
+instrumentMethods(RealEstateCalculator, 'RealEstateCalculator', [
+  'calculateNetYield', 'calculateRentalTax', 'calculateCashOnCash', 'simulateMortgage', 'evaluateScenarios', 'compareBuyVsRent'
+]);
+
 // Constante pentru UI
 export const PROPERTY_TYPES = {
   'garsoniera': 'Garsonieră',
@@ -3,6 +3,9 @@
  * This file is part of the 'Sandbox Isolation' architecture.
  */
 
+import { PiecewiseInverter } from './net-gross-inverter.js';
+import { addIterations, instrumentMethods, metrics, timeCall } from './metrics.js';
+
 const DEFAULT_RULES = {
     minimum_salary: 0,
     minimum_gross_construction: 0,
@@ -32,9 +35,147 @@ const DEFAULT_RULES = {
     part_time_overtax_enabled: false
 };
 
+// Inverters are rebuilt only when rules, sector or options change (keyboard input re-renders often)
+const INVERTER_CACHE_SIZE = 32;
+const inverterCache = new Map();
+
+// Reguli compilate: getRule + fallback-urile `|| x` se evaluează o singură dată per versiune de reguli.
+// Cheia e (year, effectiveDate) + conținutul secțiunii salary, ca o regulă editată din admin
+// (același an și aceeași dată, chiar și modificată pe loc în același obiect) să nu refolosească valori vechi.
+const COMPILED_CACHE_SIZE = 32;
+const compiledCache = new Map();
+// Același obiect de reguli (re-render, batch) -> fără JSON.stringify, dacă nu a fost modificat de la compilare
+const compiledByObject = new WeakMap();
+
+// Obiectul viu are încă exact cheile și valorile (simple) compilate; altfel decide cheia de conținut
+const unchangedSince = (compiled, salary) => {
+    const { salaryKeys: keys, salaryValues: values } = compiled;
+    let i = 0;
+    for (const key in salary) {
+        const value = salary[key];
+        if (key !== keys[i] || value !== values[i] || (value !== null && typeof value === 'object')) return false;
+        i++;
+    }
+    return i === keys.length;
+};
+
+let compiledCount = 0;
+
+const compileRules = (salary) => {
+    const getRule = key => salary[key] !== undefined ? salary[key] : DEFAULT_RULES[key];
+
+    const minWage = getRule('minimum_salary');
+    const deductionPercent = getRule('personal_deduction_percent') || 0;
+    const deduction = Object.freeze({
+        minWage,
+        range: getRule('personal_deduction_range') || 2000,
+        // Prefer absolute value, fallback to percentage
+        base: getRule('personal_deduction_base') || Math.round(minWage * (deductionPercent / 100))
+    });
+
+    const untaxed = getRule('untaxed_amount') || 0;
+    const cassPercent = getRule('cass_rate') || 0;
+    const taxPercent = getRule('income_tax_rate') || 0;
+    const camPercent = getRule('cam_rate') || 0;
+    const casPercent = getRule('cas_rate') || 0;
+    const pilon2CasPercent = casPercent - (getRule('pilon2_rate') || 0);
+
+    const standard = Object.freeze({
+        minWage: minWage || 0,
+        untaxed,
+        casPercent, cassPercent, taxPercent, camPercent,
+        casRate: casPercent / 100,
+        cassRate: cassPercent / 100,
+        taxRate: taxPercent / 100,
+        camRate: camPercent / 100
+    });
+
+    const it = Object.freeze({
+        taxExempt: getRule('it_tax_exempt'),
+        threshold: getRule('it_threshold') || 0,
+        pilon2Optional: getRule('it_pilon2_optional'),
+        pilon2CasPercent,
+        pilon2CasRate: pilon2CasPercent / 100
+    });
+
+    const reducedSector = (prefix, minWageKey) => {
+        const sectorCasPercent = getRule(`${prefix}_cas_rate`) || 0;
+        const cassExempt = getRule(`${prefix}_cass_exempt`);
+        const effectiveCassRate = cassExempt ? 0 : cassPercent;
+        return Object.freeze({
+            minWage: getRule(minWageKey) || 0,
+            untaxed,
+            casPercent: sectorCasPercent,
+            cassPercent: effectiveCassRate,
+            taxPercent, camPercent,
+            casRate: sectorCasPercent / 100,
+            cassRate: effectiveCassRate / 100,
+            taxRate: taxPercent / 100,
+            camRate: camPercent / 100,
+            taxExempt: getRule(`${prefix}_tax_exempt`),
+            threshold: getRule('tax_exemption_threshold') || 0
+        });
+    };
+
+    return Object.freeze({
+        id: ++compiledCount,
+        // Copia înghețată citită de getRule: un calcul nu amestecă valori vechi și noi
+        salary: Object.freeze({ ...salary }),
+        salaryKeys: Object.freeze(Object.keys(salary)),
+        salaryValues: Object.freeze(Object.values(salary)),
+        deduction,
+        standard,
+        it,
+        construction: reducedSector('construction', 'minimum_gross_construction'),
+        agriculture: reducedSector('agriculture', 'minimum_gross_agriculture'),
+        minimums: Object.freeze({
+            standard: getRule('minimum_salary'),
+            it: getRule('minimum_gross_it'),
+            construction: getRule('minimum_gross_construction'),
+            agriculture: getRule('minimum_gross_agriculture')
+        })
+    });
+};
+
+/**
+ * Regulile salariale compilate (înghețate) pentru un document fiscal_rules,
+ * refolosite de toate apelurile SalaryCalculator pe aceeași versiune.
+ */
+export const compileSalaryRules = (fiscalRules) => {
+    const rules = fiscalRules || {};
+    const salary = rules.salary ? rules.salary : rules;
+    let compiled = compiledByObject.get(salary);
+    if (compiled && unchangedSince(compiled, salary)) return compiled;
+
+    const key = `${rules.year ?? ''}|${rules.effectiveDate ?? ''}|${JSON.stringify(salary)}`;
+    compiled = compiledCache.get(key);
+    if (compiled) {
+        compiledCache.delete(key);
+    } else {
+        compiled = compileRules(salary);
+        if (compiledCache.size >= COMPILED_CACHE_SIZE) compiledCache.delete(compiledCache.keys().next().value);
+    }
+    compiledCache.set(key, compiled);
+    compiledByObject.set(salary, compiled);
+    return compiled;
+};
+
+const voucherTotal = (options) =>
+    ((options.mealVouchers || 0) * (options.voucherDays || 0)) + (parseFloat(options.vacationVouchers) || 0);
+
+const personalDeduction = (deduction, grossSalary) => {
+    // APPLY REGRESSIVE LOGIC (BUSINESS_LOGIC.md)
+    if (grossSalary <= deduction.minWage) return deduction.base;
+    if (grossSalary > deduction.minWage + deduction.range) return 0;
+
+    // Regression Formula: DB * (1 - (Gross - Min) / Range)
+    return Math.round(deduction.base * (1 - (grossSalary - deduction.minWage) / deduction.range));
+};
+
 export class SalaryCalculator {
     constructor(fiscalRules) {
-        this.rules = (fiscalRules && fiscalRules.salary) ? fiscalRules.salary : (fiscalRules || {});
+        this.compiled = compileSalaryRules(fiscalRules);
+        this.rules = this.compiled.salary;
     }
 
     getRule(key) {
@@ -44,53 +185,30 @@ export class SalaryCalculator {
 
     calculatePersonalDeduction(grossSalary, isBasicFunction = true) {
         if (!isBasicFunction) return 0;
-
-        // 1. EXTRACT RULES (Strict Dynamic Fetching)
-        const minWage = this.getRule('minimum_salary');
-        const deductionPercent = this.getRule('personal_deduction_percent') || 0;
-        const range = this.getRule('personal_deduction_range') || 2000;
-
-        // 2. DP Base: Prefer absolute value, fallback to percentage
-        const deductionBase = this.getRule('personal_deduction_base') || Math.round(minWage * (deductionPercent / 100));
-
-        // 3. APPLY REGRESSIVE LOGIC (BUSINESS_LOGIC.md)
-        if (grossSalary <= minWage) return deductionBase;
-        if (grossSalary > minWage + range) return 0;
-
-        // Regression Formula: DB * (1 - (Gross - Min) / Range)
-        return Math.round(deductionBase * (1 - (grossSalary - minWage) / range));
+        return personalDeduction(this.compiled.deduction, grossSalary);
     }
 
     calculateStandard(grossSalary, options = {}) {
         const { isBasicFunction = true } = options;
-
-        // 0. FETCH BASE RULES (Strictly Dynamic)
-        const minWage = this.getRule('minimum_salary') || 0;
-        const non_taxable_amount_admin = this.getRule('untaxed_amount') || 0;
-        const cas_percentage = this.getRule('cas_rate') || 0;
-        const cass_percentage = this.getRule('cass_rate') || 0;
-        const tax_percentage = this.getRule('income_tax_rate') || 0;
-        const cam_percentage = this.getRule('cam_rate') || 0;
+        const c = this.compiled.standard;
 
         // 1. Facilitate Salariu Minim (Suma Netaxabilă) 
         // Logica de Prag: Daca Brut > Prag (Minim), Scutirea devine 0.
         // STRICT LEGAL: Fără toleranță. Brut <= Minim => Scutire.
-        const applySN = grossSalary <= minWage;
-        const non_taxable_amount = applySN ? non_taxable_amount_admin : 0;
+        const non_taxable_amount = grossSalary <= c.minWage ? c.untaxed : 0;
 
         // 2. Formule Angajat (Baza de Calcul)
         // Baza_Contributii = MAX(0, Venit_Brut - non_taxable_amount)
         const Baza_Contributii = Math.max(0, grossSalary - non_taxable_amount);
 
         // CAS = Math.round(Baza_Contributii * (cas_percentage / 100))
-        const cas = Math.round(Baza_Contributii * (cas_percentage / 100));
+        const cas = Math.round(Baza_Contributii * c.casRate);
 
         // CASS = Math.round(Baza_Contributii * (cass_percentage / 100))
-        const cass = Math.round(Baza_Contributii * (cass_percentage / 100));
+        const cass = Math.round(Baza_Contributii * c.cassRate);
 
-        // 3. Deducere Personală
-        // Deducere_Personala = min_wage * (deduction_percentage / 100) (aplica regresivitatea)
-        const Deducere_Personala = this.calculatePersonalDeduction(grossSalary, isBasicFunction);
+        // 3. Deducere Personală (aplica regresivitatea)
+        const Deducere_Personala = isBasicFunction ? personalDeduction(this.compiled.deduction, grossSalary) : 0;
 
         // 4. Baza Impozit (BI)
         // Corecție: Tichetele sunt venit impozabil, dar nu contributiv.
@@ -101,18 +219,15 @@ export class SalaryCalculator {
         const Baza_Impozit = Math.max(0, grossSalary - non_taxable_amount - cas - cass - Deducere_Personala + Tichete_Masa + Tichete_Vacanta);
 
         // Impozit = Math.round(Baza_Impozit * (tax_percentage / 100))
-        const incomeTax = Math.round(Baza_Impozit * (tax_percentage / 100));
+        const incomeTax = Math.round(Baza_Impozit * c.taxRate);
 
         // 5. SALARIU NET
         // SALARIU NET = Venit_Brut - CAS - CASS - Impozit
         const netSalary = grossSalary - cas - cass - incomeTax;
 
         // 6. Formule Angajator (Cost Firma)
-        // Baza_CAM = MAX(0, Venit_Brut - non_taxable_amount)
-        const Baza_CAM = Math.max(0, grossSalary - non_taxable_amount);
-
-        // CAM = Math.floor(Baza_CAM * (cam_percentage / 100))
-        const cam = Math.floor(Baza_CAM * (cam_percentage / 100));
+        // CAM = Math.floor(MAX(0, Venit_Brut - non_taxable_amount) * (cam_percentage / 100))
+        const cam = Math.floor(Baza_Contributii * c.camRate);
 
         // COST TOTAL = Venit_Brut + CAM
         const totalCost = grossSalary + cam;
@@ -129,45 +244,39 @@ export class SalaryCalculator {
             cam,
             totalCost,
             breakdown: {
-                casPercent: cas_percentage,
-                cassPercent: cass_percentage,
-                taxPercent: tax_percentage,
-                camPercent: cam_percentage
+                casPercent: c.casPercent,
+                cassPercent: c.cassPercent,
+                taxPercent: c.taxPercent,
+                camPercent: c.camPercent
             }
         };
     }
 
-    // ... calculateIT, calculateConstruction (similarly use standard or own logic) ...
-
     calculateIT(grossSalary, options = {}) {
-        const isTaxExemptRule = this.getRule('it_tax_exempt');
-        const threshold = this.getRule('it_threshold') || 0;
+        const c = this.compiled.it;
 
         // Force Standard calculation as base (contains all dynamic rules)
         const res = this.calculateStandard(grossSalary, options);
 
         // IT Specific adjustment: CAS reduction (Pilon 2)
-        const pilon2Rate = this.getRule('pilon2_rate') || 0;
-        if (this.getRule('it_pilon2_optional')) {
+        if (c.pilon2Optional) {
             // Recalculate CAS with reduced rate
-            const casPercent = res.breakdown.casPercent - pilon2Rate;
-            res.cas = Math.round((grossSalary - res.untaxedAmount) * (casPercent / 100));
-            res.breakdown.casPercent = casPercent;
+            res.cas = Math.round((grossSalary - res.untaxedAmount) * c.pilon2CasRate);
+            res.breakdown.casPercent = c.pilon2CasPercent;
         }
 
         // Apply IT Tax Exemption
-        if (isTaxExemptRule) {
-            if (grossSalary <= threshold) {
+        if (c.taxExempt) {
+            if (grossSalary <= c.threshold) {
                 res.incomeTax = 0;
                 res.taxableIncome = 0;
             } else {
                 // Taxable only above threshold
-                const taxablePart = grossSalary - threshold;
-                const Tichete = ((options.mealVouchers || 0) * (options.voucherDays || 0)) + (parseFloat(options.vacationVouchers) || 0);
+                const taxablePart = grossSalary - c.threshold;
 
                 // BI = MAX(0, Venit_Impozabil - DP + Tichete)
-                const BI = Math.max(0, taxablePart - res.personalDeduction + Tichete);
-                res.incomeTax = Math.round(BI * (res.breakdown.taxPercent / 100));
+                const BI = Math.max(0, taxablePart - res.personalDeduction + voucherTotal(options));
+                res.incomeTax = Math.round(BI * this.compiled.standard.taxRate);
                 res.taxableIncome = BI;
             }
         }
@@ -177,55 +286,36 @@ export class SalaryCalculator {
     }
 
     calculateConstruction(grossSalary, options = {}) {
-        const sector = (options.sector === 'agriculture') ? 'agriculture' : 'construction';
-        const prefix = sector;
-
-        // 0. FETCH BASE RULES
-        const minWageKey = (sector === 'agriculture') ? 'minimum_gross_agriculture' : 'minimum_gross_construction';
-        const minWage = this.getRule(minWageKey) || 0;
-        const cas_percentage = this.getRule(`${prefix}_cas_rate`) || 0;
-        const cass_percentage = this.getRule('cass_rate') || 0;
-        const tax_percentage = this.getRule('income_tax_rate') || 0;
-        const cam_percentage = this.getRule('cam_rate') || 0;
-        const taxExempt = this.getRule(`${prefix}_tax_exempt`);
-        const cassExempt = this.getRule(`${prefix}_cass_exempt`);
-        const threshold = this.getRule('tax_exemption_threshold') || 0;
-        const non_taxable_amount_admin = this.getRule('untaxed_amount') || 0;
+        return this._calculateReduced(grossSalary, options.sector === 'agriculture' ? 'agriculture' : 'construction', options);
+    }
+
+    // Construcții / agricultură: CAS redus, scutiri de impozit/CASS sub prag
+    _calculateReduced(grossSalary, sector, options) {
+        const c = this.compiled[sector];
 
         // 1. Facilitate Salariu Minim (Suma Netaxabilă)
         // STRICT LEGAL: Fără toleranță. Brut <= Minim => Scutire.
         // Pentru a evita problema "Fiscal Cliff" la reciprocitate, pragul e fix.
-        const applySN = grossSalary <= minWage;
-        const non_taxable_amount = applySN ? non_taxable_amount_admin : 0;
+        const non_taxable_amount = grossSalary <= c.minWage ? c.untaxed : 0;
 
         // 2. Formule Angajat
         const Baza_Contributii = Math.max(0, grossSalary - non_taxable_amount);
-        const cas = Math.round(Baza_Contributii * (cas_percentage / 100));
-
-        const effectiveCassRate = cassExempt ? 0 : cass_percentage;
-        const cass = Math.round(Baza_Contributii * (effectiveCassRate / 100));
+        const cas = Math.round(Baza_Contributii * c.casRate);
+        const cass = Math.round(Baza_Contributii * c.cassRate);
 
         const Deducere_Personala = this.calculatePersonalDeduction(grossSalary, options.isBasicFunction);
 
         // 3. Impozit
         let incomeTax = 0;
         let BI = 0;
-        if (taxExempt && grossSalary <= threshold) {
-            incomeTax = 0;
-            // Note: Even if exempt from standard tax, vouchers might be taxable? 
-            // Legal nuance: Usually the exemption covers all salary income. 
-            // User formula: MAX(0, Venit_Brut - SN - CAS - CASS - DP + Tichete)
-            // If taxExempt, we assume BI=0 unless part-taxable.
-        } else {
-            const Tichete = ((options.mealVouchers || 0) * (options.voucherDays || 0)) + (parseFloat(options.vacationVouchers) || 0);
-            // Apply standard BI formula if not exempt
-            BI = Math.max(0, grossSalary - non_taxable_amount - cas - cass - Deducere_Personala + Tichete);
-            incomeTax = Math.round(BI * (tax_percentage / 100));
+        if (!(c.taxExempt && grossSalary <= c.threshold)) {
+            // Apply standard BI formula if not exempt: MAX(0, Venit_Brut - SN - CAS - CASS - DP + Tichete)
+            BI = Math.max(0, grossSalary - non_taxable_amount - cas - cass - Deducere_Personala + voucherTotal(options));
+            incomeTax = Math.round(BI * c.taxRate);
         }
 
         // 4. Formule Angajator
-        const Baza_CAM = Math.max(0, grossSalary - non_taxable_amount);
-        const cam = Math.floor(Baza_CAM * (cam_percentage / 100));
+        const cam = Math.floor(Baza_Contributii * c.camRate);
         const totalCost = grossSalary + cam;
 
         return {
@@ -240,24 +330,79 @@ export class SalaryCalculator {
             cam,
             totalCost,
             breakdown: {
-                casPercent: cas_percentage,
-                cassPercent: effectiveCassRate,
-                taxPercent: tax_percentage,
-                camPercent: cam_percentage
+                casPercent: c.casPercent,
+                cassPercent: c.cassPercent,
+                taxPercent: c.taxPercent,
+                camPercent: c.camPercent
             }
         };
     }
 
+    _sectorMinimum(sector) {
+        const minimums = this.compiled.minimums;
+        return sector === 'it' || sector === 'construction' || sector === 'agriculture' ? minimums[sector] : minimums.standard;
+    }
+
     /**
-     * Calculează Brut pornind de la Net (Binary Search Robust cu suport pentru Discontinuități)
+     * Segmentele Net(Brut) pentru reguli + sector + opțiuni (construite o singură dată).
+     * Breakpoints: salariile minime (cliff suma netaxabilă), capătul intervalului de deducere,
+     * pragurile IT / construcții. Restul kink-urilor sunt găsite de PiecewiseInverter.
+     */
+    getNetToGrossInverter(sector = 'standard', options = {}) {
+        // Regulile compilate au un id per versiune: cheia nu mai serializează tot documentul la fiecare query
+        const key = JSON.stringify([this.compiled.id, sector, options.mealVouchers, options.voucherDays,
+            options.vacationVouchers, options.isBasicFunction]);
+        let inverter = inverterCache.get(key);
+        if (!inverter) {
+            const minWage = this.getRule('minimum_salary') || 0;
+            const breakpoints = [
+                minWage,
+                minWage + (this.getRule('personal_deduction_range') || 2000),
+                this._sectorMinimum(sector) || 0
+            ];
+            if (sector === 'it') breakpoints.push(this.getRule('it_threshold') || 0);
+            if (sector === 'construction' || sector === 'agriculture') {
+                breakpoints.push(this.getRule('tax_exemption_threshold') || 0);
+            }
+            const sectorOptions = { ...options, sector };
+            inverter = new PiecewiseInverter(gross => this._calculateForSector(gross, sector, sectorOptions), breakpoints);
+            if (inverterCache.size >= INVERTER_CACHE_SIZE) inverterCache.delete(inverterCache.keys().next().value);
+        } else {
+            inverterCache.delete(key);
+        }
+        inverterCache.set(key, inverter);
+        return inverter;
+    }
+
+    /**
+     * Calculează Brut pornind de la Net (inversare pe segmente liniare, O(log segmente))
      */
     calculateNetToGross(netSalary, sector = 'standard', options = {}) {
+        return this.calculateNetToGrossBatch([netSalary], sector, options)[0];
+    }
+
+    // Batch: mii de ținte Net pe aceleași reguli, segmentele se construiesc o singură dată
+    calculateNetToGrossBatch(netSalaries, sector = 'standard', options = {}) {
+        const inverter = this.getNetToGrossInverter(sector, options);
+        // Match exact la pragul de Salariu Minim (Reciprocitate)
+        const resMin = this._calculateForSector(this._sectorMinimum(sector), sector, options);
+
+        return Array.from(netSalaries, netSalary => {
+            if (Math.abs(resMin.net - netSalary) < 1) return this._calculateForSector(resMin.gross, sector, options);
+            const res = inverter.solve(netSalary);
+            // Iterații = evaluări ale motorului: saltul analitic + pașii de corecție
+            if (metrics.enabled) addIterations(1 + inverter.lastSteps);
+            return res || this._searchNetToGross(netSalary, sector, options);
+        });
+    }
+
+    /**
+     * Brut din Net prin Binary Search (referință pentru verify_net_to_gross.mjs și fallback)
+     */
+    _searchNetToGross(netSalary, sector = 'standard', options = {}) {
         // 1. Check "Cliff" Point (Salariu Minim)
         // Discontinuitatea "Untaxed Amount" (200/300 RON) crează o scădere a Netului imediat după prag.
-        const minSalary = sector === 'construction' ? this.getRule('minimum_gross_construction') :
-            sector === 'agriculture' ? this.getRule('minimum_gross_agriculture') :
-                sector === 'it' ? this.getRule('minimum_gross_it') :
-                    this.getRule('minimum_salary');
+        const minSalary = this._sectorMinimum(sector);
 
         // Calculăm Net-ul EXACT la pragul de Salariu Minim
         let resMin = this._calculateForSector(minSalary, sector, options);
@@ -282,6 +427,7 @@ export class SalaryCalculator {
         for (let i = 0; i < 50; i++) { // 50 iterații pt precizie maximă
             const mid = Math.round((low + high) / 2);
             if (mid <= 0) break;
+            if (metrics.enabled) addIterations(1);
 
             const res = this._calculateForSector(mid, sector, options);
             const diff = res.net - netSalary;
@@ -306,11 +452,30 @@ export class SalaryCalculator {
     // Helper intern pentru a apela funcția corectă de calcul (Single Source of Truth)
     _calculateForSector(gross, sector, options) {
         if (sector === 'it') return this.calculateIT(gross, options);
-        if (sector === 'construction' || sector === 'agriculture') return this.calculateConstruction(gross, options);
-        return this.calculateStandard(gross, { ...options, sector });
+        if (sector === 'construction' || sector === 'agriculture') return this._calculateReduced(gross, sector, options);
+        return this.calculateStandard(gross, options);
     }
 
+    /**
+     * Calculează Brut pornind de la Cost Total (formă închisă).
+     * Cost = Brut + floor(max(0, Brut - SN) * CAM%), SN doar pentru Brut <= minim,
+     * deci Brut = (Cost + SN * CAM%) / (1 + CAM%) pe fiecare parte a pragului.
+     */
     calculateCostToNet(totalCost, sector = 'standard', options = {}) {
+        const camRate = (this.getRule('cam_rate') || 0) / 100;
+        const untaxed = this.getRule('untaxed_amount') || 0;
+        let best = null;
+        for (const sn of untaxed ? [0, untaxed] : [0]) {
+            const gross = (totalCost + sn * camRate) / (1 + camRate);
+            if (!(gross > sn)) continue;
+            if (metrics.enabled) addIterations(1);
+            const res = this._calculateForSector(gross, sector, options);
+            if (Math.abs(res.totalCost - totalCost) < 1 && (!best || res.gross < best.gross)) best = res;
+        }
+        return best || this._searchCostToNet(totalCost, sector, options);
+    }
+
+    _searchCostToNet(totalCost, sector = 'standard', options = {}) {
         // ... existing simple binary search is likely fine for CostToNet as Cost is monotonic ...
         // But for consistency let's use the helper
         let low = totalCost * 0.3;
@@ -318,6 +483,7 @@ export class SalaryCalculator {
         let bestGuess = low;
         for (let i = 0; i < 40; i++) {
             const mid = (low + high) / 2;
+            if (metrics.enabled) addIterations(1);
             const res = this._calculateForSector(mid, sector, options);
 
             if (Math.abs(res.totalCost - totalCost) < 1) return res;
@@ -329,19 +495,26 @@ export class SalaryCalculator {
 }
 
 
+instrumentMethods(SalaryCalculator, 'SalaryCalculator', ['calculateNetToGross', 'calculateNetToGrossBatch', 'calculateCostToNet']);
+
 export const calculateSalaryResults = (inputValue, calculationType, sector, rules, options = {}) => {
+    if (metrics.enabled) {
+        return timeCall(`calculateSalaryResults:${calculationType}`,
+            () => computeSalaryResults(inputValue, calculationType, sector, rules, options));
+    }
+    return computeSalaryResults(inputValue, calculationType, sector, rules, options);
+};
+
+const computeSalaryResults = (inputValue, calculationType, sector, rules, options) => {
     if (!rules || !inputValue) return null;
     const calculator = new SalaryCalculator(rules);
     const value = parseFloat(inputValue);
     if (isNaN(value)) return null;
-    const calcOptions = { ...options, sector };
+    // Sectorul merge explicit la _calculateForSector, fără copie { ...options, sector } per apel
     let res;
-    if (calculationType === 'brut-net') {
-        if (sector === 'it') res = calculator.calculateIT(value, calcOptions);
-        else if (sector === 'construction' || sector === 'agriculture') res = calculator.calculateConstruction(value, calcOptions);
-        else res = calculator.calculateStandard(value, calcOptions);
-    } else if (calculationType === 'net-brut') res = calculator.calculateNetToGross(value, sector, calcOptions);
-    else res = calculator.calculateCostToNet(value, sector, calcOptions);
+    if (calculationType === 'brut-net') res = calculator._calculateForSector(value, sector, options);
+    else if (calculationType === 'net-brut') res = calculator.calculateNetToGross(value, sector, options);
+    else res = calculator.calculateCostToNet(value, sector, options);
 
     if (options.isTaxExempt) {
         res.net += res.incomeTax;
@@ -0,0 +1,131 @@
+// Sitemap Shards - index + fișiere separate pe secțiune și an
+// Folosit de app/sitemap.xml/route.ts (index) și app/sitemaps/[shard]/route.ts (shard-uri).
+//
+// Lista de URL-uri depinde doar de datele din lib/ (orașe, stațiuni, județe, valori salariale),
+// deci se construiește o singură dată per proces/build și se reutilizează. lastModified vine din
+// SECTION_LAST_MODIFIED (se actualizează odată cu datele secțiunii), nu din new Date(), ca
+// motoarele de căutare să nu vadă toate paginile "modificate" la fiecare crawl.
+
+import { CITIES_ROMANIA } from './cities-data.js';
+import { MOUNTAIN_RESORTS_ZONES, ALL_COASTAL_RESORTS, ROMANIAN_MOUNTAIN_PEAKS } from './resorts-data.js';
+import { ROMANIA_COUNTIES } from './counties-data.js';
+
+export const SITEMAP_BASE_URL = 'https://ecalc.ro';
+export const SITEMAP_YEARS = [2024, 2025, 2026];
+
+// Limita protocolului este 50.000 URL-uri / fișier; păstrăm o marjă
+export const SHARD_MAX_URLS = 45000;
+
+// Data ultimei modificări a datelor fiecărei secțiuni (YYYY-MM-DD)
+export const SECTION_LAST_MODIFIED = {
+  pagini: '2026-02-01',
+  calculatoare: '2026-02-01',
+  salarii: '2026-02-01',
+  'vreme-orase': '2026-02-01',
+  'vreme-locatii': '2026-02-01',
+  'vreme-judete': '2026-02-01',
+};
+
+export const SALARY_VALUES = [1000, 3700, 4050, 4325, 4850, 5000, 5500, 6000, 7000, 8000, 9000, 10000, 12000, 15000, 20000];
+
+const CALCULATOR_ROUTES = [
+  'calculator-salarii-pro',
+  'calculator-pfa',
+  'decision-maker',
+  'calculator-concediu-medical',
+  'calculator-impozit-auto',
+  'calculator-imobiliare-pro',
+  'calculator-efactura',
+  'calculator-compensatii-zboruri',
+  'zile-lucratoare',
+  'zile-libere',
+];
+
+export const EXTRA_LOCATION_SLUGS = ['transfagarasan', 'aeroport-otopeni', 'aeroport-cluj', 'aeroport-timisoara', 'delta-dunarii'];
+
+// Helper for consistent slug generation
+export const normalizeSlug = (name) => name
+  .toLowerCase()
+  .normalize('NFD')
+  .replace(/[\u0300-\u036f]/g, '')
+  .replace(/\s+/g, '-')
+  .replace(/[^a-z0-9-]/g, '');
+
+// Secțiunile, în ordinea din index: [secțiune, an | null, rute]
+const sectionRoutes = (years) => [
+  ['pagini', null, ['', '/vreme']],
+  ...years.map(year => ['calculatoare', year, CALCULATOR_ROUTES.map(route => `/${route}/${year}`)]),
+  ...years.map(year => ['salarii', year, [
+    ...SALARY_VALUES.flatMap(val => [
+      `/calculator-salarii-pro/${year}/salariu-brut-${val}-lei`,
+      `/calculator-salarii-pro/${year}/salariu-net-${val}-lei`,
+    ]),
+    `/calculator-salarii-pro/${year}/salariu-minim-pe-economie-${year}`,
+    `/calculator-salarii-pro/${year}/salariu-minim-constructii-${year}`,
+    `/calculator-salarii-pro/${year}/salariu-minim-agricultura-${year}`,
+  ]]),
+  ['vreme-orase', null, CITIES_ROMANIA.map(city => `/vreme/${normalizeSlug(city.name)}`)],
+  ['vreme-locatii', null, Array.from(new Set([
+    ...MOUNTAIN_RESORTS_ZONES.flatMap(z => z.items.map(i => i.slug)),
+    ...ALL_COASTAL_RESORTS.map(s => s.slug),
+    ...ROMANIAN_MOUNTAIN_PEAKS.map(p => p.slug),
+    ...EXTRA_LOCATION_SLUGS,
+  ])).map(slug => `/vreme/${slug}`)],
+  ['vreme-judete', null, ROMANIA_COUNTIES.map(judet => `/vreme/judet/${judet.slug}`)],
+];
+
+/**
+ * Toate shard-urile: { id, section, year, lastModified, urls }.
+ * Un shard prea mare se împarte în id, id-2, id-3, ...
+ */
+export function buildSitemapShards(baseUrl = SITEMAP_BASE_URL, years = SITEMAP_YEARS, maxUrls = SHARD_MAX_URLS) {
+  const shards = [];
+  const seen = new Set();
+  for (const [section, year, routes] of sectionRoutes(years)) {
+    // Un URL apare o singură dată în tot sitemap-ul (prima secțiune care îl conține)
+    const urls = routes.map(route => `${baseUrl}${route}`).filter(url => !seen.has(url) && seen.add(url));
+    const id = year ? `${section}-${year}` : section;
+    for (let part = 0; part * maxUrls < urls.length; part++) {
+      shards.push({
+        id: part === 0 ? id : `${id}-${part + 1}`,
+        section,
+        year,
+        lastModified: SECTION_LAST_MODIFIED[section],
+        urls: urls.slice(part * maxUrls, (part + 1) * maxUrls),
+      });
+    }
+  }
+  return shards;
+}
+
+const cache = new Map();
+
+// Shard-urile se construiesc o dată per baseUrl și se reutilizează
+export function getSitemapShards(baseUrl = SITEMAP_BASE_URL) {
+  if (!cache.has(baseUrl)) cache.set(baseUrl, buildSitemapShards(baseUrl));
+  return cache.get(baseUrl);
+}
+
+const escapeXml = (value) => String(value)
+  .replace(/&/g, '&amp;')
+  .replace(/</g, '&lt;')
+  .replace(/>/g, '&gt;')
+  .replace(/"/g, '&quot;')
+  .replace(/'/g, '&apos;');
+
+const XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n';
+const SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9';
+
+export const shardUrl = (baseUrl, shard) => `${baseUrl}/sitemaps/${shard.id}.xml`;
+
+export function renderSitemapIndex(shards, baseUrl = SITEMAP_BASE_URL) {
+  const entries = shards.map(shard =>
+    `<sitemap><loc>${escapeXml(shardUrl(baseUrl, shard))}</loc><lastmod>${shard.lastModified}</lastmod></sitemap>`);
+  return `${XML_HEADER}<sitemapindex xmlns="${SITEMAP_NS}">\n${entries.join('\n')}\n</sitemapindex>\n`;
+}
+
+export function renderUrlSet(shard) {
+  const entries = shard.urls.map(url =>
+    `<url><loc>${escapeXml(url)}</loc><lastmod>${shard.lastModified}</lastmod></url>`);
+  return `${XML_HEADER}<urlset xmlns="${SITEMAP_NS}">\n${entries.join('\n')}\n</urlset>\n`;
+}
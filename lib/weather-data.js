@@ -1,19 +1,71 @@
-// Open-Meteo API integration pentru date meteo istorice România
-// API gratuit, fără API key necesar
+// Date meteo istorice România: medii multianuale din climatology store (lib/climatology-store.js)
+// Store-ul e generat la build din Open-Meteo Archive API de climatology_store.py. Pe server se citește
+// direct, în browser prin GET /api/climatology/:slug (o celulă, nu tot fișierul). Dacă store-ul lipsește
+// sau nu are ziua, media se calculează ca înainte din Open-Meteo Archive API (coordonate București).
+
+import { CLIMATOLOGY_API, loadClimatologyStore } from './climatology-store.js';
+
+export const DEFAULT_WEATHER_LOCATION = 'bucuresti';
+
+// Coordonate București, România (centru țară) - pentru fallback-ul live din arhivă
+const ARCHIVE_LAT = 44.4268;
+const ARCHIVE_LON = 26.1025;
 
 /**
- * Extrage date meteo istorice pentru o dată specifică din România
- * Folosește Open-Meteo Historical Weather API
- * @param {string} date - Data în format YYYY-MM-DD
- * @returns {Promise<{temp: string, condition: string, icon: string}>}
+ * Media multianuală din store pentru locație și zi: { temp, precip, years } sau null
  */
+export async function getClimatologyStats(location, month, day) {
+    if (typeof window === 'undefined') {
+        const store = await loadClimatologyStore();
+        return store?.lookup(location, month, day) ?? null;
+    }
+    const response = await fetch(`${CLIMATOLOGY_API}/${encodeURIComponent(location)}?month=${month}&day=${day}`);
+    return response.ok ? response.json() : null;
+}
+
+/**
+ * Media ultimilor 5 ani din Open-Meteo Archive API (fallback când store-ul lipsește)
+ */
+export async function fetchArchiveAverage(month, day) {
+    const currentYear = new Date().getFullYear();
+    const startYear = Math.max(2015, currentYear - 5);
+    const endYear = currentYear - 1; // Nu includem anul curent
+    const mm = String(month).padStart(2, '0');
+    const dd = String(day).padStart(2, '0');
+
+    const years = [];
+    for (let year = startYear; year <= endYear; year++) years.push(year);
+    const days = await Promise.all(years.map(async year => {
+        const historicalDate = `${year}-${mm}-${dd}`;
+        try {
+            const response = await fetch(
+                `https://archive-api.open-meteo.com/v1/archive?latitude=${ARCHIVE_LAT}&longitude=${ARCHIVE_LON}&start_date=${historicalDate}&end_date=${historicalDate}&daily=temperature_2m_mean,precipitation_sum&timezone=Europe/Bucharest`
+            );
+            if (!response.ok) return null;
+            const data = await response.json();
+            const temp = data.daily?.temperature_2m_mean?.[0];
+            return temp === null || temp === undefined ? null : { temp, precip: data.daily.precipitation_sum?.[0] || 0 };
+        } catch (error) {
+            console.error(`Error fetching weather for ${historicalDate}:`, error);
+            return null;
+        }
+    }));
+
+    const found = days.filter(Boolean);
+    if (found.length === 0) return null;
+    return {
+        temp: found.reduce((sum, d) => sum + d.temp, 0) / found.length,
+        precip: found.reduce((sum, d) => sum + d.precip, 0) / found.length
+    };
+}
+
 /**
- * Extrage date meteo istorice pentru o dată specifică din România
- * Folosește Open-Meteo Historical Weather API
+ * Media multianuală pentru o dată (zi + lună) într-o locație din cities-data.js / resorts-data.js
  * @param {string} date - Data în format YYYY-MM-DD
+ * @param {string} location - slug-ul locației (implicit București, centrul țării)
  * @returns {Promise<{temp: string, condition: string, icon: string}>}
  */
-export async function getHistoricalWeather(date) {
+export async function getHistoricalWeather(date, location = DEFAULT_WEATHER_LOCATION) {
     const targetDate = new Date(date);
     const targetYear = targetDate.getFullYear();
 
@@ -22,89 +74,60 @@ export async function getHistoricalWeather(date) {
         return getHardcodedWeather(targetDate.getMonth());
     }
 
+    const month = targetDate.getMonth() + 1;
+    const day = targetDate.getDate();
     try {
-        // Coordonate București, România (centru țară)
-        const lat = 44.4268;
-        const lon = 26.1025;
-
-        // Extragem anul din dată
-        const targetDate = new Date(date);
-        const currentYear = new Date().getFullYear();
-
-        // Calculăm media ultimilor 5 ani (sau până în 2015)
-        const startYear = Math.max(2015, currentYear - 5);
-        const endYear = currentYear - 1; // Nu includem anul curent
-
-        // Construim datele pentru fiecare an
-        const month = String(targetDate.getMonth() + 1).padStart(2, '0');
-        const day = String(targetDate.getDate()).padStart(2, '0');
-
-        let totalTemp = 0;
-        let totalPrecip = 0;
-        let count = 0;
-
-        // Fetch date pentru fiecare an
-        for (let year = startYear; year <= endYear; year++) {
-            const historicalDate = `${year}-${month}-${day}`;
-
-            try {
-                const response = await fetch(
-                    `https://archive-api.open-meteo.com/v1/archive?latitude=${lat}&longitude=${lon}&start_date=${historicalDate}&end_date=${historicalDate}&daily=temperature_2m_mean,precipitation_sum&timezone=Europe/Bucharest`
-                );
-
-                if (response.ok) {
-                    const data = await response.json();
-                    if (data.daily && data.daily.temperature_2m_mean && data.daily.temperature_2m_mean[0] !== null) {
-                        totalTemp += data.daily.temperature_2m_mean[0];
-                        totalPrecip += data.daily.precipitation_sum[0] || 0;
-                        count++;
-                    }
-                }
-            } catch (error) {
-                console.error(`Error fetching weather for ${historicalDate}:`, error);
-            }
+        let stats = await getClimatologyStats(location, month, day);
+        if (!stats && location !== DEFAULT_WEATHER_LOCATION) {
+            stats = await getClimatologyStats(DEFAULT_WEATHER_LOCATION, month, day);
         }
-
-        if (count === 0) {
-            // Fallback la date aproximative dacă API-ul eșuează
+        // Store lipsă (build fără climatology_store.py) sau fără ziua: media live din arhivă
+        stats ??= await fetchArchiveAverage(month, day);
+        if (!stats) {
+            // Fallback la date aproximative dacă și API-ul eșuează
             return getFallbackWeather(targetDate.getMonth());
         }
-
-        const avgTemp = Math.round(totalTemp / count);
-        const avgPrecip = totalPrecip / count;
-
-        // Determinăm condiția meteo
-        let condition = 'Senin';
-        let icon = 'Sun';
-
-        if (avgTemp < 0) {
-            condition = 'Îngheț';
-            icon = 'Snowflake';
-        } else if (avgTemp < 5 && avgPrecip > 5) {
-            condition = 'Ninsoare';
-            icon = 'CloudSnow';
-        } else if (avgPrecip > 10) {
-            condition = 'Ploaie';
-            icon = 'CloudRain';
-        } else if (avgTemp > 30) {
-            condition = 'Caniculă';
-            icon = 'Sun';
-        } else if (avgPrecip > 2) {
-            condition = 'Nor';
-            icon = 'Cloud';
-        }
-
-        return {
-            temp: `${avgTemp}°C`,
-            condition,
-            icon
-        };
+        return describeWeather(stats.temp, stats.precip);
     } catch (error) {
-        console.error('Error fetching historical weather:', error);
-        return getFallbackWeather(new Date(date).getMonth());
+        console.error('Error reading historical weather:', error);
+        return getFallbackWeather(targetDate.getMonth());
     }
 }
 
+/**
+ * Condiția meteo din temperatura medie (°C) și precipitațiile medii (mm) ale zilei
+ */
+export function describeWeather(temp, precip) {
+    const avgTemp = Math.round(temp);
+    const avgPrecip = precip;
+
+    let condition = 'Senin';
+    let icon = 'Sun';
+
+    if (avgTemp < 0) {
+        condition = 'Îngheț';
+        icon = 'Snowflake';
+    } else if (avgTemp < 5 && avgPrecip > 5) {
+        condition = 'Ninsoare';
+        icon = 'CloudSnow';
+    } else if (avgPrecip > 10) {
+        condition = 'Ploaie';
+        icon = 'CloudRain';
+    } else if (avgTemp > 30) {
+        condition = 'Caniculă';
+        icon = 'Sun';
+    } else if (avgPrecip > 2) {
+        condition = 'Nor';
+        icon = 'Cloud';
+    }
+
+    return {
+        temp: `${avgTemp}°C`,
+        condition,
+        icon
+    };
+}
+
 /**
  * Date meteo bazate pe statistici climatice România (Media multianuală)
  * Folosit pentru 2026 (hardcoded) și ca fallback
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Backend API Load Harness for eCalc RO
+Concurrent asyncio load mode on top of FiscalRulesAPITester.
+
+Requests go through a small pool of keep-alive HTTP/1.1 connections (stdlib
+asyncio streams, no extra dependency), so each worker reuses its TCP/TLS
+connection instead of opening a new one per call. Reports p50/p95/p99 latency
+and requests/sec per endpoint.
+
+With --metrics the server's GET /api/metrics (lib/metrics.js, ECALC_METRICS=1)
+is scraped before, during and after the run; the difference of the snapshots
+goes into the report as server-side latency percentiles, Mongo round trips per
+request and calculator call counts / durations / search iterations.
+
+Usage:
+    python backend_test.py --load --concurrency 50 --duration 30
+    python load_test.py --base-url http://localhost:3000 --concurrency 50 --metrics
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import ssl
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from backend_test import FiscalRulesAPITester
+
+# (name, method, path) - '{year}' is filled from the years list
+DEFAULT_ENDPOINTS = [
+    ('GET /api/fiscal-rules/:year', 'GET', '/fiscal-rules/{year}'),
+    ('GET /api/fiscal-rules/all', 'GET', '/fiscal-rules/all'),
+    ('GET /api/holidays/:year', 'GET', '/holidays/{year}'),
+    ('GET /api/settings', 'GET', '/settings'),
+]
+DEFAULT_YEARS = (2025, 2026)
+
+
+class HTTPError(Exception):
+    """Malformed or interrupted HTTP response"""
+
+
+class PooledHTTPClient:
+    """Minimal asyncio HTTP/1.1 client with a bounded keep-alive connection pool"""
+
+    def __init__(self, base_url: str, size: int, timeout: float = 10.0):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port or (443 if self.https else 80)
+        self.prefix = parts.path.rstrip('/')
+        self.host_header = parts.netloc
+        self.timeout = timeout
+        self.ssl_context = ssl.create_default_context() if self.https else None
+        self._idle: asyncio.LifoQueue = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def _connect(self):
+        self.opened += 1
+        return await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl_context,
+            server_hostname=self.host if self.https else None)
+
+    async def request(self, method: str, path: str, body: Optional[bytes] = None,
+                      headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """Send one request on a pooled connection, return (status, headers, body)"""
+        async with self._slots:
+            conn = self._idle.get_nowait() if not self._idle.empty() else await self._connect()
+            try:
+                status, resp_headers, data, reusable = await asyncio.wait_for(
+                    self._exchange(conn, method, path, body, headers or {}), self.timeout)
+            except BaseException:
+                conn[1].close()
+                raise
+            if reusable:
+                self._idle.put_nowait(conn)
+            else:
+                conn[1].close()
+            return status, resp_headers, data
+
+    async def _exchange(self, conn, method, path, body, headers):
+        reader, writer = conn
+        lines = [f"{method} {self.prefix}{path} HTTP/1.1", f"Host: {self.host_header}",
+                 "Connection: keep-alive", "Accept: application/json", "User-Agent: ecalc-load/1.0"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b''))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise HTTPError("connection closed before response")
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise HTTPError(f"bad status line: {status_line!r}")
+
+        resp_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            resp_headers[key.strip().lower()] = value.strip()
+
+        reusable = resp_headers.get('connection', '').lower() != 'close'
+        if method == 'HEAD' or status in (204, 304):
+            data = b''
+        elif resp_headers.get('transfer-encoding', '').lower() == 'chunked':
+            data = await self._read_chunked(reader)
+        elif 'content-length' in resp_headers:
+            data = await reader.readexactly(int(resp_headers['content-length']))
+        else:
+            data = await reader.read()
+            reusable = False
+        return status, resp_headers, data, reusable
+
+    @staticmethod
+    async def _read_chunked(reader) -> bytes:
+        parts = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(parts)
+            parts.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    async def close(self):
+        while not self._idle.empty():
+            _, writer = self._idle.get_nowait()
+            writer.close()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def histogram_percentile(histogram: Dict[str, Any], pct: float) -> float:
+    """Percentile of a lib/metrics.js histogram, linear inside the bucket (open bucket capped at max)"""
+    bounds, counts = histogram['buckets'], histogram['counts']
+    total = sum(counts)
+    if not total:
+        return 0.0
+    rank = pct / 100.0 * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if count and seen + count >= rank:
+            lower = bounds[i - 1] if i > 0 else 0.0
+            upper = min(bounds[i], histogram['max']) if i < len(bounds) else histogram['max']
+            return lower + (max(upper, lower) - lower) * (rank - seen) / count
+        seen += count
+    return histogram['max']
+
+
+def _histogram_delta(before: Optional[Dict[str, Any]], after: Dict[str, Any]) -> Dict[str, Any]:
+    if not before:
+        return after
+    # max cannot be differenced: the lifetime max is an upper bound for the run
+    return dict(after, sum=after['sum'] - before['sum'],
+                counts=[a - b for a, b in zip(after['counts'], before['counts'])])
+
+
+def metrics_delta(before: Optional[Dict[str, Any]], after: Dict[str, Any]) -> Dict[str, Any]:
+    """What happened between two /api/metrics snapshots (counters reset in between -> `after` as is)"""
+    if not before or before.get('startedAt') != after.get('startedAt'):
+        return after
+    endpoints = {}
+    for route, e in after['endpoints'].items():
+        b = before['endpoints'].get(route)
+        if not b:
+            endpoints[route] = e
+            continue
+        endpoints[route] = {
+            'count': e['count'] - b['count'],
+            'errors': e['errors'] - b['errors'],
+            'status': {k: v - b['status'].get(k, 0) for k, v in e['status'].items()},
+            'latencyMs': _histogram_delta(b['latencyMs'], e['latencyMs']),
+            'dbRoundTrips': {'sum': e['dbRoundTrips']['sum'] - b['dbRoundTrips']['sum'],
+                             'max': e['dbRoundTrips']['max']},
+        }
+    calculators = {}
+    for name, c in after['calculators'].items():
+        b = before['calculators'].get(name)
+        if not b:
+            calculators[name] = c
+            continue
+        calculators[name] = {
+            'calls': c['calls'] - b['calls'],
+            'errors': c['errors'] - b['errors'],
+            'durationMs': _histogram_delta(b['durationMs'], c['durationMs']),
+            'iterations': {'calls': c['iterations']['calls'] - b['iterations']['calls'],
+                           'sum': c['iterations']['sum'] - b['iterations']['sum'],
+                           'max': c['iterations']['max']},
+        }
+    return dict(after, endpoints=endpoints, calculators=calculators)
+
+
+def summarize_metrics(delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Report section from a metrics delta: per endpoint and per calculator"""
+    endpoints = {}
+    for route, e in sorted(delta['endpoints'].items()):
+        if not e['count']:
+            continue
+        latency = e['latencyMs']
+        endpoints[route] = {
+            'requests': e['count'],
+            'errors': e['errors'],
+            'status': {k: v for k, v in e['status'].items() if v},
+            'mean_ms': latency['sum'] / e['count'],
+            'p50_ms': histogram_percentile(latency, 50),
+            'p95_ms': histogram_percentile(latency, 95),
+            'p99_ms': histogram_percentile(latency, 99),
+            'db_round_trips': e['dbRoundTrips']['sum'],
+            'db_round_trips_per_request': e['dbRoundTrips']['sum'] / e['count'],
+            'db_round_trips_max': e['dbRoundTrips']['max'],
+        }
+    calculators = {}
+    for name, c in sorted(delta['calculators'].items()):
+        if not c['calls']:
+            continue
+        iterations = c['iterations']
+        calculators[name] = {
+            'calls': c['calls'],
+            'errors': c['errors'],
+            'mean_us': c['durationMs']['sum'] / c['calls'] * 1000,
+            'p99_us': histogram_percentile(c['durationMs'], 99) * 1000,
+            'iterations_mean': iterations['sum'] / iterations['calls'] if iterations['calls'] else None,
+            'iterations_max': iterations['max'] if iterations['calls'] else None,
+        }
+    return {'endpoints': endpoints, 'calculators': calculators}
+
+
+class MetricsScraper:
+    """Periodic GET /api/metrics on its own connection, so it never waits behind the load workers"""
+
+    def __init__(self, base_url: str, interval: float = 1.0):
+        self.client = PooledHTTPClient(base_url, size=1)
+        self.interval = interval
+        self.snapshots: List[Tuple[float, Dict[str, Any]]] = []
+        self.error: Optional[str] = None
+
+    async def scrape(self, t0: float) -> Optional[Dict[str, Any]]:
+        try:
+            status, _, data = await self.client.request('GET', '/api/metrics')
+        except (OSError, asyncio.TimeoutError, HTTPError, asyncio.IncompleteReadError) as e:
+            self.error = f"scrape failed: {e}"
+            return None
+        if status != 200:
+            self.error = ("metrics disabled on the server (start it with ECALC_METRICS=1)"
+                          if status == 404 else f"scrape failed: HTTP {status}")
+            return None
+        snapshot = json.loads(data)
+        self.snapshots.append((time.perf_counter() - t0, snapshot))
+        return snapshot
+
+    async def run_until(self, t0: float, deadline: float):
+        while time.perf_counter() + self.interval < deadline:
+            await asyncio.sleep(self.interval)
+            if await self.scrape(t0) is None:
+                return
+
+    def report(self) -> Dict[str, Any]:
+        if len(self.snapshots) < 2:
+            return {'error': self.error or 'no metrics scraped'}
+        first = self.snapshots[0][1]
+        timeline = []
+        previous_t, previous = self.snapshots[0]
+        for t, snapshot in self.snapshots[1:]:
+            delta = metrics_delta(previous, snapshot)
+            requests = sum(e['count'] for e in delta['endpoints'].values())
+            timeline.append({
+                't_s': t,
+                'requests': requests,
+                'rps': requests / (t - previous_t) if t > previous_t else 0.0,
+                'db_round_trips': sum(e['dbRoundTrips']['sum'] for e in delta['endpoints'].values()),
+                'calculator_calls': sum(c['calls'] for c in delta['calculators'].values()),
+            })
+            previous_t, previous = t, snapshot
+        summary = summarize_metrics(metrics_delta(first, self.snapshots[-1][1]))
+        summary['timeline'] = timeline
+        if self.error:
+            summary['error'] = self.error
+        return summary
+
+
+class FiscalRulesLoadTester(FiscalRulesAPITester):
+    """Load mode: hammer the read endpoints with N concurrent workers"""
+
+    def __init__(self, base_url: Optional[str] = None, endpoints=None, years=DEFAULT_YEARS):
+        super().__init__(base_url)
+        self.endpoints = endpoints or DEFAULT_ENDPOINTS
+        self.years = list(years)
+
+    def request_plan(self) -> List[Tuple[str, str, str]]:
+        """Expand ':year' endpoints over the configured years"""
+        plan = []
+        for name, method, path in self.endpoints:
+            if '{year}' in path:
+                plan += [(name, method, path.format(year=y)) for y in self.years]
+            else:
+                plan.append((name, method, path))
+        return plan
+
+    async def _worker(self, client: PooledHTTPClient, plan, offset: int, deadline: float,
+                      samples: Dict[str, List[float]], errors: Dict[str, int]):
+        i = offset
+        while time.perf_counter() < deadline:
+            name, method, path = plan[i % len(plan)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                status, _, _ = await client.request(method, f"/api{path}")
+                ok = status < 400
+            except (OSError, asyncio.TimeoutError, HTTPError, asyncio.IncompleteReadError):
+                ok = False
+            if ok:
+                samples[name].append(time.perf_counter() - started)
+            else:
+                errors[name] += 1
+
+    async def _run(self, concurrency: int, duration: float, metrics_interval: Optional[float] = None) -> Dict[str, Any]:
+        plan = self.request_plan()
+        names = [name for name, _, _ in self.endpoints]
+        samples = {name: [] for name in names}
+        errors = {name: 0 for name in names}
+        client = PooledHTTPClient(self.base_url, size=concurrency)
+        scraper = MetricsScraper(self.base_url, metrics_interval) if metrics_interval else None
+        tasks = []
+
+        started = time.perf_counter()
+        if scraper and await scraper.scrape(started) is not None:
+            tasks.append(scraper.run_until(started, started + duration))
+        deadline = started + duration
+        try:
+            await asyncio.gather(*(self._worker(client, plan, n, deadline, samples, errors)
+                                   for n in range(concurrency)), *tasks)
+            if tasks:
+                await scraper.scrape(started)
+        finally:
+            await client.close()
+            if scraper:
+                await scraper.client.close()
+        elapsed = time.perf_counter() - started
+
+        endpoints = {}
+        for name in names:
+            latencies = sorted(samples[name])
+            endpoints[name] = {
+                'requests': len(latencies),
+                'errors': errors[name],
+                'rps': len(latencies) / elapsed if elapsed else 0.0,
+                'p50_ms': percentile(latencies, 50) * 1000,
+                'p95_ms': percentile(latencies, 95) * 1000,
+                'p99_ms': percentile(latencies, 99) * 1000,
+            }
+        total = sum(e['requests'] for e in endpoints.values())
+        return {
+            'base_url': self.base_url,
+            'concurrency': concurrency,
+            'duration_s': elapsed,
+            'connections_opened': client.opened,
+            'requests': total,
+            'errors': sum(errors.values()),
+            'rps': total / elapsed if elapsed else 0.0,
+            'endpoints': endpoints,
+            **({'server': scraper.report()} if scraper else {}),
+        }
+
+    def run_load(self, concurrency: int = 20, duration: float = 10.0,
+                 report_path: Optional[str] = None, metrics_interval: Optional[float] = None) -> Dict[str, Any]:
+        """Run the load test, print a per-endpoint table and return the results"""
+        print(f"🚀 Load test: {concurrency} concurrent worker(s) for {duration:.0f}s")
+        print(f"📍 API URL: {self.api_url}")
+        print("-" * 80)
+
+        results = asyncio.run(self._run(concurrency, duration, metrics_interval))
+
+        print(f"{'Endpoint':<32}{'req':>8}{'err':>6}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for name, e in results['endpoints'].items():
+            print(f"{name:<32}{e['requests']:>8}{e['errors']:>6}{e['rps']:>10.1f}"
+                  f"{e['p50_ms']:>9.1f}{e['p95_ms']:>9.1f}{e['p99_ms']:>9.1f}")
+        print("-" * 80)
+        print(f"📊 {results['requests']} requests, {results['errors']} errors, "
+              f"{results['rps']:.1f} req/s over {results['connections_opened']} connection(s)")
+        if 'server' in results:
+            self.print_server_metrics(results['server'])
+
+        if report_path:
+            folder = os.path.dirname(report_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"📝 Report written to {report_path}")
+        return results
+
+    @staticmethod
+    def print_server_metrics(server: Dict[str, Any]):
+        if 'endpoints' not in server:
+            print(f"⚠️  Server metrics: {server['error']}")
+            return
+        print("-" * 80)
+        print(f"🔬 Server side (/api/metrics, {len(server['timeline'])} scrape interval(s))")
+        print(f"{'Route':<32}{'req':>8}{'err':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'db/req':>9}")
+        for route, e in server['endpoints'].items():
+            print(f"{route:<32}{e['requests']:>8}{e['errors']:>6}{e['p50_ms']:>9.1f}{e['p95_ms']:>9.1f}"
+                  f"{e['p99_ms']:>9.1f}{e['db_round_trips_per_request']:>9.2f}")
+        if server['calculators']:
+            print(f"{'Calculator':<48}{'calls':>8}{'mean µs':>10}{'p99 µs':>10}{'iter':>8}")
+            for name, c in server['calculators'].items():
+                iterations = f"{c['iterations_mean']:.1f}" if c['iterations_mean'] is not None else '-'
+                print(f"{name:<48}{c['calls']:>8}{c['mean_us']:>10.1f}{c['p99_us']:>10.1f}{iterations:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="eCalc RO backend API load harness")
+    parser.add_argument('--base-url', default=None, help="override NEXT_PUBLIC_BASE_URL")
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--years', default=','.join(str(y) for y in DEFAULT_YEARS),
+                        help="comma separated years for the :year endpoints")
+    parser.add_argument('--report', default=None, help="write JSON results to this path")
+    parser.add_argument('--metrics', action='store_true', help="scrape GET /api/metrics during the run")
+    parser.add_argument('--metrics-interval', type=float, default=1.0, help="seconds between metrics scrapes")
+    args = parser.parse_args()
+
+    years = [int(y) for y in args.years.split(',') if y.strip()]
+    tester = FiscalRulesLoadTester(args.base_url, years=years)
+    results = tester.run_load(args.concurrency, args.duration, args.report,
+                              args.metrics_interval if args.metrics else None)
+    return 0 if results['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
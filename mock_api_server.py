@@ -0,0 +1,806 @@
+#!/usr/bin/env python3
+"""
+Local Stand-in for the eCalc RO API
+In-memory replacement for app/api/[[...slug]]/route.js so the backend test
+suite and the load harness run offline, fast and repeatably.
+
+Serves /api/fiscal-rules, /api/holidays, /api/settings and /api/leads with the
+same response shapes as route.js (Mongo `_id` fields included, dates as ISO
+strings). Latency and faults can be injected with a seeded RNG so a run can be
+reproduced exactly. Like route.js, fiscal rules, holidays and settings go
+through a read-through cache with ETag/If-None-Match, invalidated by the PUT
+handlers; --db-latency-ms charges every simulated Mongo round trip so the
+cache effect is measurable. Settings saves and PUT /api/batch are one bulkWrite
+per collection; --legacy-writes brings back the per-key updateOne loop for
+comparison. With --metrics, GET /api/metrics serves the same per-endpoint latency
+histograms and Mongo round-trip counts as lib/metrics.js (ECALC_METRICS=1).
+
+Usage:
+    python mock_api_server.py --port 3001 --latency-ms 20 --fault-rate 0.01 --metrics
+    python backend_test.py --local
+
+    with MockAPIServer(latency_ms=5) as server:
+        FiscalRulesAPITester(server.base_url, allow_writes=True).run_all_tests()
+"""
+
+import argparse
+import base64
+import copy
+import hashlib
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+FISCAL_RULES_FIXTURES = [
+    {
+        'year': 2026,
+        'effectiveDate': '2026-01-01',
+        'salary': {
+            'minimum_salary': 4050,
+            'minimum_gross_construction': 4582,
+            'minimum_gross_agriculture': 3436,
+            'minimum_gross_it': 4050,
+            'average_salary': 7500,
+            'cas_rate': 25,
+            'pilon2_rate': 4.75,
+            'cass_rate': 10,
+            'income_tax_rate': 10,
+            'cam_rate': 2.25,
+            'untaxed_amount_enabled': True,
+            'untaxed_amount': 300,
+            'meal_voucher_max': 40,
+            'tax_exemption_threshold': 10000,
+            'personal_deduction_base': 510,
+            'personal_deduction_range': 2000,
+            'child_deduction': 100,
+            'dependent_deduction': 0,
+            'it_tax_exempt': True,
+            'it_threshold': 10000,
+            'construction_cas_rate': 21.25,
+            'construction_tax_exempt': True,
+            'agriculture_cas_rate': 21.25,
+            'agriculture_tax_exempt': True,
+            'youth_exemption_enabled': True,
+            'youth_exemption_threshold': 6050,
+        },
+        'pfa': {
+            'minimum_salary': 4050,
+            'cas_rate': 25,
+            'cass_rate': 10,
+            'income_tax_rate': 10,
+            'cass_min_threshold': 6,
+            'cass_max_threshold': 60,
+            'cas_min_optional': 12,
+            'cas_obligatory_12': 12,
+            'cas_obligatory_24': 24,
+            'norm_limit_eur': 25000,
+        },
+        'exchange_rate': {'eur': 5.0923, 'auto_update': True},
+    },
+    {
+        'year': 2025,
+        'effectiveDate': '2025-01-01',
+        'salary': {
+            'minimum_salary': 3700,
+            'minimum_gross_construction': 4582,
+            'minimum_gross_agriculture': 3436,
+            'minimum_gross_it': 3700,
+            'average_salary': 7000,
+            'cas_rate': 25,
+            'cass_rate': 10,
+            'income_tax_rate': 10,
+            'cam_rate': 2.25,
+            'untaxed_amount_enabled': True,
+            'untaxed_amount': 200,
+            'tax_exemption_threshold': 10000,
+            'personal_deduction_base': 510,
+            'personal_deduction_range': 2000,
+            'child_deduction': 100,
+            'it_tax_exempt': True,
+            'it_threshold': 10000,
+            'construction_cas_rate': 21.25,
+            'construction_tax_exempt': True,
+            'youth_exemption_enabled': True,
+            'youth_exemption_threshold': 5700,
+        },
+        'exchange_rate': {'eur': 4.9775, 'auto_update': True},
+    },
+]
+
+HOLIDAY_FIXTURES = {
+    2025: ['2025-01-01', '2025-01-02', '2025-01-06', '2025-01-07', '2025-01-24', '2025-04-18',
+           '2025-04-20', '2025-04-21', '2025-05-01', '2025-06-01', '2025-06-08', '2025-06-09',
+           '2025-08-15', '2025-11-30', '2025-12-01', '2025-12-25', '2025-12-26'],
+    2026: ['2026-01-01', '2026-01-02', '2026-01-06', '2026-01-07', '2026-01-24', '2026-04-10',
+           '2026-04-12', '2026-04-13', '2026-05-01', '2026-05-31', '2026-06-01', '2026-08-15',
+           '2026-11-30', '2026-12-01', '2026-12-25', '2026-12-26'],
+}
+
+SETTINGS_FIXTURES = {
+    'initialized': True,
+    'ad_header': '<div><!-- Ad Header --></div>',
+}
+
+LEADS_CSV_HEADER = 'ID,Nume,Email,Telefon,Calculator,Data Creării\n'
+LEADS_PAGE_SIZE = 100
+LEADS_PAGE_MAX = 1000
+EXPORT_BATCH_SIZE = 1000
+SYNTHETIC_CALCULATORS = ('salarii', 'pfa', 'concediu', 'imobiliare', 'masini')
+
+
+def iso_now() -> str:
+    """Same format NextResponse.json produces for a JS Date"""
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+class MockStore:
+    """Thread-safe in-memory collections mirroring the Mongo ones used by route.js"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.reset()
+
+    def _object_id(self) -> str:
+        return f"{next(self._ids):024x}"
+
+    def reset(self):
+        with self.lock:
+            created = iso_now()
+            self.fiscal_rules = [dict(copy.deepcopy(doc), _id=self._object_id(), createdAt=created,
+                                      updatedAt=created) for doc in FISCAL_RULES_FIXTURES]
+            self.holidays = {
+                year: {'_id': self._object_id(), 'year': year,
+                       'holidays': [{'date': d, 'type': 'legal'} for d in dates]}
+                for year, dates in HOLIDAY_FIXTURES.items()
+            }
+            self.settings = dict(SETTINGS_FIXTURES)
+            # Insertion order == (createdAt, _id) ascending, see _lead_key; seeded leads come first, generated on demand
+            self.leads: List[Dict[str, Any]] = []
+            self.synthetic_leads = 0
+            self._synthetic_start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    # -------------------------------------------------------------- fiscal rules
+
+    def fiscal_rules_for_year(self, year: int) -> List[Dict[str, Any]]:
+        with self.lock:
+            rules = [copy.deepcopy(r) for r in self.fiscal_rules if r['year'] == year]
+        return sorted(rules, key=lambda r: r.get('effectiveDate', ''), reverse=True)
+
+    def all_fiscal_rules(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            rules = copy.deepcopy(self.fiscal_rules)
+        return sorted(rules, key=lambda r: r['year'], reverse=True)
+
+    def upsert_fiscal_rules(self, year: int, body: Dict[str, Any]):
+        update = {k: v for k, v in body.items() if k != '_id'}
+        effective = update.get('effectiveDate') or f"{year}-01-01"
+        with self.lock:
+            for doc in self.fiscal_rules:
+                if doc['year'] == year and doc.get('effectiveDate') == effective:
+                    break
+            else:
+                doc = {'_id': self._object_id(), 'year': year, 'effectiveDate': effective}
+                self.fiscal_rules.append(doc)
+            doc.update(copy.deepcopy(update), year=year, updatedAt=iso_now())
+
+    # -------------------------------------------------------------- holidays
+
+    def holidays_for_year(self, year: int) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return copy.deepcopy(self.holidays.get(year))
+
+    def upsert_holidays(self, year: int, body: Dict[str, Any]):
+        with self.lock:
+            doc = self.holidays.setdefault(year, {'_id': self._object_id(), 'year': year})
+            doc.update(copy.deepcopy(body), year=year, lastUpdated=iso_now())
+
+    # -------------------------------------------------------------- settings & leads
+
+    def get_settings(self) -> Dict[str, Any]:
+        with self.lock:
+            return copy.deepcopy(self.settings)
+
+    def update_settings(self, body: Dict[str, Any]):
+        with self.lock:
+            self.settings.update(copy.deepcopy(body))
+
+    def add_lead(self, body: Dict[str, Any]):
+        with self.lock:
+            self.leads.append(dict(body, _id=self._object_id(), id=str(uuid.uuid4()), createdAt=iso_now()))
+
+    def seed_leads(self, count: int):
+        """Add `count` synthetic leads older than every real one (O(1) memory, built when read)"""
+        with self.lock:
+            self.synthetic_leads = count
+
+    def _synthetic_lead(self, i: int) -> Dict[str, Any]:
+        created = self._synthetic_start + timedelta(milliseconds=i)
+        return {
+            '_id': f"f{i:023x}",
+            'name': f"Lead {i}",
+            'email': f"lead{i}@example.com",
+            'phone': f"07{i % 10 ** 8:08d}",
+            'calculatorType': SYNTHETIC_CALCULATORS[i % len(SYNTHETIC_CALCULATORS)],
+            'id': str(uuid.UUID(int=i)),
+            'createdAt': created.isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+        }
+
+    def _lead_at(self, position: int) -> Dict[str, Any]:
+        if position < self.synthetic_leads:
+            return self._synthetic_lead(position)
+        return copy.deepcopy(self.leads[position - self.synthetic_leads])
+
+    def _position_before(self, key) -> int:
+        """Number of leads sorting before (createdAt, _id) = key, by binary search"""
+        lo, hi = 0, self.synthetic_leads + len(self.leads)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _lead_key(self._lead_at(mid)) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def lead_count(self) -> int:
+        with self.lock:
+            return self.synthetic_leads + len(self.leads)
+
+    def leads_page(self, limit: int, before=None):
+        """Newest-first page of leads older than `before` (createdAt, _id); returns (leads, next key)"""
+        with self.lock:
+            end = self.synthetic_leads + len(self.leads) if before is None else self._position_before(before)
+            start = max(0, end - limit)
+            page = [self._lead_at(p) for p in range(end - 1, start - 1, -1)]
+        last = page[-1] if page and start > 0 else None
+        return page, (last.get('createdAt'), last['_id']) if last else None
+
+    def iter_leads(self, batch_size: int = EXPORT_BATCH_SIZE):
+        """Newest-first batches, like a Mongo cursor; leads added meanwhile are newer and not revisited"""
+        with self.lock:
+            end = self.synthetic_leads + len(self.leads)
+        while end > 0:
+            start = max(0, end - batch_size)
+            with self.lock:
+                batch = [self._lead_at(p) for p in range(end - 1, start - 1, -1)]
+            yield batch
+            end = start
+
+    def get_leads(self) -> List[Dict[str, Any]]:
+        return [lead for batch in self.iter_leads() for lead in batch]
+
+
+class FaultInjector:
+    """Seeded latency/fault decisions so a run can be replayed exactly"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, fault_rate: float = 0.0,
+                 fault_status: int = 500, seed: Optional[int] = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fault_rate = fault_rate
+        self.fault_status = fault_status
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.faults = 0
+
+    def next(self):
+        """Return (delay_seconds, fail) for the next request"""
+        with self.lock:
+            delay = self.latency_ms + (self.rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+            fail = self.fault_rate > 0 and self.rng.random() < self.fault_rate
+            if fail:
+                self.faults += 1
+        return delay / 1000.0, fail
+
+
+# Same bucket bounds (ms) as LATENCY_BUCKETS_MS in lib/metrics.js
+LATENCY_BUCKETS_MS = [0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class ServerMetrics:
+    """Mirror of lib/metrics.js for the API side: per-route latency histogram and db round trips"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.endpoints: Dict[str, Dict[str, Any]] = {}
+            self.started = time.time()
+
+    def record(self, route: str, duration_ms: float, status: int, db_round_trips: int):
+        bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if duration_ms <= bound),
+                      len(LATENCY_BUCKETS_MS))
+        with self.lock:
+            e = self.endpoints.get(route)
+            if e is None:
+                e = self.endpoints[route] = {
+                    'count': 0, 'errors': 0, 'status': {},
+                    'latencyMs': {'sum': 0.0, 'max': 0.0, 'buckets': LATENCY_BUCKETS_MS,
+                                  'counts': [0] * (len(LATENCY_BUCKETS_MS) + 1)},
+                    'dbRoundTrips': {'sum': 0, 'max': 0},
+                }
+            e['count'] += 1
+            e['errors'] += status >= 500
+            e['status'][str(status)] = e['status'].get(str(status), 0) + 1
+            latency = e['latencyMs']
+            latency['counts'][bucket] += 1
+            latency['sum'] += duration_ms
+            latency['max'] = max(latency['max'], duration_ms)
+            e['dbRoundTrips']['sum'] += db_round_trips
+            e['dbRoundTrips']['max'] = max(e['dbRoundTrips']['max'], db_round_trips)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'enabled': True,
+                'startedAt': datetime.fromtimestamp(self.started, timezone.utc).isoformat(timespec='milliseconds')
+                .replace('+00:00', 'Z'),
+                'uptimeMs': (time.time() - self.started) * 1000.0,
+                'endpoints': copy.deepcopy(self.endpoints),
+                'calculators': {},  # the mock runs no calculators
+            }
+
+
+def metrics_route(method: str, slug: str) -> str:
+    """metricsRoute() of route.js: the year segment is collapsed to ':year'"""
+    parts = [':year' if part.isdigit() else part for part in slug.split('/') if part][:2]
+    return f"{method} /api/{'/'.join(parts)}"
+
+
+class ResponseCache:
+    """Mirror of the read-through cache in route.js (ETag, TTL, generation-based invalidation)"""
+
+    def __init__(self, ttl_ms: float = 60000.0):
+        self.ttl = ttl_ms / 1000.0
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key: str, loader):
+        """Return (entry, hit); entry = {'body', 'etag', 'expires'}"""
+        with self.lock:
+            entry = self.entries.get(key)
+            generation = self.generation
+        if entry and entry['expires'] > time.monotonic():
+            with self.lock:
+                self.hits += 1
+            return entry, True
+
+        body = json.dumps(loader(), ensure_ascii=False).encode('utf-8')
+        digest = base64.urlsafe_b64encode(hashlib.sha1(body).digest()).rstrip(b'=').decode('ascii')
+        entry = {'body': body, 'etag': f'W/"{digest}"', 'expires': time.monotonic() + self.ttl}
+        with self.lock:
+            self.misses += 1
+            # A PUT that landed while loading makes this body stale: serve it, don't keep it
+            if generation == self.generation and self.ttl > 0:
+                self.entries[key] = entry
+        return entry, False
+
+    def invalidate(self, prefix: str):
+        with self.lock:
+            self.generation += 1
+            for key in [k for k in self.entries if k.startswith(prefix)]:
+                del self.entries[key]
+
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'eCalcMock/1.0'
+    # Send header + body in one segment; unbuffered writes hit Nagle/delayed-ACK stalls
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    # -------------------------------------------------------------- plumbing
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_response(self, code, message=None):
+        self.status_sent = code
+        super().send_response(code, message)
+
+    def _send(self, status: int, body: bytes, content_type: str, extra_headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _json(self, data: Any, status: int = 200):
+        self._send(status, json.dumps(data, ensure_ascii=False).encode('utf-8'), 'application/json')
+
+    def _cached_json(self, key: str, loader):
+        """cachedJson() of route.js: read-through cache + conditional GET"""
+        entry, hit = self.server.cache.get_or_load(key, loader)
+        headers = {'ETag': entry['etag'], 'Cache-Control': 'no-cache', 'X-Cache': 'HIT' if hit else 'MISS'}
+        if_none_match = self.headers.get('If-None-Match') or ''
+        if entry['etag'] in (tag.strip() for tag in if_none_match.split(',')):
+            self.send_response(304)
+            for key_, value in headers.items():
+                self.send_header(key_, value)
+            self.end_headers()
+            return
+        self._send(200, entry['body'], 'application/json', headers)
+
+    def _read_json(self) -> Any:
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            return json.loads(raw or b'{}')
+        except ValueError:
+            return {}
+
+    def _dispatch(self, method: str):
+        parts = urlsplit(self.path)
+        self.query = parse_qs(parts.query)
+        slug = parts.path.strip('/')
+        if slug != 'api' and not slug.startswith('api/'):
+            return self._json({'error': 'Not Found'}, 404)
+        slug = slug[4:]
+        if method == 'GET' and slug == 'metrics':
+            return self._metrics_get()
+
+        metrics = self.server.metrics
+        if metrics is None:
+            return self._route(method, slug)
+        probe = self.server.start_probe()
+        started = time.perf_counter()
+        self.status_sent = 500
+        try:
+            return self._route(method, slug)
+        finally:
+            self.server.end_probe()
+            metrics.record(metrics_route(method, slug), (time.perf_counter() - started) * 1000.0,
+                           self.status_sent, probe['db_round_trips'])
+
+    def _route(self, method: str, slug: str):
+        body = self._read_json() if method in ('POST', 'PUT') else None
+        self.server.requests_served += 1
+
+        delay, fail = self.server.faults.next()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            return self._json({'error': 'Internal Server Error'}, self.server.faults.fault_status)
+
+        if method == 'GET':
+            self.server.ensure_initialized()
+        handler = getattr(self, f"_{method.lower()}", None)
+        return handler(slug, body)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    # -------------------------------------------------------------- routes (see route.js)
+
+    def _get(self, slug: str, body):
+        store = self.server.store
+        db = self.server.db_round_trip
+        if slug.startswith('fiscal-rules/'):
+            year = slug.split('/')[1]
+            if year == 'all' or not year:
+                return self._cached_json('fiscal-rules/all', lambda: db(store.all_fiscal_rules()))
+            return self._fiscal_rules_get(year)
+        if slug == 'fiscal-rules':
+            return self._cached_json('fiscal-rules/all', lambda: db(store.all_fiscal_rules()))
+        if slug.startswith('holidays/'):
+            return self._holidays_get(slug.split('/')[1])
+        if slug == 'settings':
+            return self._cached_json('settings', lambda: db(store.get_settings()))
+        if slug == 'leads':
+            return self._leads_get()
+        if slug == 'leads/export':
+            return self._leads_export()
+        return self._json({
+            'message': 'eCalc RO API - Professional Edition',
+            'version': '2.0',
+            'endpoints': ['/api/fiscal-rules/:year', '/api/holidays/:year', '/api/leads', '/api/settings', '/api/batch',
+                          '/api/auth/login', '/api/metrics'],
+        })
+
+    def _post(self, slug: str, body):
+        if slug == 'leads':
+            self.server.store.add_lead(body if isinstance(body, dict) else {})
+            return self._json({'success': True, 'message': 'Lead salvat cu succes'})
+        return self._json({'error': 'Not Found'}, 404)
+
+    def _put(self, slug: str, body):
+        store = self.server.store
+        if not isinstance(body, dict):
+            return self._json({'error': 'Invalid JSON body'}, 500)
+        cache = self.server.cache
+        if slug.startswith('fiscal-rules/'):
+            self.server.db_round_trip(store.upsert_fiscal_rules(_parse_year(slug.split('/')[1]), body))
+            cache.invalidate('fiscal-rules/')
+            return self._json({'success': True, 'message': 'Reguli fiscale actualizate'})
+        if slug.startswith('holidays/'):
+            self.server.db_round_trip(store.upsert_holidays(_parse_year(slug.split('/')[1]), body))
+            cache.invalidate('holidays/')
+            return self._json({'success': True, 'message': 'Holidays updated'})
+        if slug == 'settings':
+            self._bulk_settings(body)
+            cache.invalidate('settings')
+            return self._json({'success': True, 'message': 'Settings updated'})
+        if slug == 'batch':
+            return self._batch_put(body)
+        return self._json({'error': 'Not Found'}, 404)
+
+    def _bulk_settings(self, settings) -> int:
+        """One bulkWrite for every key (or one updateOne per key in legacy mode)"""
+        store = self.server.store
+        settings = settings if isinstance(settings, dict) else {}
+        if not self.server.bulk_writes:
+            for key, value in settings.items():
+                self.server.db_round_trip(store.update_settings({key: value}))
+        elif settings:
+            self.server.db_round_trip(store.update_settings(settings))
+        return len(settings)
+
+    def _batch_put(self, body: Dict[str, Any]):
+        """PUT /api/batch: several years of fiscal_rules/holidays (+ settings), one bulkWrite per collection"""
+        store = self.server.store
+        fiscal_rules = body.get('fiscal_rules') if isinstance(body.get('fiscal_rules'), list) else []
+        holidays = body.get('holidays') if isinstance(body.get('holidays'), list) else []
+        docs = fiscal_rules + holidays
+        years = [_parse_year(str(doc.get('year', ''))) if isinstance(doc, dict) else None for doc in docs]
+        if any(year is None for year in years):
+            return self._json({'error': 'Fiecare document trebuie să aibă un an valid'}, 400)
+
+        # route.js awaits the bulkWrites together (Promise.allSettled): one latency, one round trip each
+        for doc, year in zip(fiscal_rules, years):
+            store.upsert_fiscal_rules(year, doc)
+        for doc, year in zip(holidays, years[len(fiscal_rules):]):
+            store.upsert_holidays(year, {k: v for k, v in doc.items() if k != '_id'})
+        parallel = bool(fiscal_rules) + bool(holidays)
+        if parallel:
+            self.server.db_round_trip(count=parallel)
+        settings = self._bulk_settings(body.get('settings'))
+
+        cache = self.server.cache
+        if fiscal_rules:
+            cache.invalidate('fiscal-rules/')
+        if holidays:
+            cache.invalidate('holidays/')
+        if settings:
+            cache.invalidate('settings')
+        return self._json({'success': True, 'message': 'Actualizare în lot salvată',
+                           'counts': {'fiscal_rules': len(fiscal_rules), 'holidays': len(holidays),
+                                      'settings': settings}})
+
+    def _metrics_get(self):
+        metrics = self.server.metrics
+        if metrics is None:
+            return self._json({'error': 'Metrics disabled (ECALC_METRICS=1)'}, 404)
+        snapshot = metrics.snapshot()
+        if self.query.get('reset', [''])[0] == '1':
+            metrics.reset()
+        self._send(200, json.dumps(snapshot).encode('utf-8'), 'application/json', {'Cache-Control': 'no-store'})
+
+    def _fiscal_rules_get(self, year: str):
+        requested = _parse_year(year)
+        show_history = self.query.get('history', [''])[0] == '1'
+
+        def load():
+            rules = self.server.db_round_trip(self.server.store.fiscal_rules_for_year(requested))
+            if rules:
+                return rules if show_history else rules[0]
+            return {
+                'year': requested,
+                'effectiveDate': f"{requested}-01-01",
+                'salary': {'minimum_salary': 0, 'cas_rate': 0, 'cass_rate': 0, 'income_tax_rate': 0},
+            }
+        return self._cached_json(f"fiscal-rules/{_js_year(requested)}{'?history=1' if show_history else ''}", load)
+
+    def _holidays_get(self, year: str):
+        requested = _parse_year(year)
+
+        def load():
+            data = self.server.db_round_trip(self.server.store.holidays_for_year(requested))
+            if data:
+                return data
+            return {'year': requested, 'holidays': [], 'weather': {},
+                    'message': 'No holidays found in database'}
+        return self._cached_json(f"holidays/{_js_year(requested)}", load)
+
+    def _leads_get(self):
+        limit = _parse_year(self.query.get('limit', [''])[0]) or LEADS_PAGE_SIZE
+        limit = min(max(limit, 1), LEADS_PAGE_MAX)
+        before = None
+        token = self.query.get('cursor', [''])[0]
+        if token:
+            try:
+                created, id_ = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+                before = ('' if created is None else str(created), str(id_))
+            except (ValueError, TypeError):
+                return self._json({'error': 'Cursor invalid'}, 400)
+
+        page, next_key = self.server.db_round_trip(self.server.store.leads_page(limit, before))
+        headers = {}
+        if next_key:
+            raw = json.dumps(list(next_key), separators=(',', ':')).encode('utf-8')
+            headers['X-Next-Cursor'] = base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+        self._send(200, json.dumps(page, ensure_ascii=False).encode('utf-8'), 'application/json', headers)
+
+    def _leads_export(self):
+        """Chunked CSV straight from the store cursor, one batch of rows per chunk"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv')
+        self.send_header('Content-Disposition', 'attachment; filename=leads.csv')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self._write_chunk(LEADS_CSV_HEADER.encode('utf-8'))
+        for batch in self.server.store.iter_leads(EXPORT_BATCH_SIZE):
+            self.server.db_round_trip()  # one getMore per batch
+            self._write_chunk(''.join(_lead_csv_row(lead) for lead in batch).encode('utf-8'))
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _write_chunk(self, data: bytes):
+        if data:
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b'\r\n')
+
+
+def _lead_key(lead: Dict[str, Any]):
+    """(createdAt, _id) sort key; like Mongo, leads without createdAt sort before every dated one"""
+    return lead.get('createdAt') or '', lead['_id']
+
+
+def _lead_csv_row(lead: Dict[str, Any]) -> str:
+    id_, name, email, phone, calc, created = (
+        _js_text(lead, k) for k in ('id', 'name', 'email', 'phone', 'calculatorType', 'createdAt'))
+    return f'{id_},"{name}","{email}","{phone}","{calc}","{created}"\n'
+
+
+def _js_text(doc: Dict[str, Any], key: str) -> str:
+    """String interpolation of a field the way a JS template literal renders it"""
+    if key not in doc:
+        return 'undefined'
+    value = doc[key]
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _js_year(year: Optional[int]) -> str:
+    """Template-literal rendering of a parseInt() result (NaN when it failed)"""
+    return 'NaN' if year is None else str(year)
+
+
+def _parse_year(value: str) -> Optional[int]:
+    """parseInt() semantics: leading digits, otherwise null"""
+    digits = ''
+    for char in (value or '').strip():
+        if not char.isdigit():
+            break
+        digits += char
+    return int(digits) if digits else None
+
+
+class MockAPIServer(ThreadingHTTPServer):
+    """Threaded local server; usable as a context manager in tests and load runs"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, fault_rate: float = 0.0, fault_status: int = 500,
+                 seed: Optional[int] = 0, verbose: bool = False, db_latency_ms: float = 0.0,
+                 cache_ttl_ms: float = 60000.0, bulk_writes: bool = True, metrics: bool = False):
+        super().__init__((host, port), MockAPIHandler)
+        self.store = MockStore()
+        self.faults = FaultInjector(latency_ms, jitter_ms, fault_rate, fault_status, seed)
+        self.cache = ResponseCache(cache_ttl_ms)
+        self.db_latency = db_latency_ms / 1000.0
+        self.db_round_trips = 0
+        self.bulk_writes = bulk_writes
+        self.verbose = verbose
+        self.requests_served = 0
+        self.metrics = ServerMetrics() if metrics else None
+        self._probe = threading.local()  # round trips of the request this handler thread is serving
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def db_round_trip(self, result=None, count: int = 1):
+        """Charge simulated Mongo round trips (`count` issued concurrently) and pass the result through"""
+        with self._db_lock:
+            self.db_round_trips += count
+        probe = getattr(self._probe, 'current', None)
+        if probe is not None:
+            probe['db_round_trips'] += count
+        if self.db_latency:
+            time.sleep(self.db_latency)
+        return result
+
+    def start_probe(self) -> Dict[str, int]:
+        probe = self._probe.current = {'db_round_trips': 0}
+        return probe
+
+    def end_probe(self):
+        self._probe.current = None
+
+    def ensure_initialized(self):
+        """ensureInitialized() of route.js: the two seeding findOne calls, once per process"""
+        with self._init_lock:  # concurrent first requests wait for the same seeding, like the shared promise
+            if not self._initialized:
+                self.db_round_trip()
+                self.db_round_trip()
+                self._initialized = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockAPIServer':
+        self._thread = threading.Thread(target=self.serve_forever, name='mock-api', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'MockAPIServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the eCalc RO API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3001)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="fixed delay added to every request")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="extra uniform random delay")
+    parser.add_argument('--fault-rate', type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument('--fault-status', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0, help="RNG seed for jitter and faults")
+    parser.add_argument('--db-latency-ms', type=float, default=0.0, help="delay per simulated Mongo round trip")
+    parser.add_argument('--cache-ttl-ms', type=float, default=60000.0, help="response cache TTL (0 disables it)")
+    parser.add_argument('--legacy-writes', action='store_true', help="settings PUT as one updateOne per key")
+    parser.add_argument('--metrics', action='store_true', help="serve GET /api/metrics (like ECALC_METRICS=1)")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server = MockAPIServer(args.host, args.port, args.latency_ms, args.jitter_ms,
+                           args.fault_rate, args.fault_status, args.seed, args.verbose,
+                           args.db_latency_ms, args.cache_ttl_ms, not args.legacy_writes, args.metrics)
+    print(f"🧪 Mock eCalc API listening on {server.base_url}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
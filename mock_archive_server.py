@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Local Stand-in for the Open-Meteo Archive and Geocoding APIs
+Lets climatology_store.py ingest offline, fast and repeatably.
+
+Serves /v1/archive (daily temperature_2m_mean / precipitation_sum, several
+comma-separated coordinates per request like the real API, which then answers
+with a JSON list) and /v1/search (geocoding). Values are synthetic but
+deterministic: a seasonal curve that cools with latitude plus noise hashed
+from (coordinates, date), with the odd missing day. Latency and faults reuse
+the seeded FaultInjector of mock_api_server.py.
+
+Usage:
+    python mock_archive_server.py --port 3002 --fault-rate 0.05
+    python climatology_store.py --archive-url http://127.0.0.1:3002 --geocoding-url http://127.0.0.1:3002
+
+    with MockArchiveServer() as server:
+        build_store(out, locations, (2020, 2024), server.base_url, server.base_url)
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import sys
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from mock_api_server import FaultInjector
+
+# Romania's bounding box, for the synthetic geocoder
+LAT_RANGE = (43.7, 48.2)
+LON_RANGE = (20.3, 29.6)
+DAILY_FIELDS = ('temperature_2m_mean', 'precipitation_sum')
+
+
+def synthetic_day(lat: float, lon: float, day: date) -> Tuple[Optional[float], Optional[float]]:
+    """(mean temperature °C, precipitation mm) the stand-in reports for one location and day"""
+    h = zlib.crc32(f"{lat:.4f},{lon:.4f},{day.isoformat()}".encode('ascii'))
+    if h % 211 == 0:
+        return None, None  # the archive has gaps too
+    doy = day.timetuple().tm_yday
+    seasonal = 10.5 - 0.9 * (lat - 45.0) + 12.5 * math.sin(2 * math.pi * (doy - 105) / 365.25)
+    temp = round(seasonal + ((h & 0xffff) / 0xffff - 0.5) * 6.0, 1)
+    rain = (h >> 16) & 0xffff
+    precip = round((rain % 97) / 97 * 12.0, 1) if rain % 3 == 0 else 0.0
+    return temp, precip
+
+
+def synthetic_place(name: str) -> Tuple[float, float]:
+    digest = hashlib.sha1(name.lower().encode('utf-8')).digest()
+    lat = LAT_RANGE[0] + int.from_bytes(digest[:4], 'big') / 2 ** 32 * (LAT_RANGE[1] - LAT_RANGE[0])
+    lon = LON_RANGE[0] + int.from_bytes(digest[4:8], 'big') / 2 ** 32 * (LON_RANGE[1] - LON_RANGE[0])
+    return round(lat, 4), round(lon, 4)
+
+
+def _days(start: date, end: date) -> Iterable[date]:
+    for n in range((end - start).days + 1):
+        yield start + timedelta(days=n)
+
+
+class MockArchiveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'eCalcArchiveMock/1.0'
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _json(self, data: Any, status: int = 200):
+        body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        delay, fail = self.server.faults.next()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            return self._json({'error': True, 'reason': 'Too many requests'}, self.server.faults.fault_status)
+        if parts.path == '/v1/archive':
+            return self._archive(query)
+        if parts.path == '/v1/search':
+            return self._search(query)
+        return self._json({'error': True, 'reason': 'Not Found'}, 404)
+
+    def _archive(self, query: Dict[str, str]):
+        try:
+            lats = [float(v) for v in query['latitude'].split(',')]
+            lons = [float(v) for v in query['longitude'].split(',')]
+            start, end = date.fromisoformat(query['start_date']), date.fromisoformat(query['end_date'])
+        except (KeyError, ValueError) as e:
+            return self._json({'error': True, 'reason': f"Invalid parameters: {e}"}, 400)
+        if len(lats) != len(lons) or end < start:
+            return self._json({'error': True, 'reason': 'Invalid parameters'}, 400)
+        fields = [f for f in query.get('daily', '').split(',') if f in DAILY_FIELDS]
+
+        days = list(_days(start, end))
+        results = []
+        for lat, lon in zip(lats, lons):
+            values = [synthetic_day(lat, lon, day) for day in days]
+            daily: Dict[str, List[Any]] = {'time': [day.isoformat() for day in days]}
+            for i, field in enumerate(DAILY_FIELDS):
+                if field in fields:
+                    daily[field] = [v[i] for v in values]
+            results.append({'latitude': lat, 'longitude': lon, 'timezone': query.get('timezone', 'GMT'),
+                            'daily_units': {'time': 'iso8601', 'temperature_2m_mean': '°C', 'precipitation_sum': 'mm'},
+                            'daily': daily})
+        with self.server.lock:
+            self.server.archive_requests += 1
+            self.server.locations_fetched += len(results)
+        self._json(results[0] if len(results) == 1 else results)
+
+    def _search(self, query: Dict[str, str]):
+        name = query.get('name', '').strip()
+        with self.server.lock:
+            self.server.geocoding_requests += 1
+        if not name or name.lower() in self.server.unknown_names:
+            return self._json({'generationtime_ms': 0.1})  # no 'results' key, like the real API
+        lat, lon = synthetic_place(name)
+        self._json({'results': [{'name': name, 'latitude': lat, 'longitude': lon, 'country_code': 'RO',
+                                 'admin1': self.server.admin1.get(name.lower())}]})
+
+
+class MockArchiveServer(ThreadingHTTPServer):
+    """Threaded stand-in; usable as a context manager in tests and local builds"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 0.0,
+                 fault_rate: float = 0.0, fault_status: int = 429, seed: Optional[int] = 0,
+                 unknown_names: Iterable[str] = (), admin1: Optional[Dict[str, str]] = None,
+                 verbose: bool = False):
+        super().__init__((host, port), MockArchiveHandler)
+        self.faults = FaultInjector(latency_ms, 0.0, fault_rate, fault_status, seed)
+        self.unknown_names = {name.lower() for name in unknown_names}
+        self.admin1 = {k.lower(): v for k, v in (admin1 or {}).items()}
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.archive_requests = 0
+        self.geocoding_requests = 0
+        self.locations_fetched = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockArchiveServer':
+        self._thread = threading.Thread(target=self.serve_forever, name='mock-archive', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'MockArchiveServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Open-Meteo archive and geocoding APIs")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3002)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="fixed delay added to every request")
+    parser.add_argument('--fault-rate', type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument('--fault-status', type=int, default=429)
+    parser.add_argument('--seed', type=int, default=0, help="RNG seed for faults")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server = MockArchiveServer(args.host, args.port, args.latency_ms, args.fault_rate, args.fault_status,
+                               args.seed, verbose=args.verbose)
+    print(f"🧪 Mock archive API listening on {server.base_url}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
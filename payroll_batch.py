@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+Payroll Batch - a company's payroll file through the vectorized salary engine
+Companion of salary_engine.py / salary_tables.py.
+
+Reads a CSV (with header) or JSONL payroll file, one row per employee and month,
+and streams it through the engine in fixed-size chunks spread over worker
+processes. Memory stays bounded by chunk size x in-flight chunks, whatever the
+size of the file. Each chunk is grouped by (rules version, sector) and evaluated
+in one vectorized pass; net rows are first turned into gross with the same
+inverse lookup as the salary tables (integer gross, never further from the net
+than calculateNetToGross).
+
+The fiscal_rules version of each month is the one in force on the 1st of the
+month, picked from the effectiveDate history (GET /api/fiscal-rules/:year?history=1).
+
+Columns (CSV header or JSON keys):
+    employee_id, month (YYYY-MM), gross | net, sector, children, dependents,
+    mealVouchers, voucherDays, vacationVouchers, isBasicFunction,
+    isTaxExempt, isYouthExempt
+
+children and dependents are copied to the results; like calculateSalaryResults,
+the engine does not use them in the tax computation. The rates applied to each
+row (breakdown of calculateSalaryResults) follow the amounts as casPercent,
+cassPercent, taxPercent and camPercent.
+
+Usage:
+    python payroll_batch.py payroll_2026.csv --rules-history history_2026.json --out results.csv
+    python payroll_batch.py payroll_2026.jsonl --base-url http://localhost:3000 --workers 8 --report totals.json
+    python payroll_batch.py payroll_100k.csv --generate 100000 --rules rules_2026.json --out results.csv
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import re
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import zip_longest
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from salary_engine import BREAKDOWN_FIELDS, RESULT_FIELDS, SECTORS, calculate_salary_results, sector_minimum
+from salary_tables import inverse_lookup
+
+CHUNK_ROWS = 10000
+GROSS_LIMIT = 5_000_000
+# Net curves kept per worker (LRU); one is two float64 arrays, ~1 MB at the initial 65,536 gross values
+CURVE_CACHE_SIZE = 32
+TOTAL_FIELDS = ('gross', 'net', 'cas', 'cass', 'incomeTax', 'cam', 'totalCost')
+OUTPUT_FIELDS = (('employee_id', 'month', 'sector', 'type', 'amount', 'effectiveDate', 'children', 'dependents')
+                 + RESULT_FIELDS + BREAKDOWN_FIELDS + ('error',))
+OPTION_FIELDS = ('mealVouchers', 'voucherDays', 'vacationVouchers')
+FLAG_FIELDS = ('isBasicFunction', 'isTaxExempt', 'isYouthExempt')
+INPUT_FIELDS = ('employee_id', 'month', 'gross', 'net', 'sector', 'children', 'dependents') + OPTION_FIELDS + FLAG_FIELDS
+MONTH_RE = re.compile(r'^(\d{4})-(0[1-9]|1[0-2])$')
+TRUE_VALUES = ('1', 'true', 'yes', 'da', 'y')
+FALSE_VALUES = ('', '0', 'false', 'no', 'nu', 'n')
+
+
+def _is_jsonl(path: str) -> bool:
+    return path.lower().endswith(('.jsonl', '.ndjson'))
+
+
+def _effective_date(doc: Dict[str, Any]) -> str:
+    return str(doc.get('effectiveDate') or '')[:10]
+
+
+def _error(errors: List[str], i: int, message: str):
+    """Keep the first error of a row"""
+    if not errors[i]:
+        errors[i] = message
+
+
+def _flag(value, default: bool) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, (bool, int, float)):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return default if text == '' else False
+    raise ValueError
+
+
+def _flag_column(values: list, default: bool, field: str, errors: List[str]) -> np.ndarray:
+    lookup = {None: default, '': default, True: True, False: False, 'true': True, 'false': False,
+              'True': True, 'False': False, '1': True, '0': False}
+    flags = [lookup.get(v) if isinstance(v, (str, bool)) or v is None else None for v in values]
+    for i, flag in enumerate(flags):
+        if flag is None:
+            try:
+                flags[i] = _flag(values[i], default)
+            except ValueError:
+                flags[i] = default
+                _error(errors, i, f"invalid {field} {values[i]!r}")
+    return np.array(flags, dtype=bool)
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _number_column(values: list, field: str, errors: List[str]) -> np.ndarray:
+    """Non-negative numbers, '' / missing = 0"""
+    cells = [0.0 if v is None or v == '' else v for v in values]
+    try:
+        numbers = np.array(cells, dtype=np.float64)
+    except (TypeError, ValueError):
+        numbers = np.array([_to_float(v) for v in cells], dtype=np.float64)
+    bad = ~np.isfinite(numbers) | (numbers < 0)
+    for i in np.flatnonzero(bad):
+        _error(errors, i, f"invalid {field} {values[i]!r}")
+    return np.where(bad, 0.0, numbers)
+
+
+def _text_column(values: list) -> List[str]:
+    return ['' if v is None else str(v) for v in values]
+
+
+def _format_column(values: np.ndarray, ok: np.ndarray) -> List[str]:
+    """Numbers as text (integers without a decimal point), '' for rows with errors"""
+    if np.all(values == np.floor(values)) and np.abs(values).max(initial=0) < 2 ** 53:
+        text = values.astype(np.int64).astype(str).tolist()
+    else:
+        text = [f"{v:.15g}" for v in values.tolist()]
+    return [t if k else '' for t, k in zip(text, ok.tolist())]
+
+
+# ---------------------------------------------------------------------- rules
+
+
+def load_rules_history(path: Optional[str], base_url: Optional[str], years: List[int]) -> List[Dict[str, Any]]:
+    """Every fiscal_rules version: a JSON document or list of documents, or ?history=1 for each year"""
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else [data]
+    import requests
+    history = []
+    for year in years:
+        response = requests.get(f"{base_url.rstrip('/')}/api/fiscal-rules/{year}",
+                                params={'history': '1'}, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        history.extend(data if isinstance(data, list) else [data])
+    return history
+
+
+class RulesResolver:
+    """fiscal_rules version in force on the first day of a payroll month"""
+
+    def __init__(self, history: List[Dict[str, Any]]):
+        self.versions = sorted(history, key=lambda d: (int(d.get('year') or 0), _effective_date(d)))
+        self._months: Dict[str, int] = {}
+
+    def index_for(self, month: str) -> int:
+        """Index into self.versions, -1 when no version covers the year"""
+        if month not in self._months:
+            year = int(month[:4])
+            first_day = f"{month}-01"
+            # A document without a year applies to every year
+            candidates = [i for i, doc in enumerate(self.versions) if int(doc.get('year') or year) == year]
+            in_force = [i for i in candidates if _effective_date(self.versions[i]) <= first_day]
+            # Months before the first effectiveDate of the year use the earliest version
+            self._months[month] = in_force[-1] if in_force else (candidates[0] if candidates else -1)
+        return self._months[month]
+
+    def label(self, index: int) -> str:
+        doc = self.versions[index]
+        return _effective_date(doc) or str(doc.get('year') or '')
+
+
+# ---------------------------------------------------------------------- input
+
+
+def read_chunks(path: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[Tuple[Optional[List[str]], list]]:
+    """(header, rows) chunks: CSV rows as lists under the file header, JSONL rows as raw lines"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if _is_jsonl(path):
+            header, rows = None, (line for line in f if line.strip())
+        else:
+            reader = csv.reader(f)
+            header = [name.strip() for name in next(reader, [])]
+            rows = (row for row in reader if any(cell.strip() for cell in row))
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                yield header, chunk
+                chunk = []
+        if chunk:
+            yield header, chunk
+
+
+def scan_years(path: str) -> List[int]:
+    """Years present in the month column (used to fetch the rules history)"""
+    years = set()
+    for header, rows in read_chunks(path):
+        for row in rows:
+            record = json.loads(row) if header is None else dict(zip(header, row))
+            match = MONTH_RE.match(str(record.get('month') or '').strip())
+            if match:
+                years.add(int(match.group(1)))
+    return sorted(years)
+
+
+# ---------------------------------------------------------------------- engine
+
+
+class PayrollBatch:
+    """Evaluates payroll chunks against a fixed rules history"""
+
+    def __init__(self, history: List[Dict[str, Any]], default_month: Optional[str] = None):
+        self.resolver = RulesResolver(history)
+        self.default_month = default_month
+        self._curves: 'OrderedDict[tuple, Tuple[np.ndarray, np.ndarray, int]]' = OrderedDict()
+
+    def _net_curve(self, key: tuple, target: float) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Net for every integer gross 0..N (N grows until it reaches the target), per rules/sector/vouchers"""
+        version, sector, vouchers, basic = key
+        curve = self._curves.get(key)
+        if curve is not None:
+            self._curves.move_to_end(key)
+            if curve[1][-1] >= target or len(curve[0]) > GROSS_LIMIT:
+                return curve
+        rules = self.resolver.versions[version]
+        size = len(curve[0]) * 2 if curve is not None else 1 << 16
+        while True:
+            gross = np.arange(size, dtype=np.float64)
+            net = calculate_salary_results(gross, SECTORS[sector], rules, vacationVouchers=vouchers,
+                                           isBasicFunction=bool(basic))['net']
+            if net.max() >= target or size > GROSS_LIMIT:
+                break
+            size *= 2
+        curve = (net, np.maximum.accumulate(net), int(sector_minimum(rules, SECTORS[sector])))
+        self._curves[key] = curve
+        if len(self._curves) > CURVE_CACHE_SIZE:
+            self._curves.popitem(last=False)
+        return curve
+
+    def _columns(self, header: Optional[List[str]], raw_rows: list, errors: List[str]) -> Dict[str, list]:
+        """Raw values per input field; a missing column is all None"""
+        n = len(raw_rows)
+        if header is None:
+            records = []
+            for i, line in enumerate(raw_rows):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if not isinstance(record, dict):
+                    _error(errors, i, "invalid JSON row")
+                    record = {}
+                records.append(record)
+            return {field: [r.get(field) for r in records] for field in INPUT_FIELDS}
+        columns = dict(zip(header, zip_longest(*raw_rows, fillvalue='')))
+        return {field: list(columns[field]) if field in columns else [None] * n for field in INPUT_FIELDS}
+
+    def process(self, header: Optional[List[str]], raw_rows: list, as_json: bool = False) -> Tuple[str, Dict[str, Dict[str, float]]]:
+        """One chunk -> (serialized result rows, totals per month)"""
+        n = len(raw_rows)
+        errors = [''] * n
+        raw = self._columns(header, raw_rows, errors)
+
+        # Month -> rules version, resolved once per distinct month
+        months = [str(v).strip() if v not in (None, '') else (self.default_month or '') for v in raw['month']]
+        month_version = {}
+        for month in set(months):
+            if not MONTH_RE.match(month):
+                month_version[month] = (-1, f"invalid month {month!r}")
+            else:
+                index = self.resolver.index_for(month)
+                month_version[month] = (index, '' if index >= 0 else f"no fiscal rules for {month[:4]}")
+        version = np.empty(n, dtype=np.int64)
+        for i, month in enumerate(months):
+            version[i], message = month_version[month]
+            if message:
+                _error(errors, i, message)
+
+        sector_codes = {name: code for code, name in enumerate(SECTORS)}
+        sector = np.array([sector_codes.get(v or 'standard', -1) for v in raw['sector']], dtype=np.int64)
+        for i in np.flatnonzero(sector < 0):
+            _error(errors, i, f"unknown sector {raw['sector'][i]!r}")
+
+        has_gross = np.array([v not in (None, '') for v in raw['gross']], dtype=bool)
+        has_net = np.array([v not in (None, '') for v in raw['net']], dtype=bool)
+        amount = np.where(has_gross, _number_column(raw['gross'], 'gross', errors),
+                          _number_column([None if g else v for g, v in zip(has_gross.tolist(), raw['net'])], 'net', errors))
+        is_net = ~has_gross & has_net
+        for i in np.flatnonzero(~has_gross & ~has_net):
+            _error(errors, i, "missing gross or net")
+        for i in np.flatnonzero((has_gross | has_net) & (amount <= 0)):
+            _error(errors, i, f"{'net' if is_net[i] else 'gross'} must be positive")
+
+        options = {field: _number_column(raw[field], field, errors) for field in OPTION_FIELDS}
+        for field in FLAG_FIELDS:
+            options[field] = _flag_column(raw[field], field == 'isBasicFunction', field, errors)
+        _number_column(raw['children'], 'children', errors)
+        _number_column(raw['dependents'], 'dependents', errors)
+
+        # Net rows: inverse lookup on the integer-gross net curve of their rules/sector/options
+        gross = amount.copy()
+        ok = np.array([not e for e in errors], dtype=bool)
+        net_rows = np.flatnonzero(ok & is_net)
+        if net_rows.size:
+            # The engine only sees the voucher total (meal x days + vacation), so that is the curve key
+            vouchers = options['mealVouchers'] * options['voucherDays'] + options['vacationVouchers']
+            keys = np.column_stack([version[net_rows], sector[net_rows], vouchers[net_rows],
+                                    options['isBasicFunction'][net_rows]])
+            unique_keys, group = np.unique(keys, axis=0, return_inverse=True)
+            for g, key in enumerate(unique_keys.tolist()):
+                idx = net_rows[group.ravel() == g]
+                key = (int(key[0]), int(key[1]), key[2], bool(key[3]))
+                net_curve, reached, minimum = self._net_curve(key, amount[idx].max())
+                found = inverse_lookup(net_curve, minimum, amount[idx], reached)
+                gross[idx] = found
+                for i in idx[found < 0]:
+                    _error(errors, i, f"net {amount[i]:g} is not reachable")
+            ok = np.array([not e for e in errors], dtype=bool)
+
+        # One vectorized pass per (rules version, sector)
+        results = {field: np.zeros(n) for field in RESULT_FIELDS + BREAKDOWN_FIELDS}
+        group_codes = np.where(ok, version * len(SECTORS) + sector, -1)
+        for code in np.unique(group_codes[ok]).tolist():
+            idx = np.flatnonzero(group_codes == code)
+            res = calculate_salary_results(gross[idx], SECTORS[code % len(SECTORS)], self.resolver.versions[code // len(SECTORS)],
+                                           **{field: values[idx] for field, values in options.items()})
+            for field in RESULT_FIELDS:
+                results[field][idx] = res[field]
+            for field in BREAKDOWN_FIELDS:
+                results[field][idx] = res['breakdown'][field]
+
+        # Totals per month
+        totals: Dict[str, Dict[str, float]] = {}
+        month_names, month_codes = np.unique(np.array(months, dtype=object), return_inverse=True)
+        month_codes = month_codes.ravel()
+        count = np.bincount(month_codes, minlength=len(month_names))
+        failed = np.bincount(month_codes, weights=~ok, minlength=len(month_names))
+        sums = {field: np.bincount(month_codes, weights=np.where(ok, results[field], 0.0), minlength=len(month_names))
+                for field in TOTAL_FIELDS}
+        for m, month in enumerate(month_names.tolist()):
+            month_totals = {'rows': int(count[m]), 'errors': int(failed[m])}
+            month_totals.update({field: float(sums[field][m]) for field in TOTAL_FIELDS})
+            totals[month or 'invalid'] = month_totals
+
+        labels = [self.resolver.label(v) if k else '' for v, k in zip(version.tolist(), ok.tolist())]
+        columns = {
+            'employee_id': _text_column(raw['employee_id']),
+            'month': months,
+            'sector': _text_column(raw['sector']),
+            'type': ['net-brut' if flag else 'brut-net' for flag in is_net.tolist()],
+            'amount': _text_column([g if h else v for h, g, v in zip(has_gross.tolist(), raw['gross'], raw['net'])]),
+            'effectiveDate': labels,
+            'children': _text_column(raw['children']),
+            'dependents': _text_column(raw['dependents']),
+            'error': errors,
+        }
+        out = io.StringIO()
+        if as_json:
+            ok_list = ok.tolist()
+            numbers = {field: results[field].tolist() for field in RESULT_FIELDS + BREAKDOWN_FIELDS}
+            for i in range(n):
+                values = {field: columns[field][i] for field in OUTPUT_FIELDS if field in columns}
+                values.update({field: numbers[field][i] if ok_list[i] else None for field in numbers})
+                out.write(json.dumps({field: values[field] for field in OUTPUT_FIELDS}, ensure_ascii=False) + '\n')
+        else:
+            columns.update({field: _format_column(results[field], ok) for field in RESULT_FIELDS + BREAKDOWN_FIELDS})
+            csv.writer(out, lineterminator='\n').writerows(zip(*(columns[field] for field in OUTPUT_FIELDS)))
+        return out.getvalue(), totals
+
+
+_WORKER: Optional[PayrollBatch] = None
+
+
+def _init_worker(history: List[Dict[str, Any]], default_month: Optional[str]):
+    global _WORKER
+    _WORKER = PayrollBatch(history, default_month)
+
+
+def _process_chunk(header: Optional[List[str]], rows: list, as_json: bool):
+    return _WORKER.process(header, rows, as_json)
+
+
+def _merge_totals(target: Dict[str, Dict[str, float]], totals: Dict[str, Dict[str, float]]):
+    for month, values in totals.items():
+        current = target.setdefault(month, dict.fromkeys(values, 0))
+        for field, value in values.items():
+            current[field] += value
+
+
+def run_batch(input_path: str, history: List[Dict[str, Any]], out_path: Optional[str] = None,
+              workers: int = 1, chunk_rows: int = CHUNK_ROWS, default_month: Optional[str] = None) -> Dict[str, Any]:
+    """Stream the payroll file through the engine; results are written in input order"""
+    as_json = bool(out_path) and _is_jsonl(out_path)
+    out = open(out_path, 'w', encoding='utf-8', newline='') if out_path else None
+    if out and not as_json:
+        out.write(','.join(OUTPUT_FIELDS) + '\n')
+    months: Dict[str, Dict[str, float]] = {}
+
+    def consume(result):
+        text, totals = result
+        if out:
+            out.write(text)
+        _merge_totals(months, totals)
+
+    started = time.perf_counter()
+    try:
+        chunks = read_chunks(input_path, chunk_rows)
+        if workers <= 1:
+            batch = PayrollBatch(history, default_month)
+            for header, rows in chunks:
+                consume(batch.process(header, rows, as_json))
+        else:
+            # At most two chunks per worker in flight: memory does not grow with the file
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(history, default_month)) as pool:
+                pending = deque()
+                for header, rows in chunks:
+                    pending.append(pool.submit(_process_chunk, header, rows, as_json))
+                    if len(pending) >= 2 * workers:
+                        consume(pending.popleft().result())
+                while pending:
+                    consume(pending.popleft().result())
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - started
+
+    total = dict.fromkeys(('rows', 'errors') + TOTAL_FIELDS, 0)
+    for values in months.values():
+        for field in total:
+            total[field] += values[field]
+    return {
+        'input': input_path,
+        'output': out_path,
+        'workers': workers,
+        'chunk_rows': chunk_rows,
+        'seconds': elapsed,
+        'rows_per_second': total['rows'] / elapsed if elapsed else 0.0,
+        'versions': [{'year': doc.get('year'), 'effectiveDate': _effective_date(doc) or None}
+                     for doc in RulesResolver(history).versions],
+        'months': dict(sorted(months.items())),
+        'total': total,
+    }
+
+
+# ---------------------------------------------------------------------- synthetic input
+
+
+def generate_payroll(path: str, rows: int, year: int = 2026, seed: int = 0) -> int:
+    """Synthetic payroll file of exactly `rows` rows: 12 months per employee (the last one may have fewer),
+    mixed sectors, gross/net and vouchers. Returns the number of rows written."""
+    rng = random.Random(seed)
+    employees = -(-rows // 12)
+    fields = ['employee_id', 'month', 'gross', 'net', 'sector', 'children', 'dependents',
+              'mealVouchers', 'voucherDays', 'isBasicFunction']
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = None if _is_jsonl(path) else csv.writer(f, lineterminator='\n')
+        if writer:
+            writer.writerow(fields)
+        written = 0
+        for employee in range(employees):
+            sector = rng.choices(SECTORS, weights=(70, 15, 10, 5))[0]
+            by_net = rng.random() < 0.2
+            base = rng.randint(4050, 25000)
+            meal = rng.choice((0, 0, 30, 40))
+            profile = [f"E{employee:06d}", rng.choice((0, 0, 1, 2, 3)), rng.choice((0, 0, 0, 1)),
+                       meal, rng.random() < 0.9]
+            for month in range(1, 13):
+                if written >= rows:
+                    return written
+                amount = base + (month >= 7) * rng.choice((0, 0, 500))
+                record = dict(zip(fields, [profile[0], f"{year}-{month:02d}",
+                                           '' if by_net else amount, round(amount * 0.58) if by_net else '',
+                                           sector, profile[1], profile[2], meal,
+                                           rng.randint(19, 22) if meal else 0, profile[4]]))
+                if writer:
+                    writer.writerow(record.values())
+                else:
+                    f.write(json.dumps({k: v for k, v in record.items() if v != ''}) + '\n')
+                written += 1
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Whole-year payroll batch through the vectorized salary engine")
+    parser.add_argument('input', help="payroll file (.csv with header, or .jsonl)")
+    parser.add_argument('--rules-history', '--rules', dest='rules', default=None,
+                        help="fiscal_rules JSON document or list of versions (output of ?history=1)")
+    parser.add_argument('--base-url', default='http://localhost:3000', help="API to fetch ?history=1 from when --rules is not given")
+    parser.add_argument('--years', default=None, help="comma separated years to fetch (default: years in the file)")
+    parser.add_argument('--month', default=None, help="month (YYYY-MM) for rows without one")
+    parser.add_argument('--out', default=None, help="per-employee results (.csv or .jsonl)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--generate', type=int, default=None, help="first write N synthetic rows to the input path")
+    parser.add_argument('--report', default=None, help="write JSON totals to this path")
+    args = parser.parse_args()
+
+    if args.generate:
+        written = generate_payroll(args.input, args.generate)
+        print(f"🧪 Generated {written} rows in {args.input}")
+
+    years = [int(y) for y in args.years.split(',')] if args.years else scan_years(args.input)
+    if not years and args.month:
+        years = [int(args.month[:4])]
+    history = load_rules_history(args.rules, args.base_url, years)
+    print(f"📚 {len(history)} fiscal_rules version(s): "
+          + ', '.join(f"{d.get('year')}@{_effective_date(d) or '-'}" for d in RulesResolver(history).versions))
+
+    results = run_batch(args.input, history, args.out, args.workers, args.chunk_rows, args.month)
+
+    print(f"\n{'Month':<9} {'Rows':>8} {'Gross':>15} {'CAS':>13} {'CASS':>13} {'Tax':>13} {'CAM':>11} {'Net':>15}")
+    for month, t in list(results['months'].items()) + [('TOTAL', results['total'])]:
+        print(f"{month:<9} {t['rows']:>8} {t['gross']:>15,.0f} {t['cas']:>13,.0f} {t['cass']:>13,.0f}"
+              f" {t['incomeTax']:>13,.0f} {t['cam']:>11,.0f} {t['net']:>15,.0f}")
+    total = results['total']
+    print(f"\n⚡ {total['rows']} rows in {results['seconds']:.2f}s ({results['rows_per_second']:,.0f} rows/s, "
+          f"{args.workers} worker(s))")
+    if total['errors']:
+        print(f"❌ {total['errors']} row(s) with errors" + (f" - see the error column in {args.out}" if args.out else ''))
+    if args.out:
+        print(f"📝 Results written to {args.out}")
+
+    if args.report:
+        folder = os.path.dirname(args.report)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+    return 1 if total['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
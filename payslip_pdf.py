@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Payslip PDF - headless batch rendering of payslips with lib/pdf-export.js
+Companion of payroll_batch.py: turns its per-employee results into payslips.
+
+generateSalaryPDF is browser-only (saveOrOpenPDF) and builds one document per
+click. Here the same page layout (drawSalaryPage + createSalaryPDFTemplate)
+runs in a pool of long-lived node workers (payslip_worker.mjs): jsPDF, the
+standard fonts and the static template are loaded once per worker, and each
+job is a chunk of results written straight to disk. The results file is read
+in chunks with at most two chunks per worker in flight, so memory does not
+grow with the payroll; rendered files are moved into the output directory or
+appended to one zip archive as soon as their chunk completes.
+
+Input: payroll_batch.py results (CSV or JSONL, rows with an error are skipped)
+or any JSONL of calculateSalaryResults objects. employee_id and month, when
+present, go on the payslip and in the file name.
+
+Usage:
+    python payroll_batch.py payroll_2026.csv --rules rules_2026.json --out results.csv
+    python payslip_pdf.py results.csv --out payslips/ --workers 8
+    python payslip_pdf.py results.jsonl --out payslips_2026.zip --merged --report test_reports/payslips.json
+"""
+
+import argparse
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from payroll_batch import read_chunks
+from salary_engine import BREAKDOWN_FIELDS, RESULT_FIELDS
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+WORKER_SCRIPT = os.path.join(ROOT, 'payslip_worker.mjs')
+CHUNK_ROWS = 250
+DEFAULT_EXCHANGE_RATE = 4.98
+NUMBER_FIELDS = RESULT_FIELDS + ('childDeduction', 'employerExtraCAS', 'employerExtraCASS', 'voucherValue')
+TEXT_FIELDS = ('employee_id', 'month', 'sector')
+
+
+def jspdf_available() -> bool:
+    """True when node can import jspdf from this tree (npm install)"""
+    node = shutil.which('node')
+    if node is None:
+        return False
+    proc = subprocess.run([node, '--input-type=module', '-e', "await import('jspdf');"],
+                          capture_output=True, text=True, cwd=ROOT, timeout=60)
+    return proc.returncode == 0
+
+
+def _payslip(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Result record -> payslip fields; None for rows without a usable result"""
+    if str(record.get('error') or '').strip():
+        return None
+    payslip: Dict[str, Any] = {}
+    for field in NUMBER_FIELDS:
+        value = record.get(field)
+        if value is None or str(value).strip() == '':
+            continue
+        try:
+            payslip[field] = float(value)
+        except (TypeError, ValueError):
+            return None
+    if 'gross' not in payslip or 'net' not in payslip:
+        return None
+    for field in TEXT_FIELDS:
+        if str(record.get(field) or '').strip():
+            payslip[field] = str(record[field]).strip()
+    if isinstance(record.get('breakdown'), dict):
+        payslip['breakdown'] = record['breakdown']
+    else:
+        # payroll_batch.py results: the rates are flat columns; without them the labels carry no percentage
+        breakdown = {}
+        for field in BREAKDOWN_FIELDS:
+            value = record.get(field)
+            if value is None or str(value).strip() == '':
+                continue
+            try:
+                breakdown[field] = float(value)
+            except (TypeError, ValueError):
+                continue
+        if breakdown:
+            payslip['breakdown'] = breakdown
+    return payslip
+
+
+def read_payslips(path: str, chunk_rows: int = CHUNK_ROWS,
+                  stats: Optional[Dict[str, int]] = None) -> Iterator[List[Dict[str, Any]]]:
+    """Chunks of payslip records; every chunk but the last has chunk_rows records"""
+    chunk: List[Dict[str, Any]] = []
+    for header, rows in read_chunks(path, chunk_rows):
+        for row in rows:
+            record = json.loads(row) if header is None else dict(zip(header, row))
+            payslip = _payslip(record)
+            if payslip is None:
+                if stats is not None:
+                    stats['skipped'] = stats.get('skipped', 0) + 1
+                continue
+            chunk.append(payslip)
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+class NodeWorker:
+    """One long-lived payslip_worker.mjs process; jobs are JSON lines over its stdin/stdout"""
+
+    def __init__(self):
+        node = shutil.which('node')
+        if node is None:
+            raise RuntimeError("node is not installed")
+        self.proc = subprocess.Popen([node, WORKER_SCRIPT], cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.PIPE, text=True, encoding='utf-8', bufsize=1)
+
+    def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        self.proc.stdin.write(json.dumps(job, separators=(',', ':')) + '\n')
+        self.proc.stdin.flush()
+        line = self.proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"payslip worker exited: {self.proc.stderr.read().strip()}")
+        reply = json.loads(line)
+        if reply.get('error'):
+            raise RuntimeError(f"chunk {job['id']}: {reply['error']}")
+        return reply
+
+    def close(self):
+        if self.proc.poll() is None:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=30)
+
+
+class _Output:
+    """Directory or zip archive the rendered files end up in, deduplicating names"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.archive = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) if path.endswith('.zip') else None
+        if self.archive is None:
+            os.makedirs(path, exist_ok=True)
+        self.names = set()
+
+    def _unique(self, name: str) -> str:
+        stem, ext = os.path.splitext(name)
+        candidate, n = name, 1
+        while candidate in self.names:
+            n += 1
+            candidate = f"{stem}-{n}{ext}"
+        self.names.add(candidate)
+        return candidate
+
+    def add(self, source: str, name: str):
+        name = self._unique(name)
+        if self.archive is not None:
+            self.archive.write(source, name)
+            os.unlink(source)
+        else:
+            os.replace(source, os.path.join(self.path, name))
+
+    def close(self):
+        if self.archive is not None:
+            self.archive.close()
+
+
+def render_payslips(input_path: str, out: str, workers: int = 1, chunk_rows: int = CHUNK_ROWS,
+                    merged: bool = False, year: Optional[int] = None,
+                    exchange_rate: float = DEFAULT_EXCHANGE_RATE) -> Dict[str, Any]:
+    """Stream the results through the worker pool into a directory or a .zip archive"""
+    staging = tempfile.mkdtemp(prefix='.payslips-', dir=os.path.dirname(os.path.abspath(out)))
+    pool_workers: List[NodeWorker] = []
+    idle: 'queue.Queue[NodeWorker]' = queue.Queue()
+    output = _Output(out)
+    totals = {'payslips': 0, 'pages': 0, 'bytes': 0, 'files': 0, 'render_ms': 0.0, 'skipped': 0}
+
+    def render(job: Dict[str, Any]) -> Dict[str, Any]:
+        worker = idle.get()
+        try:
+            return worker.run(job)
+        finally:
+            idle.put(worker)
+
+    def consume(job: Dict[str, Any], reply: Dict[str, Any]):
+        for item in reply['files']:
+            output.add(os.path.join(job['dir'], item['file']), item['name'])
+        os.rmdir(job['dir'])
+        totals['payslips'] += len(job['results'])
+        totals['pages'] += reply['pages']
+        totals['bytes'] += reply['bytes']
+        totals['files'] += len(reply['files'])
+        totals['render_ms'] += reply['ms']
+
+    started = time.perf_counter()
+    try:
+        for _ in range(max(1, workers)):
+            worker = NodeWorker()
+            pool_workers.append(worker)
+            idle.put(worker)
+        with ThreadPoolExecutor(max(1, workers)) as pool:
+            # At most two chunks per worker in flight, consumed in input order
+            pending = deque()
+            for i, results in enumerate(read_payslips(input_path, chunk_rows, totals), 1):
+                job = {'id': i, 'dir': os.path.join(staging, f"chunk-{i:06d}"), 'results': results,
+                       'mode': 'merged' if merged else 'files', 'name': f"fluturasi_{i:05d}.pdf",
+                       'exchangeRate': exchange_rate}
+                if year:
+                    job['year'] = year
+                pending.append((job, pool.submit(render, job)))
+                if len(pending) >= 2 * max(1, workers):
+                    done, future = pending.popleft()
+                    consume(done, future.result())
+            while pending:
+                done, future = pending.popleft()
+                consume(done, future.result())
+    finally:
+        for worker in pool_workers:
+            worker.close()
+        output.close()
+        shutil.rmtree(staging, ignore_errors=True)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'input': input_path,
+        'output': out,
+        'format': ('zip' if out.endswith('.zip') else 'directory') + (', merged per chunk' if merged else ''),
+        'workers': workers,
+        'chunk_rows': chunk_rows,
+        'payslips': totals['payslips'],
+        'skipped': totals['skipped'],
+        'files': totals['files'],
+        'pages': totals['pages'],
+        'bytes': totals['bytes'],
+        'seconds': elapsed,
+        'render_seconds': totals['render_ms'] / 1000,
+        'pages_per_second': totals['pages'] / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render payslip PDFs in batch from payroll_batch.py results")
+    parser.add_argument('input', help="results file (.csv or .jsonl)")
+    parser.add_argument('--out', required=True, help="output directory, or a .zip archive")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="node worker processes")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="payslips per worker job")
+    parser.add_argument('--merged', action='store_true', help="one multi-page PDF per chunk instead of one per payslip")
+    parser.add_argument('--year', type=int, default=None, help="year on payslips whose month column is empty")
+    parser.add_argument('--exchange-rate', type=float, default=DEFAULT_EXCHANGE_RATE, help="RON per EUR")
+    parser.add_argument('--report', default=None, help="write JSON summary to this path")
+    args = parser.parse_args()
+
+    if not jspdf_available():
+        print("❌ jspdf is not installed (npm install)")
+        return 2
+
+    print(f"🧾 Rendering {args.input} -> {args.out} with {args.workers} worker(s), {args.chunk_rows} per job")
+    summary = render_payslips(args.input, args.out, args.workers, args.chunk_rows, args.merged,
+                              args.year, args.exchange_rate)
+
+    print(f"📄 {summary['payslips']} payslip(s), {summary['pages']} page(s) in {summary['files']} file(s), "
+          f"{summary['bytes'] / 1024 / 1024:.1f} MiB")
+    print(f"⚡ {summary['pages_per_second']:,.0f} pages/s ({summary['seconds']:.2f}s wall, "
+          f"{summary['render_seconds']:.2f}s rendering across workers)")
+    if summary['skipped']:
+        print(f"⚠️  {summary['skipped']} row(s) without a result skipped")
+    print(f"📝 Payslips written to {summary['output']}")
+
+    if args.report:
+        folder = os.path.dirname(args.report)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
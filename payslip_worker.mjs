@@ -0,0 +1,5 @@
+// Worker pentru payslip_pdf.py: un job JSON per linie pe stdin, un răspuns per linie pe stdout
+// (vezi lib/payslip-batch.js). Procesul rămâne activ pe tot lotul.
+import { runPayslipWorker } from './lib/payslip-batch.js';
+
+await runPayslipWorker();
@@ -0,0 +1,17 @@
+import { spawnSync } from 'child_process';
+
+// npm prebuild: magazinul de climatologie (climatology_store.py) e opțional pentru build.
+// Fără python3 sau fără numpy/requests (requirements.txt) se sare peste pas, iar paginile
+// folosesc arhiva live; erorile scriptului însuși opresc în continuare build-ul.
+// Usage: node prebuild.mjs   (PYTHON=python3.11 node prebuild.mjs)
+
+const python = process.env.PYTHON || (process.platform === 'win32' ? 'python' : 'python3');
+const probe = spawnSync(python, ['-c', 'import numpy, requests'], { encoding: 'utf8' });
+if (probe.error || probe.status !== 0) {
+    const reason = probe.error ? `${python} not found` : probe.stderr.trim().split('\n').pop();
+    console.warn(`⚠️  Skipping the climatology store (${reason}); install with: pip install -r requirements.txt`);
+    process.exit(0);
+}
+
+const run = spawnSync(python, ['climatology_store.py', '--allow-failures'], { stdio: 'inherit' });
+process.exit(run.error ? 1 : run.status ?? 1);
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Salary Engine - Python Reference Port (vectorized)
+Mirror of lib/salary-engine.js for payroll audits and salary tables.
+
+Every method takes a NumPy array of gross salaries (options may be scalars or
+arrays of the same length) and evaluates CAS, CASS, the regressive personal
+deduction, income tax, CAM and net for the whole array in one pass. Rounding
+follows the JS engine exactly: Math.round rounds halves up, CAM uses
+Math.floor, and the `rule || 0` fallbacks treat 0/false/missing alike.
+
+Usage:
+    python salary_engine.py --rules rules_2026.json --sector it --from 4050 --to 50000 --out table.csv
+    python salary_engine.py --base-url http://localhost:3000 --year 2026
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+DEFAULT_RULES = {
+    'minimum_salary': 0,
+    'minimum_gross_construction': 0,
+    'minimum_gross_agriculture': 0,
+    'minimum_gross_it': 0,
+    'cas_rate': 0,
+    'cass_rate': 0,
+    'income_tax_rate': 0,
+    'cam_rate': 0,
+    'untaxed_amount': 0,
+    'personal_deduction_percent': 0,
+    'personal_deduction_base': 0,
+    'personal_deduction_range': 0,
+    'child_deduction': 0,
+    'dependent_deduction': 0,
+    'it_threshold': 0,
+    'it_tax_exempt': False,
+    'it_pilon2_optional': False,
+    'construction_cas_rate': 0,
+    'construction_tax_exempt': False,
+    'construction_cass_exempt': False,
+    'agriculture_cas_rate': 0,
+    'agriculture_tax_exempt': False,
+    'tax_exemption_threshold': 0,
+    'youth_exemption_threshold': 0,
+    'youth_deduction_rate': 0,
+    'part_time_overtax_enabled': False,
+}
+
+SECTORS = ('standard', 'it', 'construction', 'agriculture')
+
+RESULT_FIELDS = ('gross', 'net', 'cas', 'cass', 'incomeTax', 'personalDeduction',
+                 'taxableIncome', 'untaxedAmount', 'cam', 'totalCost')
+BREAKDOWN_FIELDS = ('casPercent', 'cassPercent', 'taxPercent', 'camPercent')
+
+
+def js_round(values):
+    """Math.round: nearest integer, halves towards +Infinity"""
+    return np.floor(np.asarray(values, dtype=np.float64) + 0.5)
+
+
+def _truthy(value) -> bool:
+    return bool(value) and value == value  # NaN is falsy in JS
+
+
+def _option_array(options: Dict[str, Any], key: str) -> np.ndarray:
+    """`options[key] || 0` for a scalar or per-row array option"""
+    value = options.get(key)
+    if value is None:
+        return np.zeros(())
+    return np.nan_to_num(np.asarray(value, dtype=np.float64), nan=0.0)
+
+
+def _flag_array(options: Dict[str, Any], key: str) -> np.ndarray:
+    """`!!options[key]` for a scalar or per-row array option"""
+    value = options.get(key)
+    if value is None:
+        return np.zeros((), dtype=bool)
+    return np.asarray(value, dtype=bool)
+
+
+class SalaryCalculator:
+    """Vectorized counterpart of SalaryCalculator in lib/salary-engine.js"""
+
+    def __init__(self, fiscal_rules: Optional[Dict[str, Any]] = None):
+        rules = fiscal_rules or {}
+        self.rules = rules['salary'] if isinstance(rules.get('salary'), dict) else rules
+
+    def get_rule(self, key: str):
+        value = self.rules.get(key)
+        return value if value is not None else DEFAULT_RULES.get(key)
+
+    def _num(self, key: str, fallback: float = 0.0) -> float:
+        """getRule(key) || fallback"""
+        value = self.get_rule(key)
+        return float(value) if _truthy(value) else float(fallback)
+
+    # ------------------------------------------------------------------ options
+
+    @staticmethod
+    def _vouchers(gross: np.ndarray, options: Dict[str, Any]) -> np.ndarray:
+        meal = _option_array(options, 'mealVouchers')
+        days = _option_array(options, 'voucherDays')
+        vacation = _option_array(options, 'vacationVouchers')
+        return np.broadcast_to(meal * days + vacation, gross.shape)
+
+    @staticmethod
+    def _basic_function(gross: np.ndarray, options: Dict[str, Any]) -> np.ndarray:
+        # JS destructuring default: only a missing key means true, null means false
+        flag = options.get('isBasicFunction', True)
+        return np.broadcast_to(np.asarray(False if flag is None else flag, dtype=bool), gross.shape)
+
+    # ------------------------------------------------------------------ formulas
+
+    def calculate_personal_deduction(self, gross, is_basic_function=True) -> np.ndarray:
+        gross = np.asarray(gross, dtype=np.float64)
+        min_wage = float(self.get_rule('minimum_salary') or 0)
+        deduction_percent = self._num('personal_deduction_percent')
+        deduction_range = self._num('personal_deduction_range', 2000)
+        deduction_base = self._num('personal_deduction_base') or float(js_round(min_wage * (deduction_percent / 100)))
+
+        regressive = js_round(deduction_base * (1 - (gross - min_wage) / deduction_range))
+        deduction = np.where(gross <= min_wage, deduction_base,
+                             np.where(gross > min_wage + deduction_range, 0.0, regressive))
+        return np.where(np.asarray(is_basic_function, dtype=bool), deduction, 0.0)
+
+    def calculate_standard(self, gross, **options) -> Dict[str, np.ndarray]:
+        gross = np.atleast_1d(np.asarray(gross, dtype=np.float64))
+        min_wage = self._num('minimum_salary')
+        untaxed_admin = self._num('untaxed_amount')
+        cas_percent = self._num('cas_rate')
+        cass_percent = self._num('cass_rate')
+        tax_percent = self._num('income_tax_rate')
+        cam_percent = self._num('cam_rate')
+
+        untaxed = np.where(gross <= min_wage, untaxed_admin, 0.0)
+        base = np.maximum(0, gross - untaxed)
+        cas = js_round(base * (cas_percent / 100))
+        cass = js_round(base * (cass_percent / 100))
+        deduction = self.calculate_personal_deduction(gross, self._basic_function(gross, options))
+
+        taxable = np.maximum(0, gross - untaxed - cas - cass - deduction + self._vouchers(gross, options))
+        income_tax = js_round(taxable * (tax_percent / 100))
+        cam = np.floor(base * (cam_percent / 100))
+
+        return {
+            'gross': gross,
+            'net': gross - cas - cass - income_tax,
+            'cas': cas,
+            'cass': cass,
+            'incomeTax': income_tax,
+            'personalDeduction': deduction,
+            'taxableIncome': taxable,
+            'untaxedAmount': untaxed,
+            'cam': cam,
+            'totalCost': gross + cam,
+            'breakdown': {'casPercent': cas_percent, 'cassPercent': cass_percent,
+                          'taxPercent': tax_percent, 'camPercent': cam_percent},
+        }
+
+    def calculate_it(self, gross, **options) -> Dict[str, np.ndarray]:
+        res = self.calculate_standard(gross, **options)
+        gross = res['gross']
+        threshold = self._num('it_threshold')
+
+        if _truthy(self.get_rule('it_pilon2_optional')):
+            cas_percent = res['breakdown']['casPercent'] - self._num('pilon2_rate')
+            res['cas'] = js_round((gross - res['untaxedAmount']) * (cas_percent / 100))
+            res['breakdown']['casPercent'] = cas_percent
+
+        if _truthy(self.get_rule('it_tax_exempt')):
+            taxable = np.maximum(0, gross - threshold - res['personalDeduction'] + self._vouchers(gross, options))
+            taxable = np.where(gross <= threshold, 0.0, taxable)
+            res['incomeTax'] = js_round(taxable * (res['breakdown']['taxPercent'] / 100))
+            res['taxableIncome'] = taxable
+
+        res['net'] = gross - res['cas'] - res['cass'] - res['incomeTax']
+        return res
+
+    def calculate_construction(self, gross, **options) -> Dict[str, np.ndarray]:
+        gross = np.atleast_1d(np.asarray(gross, dtype=np.float64))
+        sector = 'agriculture' if options.get('sector') == 'agriculture' else 'construction'
+        min_wage = self._num(f"minimum_gross_{sector}")
+        cas_percent = self._num(f"{sector}_cas_rate")
+        cass_percent = self._num('cass_rate')
+        tax_percent = self._num('income_tax_rate')
+        cam_percent = self._num('cam_rate')
+        tax_exempt = _truthy(self.get_rule(f"{sector}_tax_exempt"))
+        cass_exempt = _truthy(self.get_rule(f"{sector}_cass_exempt"))
+        threshold = self._num('tax_exemption_threshold')
+        untaxed_admin = self._num('untaxed_amount')
+
+        untaxed = np.where(gross <= min_wage, untaxed_admin, 0.0)
+        base = np.maximum(0, gross - untaxed)
+        cas = js_round(base * (cas_percent / 100))
+        effective_cass = 0.0 if cass_exempt else cass_percent
+        cass = js_round(base * (effective_cass / 100))
+        deduction = self.calculate_personal_deduction(gross, self._basic_function(gross, options))
+
+        taxable = np.maximum(0, gross - untaxed - cas - cass - deduction + self._vouchers(gross, options))
+        if tax_exempt:
+            taxable = np.where(gross <= threshold, 0.0, taxable)
+        income_tax = js_round(taxable * (tax_percent / 100))
+        cam = np.floor(base * (cam_percent / 100))
+
+        return {
+            'gross': gross,
+            'net': gross - cas - cass - income_tax,
+            'cas': cas,
+            'cass': cass,
+            'incomeTax': income_tax,
+            'personalDeduction': deduction,
+            'taxableIncome': taxable,
+            'untaxedAmount': untaxed,
+            'cam': cam,
+            'totalCost': gross + cam,
+            'breakdown': {'casPercent': cas_percent, 'cassPercent': effective_cass,
+                          'taxPercent': tax_percent, 'camPercent': cam_percent},
+        }
+
+    def calculate_for_sector(self, gross, sector: str = 'standard', **options) -> Dict[str, np.ndarray]:
+        """_calculateForSector: dispatch to the sector formula"""
+        if sector == 'it':
+            return self.calculate_it(gross, **options)
+        if sector in ('construction', 'agriculture'):
+            return self.calculate_construction(gross, **dict(options, sector=sector))
+        return self.calculate_standard(gross, **dict(options, sector=sector))
+
+
+def calculate_salary_results(gross, sector: str, rules: Dict[str, Any], **options) -> Dict[str, np.ndarray]:
+    """Brut->net path of calculateSalaryResults, including the tax/youth exemptions"""
+    calculator = SalaryCalculator(rules)
+    res = calculator.calculate_for_sector(gross, sector, **options)
+    tax_exempt = _flag_array(options, 'isTaxExempt')
+    youth_exempt = _flag_array(options, 'isYouthExempt')
+    if tax_exempt.any() or youth_exempt.any():
+        youth_threshold = float(calculator.get_rule('youth_exemption_threshold') or 0)
+        exempt = tax_exempt | (youth_exempt & (res['gross'] <= youth_threshold))
+        res['net'] = np.where(exempt, res['net'] + res['incomeTax'], res['net'])
+        res['incomeTax'] = np.where(exempt, 0.0, res['incomeTax'])
+    return res
+
+
+# lib/data-mapper.js mapSingleRule: (field, 'number' | 'bool', `||` instead of `??`, default)
+MAPPED_SALARY_FIELDS = (
+    ('minimum_salary', 'number', True, 0), ('average_salary', 'number', True, 0),
+    ('cas_rate', 'number', False, 0), ('pilon2_rate', 'number', False, 0), ('cass_rate', 'number', False, 0),
+    ('income_tax_rate', 'number', False, 0), ('cam_rate', 'number', False, 0),
+    ('untaxed_amount_enabled', 'bool', False, False), ('untaxed_amount', 'number', False, 0),
+    ('meal_voucher_max', 'number', False, 0), ('gift_voucher_threshold', 'number', False, 0),
+    ('meal_allowance_max', 'number', False, 0),
+    ('personal_deduction_percent', 'number', False, 0), ('personal_deduction_base', 'number', False, 0),
+    ('personal_deduction_range', 'number', False, 0), ('child_deduction', 'number', False, 0),
+    ('dependent_deduction', 'number', False, 0),
+    ('minimum_gross_construction', 'number', True, 0), ('minimum_gross_agriculture', 'number', True, 0),
+    ('minimum_gross_it', 'number', True, 0),
+    ('it_tax_exempt', 'bool', False, False), ('it_threshold', 'number', False, 0),
+    ('it_pilon2_optional', 'bool', False, False),
+    ('construction_cas_rate', 'number', False, 0), ('construction_tax_exempt', 'bool', False, False),
+    ('construction_cass_exempt', 'bool', False, False), ('agriculture_cas_rate', 'number', False, 0),
+    ('agriculture_tax_exempt', 'bool', False, False),
+    ('tax_exemption_threshold', 'number', False, 0), ('youth_exemption_enabled', 'bool', False, False),
+    ('youth_exemption_threshold', 'number', False, 0), ('disability_tax_exempt', 'bool', False, False),
+    ('part_time_overtax_enabled', 'bool', False, False), ('part_time_minor_exempt', 'bool', False, False),
+    ('part_time_student_exempt', 'bool', False, False), ('part_time_pensioner_exempt', 'bool', False, False),
+    ('part_time_second_job_exempt', 'bool', False, False),
+    ('show_year_comparison', 'bool', False, True),
+)
+
+
+def _js_truthy(value) -> bool:
+    """Boolean(value) in JS: '', 0, NaN, null are false; any other string (even 'false') is true"""
+    if isinstance(value, float) and value != value:
+        return False
+    return value is not None and value is not False and value != 0 and value != ''
+
+
+def _js_number(value) -> float:
+    """Number(value) in JS for JSON values: '' -> 0, non-numeric strings -> NaN"""
+    if value is None:
+        return 0.0
+    if isinstance(value, (bool, int, float)):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return 0.0
+        try:
+            return float(text)
+        except ValueError:
+            return float('nan')
+    return float('nan')
+
+
+def _map_single_rule(doc: Dict[str, Any]) -> Dict[str, Any]:
+    raw = doc.get('salary') or {}
+    if not isinstance(raw, dict):
+        raw = {}
+    salary = {}
+    for field, kind, use_or, default in MAPPED_SALARY_FIELDS:
+        value = raw.get(field)
+        if use_or:
+            value = value if _js_truthy(value) else default
+        elif value is None:
+            value = default
+        salary[field] = _js_number(value) if kind == 'number' else _js_truthy(value)
+    exchange = doc.get('exchange_rate') or {}
+    eur = exchange.get('eur') if isinstance(exchange, dict) else None
+    auto_update = exchange.get('auto_update') if isinstance(exchange, dict) else None
+    return {
+        **doc,
+        'year': _js_number(doc.get('year') if _js_truthy(doc.get('year')) else 0),
+        'effectiveDate': doc.get('effectiveDate') if _js_truthy(doc.get('effectiveDate')) else '2026-01-01',
+        'salary': salary,
+        'exchange_rate': {'eur': _js_number(eur if _js_truthy(eur) else 0),
+                          'auto_update': _js_truthy(True if auto_update is None else auto_update)},
+    }
+
+
+def map_db_to_fiscal_rules(doc):
+    """mapDbToFiscalRules of lib/data-mapper.js: normalizes a fiscal_rules document (or a history list)"""
+    if not _js_truthy(doc):
+        return {'year': 0, 'effectiveDate': '', 'salary': {
+            'minimum_salary': 0, 'cas_rate': 0, 'cass_rate': 0, 'income_tax_rate': 0, 'cam_rate': 0,
+            'untaxed_amount': 0, 'it_tax_exempt': False, 'it_threshold': 0, 'personal_deduction_percent': 0,
+            'personal_deduction_base': 0, 'personal_deduction_range': 0}}
+    if isinstance(doc, list):
+        return [_map_single_rule(item) for item in doc]
+    return _map_single_rule(doc)
+
+
+def sector_minimum(rules: Dict[str, Any], sector: str) -> float:
+    calculator = SalaryCalculator(rules)
+    key = {'construction': 'minimum_gross_construction', 'agriculture': 'minimum_gross_agriculture',
+           'it': 'minimum_gross_it'}.get(sector, 'minimum_salary')
+    return float(calculator.get_rule(key) or 0)
+
+
+def salary_table(rules: Dict[str, Any], sector: str, start: float, stop: float,
+                 step: float = 1.0, **options) -> Dict[str, np.ndarray]:
+    """Every gross value from start to stop (inclusive) in one vectorized pass"""
+    gross = np.arange(start, stop + step / 2, step, dtype=np.float64)
+    return calculate_salary_results(gross, sector, rules, **options)
+
+
+def write_table_csv(result: Dict[str, np.ndarray], path: str):
+    columns = [result[field] for field in RESULT_FIELDS]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(RESULT_FIELDS)
+        for row in zip(*(c.tolist() for c in columns)):
+            writer.writerow(f"{v:g}" for v in row)
+
+
+def load_rules(path: Optional[str], base_url: Optional[str], year: int) -> Dict[str, Any]:
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    import requests
+    response = requests.get(f"{base_url.rstrip('/')}/api/fiscal-rules/{year}", timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized salary tables (port of lib/salary-engine.js)")
+    parser.add_argument('--rules', default=None, help="fiscal_rules JSON document")
+    parser.add_argument('--base-url', default='http://localhost:3000', help="API to fetch rules from when --rules is not given")
+    parser.add_argument('--year', type=int, default=2026)
+    parser.add_argument('--sector', choices=SECTORS, default='standard')
+    parser.add_argument('--from', dest='start', type=float, default=None, help="first gross (default: sector minimum)")
+    parser.add_argument('--to', dest='stop', type=float, default=50000)
+    parser.add_argument('--meal-vouchers', type=float, default=0)
+    parser.add_argument('--voucher-days', type=float, default=0)
+    parser.add_argument('--not-basic-function', action='store_true')
+    parser.add_argument('--out', default=None, help="write the table as CSV")
+    args = parser.parse_args()
+
+    rules = load_rules(args.rules, args.base_url, args.year)
+    start = args.start if args.start is not None else sector_minimum(rules, args.sector)
+
+    started = time.perf_counter()
+    table = salary_table(rules, args.sector, start, args.stop,
+                         mealVouchers=args.meal_vouchers, voucherDays=args.voucher_days,
+                         isBasicFunction=not args.not_basic_function)
+    elapsed = time.perf_counter() - started
+    print(f"📊 {len(table['gross'])} rows ({args.sector}, {start:g}..{args.stop:g}) in {elapsed * 1000:.1f} ms")
+
+    if args.out:
+        write_table_csv(table, args.out)
+        print(f"📝 Table written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Salary Lookup Tables - Precomputed per fiscal_rules version
+Companion of salary_engine.py (batch / offline lookups).
+
+Evaluates the vectorized engine once for every integer gross (0..gross_max) and
+sector, and writes net, taxes and cost columns plus an inverse net->gross index
+into one binary file that is memory-mapped (np.memmap). A lookup is then a
+single array read. Files are named after the rules version (year,
+effectiveDate, hash of the salary section), so they are rebuilt only when the
+rules change, or when a larger gross_max than the stored one is asked for.
+
+Layout (little-endian):
+    8 bytes  magic b'ECALCTBL'
+    uint32   format version
+    uint32   header length
+    header   UTF-8 JSON (rules version, dtype, column offsets per sector)
+    columns  int32 (float64 when a column has fractional values), 64-byte aligned
+
+Usage:
+    python salary_tables.py --rules rules_2026.json --out-dir .salary_tables
+    python salary_tables.py --base-url http://localhost:3000 --year 2026 --lookup 7500
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from salary_engine import SECTORS, SalaryCalculator, calculate_salary_results, load_rules, sector_minimum
+
+MAGIC = b'ECALCTBL'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+DEFAULT_GROSS_MAX = 100000
+TABLE_DIR = '.salary_tables'
+
+# Stored columns; 'gross' is the row index itself
+TABLE_FIELDS = ('net', 'cas', 'cass', 'incomeTax', 'personalDeduction',
+                'taxableIncome', 'untaxedAmount', 'cam', 'totalCost')
+
+
+def rules_version(rules: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """(year, effectiveDate, hash) identifying a fiscal_rules document + calculation options"""
+    salary = SalaryCalculator(rules).rules
+    canonical = json.dumps({'salary': salary, 'options': options or {}}, sort_keys=True, default=str)
+    return {
+        'year': rules.get('year'),
+        'effectiveDate': rules.get('effectiveDate'),
+        'hash': hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16],
+    }
+
+
+def table_filename(version: Dict[str, Any]) -> str:
+    return f"salary_{version['year']}_{version['effectiveDate'] or 'na'}_{version['hash']}.bin"
+
+
+def inverse_lookup(net: np.ndarray, minimum: int, targets, reached: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Gross (index into `net`) for every target net, same choice as calculateNetToGross:
+    the sector minimum when it matches, else the lowest gross reaching the net,
+    or the gross just below it when that one is strictly closer. -1 = unreachable.
+    `reached` (running maximum of net) can be passed when the same curve is reused.
+    """
+    targets = np.asarray(targets, dtype=np.float64)
+    if reached is None:
+        reached = np.maximum.accumulate(net)
+    gross = np.searchsorted(reached, targets, side='left')
+    found = gross < len(net)
+    gross = np.minimum(gross, len(net) - 1)
+
+    prev = np.maximum(gross - 1, 0)
+    closer = (gross > 0) & (targets - net[prev] < net[gross] - targets)
+    gross = np.where(closer, prev, gross)
+    if 0 <= minimum < len(net):
+        gross = np.where(np.abs(net[minimum] - targets) < 1, minimum, gross)
+    return np.where(found, gross, -1).astype(np.int32)
+
+
+def inverse_index(net: np.ndarray, minimum: int, net_max: int) -> np.ndarray:
+    """inverse_lookup for every integer net 0..net_max"""
+    return inverse_lookup(net, minimum, np.arange(net_max + 1, dtype=np.float64))
+
+
+def _column(values: np.ndarray):
+    if np.all(values == np.round(values)) and np.abs(values).max(initial=0) < 2 ** 31:
+        return values.astype('<i4'), 'int32'
+    return values.astype('<f8'), 'float64'
+
+
+def build_tables(rules: Dict[str, Any], path: str, gross_max: int = DEFAULT_GROSS_MAX,
+                 **options) -> Dict[str, Any]:
+    """Compute every column for every sector and write the binary table file"""
+    gross = np.arange(gross_max + 1, dtype=np.float64)
+    header = {'version': rules_version(rules, options), 'options': options,
+              'gross_max': gross_max, 'fields': list(TABLE_FIELDS), 'sectors': {}}
+    blobs = []
+    offset = 0
+
+    def add(array: np.ndarray) -> int:
+        nonlocal offset
+        start = offset
+        blobs.append(array.tobytes())
+        offset += len(blobs[-1])
+        padding = -offset % ALIGNMENT
+        if padding:
+            blobs.append(b'\0' * padding)
+            offset += padding
+        return start
+
+    for sector in SECTORS:
+        res = calculate_salary_results(gross, sector, rules, **options)
+        minimum = int(sector_minimum(rules, sector))
+        columns = {}
+        for field in TABLE_FIELDS:
+            data, dtype = _column(res[field])
+            columns[field] = {'offset': add(data), 'dtype': dtype}
+        net_max = int(max(res['net'].max(), 0))
+        inverse = inverse_index(res['net'], minimum, net_max)
+        header['sectors'][sector] = {
+            'minimum': minimum,
+            'breakdown': res['breakdown'],
+            'columns': columns,
+            'inverse': {'offset': add(inverse), 'dtype': 'int32', 'length': net_max + 1},
+        }
+
+    # Column offsets are relative to the data section, which starts on the next aligned boundary
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    prefix = len(MAGIC) + 8 + len(header_bytes)
+
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC + struct.pack('<II', FORMAT_VERSION, len(header_bytes)) + header_bytes)
+        f.write(b'\0' * (-prefix % ALIGNMENT))
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, path)
+    return header
+
+
+def _read_header(path: str) -> Tuple[Dict[str, Any], int]:
+    """(JSON header, its byte length) of a table file"""
+    with open(path, 'rb') as f:
+        magic = f.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a salary table file")
+        fmt, length = struct.unpack('<II', f.read(8))
+        if fmt != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported table format {fmt}")
+        return json.loads(f.read(length).decode('utf-8')), length
+
+
+def covers(path: str, gross_max: int) -> bool:
+    """True if the table file exists and goes up to at least gross_max"""
+    if not os.path.exists(path):
+        return False
+    try:
+        return _read_header(path)[0]['gross_max'] >= gross_max
+    except (ValueError, KeyError, struct.error):
+        return False
+
+
+def ensure_tables(rules: Dict[str, Any], out_dir: str = TABLE_DIR,
+                  gross_max: int = DEFAULT_GROSS_MAX, **options) -> str:
+    """Path of the table file for this rules version, building it if missing or smaller than gross_max"""
+    path = os.path.join(out_dir, table_filename(rules_version(rules, options)))
+    if not covers(path, gross_max):
+        build_tables(rules, path, gross_max, **options)
+    return path
+
+
+class SalaryTables:
+    """Memory-mapped reader: O(1) brut->net and net->brut lookups"""
+
+    def __init__(self, path: str):
+        self.header, length = _read_header(path)
+        prefix = len(MAGIC) + 8 + length
+        self.path = path
+        self.gross_max = self.header['gross_max']
+        self._map = np.memmap(path, dtype=np.uint8, mode='r')
+        self._columns = {}
+        base = prefix + (-prefix % ALIGNMENT)
+        for sector, info in self.header['sectors'].items():
+            for field, col in info['columns'].items():
+                self._columns[sector, field] = self._view(base + col['offset'], col['dtype'], self.gross_max + 1)
+            inverse = info['inverse']
+            self._columns[sector, 'inverse'] = self._view(base + inverse['offset'], 'int32', inverse['length'])
+
+    def _view(self, offset: int, dtype: str, count: int) -> np.ndarray:
+        dt = np.dtype('<i4' if dtype == 'int32' else '<f8')
+        return np.frombuffer(self._map, dtype=dt, count=count, offset=offset)
+
+    @property
+    def version(self) -> Dict[str, Any]:
+        return self.header['version']
+
+    def lookup(self, sector: str, gross) -> Optional[Dict[str, Any]]:
+        """Full result for integer gross (scalar or array), None when outside the table"""
+        if np.ndim(gross) == 0:
+            if not np.isfinite(gross) or gross != int(gross) or not 0 <= gross <= self.gross_max:
+                return None
+            row = int(gross)
+            res = {'gross': float(row)}
+            for field in TABLE_FIELDS:
+                res[field] = float(self._columns[sector, field][row])
+            res['breakdown'] = dict(self.header['sectors'][sector]['breakdown'])
+            return res
+        index = np.asarray(gross)
+        if np.any(index != np.floor(index)) or np.any(index < 0) or np.any(index > self.gross_max):
+            return None
+        index = index.astype(np.int64)
+        res = {'gross': index.astype(np.float64)}
+        for field in TABLE_FIELDS:
+            res[field] = self._columns[sector, field][index].astype(np.float64)
+        res['breakdown'] = dict(self.header['sectors'][sector]['breakdown'])
+        return res
+
+    def net_to_gross(self, sector: str, net) -> Optional[Dict[str, Any]]:
+        """Inverse index: full result for the gross matching an integer net, None when not covered"""
+        inverse = self._columns[sector, 'inverse']
+        if np.ndim(net) == 0:
+            if not np.isfinite(net) or net != int(net) or not 0 <= net < len(inverse) or inverse[int(net)] < 0:
+                return None
+            return self.lookup(sector, int(inverse[int(net)]))
+        index = np.asarray(net)
+        if np.any(index != np.floor(index)) or np.any(index < 0) or np.any(index >= len(inverse)):
+            return None
+        gross = inverse[index.astype(np.int64)]
+        if np.any(gross < 0):
+            return None
+        return self.lookup(sector, gross)
+
+    def close(self):
+        self._columns.clear()
+        self._map = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute memory-mappable salary lookup tables")
+    parser.add_argument('--rules', default=None, help="fiscal_rules JSON document")
+    parser.add_argument('--base-url', default='http://localhost:3000', help="API to fetch rules from when --rules is not given")
+    parser.add_argument('--year', type=int, default=2026)
+    parser.add_argument('--gross-max', type=int, default=DEFAULT_GROSS_MAX)
+    parser.add_argument('--out-dir', default=TABLE_DIR)
+    parser.add_argument('--force', action='store_true', help="rebuild even if the version already exists and covers --gross-max")
+    parser.add_argument('--lookup', type=float, default=None, help="print the row for this gross")
+    args = parser.parse_args()
+
+    rules = load_rules(args.rules, args.base_url, args.year)
+    path = os.path.join(args.out_dir, table_filename(rules_version(rules)))
+
+    started = time.perf_counter()
+    if args.force or not covers(path, args.gross_max):
+        build_tables(rules, path, args.gross_max)
+        print(f"🔨 Built {path} ({os.path.getsize(path) / 1e6:.1f} MB) in {time.perf_counter() - started:.2f}s")
+    else:
+        print(f"✅ Up to date: {path}")
+
+    if args.lookup is not None:
+        tables = SalaryTables(path)
+        for sector in SECTORS:
+            row = tables.lookup(sector, args.lookup)
+            if row is None:
+                print(f"❌ {args.lookup:g} is outside the table")
+                break
+            print(f"{sector:<13} net {row['net']:>9g}  cas {row['cas']:>7g}  cass {row['cass']:>7g}"
+                  f"  tax {row['incomeTax']:>7g}  cost {row['totalCost']:>9g}")
+        tables.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
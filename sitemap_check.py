@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Sitemap Checker for eCalc RO
+Stream-parses the sitemap index (/sitemap.xml) and every shard it lists
+(/sitemaps/<section>[-<year>].xml) with iterparse, clearing each element as
+soon as it is checked, so memory stays flat however many URLs there are.
+
+Checks: sitemap namespace and root elements, at most 50,000 URLs / 50 MB per
+shard, absolute https URLs on the expected host, no URL in more than one place
+(8-byte digests in a flat array, not the URLs themselves), valid W3C lastmod
+dates that are not in the future, each shard's lastmod >= its URLs' lastmod,
+and an index that does not change between two reads (stable lastModified).
+
+Usage:
+    python sitemap_check.py --from-lib
+    python sitemap_check.py --base-url http://localhost:3000 --report test_reports/sitemap.json
+    python sitemap_check.py --dir exported_sitemaps
+"""
+
+import argparse
+import array
+import contextlib
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+INDEX_PATH = '/sitemap.xml'
+EXPECTED_HOST = 'ecalc.ro'
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024
+MAX_ERRORS_LISTED = 20
+
+W3C_DATE = re.compile(r'^\d{4}(-\d{2}(-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:\d{2}))?)?)?$')
+
+EXPORT_SCRIPT = """
+import { mkdirSync, writeFileSync } from 'fs';
+import { getSitemapShards, renderSitemapIndex, renderUrlSet } from './lib/sitemap-shards.js';
+
+const out = process.argv[1];
+const shards = getSitemapShards();
+mkdirSync(`${out}/sitemaps`, { recursive: true });
+writeFileSync(`${out}/sitemap.xml`, renderSitemapIndex(shards));
+for (const shard of shards) writeFileSync(`${out}/sitemaps/${shard.id}.xml`, renderUrlSet(shard));
+"""
+
+Opener = Callable[[str], Any]
+
+
+def _digest(loc: str) -> int:
+    return int.from_bytes(hashlib.blake2b(loc.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class CountingReader:
+    """File-like wrapper that counts the bytes handed to the parser"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.raw.read(size)
+        self.bytes += len(chunk)
+        return chunk
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[date]:
+    """W3C datetime -> date, None when missing or malformed"""
+    if not value or not W3C_DATE.match(value.strip()):
+        return None
+    value = value.strip()
+    if len(value) <= 10:
+        parts = [int(p) for p in value.split('-')] + [1, 1]
+        try:
+            return date(parts[0], parts[1], parts[2])
+        except ValueError:
+            return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone(timezone.utc).date()
+    except ValueError:
+        return None
+
+
+def iter_entries(stream, root_tag: str, entry_tag: str) -> Iterator[Tuple[Optional[str], Optional[str]]]:
+    """(loc, lastmod) per entry; raises ValueError when the root element is wrong"""
+    root = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+                if elem.tag != SITEMAP_NS + root_tag:
+                    raise ValueError(f"root element is {elem.tag}, expected {SITEMAP_NS}{root_tag}")
+            continue
+        if elem.tag == SITEMAP_NS + entry_tag:
+            yield elem.findtext(SITEMAP_NS + 'loc'), elem.findtext(SITEMAP_NS + 'lastmod')
+            elem.clear()
+            root.clear()  # drop the references the root keeps to finished children
+
+
+def http_opener(base_url: str) -> Opener:
+    import requests
+    session = requests.Session()
+
+    @contextlib.contextmanager
+    def open_path(path: str):
+        response = session.get(f"{base_url.rstrip('/')}{path}", stream=True, timeout=60)
+        try:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield response.raw
+        finally:
+            response.close()
+    return open_path
+
+
+def dir_opener(folder: str) -> Opener:
+    def open_path(path: str):
+        return open(os.path.join(folder, path.lstrip('/')), 'rb')
+    return open_path
+
+
+def export_from_lib(folder: str):
+    """Render lib/sitemap-shards.js into folder (sitemap.xml + sitemaps/*.xml) with node"""
+    node = shutil.which('node')
+    if node is None:
+        raise RuntimeError("node is not installed")
+    root = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run([node, '--input-type=module', '-e', EXPORT_SCRIPT, folder],
+                          capture_output=True, text=True, cwd=root, timeout=120)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+
+
+class SitemapChecker:
+    def __init__(self, opener: Opener, expected_host: str = EXPECTED_HOST, today: Optional[date] = None):
+        self.open = opener
+        self.expected_host = expected_host
+        self.today = today or datetime.now(timezone.utc).date()
+        self.errors: List[str] = []
+        self.error_count = 0
+        self._digests = array.array('Q')
+
+    def error(self, message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS_LISTED:
+            self.errors.append(message)
+
+    def _check_loc(self, where: str, loc: Optional[str]) -> bool:
+        parts = urlsplit(loc or '')
+        if parts.scheme != 'https' or not parts.netloc:
+            self.error(f"{where}: not an absolute https URL: {loc!r}")
+            return False
+        if self.expected_host and parts.hostname != self.expected_host:
+            self.error(f"{where}: unexpected host {parts.hostname} in {loc}")
+        self._digests.append(_digest(loc))
+        return True
+
+    def _duplicates(self) -> set:
+        digests = np.sort(np.frombuffer(self._digests, dtype=np.uint64))
+        return set(digests[1:][digests[1:] == digests[:-1]].tolist())
+
+    def _report_duplicates(self, index, duplicates: set):
+        """Second streaming pass, only when the digests collided: name the repeated URLs"""
+        seen = set()
+        sources = [(INDEX_PATH, index)]
+        for loc, _ in index:
+            path = urlsplit(loc or '').path
+            with contextlib.suppress(OSError, ValueError, ET.ParseError), self.open(path) as raw:
+                sources.append((path, [(url, None) for url, _ in iter_entries(raw, 'urlset', 'url')
+                                       if url and _digest(url) in duplicates]))
+        for where, entries in sources:
+            for loc, _ in entries:
+                if not loc or _digest(loc) not in duplicates:
+                    continue
+                if loc in seen:
+                    self.error(f"{where}: duplicate URL {loc}")
+                seen.add(loc)
+
+    def _check_lastmod(self, where: str, value: Optional[str]) -> Optional[date]:
+        parsed = parse_lastmod(value)
+        if parsed is None:
+            self.error(f"{where}: invalid lastmod {value!r}")
+        elif parsed > self.today:
+            self.error(f"{where}: lastmod {value} is in the future")
+        return parsed
+
+    def read_index(self) -> List[Tuple[Optional[str], Optional[str]]]:
+        with self.open(INDEX_PATH) as raw:
+            return list(iter_entries(raw, 'sitemapindex', 'sitemap'))
+
+    def check_shard(self, loc: str, index_lastmod: Optional[date]) -> Dict[str, Any]:
+        path = urlsplit(loc).path
+        urls, newest = 0, None
+        try:
+            with self.open(path) as raw:
+                reader = CountingReader(raw)
+                for url, lastmod in iter_entries(reader, 'urlset', 'url'):
+                    urls += 1
+                    self._check_loc(path, url)
+                    parsed = self._check_lastmod(f"{path} {url}", lastmod)
+                    if parsed and (newest is None or parsed > newest):
+                        newest = parsed
+                size = reader.bytes
+        except (OSError, ValueError, ET.ParseError) as e:
+            self.error(f"{path}: {e}")
+            return {'loc': loc, 'urls': urls, 'bytes': 0, 'ok': False}
+
+        if urls == 0:
+            self.error(f"{path}: no URLs")
+        if urls > MAX_URLS:
+            self.error(f"{path}: {urls} URLs, more than {MAX_URLS}")
+        if size > MAX_BYTES:
+            self.error(f"{path}: {size} bytes, more than {MAX_BYTES}")
+        if index_lastmod and newest and newest > index_lastmod:
+            self.error(f"{path}: URLs modified {newest} after the shard lastmod {index_lastmod}")
+        return {'loc': loc, 'urls': urls, 'bytes': size, 'ok': True,
+                'lastmod': newest.isoformat() if newest else None}
+
+    def run(self, report_path: Optional[str] = None) -> Dict[str, Any]:
+        print(f"🗺️  Sitemap check (expected host: {self.expected_host or 'any'})")
+        print("-" * 80)
+        started = time.perf_counter()
+        tracemalloc.start()
+        shards = []
+        try:
+            index = self.read_index()
+            if not index:
+                self.error(f"{INDEX_PATH}: no shards listed")
+            shard_locs = set()
+            for loc, lastmod in index:
+                if not self._check_loc(INDEX_PATH, loc):
+                    continue
+                shard_locs.add(loc)
+                shard = self.check_shard(loc, self._check_lastmod(f"{INDEX_PATH} {loc}", lastmod))
+                shards.append(shard)
+                print(f"{'✅' if shard['ok'] else '❌'} {urlsplit(loc).path:<40}{shard['urls']:>8} URLs"
+                      f"{shard['bytes'] / 1024:>10.1f} KB")
+            duplicates = self._duplicates()
+            if duplicates:
+                self._report_duplicates(index, duplicates)
+            stable = self.read_index() == index
+            if not stable:
+                self.error(f"{INDEX_PATH}: changed between two reads (unstable lastmod)")
+        except (OSError, ValueError, ET.ParseError) as e:
+            self.error(f"{INDEX_PATH}: {e}")
+            stable = False
+        finally:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        results = {
+            'shards': len(shards),
+            'urls': sum(s['urls'] for s in shards),
+            'bytes': sum(s['bytes'] for s in shards),
+            'stable': stable,
+            'seconds': time.perf_counter() - started,
+            'peak_memory_bytes': peak,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'shard_details': shards,
+        }
+        print("-" * 80)
+        for message in self.errors:
+            print(f"   - {message}")
+        status = '✅' if self.error_count == 0 else '❌'
+        print(f"{status} {results['shards']} shard(s), {results['urls']:,} URLs, {results['bytes'] / 1e6:.2f} MB, "
+              f"peak {peak / 1024:.0f} KB, {self.error_count} error(s)")
+
+        if report_path:
+            folder = os.path.dirname(report_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"📝 Report written to {report_path}")
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming sitemap index / shard validator")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--base-url', default=None, help="fetch /sitemap.xml and the shards from this server")
+    source.add_argument('--dir', default=None, help="check an exported folder (sitemap.xml + sitemaps/*.xml)")
+    source.add_argument('--from-lib', action='store_true', help="render lib/sitemap-shards.js with node and check it")
+    parser.add_argument('--expected-host', default=EXPECTED_HOST, help="host every URL must use ('' = any)")
+    parser.add_argument('--report', default=None, help="write JSON results to this path")
+    args = parser.parse_args()
+
+    if args.dir:
+        results = SitemapChecker(dir_opener(args.dir), args.expected_host).run(args.report)
+    elif args.base_url:
+        results = SitemapChecker(http_opener(args.base_url), args.expected_host).run(args.report)
+    else:
+        with tempfile.TemporaryDirectory() as folder:
+            export_from_lib(folder)
+            results = SitemapChecker(dir_opener(folder), args.expected_host).run(args.report)
+    return 0 if results['error_count'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+// JS side of tests/test_salary_engine.py
+// stdin: { db, grossGrid, netGrid, sectors, options } -> stdout: results + timings per sector
+import { SalaryCalculator, calculateSalaryResults } from '../lib/salary-engine.js';
+import { mapDbToFiscalRules } from '../lib/data-mapper.js';
+
+const FIELDS = ['gross', 'net', 'cas', 'cass', 'incomeTax', 'personalDeduction', 'taxableIncome', 'untaxedAmount', 'cam', 'totalCost'];
+
+const readStdin = () => new Promise(resolve => {
+    let data = '';
+    process.stdin.on('data', chunk => data += chunk);
+    process.stdin.on('end', () => resolve(JSON.parse(data)));
+});
+
+const timed = fn => {
+    const t0 = performance.now();
+    const out = fn();
+    return [out, (performance.now() - t0) / 1000];
+};
+
+const columns = results => Object.fromEntries(FIELDS.map(f => [f, results.map(r => r[f])]));
+
+const input = await readStdin();
+const rules = mapDbToFiscalRules(input.db);
+const out = { sectors: {} };
+
+for (const sector of input.sectors) {
+    const options = { ...input.options, sector };
+    const calc = new SalaryCalculator(rules);
+
+    const [brut, tBrut] = timed(() => input.grossGrid.map(g => calculateSalaryResults(g, 'brut-net', sector, rules, input.options)));
+    const [inverse, tInverse] = timed(() => calc.calculateNetToGrossBatch(input.netGrid, sector, options));
+    const [search, tSearch] = timed(() => input.netGrid.map(n => calc._searchNetToGross(n, sector, options)));
+    const costGrid = input.grossGrid.map(g => g * 1.0225);
+    const [, tCost] = timed(() => costGrid.map(c => calc.calculateCostToNet(c, sector, options)));
+
+    out.sectors[sector] = {
+        brutNet: columns(brut),
+        netBrut: columns(inverse),
+        netBrutSearch: columns(search),
+        seconds: {
+            'js brut-net': tBrut,
+            'js net-brut': tInverse,
+            'js net-brut search': tSearch,
+            'js cost-net': tCost
+        }
+    };
+}
+
+console.log(JSON.stringify(out));
@@ -0,0 +1,97 @@
+"""
+Working-day calendar index (lib/calendar-index.js, calendar_index.py) vs the day-by-day loops.
+
+Run: python -m pytest -q tests
+"""
+
+import json
+import os
+import shutil
+import subprocess
+from datetime import date, timedelta
+
+import pytest
+
+from calendar_index import (HOLIDAYS_2025_2030, CalendarIndex, _run_js, loop_add_working_days,
+                            loop_working_days_between, make_queries)
+from tests.test_salary_engine import ROOT
+
+NODE = shutil.which('node')
+needs_node = pytest.mark.skipif(NODE is None, reason="node is not installed")
+
+DAYS = [date(2025, 1, 1) + timedelta(days=i) for i in range((date(2030, 12, 31) - date(2025, 1, 1)).days + 1)]
+
+JS_EFACTURA = """
+import { readFileSync } from 'fs';
+import { EFacturaCalculator, HOLIDAYS_2025, HOLIDAYS_2026 } from './lib/efactura-calculator.js';
+import { HOLIDAYS_2025_2030 } from './lib/holidays-calculator.js';
+
+const cases = JSON.parse(readFileSync(0, 'utf-8'));
+const calculator = new EFacturaCalculator({});
+const results = cases.map(([invoice, transmission]) => {
+    const delay = calculator.calculateDelayDays(invoice, transmission);
+    return [delay.deadline.deadlineString, delay.delayDays];
+});
+console.log(JSON.stringify({ results, lists: { 2025: HOLIDAYS_2025, 2026: HOLIDAYS_2026 }, HOLIDAYS_2025_2030 }));
+"""
+
+
+def _holiday_dates(year):
+    return [h['date'] for h in HOLIDAYS_2025_2030[year]]
+
+
+@pytest.fixture(scope='module')
+def indexes():
+    return {year: CalendarIndex(_holiday_dates(year)) for year in HOLIDAYS_2025_2030}
+
+
+@pytest.mark.parametrize('n', [0, 1, 5, 20, 60])
+def test_add_working_days_matches_loop(indexes, n):
+    for day in DAYS:
+        holidays = _holiday_dates(day.year)
+        assert indexes[day.year].add_working_days(day, n) == loop_add_working_days(day, n, holidays), day
+
+
+@pytest.mark.parametrize('span', [0, 6, 30, 400])
+def test_working_days_between_matches_loop(indexes, span):
+    for day in DAYS:
+        holidays = _holiday_dates(day.year)
+        end = day + timedelta(days=span)
+        assert indexes[day.year].count_working_days(day, end) == loop_working_days_between(day, end, holidays), day
+    assert indexes[2026].count_working_days('2026-03-10', '2026-03-09') == 0
+
+
+def test_is_working_day(indexes):
+    index = indexes[2026]
+    assert not index.is_working_day('2026-04-10')  # Vinerea Mare
+    assert not index.is_working_day('2026-03-07')  # sâmbătă
+    assert index.is_working_day('2026-03-09')
+
+
+@needs_node
+def test_js_holidays_calculator_matches_loops():
+    queries = make_queries(2025, 2030, 2000, seed=1)
+    out = _run_js(queries)
+    for (a, b, year, n), between, added in zip(queries, out['between'], out['added']):
+        holidays = _holiday_dates(year)
+        assert between == loop_working_days_between(a, b, holidays), (a, b, year)
+        assert added == loop_add_working_days(a, n, holidays).isoformat(), (a, n, year)
+
+
+@needs_node
+def test_js_efactura_deadlines_match_loops():
+    cases = [[day.isoformat(), (day + timedelta(days=k)).isoformat()]
+             for day in DAYS if day.year <= 2027 for k in (0, 3, 10, 40)]
+    proc = subprocess.run([NODE, '--input-type=module', '-e', JS_EFACTURA], input=json.dumps(cases),
+                          capture_output=True, text=True, cwd=ROOT, timeout=300, env=dict(os.environ, TZ='UTC'))
+    assert proc.returncode == 0, proc.stderr
+    out = json.loads(proc.stdout)
+
+    assert {int(y): h for y, h in out['HOLIDAYS_2025_2030'].items()} == HOLIDAYS_2025_2030
+    for (invoice, transmission), (deadline, delay) in zip(cases, out['results']):
+        holidays = out['lists']['2026' if int(invoice[:4]) >= 2026 else '2025']
+        expected = loop_add_working_days(invoice, 5, holidays)
+        assert deadline == expected.isoformat(), invoice
+        expected_delay = 0 if transmission <= expected.isoformat() else \
+            loop_working_days_between(expected + timedelta(days=1), transmission, holidays)
+        assert delay == expected_delay, (invoice, transmission)
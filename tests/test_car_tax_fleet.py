@@ -0,0 +1,97 @@
+"""
+Fleet mode of the car tax calculator (lib/car-tax-fleet.js, car_tax_fleet.mjs) against
+CarTaxCalculator.calculate, the single-vehicle path.
+
+Run: python -m pytest -q tests
+"""
+
+import csv
+import json
+import subprocess
+
+import pytest
+
+from tests.test_salary_engine import NODE, ROOT
+
+pytestmark = pytest.mark.skipif(NODE is None, reason="node is not installed")
+
+# Every (type, norm, capacity, locality, price) combination through both paths
+JS_PARITY = """
+import { CarTaxCalculator, EURO_NORMS, LOCATION_COEFFICIENTS, VEHICLE_TYPES } from './lib/car-tax-calculator.js';
+import { CarTaxFleet } from './lib/car-tax-fleet.js';
+
+const fiscalRules = JSON.parse(process.argv[1]);
+const single = new CarTaxCalculator(fiscalRules);
+const fleet = new CarTaxFleet(fiscalRules);
+const types = [...Object.keys(VEHICLE_TYPES), 'microbuz'];
+const norms = [...Object.keys(EURO_NORMS), 'electric', 'euro_7'];
+const capacities = [50, 999, 1600, 1601, 2000, 2001, 2600, 2601, 3000, 3001, 4400, 12001];
+const locations = [...Object.keys(LOCATION_COEFFICIENTS), 'București', 'Cluj-Napoca', 'Vaslui'];
+const fields = ['fractions', 'ratePerFraction', 'baseTax', 'locationCoefficient', 'luxuryTax', 'finalTax', 'quarterly', 'monthly'];
+let checked = 0;
+const mismatches = [];
+for (const vehicleType of types) for (const euroNorm of norms) for (const engineCC of capacities)
+  for (const location of locations) for (const purchasePrice of [0, 375000, 512345]) {
+    const vehicle = { vehicleType, euroNorm, engineCC, location, purchasePrice };
+    const expected = single.calculate(vehicle);
+    const actual = fleet.taxFor(vehicle);
+    checked++;
+    const diff = fields.filter(f => (expected[f] ?? 0) !== actual[f]);
+    if (diff.length && mismatches.length < 5) mismatches.push({ vehicle, diff, expected: expected.finalTax, actual: actual.finalTax });
+  }
+console.log(JSON.stringify({ checked, mismatches }));
+"""
+
+
+def run_node(args, **kwargs):
+    proc = subprocess.run([NODE, '--no-warnings'] + args, capture_output=True, text=True, cwd=ROOT, timeout=120, **kwargs)
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout
+
+
+@pytest.mark.parametrize('rules', [
+    {},
+    # Admin rates with missing cells (-> 19.5 / 9.5 fallbacks) and a lower luxury threshold
+    {'car_tax': {'rates': {'sub_1600': {'euro_6': 20, 'hibrid': 0}, 'peste_3000': {'euro_0_3': 400}},
+                 'motorcycle_rates': {'peste_1600': {'euro_4': 16}}, 'luxury_threshold': 300000}},
+], ids=['rates-2026', 'admin-rates'])
+def test_fleet_matches_single_vehicle_path(rules):
+    out = json.loads(run_node(['--input-type=module', '-e', JS_PARITY, json.dumps(rules)]))
+    assert out['checked'] > 100000 and out['mismatches'] == []
+
+
+def test_csv_fleet_streams_per_vehicle_and_totals(tmp_path):
+    fleet = tmp_path / 'fleet.csv'
+    fleet.write_text(
+        '\ufeffNr_Inmatriculare,CMC,Tip,Norma,Combustibil,Localitate,Pret\n'
+        'B-01-ABC,1998,autoturism,Euro 6,Benzina,București,\n'
+        'CJ-02-XYZ,2995,SUV,euro-5,motorina,cluj-napoca,480000\n'
+        'IS-03-EEE,,electric,,electric,Iași,\n'
+        'VS-04-AAA,1400,autoturism,euro_4,gpl,"Vaslui, jud. Vaslui",\n'
+        'B-05-ERR,abc,autoturism,euro_6,benzina,București,\n'
+        'B-06-ERR,,autoturism,euro_6,benzina,București,\n', encoding='utf-8')
+    out, report = tmp_path / 'taxes.csv', tmp_path / 'report.json'
+    stdout = run_node(['car_tax_fleet.mjs', str(fleet), '--out', str(out), '--report', str(report)])
+    assert '4 vehicule' in stdout and '2 rând(uri) cu erori' in stdout
+
+    with open(out, encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [r['vehicle_id'] for r in rows] == ['B-01-ABC', 'CJ-02-XYZ', 'IS-03-EEE', 'VS-04-AAA', 'B-05-ERR', 'B-06-ERR']
+    # 1998 cmc -> 10 fractions x 25.1 (Euro 6, 1601-2000) x 1.16 (București)
+    assert rows[0]['fractions'] == '10' and rows[0]['finalTax'] == str(round(251 * 1.16))
+    assert rows[1]['euroNorm'] == 'euro_5' and rows[1]['luxuryTax'] == str(round(105000 * 0.009))
+    assert rows[2]['finalTax'] == '40' and rows[2]['error'] == ''
+    assert rows[3]['location'] == 'Vaslui, jud. Vaslui' and rows[3]['locationCoefficient'] == '1'
+    assert rows[4]['error'] == 'engineCC invalid: abc' and rows[5]['error'] == 'engineCC lipsă'
+
+    totals = json.loads(report.read_text(encoding='utf-8'))['totals']
+    assert totals['vehicles'] == 4 and totals['errors'] == 2
+    assert totals['finalTax'] == sum(int(r['finalTax']) for r in rows[:4])
+    assert totals['byLocation']['București'] == {'vehicles': 1, 'tax': int(rows[0]['finalTax'])}
+    assert totals['unknownLocations'] == {'Vaslui, jud. Vaslui': 1}
+
+
+def test_benchmark_against_calculate_loop():
+    results = json.loads(run_node(['bench_car_tax_fleet.mjs', '5000', '--json']))
+    assert results['totalsMatch'] and results['vehicles'] == 5000
+    assert results['speedup'] > 1  # ~5x here
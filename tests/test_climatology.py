@@ -0,0 +1,200 @@
+"""
+Climatology store (climatology_store.py / lib/climatology-store.js) ingested from the archive stand-in.
+
+Run: python -m pytest -q tests
+"""
+
+import json
+import os
+import shutil
+import subprocess
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from climatology_store import DAYS, ClimatologyStore, build_store, export_locations
+from mock_archive_server import MockArchiveServer, synthetic_day
+from tests.test_salary_engine import ROOT
+
+NODE = shutil.which('node')
+
+LOCATIONS = [
+    {'slug': 'bucuresti', 'name': 'București', 'kind': 'city', 'county': 'București'},
+    {'slug': 'santana', 'name': 'Sântana', 'kind': 'city', 'county': 'Arad'},
+    {'slug': 'cluj-napoca', 'name': 'Cluj-Napoca', 'kind': 'city', 'county': 'Cluj'},
+    {'slug': 'sinaia', 'name': 'Sinaia', 'kind': 'resort'},
+    {'slug': 'vama-veche', 'name': 'Vama Veche', 'kind': 'resort'},
+    {'slug': 'varful-omu', 'name': 'Vârful Omu', 'kind': 'peak'},
+    {'slug': 'atlantis', 'name': 'Atlantis', 'kind': 'resort'},
+]
+# The geocoder knows the peak only as "Varful Omu, Romania", and Atlantis not at all
+UNKNOWN = ['Vârful Omu', 'Vârful Omu, Romania', 'Atlantis', 'Atlantis, Romania']
+
+JS_LOOKUP = """
+import * as fs from 'fs';
+import { ClimatologyStore } from './lib/climatology-store.js';
+import { getHistoricalWeather, describeWeather } from './lib/weather-data.js';
+
+const [path, queries] = JSON.parse(process.argv[1]);
+const file = ClimatologyStore.openFile(fs, path);
+const memory = ClimatologyStore.fromBuffer(fs.readFileSync(path));
+globalThis.fetch = () => { throw new Error('no network expected'); };
+const weather = [];
+for (const [slug, month, day] of queries) {
+    const date = `2024-${String(month).padStart(2, '0')}-${String(day).padStart(2, '0')}`;
+    weather.push([await getHistoricalWeather(date, slug), describeWeather(...Object.values(file.lookup(slug, month, day) ?? { t: 0, p: 0 }))]);
+}
+console.log(JSON.stringify({
+    file: queries.map(([slug, month, day]) => file.lookup(slug, month, day)),
+    memory: queries.map(([slug, month, day]) => memory.lookup(slug, month, day)),
+    weather
+}));
+"""
+
+
+def expected_means(lat, lon, years):
+    """Per-slot means straight from the stand-in's generator"""
+    sums = np.zeros((DAYS, 2))
+    counts = np.zeros((DAYS, 2))
+    day = date(years[0], 1, 1)
+    while day <= date(years[1], 12, 31):
+        slot = (date(2024, day.month, day.day) - date(2024, 1, 1)).days
+        for field, value in enumerate(synthetic_day(lat, lon, day)):
+            if value is not None:
+                sums[slot, field] += value
+                counts[slot, field] += 1
+        day += timedelta(days=1)
+    with np.errstate(invalid='ignore'):
+        return sums / counts
+
+
+@pytest.fixture(scope='module')
+def built(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('climatology') / 'climatology.bin')
+    with MockArchiveServer(unknown_names=UNKNOWN) as server:
+        summary = build_store(path, LOCATIONS, (2019, 2021), server.base_url, server.base_url, batch_size=2)
+        counts = (server.archive_requests, server.geocoding_requests)
+    return path, summary, counts
+
+
+def test_ingestion_batches_and_geocoding(built):
+    path, summary, (archive, geocoding) = built
+    assert summary['unresolved'] == ['atlantis'] and summary['failed'] == []
+    assert summary['locations'] == 6 and archive == 3  # 6 locations, 2 per archive request
+    # peak: name, "name, Romania", then "Varful Omu, Romania"; Atlantis: name and "name, Romania"
+    assert geocoding == 5 + 3 + 2
+    store = ClimatologyStore(path)
+    assert [loc['slug'] for loc in store.locations] == [loc['slug'] for loc in LOCATIONS[:6]]
+    assert store.header['years'] == [2019, 2021]
+
+
+def test_store_holds_day_of_year_means(built):
+    store = ClimatologyStore(built[0])
+    for location in store.locations:
+        expected = expected_means(location['lat'], location['lon'], (2019, 2021))
+        values = store.series(location['slug'])
+        ok = ~np.isnan(expected)
+        assert np.abs(values[ok] - expected[ok]).max() <= 0.05 + 1e-9  # 0.1 resolution
+        assert not np.isnan(values).any()
+    # 29 February comes from 2020 alone
+    assert store.series('bucuresti')[59] == pytest.approx(expected_means(
+        store.locations[0]['lat'], store.locations[0]['lon'], (2020, 2020))[59], abs=0.051)
+    assert store.lookup('nowhere', 1, 1) is None
+
+
+def test_refresh_reuses_coordinates_and_fills_feb_29(built, tmp_path):
+    previous = ClimatologyStore(built[0])
+    path = str(tmp_path / 'refresh.bin')
+    with MockArchiveServer(fault_rate=0.3, seed=3) as server:
+        summary = build_store(path, LOCATIONS[:6], (2021, 2022), server.base_url, server.base_url,
+                              batch_size=4, previous=previous, backoff=0)
+        assert server.geocoding_requests == 0
+    assert summary['reused_coordinates'] == 6 and summary['requests']['retries'] > 0 and not summary['failed']
+
+    store = ClimatologyStore(path)
+    values = store.series('sinaia')
+    assert not np.isnan(values).any()
+    assert values[59, 0] == pytest.approx((values[58, 0] + values[60, 0]) / 2, abs=0.051)
+
+
+@pytest.mark.skipif(NODE is None, reason="node is not installed")
+def test_js_reader_matches_memmap_without_network(built):
+    path = built[0]
+    store = ClimatologyStore(path)
+    queries = [[loc['slug'], month, day] for loc in store.locations for month, day in ((1, 1), (2, 29), (7, 15), (12, 31))]
+    queries.append(['nowhere', 3, 1])
+    proc = subprocess.run([NODE, '--input-type=module', '-e', JS_LOOKUP, json.dumps([path, queries])],
+                          capture_output=True, text=True, cwd=ROOT, timeout=60,
+                          env={'PATH': os.environ['PATH'], 'CLIMATOLOGY_PATH': path})
+    assert proc.returncode == 0, proc.stderr
+    out = json.loads(proc.stdout)
+    expected = [store.lookup(slug, month, day) for slug, month, day in queries]
+    assert out['file'] == out['memory'] == expected
+    # 2024 dates are answered from the store (fetch throws), labelled from the stored means
+    for (slug, month, day), (weather, direct) in zip(queries[:-1], out['weather']):
+        assert weather == direct, (slug, month, day)
+
+
+@pytest.mark.skipif(NODE is None, reason="node is not installed")
+def test_every_vreme_location_is_ingested():
+    locations = export_locations()
+    slugs = [loc['slug'] for loc in locations]
+    assert len(slugs) == len(set(slugs)) and 'bucuresti' in slugs and 'sinaia' in slugs
+    assert {loc['kind'] for loc in locations} == {'city', 'resort', 'peak'}
+
+
+# Browser: one cell through /api/climatology; server without a store: the live archive
+JS_FALLBACKS = """
+import { getHistoricalWeather, describeWeather } from './lib/weather-data.js';
+
+const [mode, cell] = JSON.parse(process.argv[1]);
+const urls = [];
+globalThis.fetch = async (url) => {
+    urls.push(String(url));
+    if (String(url).startsWith('/api/climatology/')) {
+        return cell ? { ok: true, json: async () => cell } : { ok: false, status: 503 };
+    }
+    return { ok: true, json: async () => ({ daily: { temperature_2m_mean: [12], precipitation_sum: [4] } }) };
+};
+if (mode === 'browser') globalThis.window = {};
+const weather = await getHistoricalWeather('2024-07-15', 'sinaia');
+console.log(JSON.stringify({ weather, urls, direct: describeWeather(12, 4) }));
+"""
+
+
+def run_fallbacks(mode, cell, tmp_path):
+    proc = subprocess.run([NODE, '--input-type=module', '-e', JS_FALLBACKS, json.dumps([mode, cell])],
+                          capture_output=True, text=True, cwd=ROOT, timeout=60,
+                          env={'PATH': os.environ['PATH'], 'CLIMATOLOGY_PATH': str(tmp_path / 'missing.bin')})
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout)
+
+
+@pytest.mark.skipif(NODE is None, reason="node is not installed")
+def test_browser_asks_the_api_and_missing_store_falls_back_to_archive(tmp_path):
+    out = run_fallbacks('browser', {'temp': 24.4, 'precip': 1.2, 'years': [2016, 2025]}, tmp_path)
+    assert out['urls'] == ['/api/climatology/sinaia?month=7&day=15']  # one cell, never the .bin
+    assert out['weather']['temp'] == '24°C'
+
+    for mode, cell in (('browser', None), ('server', None)):
+        out = run_fallbacks(mode, cell, tmp_path)
+        archive = [url for url in out['urls'] if 'archive-api.open-meteo.com' in url]
+        assert archive and all('-07-15' in url for url in archive), mode
+        assert out['weather'] == out['direct'], mode
+
+
+@pytest.mark.skipif(NODE is None, reason="node is not installed")
+@pytest.mark.parametrize('missing', ['python', 'numpy'])
+def test_prebuild_skips_without_python_dependencies(missing, tmp_path):
+    env = {'PATH': os.environ['PATH']}
+    if missing == 'python':
+        env['PYTHON'] = str(tmp_path / 'no-python3')
+    else:
+        # A shadowing module that fails like an uninstalled numpy
+        (tmp_path / 'numpy.py').write_text("raise ImportError('No module named numpy')\n", encoding='utf-8')
+        env['PYTHONPATH'] = str(tmp_path)
+    proc = subprocess.run([NODE, 'prebuild.mjs'], capture_output=True, text=True, cwd=ROOT, timeout=60, env=env)
+    assert proc.returncode == 0, proc.stderr
+    assert 'Skipping the climatology store' in proc.stderr and 'requirements.txt' in proc.stderr
+    assert ('not found' if missing == 'python' else 'numpy') in proc.stderr
@@ -0,0 +1,99 @@
+"""
+What-if impact of a fiscal_rules change (fiscal_impact.py), rules normalized with
+map_db_to_fiscal_rules (port of mapDbToFiscalRules, lib/data-mapper.js).
+
+Run: python -m pytest -q tests
+"""
+
+import json
+import math
+import subprocess
+import time
+
+import numpy as np
+import pytest
+
+from fiscal_impact import apply_overrides, impact, load_distribution, synthetic_distribution
+from salary_engine import SECTORS, calculate_salary_results, map_db_to_fiscal_rules
+from tests.test_salary_engine import NODE, ROOT, load_mock_db, needs_node
+
+JS_MAPPER = """
+import { mapDbToFiscalRules } from './lib/data-mapper.js';
+console.log(JSON.stringify(JSON.parse(process.argv[1]).map(mapDbToFiscalRules)));
+"""
+
+
+def _json_nan(value):
+    """JSON.stringify writes NaN as null"""
+    if isinstance(value, dict):
+        return {k: _json_nan(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_json_nan(v) for v in value]
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+@needs_node
+def test_mapper_matches_data_mapper_js():
+    db = load_mock_db()
+    quirky = apply_overrides(db, ['minimum_salary=""', 'cas_rate=null', 'it_tax_exempt="false"',
+                                  'show_year_comparison=null', 'cass_rate="10"', 'personal_deduction_base="x"'])
+    docs = [db, quirky, {'year': 2027}, {}]
+    proc = subprocess.run([NODE, '--input-type=module', '-e', JS_MAPPER, json.dumps(docs)],
+                          capture_output=True, text=True, cwd=ROOT, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    expected = json.loads(proc.stdout)
+    for doc, js in zip(docs, expected):
+        assert _json_nan(map_db_to_fiscal_rules(doc)) == js
+    mapped = map_db_to_fiscal_rules(quirky)['salary']
+    assert mapped['it_tax_exempt'] is True and mapped['cass_rate'] == 10.0  # JS truthiness / Number()
+
+
+def test_impact_matches_per_row_results():
+    db = load_mock_db()
+    proposed = apply_overrides(db, ['minimum_salary=4500', 'cas_rate=24'])
+    dist = synthetic_distribution(2000, db, seed=7)
+    result = impact(db, proposed, dist)
+    report = result['report']
+    assert report['changed_rules'] == {'cas_rate': [25.0, 24.0], 'minimum_salary': [4050.0, 4500.0]}
+
+    mapped = map_db_to_fiscal_rules(proposed)
+    for i in (0, 1, 17, 999, 1999):
+        row = calculate_salary_results(dist['gross'][i], SECTORS[dist['sector'][i]], mapped,
+                                       isBasicFunction=bool(dist['isBasicFunction'][i]),
+                                       mealVouchers=float(dist['mealVouchers'][i]),
+                                       voucherDays=float(dist['voucherDays'][i]),
+                                       isTaxExempt=bool(dist['isTaxExempt'][i]),
+                                       isYouthExempt=bool(dist['isYouthExempt'][i]))
+        assert result['after']['net'][i] == row['net'] and result['after']['cam'][i] == row['cam']
+
+    total = report['total']
+    assert total['rows'] == sum(s['rows'] for s in report['sectors'].values()) == 2000
+    assert total['net']['delta'] == pytest.approx(float((result['after']['net'] - result['before']['net']).sum()))
+    assert total['winners'] + total['losers'] <= 2000 and total['cas']['delta'] < 0
+
+
+def test_minimum_wage_increase_moves_rows_across_the_untaxed_cliff(tmp_path):
+    db = load_mock_db()
+    path = tmp_path / 'salaries.csv'
+    grosses = [4050, 4300, 4301, 5000, 5001, 6500]
+    path.write_text('gross,sector,isBasicFunction\n' + ''.join(f"{g},standard,da\n" for g in grosses)
+                    + '7000,it,\nn/a,standard,\n3000,shipping,\n', encoding='utf-8')
+    dist = load_distribution(str(path))
+    assert dist['skipped'] == 2 and len(dist['gross']) == 7 and dist['isBasicFunction'].all()
+
+    report = impact(db, apply_overrides(db, ['minimum_salary=5000']), dist)['report']
+    # The 300 lei untaxed amount applies up to the minimum wage: 4050 keeps it, (4050, 5000] gains it
+    assert report['cliffs']['untaxed_amount'] == {'entered': 3, 'left': 0, 'by_sector': {
+        'standard': [3, 0], 'it': [0, 0], 'construction': [0, 0], 'agriculture': [0, 0]}}
+    assert report['cliffs']['below_minimum']['entered'] == sum(1 for g in grosses if 4050 <= g < 5000)
+    assert report['changed_rules'] == {'minimum_salary': [4050.0, 5000.0]}
+
+
+def test_million_salaries_in_one_batch():
+    db = load_mock_db()
+    dist = synthetic_distribution(1_000_000, db, seed=1)
+    started = time.perf_counter()
+    report = impact(db, apply_overrides(db, ['minimum_salary=5000']), dist)['report']
+    assert time.perf_counter() - started < 10  # ~1s here; generous bound for slow CI
+    assert report['rows'] == 1_000_000 and np.isfinite(report['total']['net']['delta'])
+    assert report['cliffs']['untaxed_amount']['entered'] > 0
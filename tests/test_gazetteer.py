@@ -0,0 +1,172 @@
+"""
+Build-time gazetteer (gazetteer_index.py / lib/gazetteer.js) against the geocoding stand-in.
+
+Run: python -m pytest -q tests
+"""
+
+import json
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from gazetteer_index import build_index, export_entries, read_coordinates
+from mock_archive_server import MockArchiveServer
+from tests.test_salary_engine import ROOT
+
+NODE = shutil.which('node')
+pytestmark = pytest.mark.skipif(NODE is None, reason="node is not installed")
+
+# Loads a generated module into the index, then resolves slugs with a counting fetch
+JS_RESOLVE = """
+import { getSitemapShards } from './lib/sitemap-shards.js';
+import { countyLocalities, geocodeLocation, nearbyPlaces, resolveLocation } from './lib/gazetteer.js';
+import { GAZETTEER_COORDINATES } from './lib/gazetteer-coordinates.js';
+import { ROMANIA_COUNTIES } from './lib/counties-data.js';
+
+const [modulePath, slugs] = JSON.parse(process.argv[1]);
+if (modulePath) Object.assign(GAZETTEER_COORDINATES, (await import(modulePath)).GAZETTEER_COORDINATES);
+
+const queries = [];
+const fetchImpl = async (url) => {
+    const name = new URL(url).searchParams.get('name');
+    queries.push(name);
+    const results = name === 'Baia Mare' ? [{ latitude: 47.65, longitude: 23.57, name, admin1: 'Maramureș' }] : undefined;
+    return { json: async () => ({ results }) };
+};
+const resolved = {};
+for (const slug of slugs) {
+    const before = queries.length;
+    resolved[slug] = { location: await geocodeLocation(slug, { fetchImpl }), queries: queries.slice(before) };
+}
+const sitemapSlugs = getSitemapShards().flatMap(shard => shard.urls)
+    .map(url => url.match(/\\/vreme\\/(?!judet\\/)([^/]+)$/)?.[1]).filter(Boolean);
+console.log(JSON.stringify({
+    resolved,
+    unindexed: sitemapSlugs.filter(slug => !resolveLocation(slug)),
+    counties: ROMANIA_COUNTIES.map(c => [c.slug, countyLocalities(c.slug).map(p => p.slug)]),
+    nearby: nearbyPlaces(resolveLocation('cluj-napoca'), 5),
+    sinaia: resolveLocation('sinaia')
+}));
+"""
+
+
+def run_js(module_path, slugs):
+    proc = subprocess.run([NODE, '--input-type=module', '-e', JS_RESOLVE, json.dumps([module_path, slugs])],
+                          capture_output=True, text=True, cwd=ROOT, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout)
+
+
+@pytest.fixture(scope='module')
+def entries():
+    return export_entries()
+
+
+def test_every_vreme_slug_is_indexed(entries):
+    out = run_js(None, [])
+    assert out['unindexed'] == []
+    slugs = {e['slug'] for e in entries}
+    for county, places in out['counties']:
+        assert places, county  # Călărași's capital is added even though cities-data lacks it
+        assert set(places) <= slugs
+    assert 'calarasi' in slugs
+    assert [p['slug'] for p in out['nearby']][:1] and 'cluj-napoca' not in [p['slug'] for p in out['nearby']]
+    assert all(p['county'] == 'Cluj' for p in out['nearby'])
+
+
+def test_build_reuses_previous_coordinates(entries, tmp_path):
+    out = str(tmp_path / 'gazetteer-coordinates.js')
+    sample = [e for e in entries if e['slug'] in ('bucuresti', 'cluj-napoca', 'sinaia', 'varful-omu', 'delta-dunarii')]
+    with MockArchiveServer(unknown_names=['Vârful Omu', 'Vârful Omu, Romania', 'Delta Dunarii', 'Delta Dunarii, Romania'],
+                           admin1={'Sinaia': 'Prahova'}) as server:
+        summary = build_index(out, sample, server.base_url, previous={}, backoff=0)
+        first = server.geocoding_requests
+        again = build_index(out, sample, server.base_url, previous=read_coordinates(out), backoff=0)
+        assert server.geocoding_requests == first + 1 + 2  # the probe, then only the miss is looked up again
+    assert summary['indexed'] == 4 and summary['unresolved'] == ['delta-dunarii']
+    # The probe; one per city / resort; peak via "Varful Omu, Romania"; Delta: name and "name, Romania"
+    assert first == 1 + 3 + 3 + 2
+    assert again['reused']['module'] == 4 and again['geocoded'] == 1  # the miss is retried on rebuild
+    assert summary['written'] and not again['written']  # same coordinates: the module is left as it was
+    assert read_coordinates(out)['sinaia'][2] == 'Prahova'
+
+
+def test_offline_build_fails_fast_and_keeps_the_module(entries, tmp_path):
+    out = tmp_path / 'gazetteer-coordinates.js'
+    with MockArchiveServer(admin1={'Sinaia': 'Prahova'}) as server:
+        build_index(str(out), [e for e in entries if e['slug'] in ('bucuresti', 'sinaia')], server.base_url, backoff=0)
+        dead_url = server.base_url
+    text = out.read_text(encoding='utf-8')
+
+    # Server gone (connection refused): one probe, no per-slug retries, nothing rewritten
+    started = time.perf_counter()
+    summary = build_index(str(out), entries, dead_url, previous=read_coordinates(str(out)))
+    assert time.perf_counter() - started < 10
+    assert summary['requests'] == {'archive': 0, 'geocoding': 0, 'retries': 0}
+    assert len(summary['failed']) == len(entries) - 2 and summary['indexed'] == 2
+    assert not summary['written'] and out.read_text(encoding='utf-8') == text
+
+
+def test_pages_resolve_in_memory_and_fall_back_for_misses(entries, tmp_path):
+    out = str(tmp_path / 'gazetteer-coordinates.js')
+    with MockArchiveServer(admin1={'Sinaia': 'Prahova'}) as server:
+        build_index(out, [e for e in entries if e['slug'] != 'baia-mare'], server.base_url, backoff=0)
+    coordinates = read_coordinates(out)
+
+    result = run_js(out, ['cluj-napoca', 'sinaia', 'baia-mare', 'varful-necunoscut'])
+    resolved = result['resolved']
+    cluj = resolved['cluj-napoca']
+    assert cluj['queries'] == [] and cluj['location']['source'] == 'index'
+    assert [cluj['location']['latitude'], cluj['location']['longitude']] == coordinates['cluj-napoca'][:2]
+    assert cluj['location']['region'] == 'Cluj'
+    # Resorts take their county from the geocoded admin1
+    assert resolved['sinaia']['location']['region'] == 'Prahova' and result['sinaia']['countySlug'] == 'prahova'
+    # Indexed name without coordinates: one query with the real name
+    assert resolved['baia-mare']['queries'] == ['Baia Mare']
+    assert resolved['baia-mare']['location']['region'] == 'Maramureș'
+    # Unknown slug: the old cascade, peaks included
+    assert resolved['varful-necunoscut']['queries'] == ['Varful Necunoscut', 'Varful Necunoscut, Romania']
+    assert resolved['varful-necunoscut']['location'] is None
+
+
+# Geocoder that answers like Open-Meteo: worldwide without countryCode, Romania only with it
+JS_HOMONYMS = """
+import { geocodeLocation } from './lib/gazetteer.js';
+
+const places = {
+    Alexandria: [
+        { latitude: 31.2, longitude: 29.92, name: 'Alexandria', admin1: 'Alexandria', country_code: 'EG' },
+        { latitude: 43.97, longitude: 25.33, name: 'Alexandria', admin1: 'Teleorman', country_code: 'RO' }
+    ],
+    'Sântana': [
+        { latitude: 46.02, longitude: 26.85, name: 'Sântana', admin1: 'Bacău', country_code: 'RO' },
+        { latitude: 46.35, longitude: 21.5, name: 'Sântana', admin1: 'Arad', country_code: 'RO' }
+    ]
+};
+const urls = [];
+const fetchImpl = async (url) => {
+    urls.push(url);
+    const params = new URL(url).searchParams;
+    const country = params.get('countryCode');
+    const results = (places[params.get('name')] || []).filter(r => !country || r.country_code === country)
+        .slice(0, Number(params.get('count')));
+    return { json: async () => ({ results: results.length ? results : undefined }) };
+};
+const found = {};
+for (const slug of JSON.parse(process.argv[1])) found[slug] = await geocodeLocation(slug, { fetchImpl });
+console.log(JSON.stringify({ found, urls }));
+"""
+
+
+def test_render_time_fallback_stays_in_romania():
+    proc = subprocess.run([NODE, '--input-type=module', '-e', JS_HOMONYMS, json.dumps(['alexandria', 'santana'])],
+                          capture_output=True, text=True, cwd=ROOT, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    out = json.loads(proc.stdout)
+    assert all('countryCode=RO' in url and 'count=10' in url for url in out['urls'])
+    alexandria, santana = out['found']['alexandria'], out['found']['santana']
+    assert [alexandria['latitude'], alexandria['region']] == [43.97, 'Teleorman']
+    # Homonyms inside Romania: the one in the indexed county (Sântana, Arad)
+    assert santana['latitude'] == 46.35 and santana['source'] == 'geocoder'
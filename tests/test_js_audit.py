@@ -0,0 +1,195 @@
+"""
+JS/JSX structure auditor (js_audit.py): tokenizer edge cases, whole-tree mode,
+the findings cache and chunked scanning.
+
+Run: python -m pytest -q tests
+"""
+
+import hashlib
+import json
+import time
+
+import pytest
+
+import js_audit
+from js_audit import (AuditCache, Finding, audit_file, audit_paths, audit_source, content_key, discover_sources,
+                      main)
+from tests.test_salary_engine import ROOT
+
+
+# Every token kind, multi-byte text and a few real problems, for the chunk boundary checks
+MIXED_SOURCE = """// Calculator – diacritice: ăâîșț 🚗
+import { x } from './x.js';
+const re = /[}{\\/]+/gi, half = total / 2 / (n || 1);
+const s = `Salariu ${gross} lei, ${ `net ${net}` } }`;
+/* bloc { ( [ */ const t = 'it\\'s }' + "\\"{";
+export default function Page({ items }) {
+  if (a < b && c > d) { run(); }
+  return (
+    <>
+      <Header title="a > b" data={{ k: [1, 2] }} />
+      <p className='x'>Don't {items.map(i => <b key={i}>{i / 2}</b>)} – ț</p>
+      <section>
+        <span>{open}<i>x</span>
+      </section>
+    </>
+  );
+}
+const extra = [1, 2]];
+function unclosed() {
+"""
+
+
+@pytest.mark.parametrize('source', [
+    # Division after a value: a regex read here would swallow the '{' and report the '}'
+    "const r = x / 2; if (y) { z = w / 3 }",
+    "const half = (a + b) / 2 / (c);",
+    "const n = arr[i] / 2; const m = obj.total / count; { }",
+    # Regex literals after an operator or keyword: their brackets are not code
+    "const re = /[}{]+/g; const s = str.replace(/\\/}/, '');",
+    "function f() { return /}/.test(x) }",
+    "const ok = a && /\\(/.test(b);",
+    "const half = total / 2 /* } */;",
+], ids=['division', 'division-paren', 'division-member', 'regex-class', 'regex-after-return',
+        'regex-after-operator', 'comment'])
+def test_regex_vs_division(source):
+    assert audit_source(source) == []
+
+
+@pytest.mark.parametrize('source', [
+    # JSX text: apostrophes, parens and '>' are plain text
+    "return (\n  <div>\n    <p>Don't pay 50% (VAT) if a > b</p>\n  </div>\n);",
+    "return (<p>{'}'} and {\"{\"}</p>);",
+    "return (\n  <>\n    <p>{items.map(i => <b key={i}>{i}</b>)}</p>\n  </>\n);",
+    "return (<><Header title=\"a > b\" /><Footer {...props} /></>);",
+    "const s = `a ${ `b ${c}` } }`;",
+], ids=['text', 'braces-in-strings', 'fragment-nested', 'fragment-selfclose', 'template'])
+def test_jsx_text_and_fragments(source):
+    assert audit_source(source) == []
+
+
+@pytest.mark.parametrize('source', [
+    "const [v, set] = useState<Record<string, number>>({});",
+    "foo<Bar>(x);",
+    "if (a < b) { x = c > d ? (e < f) : g; }",
+    "for (let i = 0; i < n; i++) { total += i > 2 ? i : 0; }",
+], ids=['generic-call', 'generic-bare', 'comparisons', 'loop'])
+def test_generic_calls_vs_comparisons(source):
+    assert audit_source(source) == []
+
+
+def test_findings_with_positions():
+    assert audit_source("function f() {\n  if (x) {\n}") == [Finding('unclosed', 'brace', "'{'", 1, 14)]
+    assert audit_source("const a = [1, 2]];") == [Finding('unexpected', 'bracket', "']'", 1, 17)]
+    assert audit_source("return (<div>\n  <p>text\n</div>);") == [Finding('unclosed', 'tag', '<p>', 2, 3)]
+    # A bare '}' in JSX text is a syntax error
+    assert audit_source("return (\n  <>\n    <p>50% } off</p>\n  </>\n);") == [
+        Finding('unexpected', 'brace', "'}'", 3, 12)]
+    # Type arguments in plain .ts are not tags
+    assert audit_source("const m = f<string>(x); let y = <T>(v);", jsx=False) == []
+
+
+def write_tree(root):
+    """app/ + lib/ sources with one broken file, plus folders tree mode must skip"""
+    files = {
+        'app/page.js': "export default function Page() {\n  return (<main>{x / 2}</main>);\n}\n",
+        'app/api/[[...slug]]/route.js': "export async function GET() { return Response.json({ ok: true }); }\n",
+        'app/layout.tsx': "export default function Layout({ children }: Props) { return <html>{children}</html>; }\n",
+        'lib/broken.js': "export const f = () => {\n  if (x) {\n};\n",
+        'lib/notes.md': "{ not code",
+        'lib/node_modules/dep/index.js': "{{{",
+        'components/.next/chunk.js': "(((",
+    }
+    for name, text in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+
+
+def test_tree_mode_smoke(tmp_path, capsys):
+    write_tree(tmp_path)
+    sources = discover_sources(str(tmp_path))
+    assert [p[len(str(tmp_path)) + 1:].replace('\\', '/') for p in sources] == [
+        'app/layout.tsx', 'app/page.js', 'app/api/[[...slug]]/route.js', 'lib/broken.js']
+    # The process pool reports the same findings, in path order, as a sequential run
+    assert audit_paths(sources, workers=2) == audit_paths(sources, workers=1)
+
+    assert main(['--tree', '--root', str(tmp_path), '--no-cache', '--workers', '2']) == 1
+    out = capsys.readouterr().out
+    assert "broken.js:1:24: Unclosed brace '{' opened at line 1" in out and '1 problem(s) in 4 file(s)' in out
+    assert main(['--tree', '--root', str(tmp_path), '--no-cache', '--only', 'tag,paren']) == 0
+    assert '✅ 4 file(s) balanced [tag, paren]' in capsys.readouterr().out
+
+
+def test_cache_hits_evicts_and_keys_on_version(tmp_path, monkeypatch):
+    write_tree(tmp_path)
+    sources = discover_sources(str(tmp_path))
+    path = str(tmp_path / 'cache' / 'findings.json')
+
+    cache = AuditCache(path)
+    first = audit_paths(sources, workers=1, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 4)
+    cache.save()
+
+    cache = AuditCache(path)
+    assert audit_paths(sources, workers=1, cache=cache) == first and (cache.hits, cache.misses) == (4, 0)
+    # An edited file is rescanned, its old entry ages out by LRU
+    broken = tmp_path / 'lib' / 'broken.js'
+    broken.write_text("export const f = () => {\n  if (x) {}\n};\n", encoding='utf-8')
+    cache = AuditCache(path, max_entries=4)
+    reports = audit_paths(sources, workers=1, cache=cache)
+    assert (cache.hits, cache.misses) == (3, 1) and all(r.ok for r in reports)
+    cache.save()
+    assert len(cache.entries) == 4 and content_key(str(broken)) in cache.entries
+
+    # Entries unused for max_age and entries of another auditor version are dropped
+    stale = content_key(sources[0])
+    cache.entries[stale]['used'] = time.time() - 31 * 86400
+    cache.entries['0.9:jsx:' + '0' * 64] = {'used': time.time(), 'findings': []}
+    cache.save()
+    assert stale not in cache.entries and len(cache.entries) == 3
+
+    # The key changes with the auditor version and the JSX mode, not with the path
+    key = content_key(str(broken))
+    digest = hashlib.sha256(broken.read_bytes()).hexdigest()
+    assert key == f"{js_audit.AUDITOR_VERSION}:jsx:{digest}"
+    copy = tmp_path / 'lib' / 'copy.ts'
+    copy.write_bytes(broken.read_bytes())
+    assert content_key(str(copy)) == f"{js_audit.AUDITOR_VERSION}:ts:{digest}"
+    monkeypatch.setattr(js_audit, 'AUDITOR_VERSION', '9.9')
+    assert content_key(str(broken)) == f"9.9:jsx:{digest}"
+    cache = AuditCache(path)
+    audit_paths(sources, workers=1, cache=cache)
+    assert cache.hits == 0
+    cache.save()
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['auditor_version'] == '9.9' and all(k.startswith('9.9:') for k in data['entries'])
+
+
+def test_content_key_without_file_digest(tmp_path, monkeypatch):
+    """hashlib.file_digest is Python 3.11+; older interpreters hash the file in chunks"""
+    path = tmp_path / 'big.js'
+    path.write_bytes(b'const x = 1;\n' * 20000)
+    expected = content_key(str(path))
+    monkeypatch.delattr(hashlib, 'file_digest', raising=False)
+    assert content_key(str(path)) == expected
+
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'utf-8-sig', 'utf-16'])
+def test_findings_identical_across_chunk_sizes(tmp_path, encoding):
+    path = tmp_path / 'page.js'
+    path.write_text(MIXED_SOURCE, encoding=encoding)
+    expected = audit_source(MIXED_SOURCE)
+    assert expected == [Finding('unclosed', 'tag', '<i>', 13, 21), Finding('unexpected', 'bracket', "']'", 18, 21),
+                        Finding('unclosed', 'brace', "'{'", 19, 21)]
+    for chunk_size in (1, 7, 4096):
+        report = audit_file(str(path), chunk_size=chunk_size)
+        assert report.error is None and report.findings == expected, chunk_size
+
+
+@pytest.mark.parametrize('name', ['lib/payslip-layout.js', 'lib/pdf-export.js', 'app/layout.tsx'])
+def test_repo_sources_across_chunk_sizes(name):
+    path = f"{ROOT}/{name}"
+    reports = [audit_file(path, chunk_size=size) for size in (1, 7, 4096)]
+    assert reports[0].findings == reports[1].findings == reports[2].findings == audit_file(path).findings
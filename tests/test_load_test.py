@@ -0,0 +1,72 @@
+"""
+Load harness (load_test.py): percentiles and the pooled keep-alive client, against an in-process MockAPIServer.
+
+Run: python -m pytest -q tests
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from load_test import FiscalRulesLoadTester, PooledHTTPClient, percentile
+from mock_api_server import MockAPIServer
+
+
+@pytest.fixture
+def server():
+    with MockAPIServer() as server:
+        yield server
+
+
+def test_percentile_is_nearest_rank():
+    values = sorted(float(v) for v in range(1, 101))
+    assert [percentile(values, p) for p in (50, 95, 99, 100)] == [50.0, 95.0, 99.0, 100.0]
+    assert percentile([3.0, 7.0, 9.0], 50) == 7.0 and percentile([3.0, 7.0, 9.0], 1) == 3.0
+    assert percentile([4.2], 99) == 4.2 and percentile([], 95) == 0.0
+
+
+def test_pooled_client_reuses_connections(server):
+    server.store.seed_leads(1200)
+
+    async def run():
+        client = PooledHTTPClient(server.base_url, size=4)
+        try:
+            replies = await asyncio.gather(*(client.request('GET', '/api/settings') for _ in range(40)))
+            status, headers, body = replies[0]
+            # Conditional GET: 304 without a body, on the same keep-alive connection
+            revalidated = await client.request('GET', '/api/settings', headers={'If-None-Match': headers['etag']})
+            # Chunked transfer encoding (the CSV export)
+            export = await client.request('GET', '/api/leads/export')
+            return replies, revalidated, export, client.opened
+        finally:
+            await client.close()
+
+    replies, revalidated, export, opened = asyncio.run(run())
+    assert {status for status, _, _ in replies} == {200} and json.loads(replies[0][2])['initialized']
+    assert revalidated[0] == 304 and revalidated[2] == b''
+    assert export[0] == 200 and export[1]['transfer-encoding'] == 'chunked'
+    assert export[2].decode('utf-8').count('\n') == 1201  # header + one row per lead
+    assert opened <= 4
+
+
+def test_load_run_reports_per_endpoint(server, tmp_path):
+    report = tmp_path / 'reports' / 'load.json'
+    tester = FiscalRulesLoadTester(server.base_url, years=[2025, 2026])
+    results = tester.run_load(concurrency=4, duration=0.5, report_path=str(report))
+
+    assert results['errors'] == 0 and results['requests'] == server.requests_served
+    assert results['connections_opened'] <= 4
+    endpoints = results['endpoints']
+    assert set(endpoints) == {'GET /api/fiscal-rules/:year', 'GET /api/fiscal-rules/all',
+                              'GET /api/holidays/:year', 'GET /api/settings'}
+    for e in endpoints.values():
+        assert e['requests'] > 0 and 0 < e['p50_ms'] <= e['p95_ms'] <= e['p99_ms']
+    assert json.loads(report.read_text(encoding='utf-8'))['requests'] == results['requests']
+
+
+def test_injected_faults_are_counted_as_errors():
+    with MockAPIServer(fault_rate=0.2, seed=3) as server:
+        results = FiscalRulesLoadTester(server.base_url).run_load(concurrency=2, duration=0.3)
+        assert results['errors'] == server.faults.faults > 0
+        assert results['requests'] + results['errors'] == server.requests_served
@@ -0,0 +1,148 @@
+"""
+Opt-in instrumentation (lib/metrics.js) and the /api/metrics scrape of load_test.py.
+
+Run: python -m pytest -q tests
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from load_test import FiscalRulesLoadTester, histogram_percentile, metrics_delta
+from mock_api_server import MockAPIServer
+from tests.test_salary_engine import ROOT
+
+NODE = shutil.which('node')
+
+JS_RUN = """
+import { countRoundTrips, enableMetrics, metricsSnapshot, resetMetrics } from './lib/metrics.js';
+import { calculateSalaryResults, SalaryCalculator } from './lib/salary-engine.js';
+import { BreakEvenCalculator } from './lib/break-even-calculator.js';
+
+const rules = {
+    salary: { minimum_salary: 4050, cas_rate: 25, cass_rate: 10, income_tax_rate: 10, cam_rate: 2.25,
+        untaxed_amount: 300, personal_deduction_base: 810 },
+    pfa: { minimum_salary: 4050, cas_rate: 25, cass_rate: 10, income_tax_rate: 10, cass_min_threshold: 6,
+        cass_max_threshold: 60, cas_obligatory_12: 12, cas_obligatory_24: 24 }
+};
+const original = SalaryCalculator.prototype.calculateNetToGross;
+const run = () => {
+    for (let i = 0; i < 50; i++) calculateSalaryResults(3000 + 97 * i, 'net-brut', 'standard', rules, {});
+    calculateSalaryResults(9000, 'cost-net', 'it', rules, {});
+    calculateSalaryResults(9000, 'brut-net', 'it', rules, {});
+    new BreakEvenCalculator(rules).calculateSalaryToPFABreakeven(30);
+};
+
+run();
+const disabled = metricsSnapshot();
+enableMetrics();
+const wrapped = SalaryCalculator.prototype.calculateNetToGross !== original;
+run();
+const enabled = metricsSnapshot();
+enableMetrics(false);
+const restored = SalaryCalculator.prototype.calculateNetToGross === original;
+resetMetrics();
+
+// Fake driver: collections with one-shot methods and a cursor that fetches batches of 2
+const collection = docs => ({
+    findOne: async () => docs[0],
+    updateOne: async () => ({}),
+    find() {
+        let buffer = [];
+        let fetched = 0;
+        const cursor = {
+            closed: false,
+            id: null,
+            sort() { return cursor; },
+            bufferedCount: () => buffer.length,
+            async next() {
+                if (!buffer.length && fetched < docs.length) {
+                    buffer = docs.slice(fetched, fetched + 2);
+                    fetched += buffer.length;
+                    cursor.id = fetched < docs.length ? 42 : 0;
+                }
+                if (!buffer.length) cursor.closed = true;
+                return buffer.shift() ?? null;
+            },
+            async toArray() { return docs; }
+        };
+        return cursor;
+    }
+});
+const db = { collection: () => collection([1, 2, 3, 4, 5]) };
+const probe = { dbRoundTrips: 0 };
+const counted = countRoundTrips(db, probe);
+await counted.collection('settings').findOne({});
+await counted.collection('settings').updateOne({}, {});
+await counted.collection('leads').find({}).sort({}).toArray();
+const cursor = counted.collection('leads').find({}).sort({});
+while (await cursor.next() !== null);
+
+console.log(JSON.stringify({ disabled, enabled, wrapped, restored, roundTrips: probe.dbRoundTrips,
+    passthrough: countRoundTrips(db, null) === db }));
+"""
+
+
+@pytest.mark.skipif(NODE is None, reason="node is not installed")
+def test_js_instrumentation_is_opt_in():
+    proc = subprocess.run([NODE, '--input-type=module', '-e', JS_RUN],
+                          capture_output=True, text=True, cwd=ROOT, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    out = json.loads(proc.stdout)
+
+    assert out['disabled']['calculators'] == {} and not out['disabled']['enabled']
+    assert out['wrapped'] and out['restored']
+
+    calculators = out['enabled']['calculators']
+    net = calculators['calculateSalaryResults:net-brut']
+    assert net['calls'] == 50 and net['errors'] == 0
+    assert sum(net['durationMs']['counts']) == 50
+    # Analytic jump + a couple of correction steps, not a 50-step binary search
+    assert net['iterations']['calls'] == 50 and 1 <= net['iterations']['max'] <= 8
+    assert calculators['SalaryCalculator.calculateNetToGross']['iterations'] == net['iterations']
+    assert calculators['SalaryCalculator.calculateCostToNet']['iterations']['sum'] >= 1
+    assert calculators['calculateSalaryResults:brut-net']['iterations']['calls'] == 0
+    assert calculators['BreakEvenCalculator.calculateSalaryToPFABreakeven']['iterations']['sum'] > 10
+
+    # findOne + updateOne + toArray, then the cursor: 3 batches of 2 docs
+    assert out['roundTrips'] == 3 + 3
+    assert out['passthrough']
+
+
+def test_histogram_percentile():
+    histogram = {'buckets': [1, 2, 5], 'counts': [10, 0, 10, 0], 'sum': 40.0, 'max': 4.0}
+    assert histogram_percentile(histogram, 50) == 1.0
+    assert histogram_percentile(histogram, 75) == pytest.approx(2 + (4 - 2) * 0.5)
+    assert histogram_percentile(histogram, 100) == 4.0
+    assert histogram_percentile(dict(histogram, counts=[0, 0, 0, 0]), 99) == 0.0
+
+
+def test_load_run_scrapes_server_metrics():
+    with MockAPIServer(cache_ttl_ms=0, metrics=True) as server:
+        tester = FiscalRulesLoadTester(server.base_url, years=[2026])
+        results = tester.run_load(concurrency=4, duration=1.5, metrics_interval=0.5)
+
+    report = results['server']
+    assert len(report['timeline']) >= 2
+    for name, client in results['endpoints'].items():
+        served = report['endpoints'][name]
+        # Every request the client saw completed is on the server side, and only those of the run
+        assert served['requests'] == client['requests'] + client['errors']
+        assert 0 < served['p50_ms'] <= served['p99_ms']
+    # No cache: one Mongo round trip per read, plus the two seeding findOne of the first request
+    assert sum(e['db_round_trips'] for e in report['endpoints'].values()) == results['requests'] + 2
+    assert sum(t['requests'] for t in report['timeline']) == results['requests']
+
+
+def test_metrics_endpoint_is_opt_in():
+    with MockAPIServer() as server:
+        results = FiscalRulesLoadTester(server.base_url).run_load(concurrency=2, duration=0.2, metrics_interval=0.1)
+    assert 'disabled' in results['server']['error']
+
+
+def test_metrics_delta_after_reset_uses_new_snapshot():
+    before = {'startedAt': 'a', 'endpoints': {}, 'calculators': {}}
+    after = {'startedAt': 'b', 'endpoints': {'GET /api/settings': {'count': 3}}, 'calculators': {}}
+    assert metrics_delta(before, after) is after
@@ -0,0 +1,103 @@
+"""
+Local API stand-in (mock_api_server.py): conditional GETs, leads cursor pagination and seeded faults.
+
+Run: python -m pytest -q tests
+"""
+
+import pytest
+import requests
+
+from mock_api_server import MockAPIServer
+
+
+@pytest.fixture
+def server():
+    with MockAPIServer() as server:
+        yield server
+
+
+def test_etag_revalidation_and_invalidation(server):
+    session = requests.Session()
+    url = f"{server.base_url}/api/fiscal-rules/2026"
+    first = session.get(url)
+    assert first.status_code == 200 and first.headers['X-Cache'] == 'MISS'
+    etag = first.headers['ETag']
+    trips = server.db_round_trips
+
+    again = session.get(url, headers={'If-None-Match': etag})
+    assert again.status_code == 304 and again.content == b'' and again.headers['ETag'] == etag
+    assert again.headers['X-Cache'] == 'HIT' and server.db_round_trips == trips
+    assert session.get(url, headers={'If-None-Match': f'W/"other", {etag}'}).status_code == 304
+
+    # A PUT invalidates the year: the old ETag no longer matches
+    body = dict(first.json(), salary=dict(first.json()['salary'], minimum_salary=4325))
+    assert session.put(url, json=body).status_code == 200
+    changed = session.get(url, headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    assert changed.json()['salary']['minimum_salary'] == 4325
+
+
+def walk_leads(session, base_url, limit):
+    leads, cursor, pages = [], None, 0
+    while True:
+        params = {'limit': limit, **({'cursor': cursor} if cursor else {})}
+        response = session.get(f"{base_url}/api/leads", params=params)
+        assert response.status_code == 200
+        leads += response.json()
+        pages += 1
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            return leads, pages
+
+
+def test_leads_cursor_pagination(server):
+    server.store.seed_leads(250)
+    session = requests.Session()
+    for i in range(3):
+        session.post(f"{server.base_url}/api/leads", json={'name': f"Real {i}", 'email': f"r{i}@example.com"})
+
+    leads, pages = walk_leads(session, server.base_url, 40)
+    assert len(leads) == 253 and pages == 7
+    assert len({lead['_id'] for lead in leads}) == 253
+    assert [lead['name'] for lead in leads[:4]] == ['Real 2', 'Real 1', 'Real 0', 'Lead 249']
+    keys = [(lead['createdAt'], lead['_id']) for lead in leads]
+    assert keys == sorted(keys, reverse=True)
+
+    # A lead added while paging is newer than the cursor: no duplicates, no shifted pages
+    first = session.get(f"{server.base_url}/api/leads", params={'limit': 100})
+    session.post(f"{server.base_url}/api/leads", json={'name': 'Late'})
+    rest = session.get(f"{server.base_url}/api/leads", params={'limit': 200, 'cursor': first.headers['X-Next-Cursor']})
+    assert [lead['_id'] for lead in first.json() + rest.json()] == [lead['_id'] for lead in leads]
+    assert 'X-Next-Cursor' not in rest.headers
+
+    bad = session.get(f"{server.base_url}/api/leads", params={'cursor': 'not-a-cursor'})
+    assert bad.status_code == 400 and bad.json() == {'error': 'Cursor invalid'}
+
+
+def test_faults_replay_with_the_same_seed():
+    def statuses(seed):
+        with MockAPIServer(fault_rate=0.3, fault_status=503, seed=seed) as server:
+            session = requests.Session()
+            return [session.get(f"{server.base_url}/api/settings").status_code for _ in range(30)]
+
+    run = statuses(11)
+    assert run == statuses(11) and set(run) == {200, 503}
+    assert run != statuses(12)
+
+
+def test_leads_without_created_at_paginate_last(server):
+    """Legacy leads with no createdAt: the cursor carries a null date (route.js encodeLeadsCursor)"""
+    session = requests.Session()
+    # Undated leads sort oldest, i.e. at the start of the ascending store
+    server.store.leads = [{'_id': f"{i:024x}", 'name': f"Legacy {i}"} for i in range(1, 6)]
+    for i in range(4):
+        session.post(f"{server.base_url}/api/leads", json={'name': f"Real {i}"})
+
+    leads, pages = walk_leads(session, server.base_url, 3)
+    assert [lead['name'] for lead in leads] == ['Real 3', 'Real 2', 'Real 1', 'Real 0',
+                                                'Legacy 5', 'Legacy 4', 'Legacy 3', 'Legacy 2', 'Legacy 1']
+    assert pages == 3
+    page = session.get(f"{server.base_url}/api/leads", params={'limit': 5})
+    rest = session.get(f"{server.base_url}/api/leads", params={'limit': 5, 'cursor': page.headers['X-Next-Cursor']})
+    assert 'createdAt' not in page.json()[-1] and [lead['name'] for lead in rest.json()] == [
+        'Legacy 4', 'Legacy 3', 'Legacy 2', 'Legacy 1']
@@ -0,0 +1,179 @@
+"""
+Payroll batch pipeline (payroll_batch.py) vs single calculations of the engines.
+
+Run: python -m pytest -q tests
+"""
+
+import copy
+import csv
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from mock_api_server import MockAPIServer
+from payroll_batch import (CURVE_CACHE_SIZE, OUTPUT_FIELDS, TOTAL_FIELDS, PayrollBatch, RulesResolver, generate_payroll,
+                           load_rules_history, run_batch)
+from salary_engine import RESULT_FIELDS, calculate_salary_results
+from tests.test_salary_engine import ROOT, load_mock_db
+
+NODE = shutil.which('node')
+
+ROWS = [
+    # employee_id, month, gross, net, sector, children, dependents, mealVouchers, voucherDays, isBasicFunction, isTaxExempt
+    ('E1', '2026-01', 4050, '', 'standard', 2, 0, 40, 21, 'true', ''),
+    ('E1', '2026-07', 4050, '', 'standard', 2, 0, 40, 21, 'true', ''),
+    ('E2', '2026-03', 12500.5, '', 'it', 0, 1, '', '', '', ''),
+    ('E3', '2026-06', 5200, '', 'construction', 0, 0, 30, 20, 'false', ''),
+    ('E4', '2026-08', 4700, '', 'agriculture', 1, 0, '', '', '', 'true'),
+    ('E5', '2026-02', '', 3000, 'standard', 0, 0, '', '', '', ''),
+    ('E5', '2026-09', '', 3000, 'standard', 0, 0, '', '', '', ''),
+    ('E6', '2026-05', '', 7342, 'it', 0, 0, 40, 22, 'false', ''),
+    ('E7', '2026-11', '', 15000, 'construction', 3, 2, '', '', '', ''),
+    ('E8', '2026-12', '', 2574, 'standard', 0, 0, '', '', '', ''),
+    ('X1', '2026-13', 5000, '', 'standard', 0, 0, '', '', '', ''),
+    ('X2', '2026-04', 5000, '', 'banking', 0, 0, '', '', '', ''),
+    ('X3', '2026-04', '', '', 'standard', 0, 0, '', '', '', ''),
+    ('X4', '2031-01', 5000, '', 'standard', 0, 0, '', '', '', ''),
+    ('X5', '2026-04', 'abc', '', 'standard', 0, 0, '', '', '', ''),
+]
+HEADER = ['employee_id', 'month', 'gross', 'net', 'sector', 'children', 'dependents',
+          'mealVouchers', 'voucherDays', 'isBasicFunction', 'isTaxExempt']
+
+JS_NET = """
+import { readFileSync } from 'fs';
+import { calculateSalaryResults } from './lib/salary-engine.js';
+
+const cases = JSON.parse(readFileSync(0, 'utf-8'));
+console.log(JSON.stringify(cases.map(([net, sector, rules, options]) =>
+    calculateSalaryResults(net, 'net-brut', sector, rules, options).net)));
+"""
+
+
+@pytest.fixture(scope='module')
+def history():
+    """Two 2026 versions served by ?history=1: the mock rules, and a July raise of the minimum wage"""
+    db = load_mock_db()
+    july = copy.deepcopy(db['salary'])
+    july['minimum_salary'] = 4325
+    with MockAPIServer() as server:
+        server.store.upsert_fiscal_rules(2026, {'effectiveDate': '2026-07-01', 'salary': july})
+        return load_rules_history(None, server.base_url, [2026])
+
+
+@pytest.fixture(scope='module')
+def payroll(tmp_path_factory):
+    folder = tmp_path_factory.mktemp('payroll')
+    with open(folder / 'payroll.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(ROWS)
+    with open(folder / 'payroll.jsonl', 'w', encoding='utf-8') as f:
+        for row in ROWS:
+            f.write(json.dumps({k: v for k, v in zip(HEADER, row) if v != ''}) + '\n')
+    return folder
+
+
+def read_results(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_history_resolves_version_in_force(history):
+    resolver = RulesResolver(history)
+    assert [resolver.label(resolver.index_for(f"2026-{m:02d}")) for m in (1, 6, 7, 12)] == \
+        ['2026-01-01', '2026-01-01', '2026-07-01', '2026-07-01']
+    assert resolver.index_for('2025-12') == -1
+
+    later = RulesResolver([dict(history[0], effectiveDate='2026-03-15')])
+    assert later.label(later.index_for('2026-01')) == '2026-03-15'  # earliest version of the year
+
+
+def test_batch_matches_single_calculations(history, payroll, tmp_path):
+    summary = run_batch(str(payroll / 'payroll.csv'), history, str(tmp_path / 'out.csv'), chunk_rows=4)
+    rows = read_results(tmp_path / 'out.csv')
+    assert [r['employee_id'] for r in rows] == [r[0] for r in ROWS]
+
+    resolver = RulesResolver(history)
+    for source, row in zip(ROWS, rows):
+        record = dict(zip(HEADER, source))
+        if row['employee_id'].startswith('X'):
+            assert row['error'] and row['net'] == ''
+            continue
+        assert row['error'] == ''
+        rules = resolver.versions[resolver.index_for(record['month'])]
+        assert row['effectiveDate'] == ('2026-07-01' if record['month'] >= '2026-07' else '2026-01-01')
+        assert (row['children'], row['dependents']) == (str(record['children']), str(record['dependents']))
+        options = {'mealVouchers': float(record['mealVouchers'] or 0), 'voucherDays': float(record['voucherDays'] or 0),
+                   'isBasicFunction': record['isBasicFunction'] != 'false', 'isTaxExempt': record['isTaxExempt'] == 'true'}
+        gross = float(row['gross'])
+        if record['net'] != '':
+            assert row['type'] == 'net-brut' and gross == int(gross)
+        else:
+            assert gross == record['gross']
+        expected = calculate_salary_results(gross, record['sector'], rules, **options)
+        for field in RESULT_FIELDS:
+            assert float(row[field]) == expected[field][0], (row['employee_id'], field)
+
+    assert 'invalid month' in rows[10]['error']
+    assert 'unknown sector' in rows[11]['error']
+    assert rows[12]['error'] == 'missing gross or net'
+    assert rows[13]['error'] == 'no fiscal rules for 2031'
+    assert 'invalid gross' in rows[14]['error']
+
+    total = summary['total']
+    valid = [r for r in rows if not r['error']]
+    assert (total['rows'], total['errors']) == (len(ROWS), len(ROWS) - len(valid))
+    for field in TOTAL_FIELDS:
+        assert total[field] == pytest.approx(sum(float(r[field]) for r in valid))
+    assert summary['months']['2026-07']['cas'] == float(rows[1]['cas'])
+
+
+def test_jsonl_and_workers_give_the_same_results(history, payroll, tmp_path):
+    run_batch(str(payroll / 'payroll.csv'), history, str(tmp_path / 'a.csv'), chunk_rows=100)
+    run_batch(str(payroll / 'payroll.jsonl'), history, str(tmp_path / 'b.csv'), workers=2, chunk_rows=3)
+    assert read_results(tmp_path / 'a.csv') == read_results(tmp_path / 'b.csv')
+
+
+@pytest.mark.skipif(NODE is None, reason="node is not installed")
+def test_net_rows_as_close_as_calculate_net_to_gross(history, payroll, tmp_path):
+    run_batch(str(payroll / 'payroll.csv'), history, str(tmp_path / 'out.csv'))
+    resolver = RulesResolver(history)
+    net_rows = [(dict(zip(HEADER, source)), row) for source, row in zip(ROWS, read_results(tmp_path / 'out.csv'))
+                if row['type'] == 'net-brut' and not row['error']]
+    cases = [[record['net'], record['sector'], resolver.versions[resolver.index_for(record['month'])],
+              {'mealVouchers': float(record['mealVouchers'] or 0), 'voucherDays': float(record['voucherDays'] or 0),
+               'isBasicFunction': record['isBasicFunction'] != 'false'}] for record, _ in net_rows]
+    proc = subprocess.run([NODE, '--input-type=module', '-e', JS_NET], input=json.dumps(cases),
+                          capture_output=True, text=True, cwd=ROOT, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    for (record, row), js_net in zip(net_rows, json.loads(proc.stdout)):
+        target = record['net']
+        assert abs(float(row['net']) - target) <= abs(js_net - target) + 1e-9, record
+
+
+def test_net_curves_are_bounded_and_keyed_on_the_voucher_total(history):
+    # 200 net rows, each with its own vacation voucher amount: at most CURVE_CACHE_SIZE curves are kept
+    header = ['employee_id', 'month', 'net', 'sector', 'vacationVouchers', 'mealVouchers', 'voucherDays']
+    rows = [[f"E{i}", '2026-03', 5000 + 7 * i, 'standard', 100 + i, '', ''] for i in range(200)]
+    # Same total as E0 (40 x 2.5 = 100): shares its curve
+    rows.append(['M1', '2026-03', 5000, 'standard', '', 40, 2.5])
+    batch = PayrollBatch(history)
+    text, _ = batch.process(header, rows)
+    assert len(batch._curves) == CURVE_CACHE_SIZE
+    out = [dict(zip(OUTPUT_FIELDS, r)) for r in csv.reader(text.splitlines())]
+    assert all(r['error'] == '' for r in out) and out[-1]['gross'] == out[0]['gross']  # E0 and M1
+
+    rules = RulesResolver(history).versions[0]
+    for row, record in zip(out[:200:37], rows[:200:37]):
+        res = calculate_salary_results(float(row['gross']), 'standard', rules, vacationVouchers=record[4])
+        assert float(row['net']) == res['net'][0]
+
+
+@pytest.mark.parametrize('rows', [1, 12, 100, 1003])
+def test_generated_payroll_has_exactly_the_requested_rows(tmp_path, rows):
+    path = tmp_path / 'payroll.csv'
+    assert generate_payroll(str(path), rows) == rows
+    records = read_results(path)
+    assert len(records) == rows and records[-1]['month'] == f"2026-{(rows - 1) % 12 + 1:02d}"
@@ -0,0 +1,132 @@
+"""
+Batch payslip rendering (payslip_pdf.py / lib/payslip-batch.js) over payroll_batch.py results.
+
+Run: python -m pytest -q tests
+"""
+
+import csv
+import json
+import re
+import subprocess
+import zipfile
+
+import pytest
+
+from payroll_batch import OUTPUT_FIELDS, run_batch
+from payslip_pdf import jspdf_available, read_payslips, render_payslips
+from tests.test_salary_engine import NODE, ROOT, load_mock_db, needs_node
+
+needs_jspdf = pytest.mark.skipif(not jspdf_available(), reason="jspdf is not installed (npm install)")
+PAGE_RE = re.compile(rb'/Type /Page\b(?!s)')
+
+# drawSalaryPage on a document that only records its text (the layout does not need jsPDF)
+JS_DRAW = """
+import { createSalaryPDFTemplate, drawSalaryPage } from './lib/payslip-layout.js';
+
+const template = createSalaryPDFTemplate(2026, 4.98);
+console.log(JSON.stringify(JSON.parse(process.argv[1]).map(result => {
+  const texts = [];
+  const doc = new Proxy({}, { get: (_, method) => (method === 'text' ? value => texts.push(value) : () => {}) });
+  drawSalaryPage(doc, result, template);
+  return texts;
+})));
+"""
+
+
+def write_results(path, count, errors=()):
+    """payroll_batch.py-shaped results: E0001..EN, one month each, plus error rows"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+        writer.writeheader()
+        for i in range(count):
+            gross = 4050 + 137 * i
+            cas, cass = round(gross * 0.25), round(gross * 0.10)
+            tax = round((gross - cas - cass) * 0.10)
+            writer.writerow({'employee_id': f"E{i + 1:04d}", 'month': f"2026-{i % 12 + 1:02d}", 'sector': 'standard',
+                             'type': 'brut-net', 'amount': gross, 'gross': gross, 'net': gross - cas - cass - tax,
+                             'cas': cas, 'cass': cass, 'incomeTax': tax, 'personalDeduction': 0,
+                             'taxableIncome': gross - cas - cass, 'untaxedAmount': 0,
+                             'cam': round(gross * 0.0225), 'totalCost': gross + round(gross * 0.0225), 'error': ''})
+        for employee in errors:
+            writer.writerow({'employee_id': employee, 'month': '2026-13', 'error': 'invalid month'})
+
+
+def test_read_payslips_skips_error_rows(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    write_results(path, 23, errors=['X1', 'X2'])
+    stats = {}
+    chunks = list(read_payslips(path, chunk_rows=10, stats=stats))
+    assert [len(c) for c in chunks] == [10, 10, 3] and stats == {'skipped': 2}
+    first = chunks[0][0]
+    assert first['employee_id'] == 'E0001' and first['month'] == '2026-01'
+    assert first['gross'] == 4050.0 and isinstance(first['net'], float) and 'childDeduction' not in first
+
+    jsonl = str(tmp_path / 'results.jsonl')
+    with open(jsonl, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'gross': 5000, 'net': 2925, 'cas': 1250, 'cass': 500, 'incomeTax': 325, 'cam': 113,
+                            'totalCost': 5113, 'breakdown': {'casPercent': 25}}) + '\n')
+        f.write(json.dumps({'gross': 'n/a', 'net': 1}) + '\n')
+    [[payslip]] = list(read_payslips(jsonl, stats=stats))
+    assert payslip['breakdown'] == {'casPercent': 25} and stats['skipped'] == 3
+
+
+@needs_node
+def test_batch_payslips_carry_the_sector_rates(tmp_path):
+    payroll = tmp_path / 'payroll.csv'
+    payroll.write_text('employee_id,month,gross,sector\nE1,2026-03,9000,it\nE2,2026-03,6000,construction\n',
+                       encoding='utf-8')
+    results = str(tmp_path / 'results.csv')
+    run_batch(str(payroll), [load_mock_db()], results)
+    payslips = [p for chunk in read_payslips(results) for p in chunk]
+    assert payslips[0]['breakdown'] == {'casPercent': 20.25, 'cassPercent': 10, 'taxPercent': 10, 'camPercent': 2.25}
+
+    # A results file without the rate columns: no made-up percentages
+    bare = {k: v for k, v in payslips[1].items() if k != 'breakdown'}
+    proc = subprocess.run([NODE, '--input-type=module', '-e', JS_DRAW, json.dumps(payslips + [bare])],
+                          capture_output=True, text=True, cwd=ROOT, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    it, construction, unknown = json.loads(proc.stdout)
+    assert it[:2] == ['1 Euro = 4.9800 lei', 'E1  -  2026-03']
+    # IT with the optional pillar II: 25% - 4.75%; construction: 21.25%
+    assert 'Asigurari Sociale (CAS)  20.25%' in it and 'Asigurari Sociale (CAS)  21.25%' in construction
+    assert 'Contributie Asiguratorie pentru Munca (CAM)  2.25%' in construction
+    assert {'Asigurari Sociale (CAS)', 'Asigurari Sociale de Sanatate (CASS)', 'Impozit pe venit (IV)',
+            'Contributie Asiguratorie pentru Munca (CAM)'} <= set(unknown)
+    assert not [t for t in unknown if t.endswith('%')]
+
+
+@needs_jspdf
+def test_zip_archive_has_one_pdf_per_payslip(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    write_results(path, 40, errors=['X1'])
+    out = str(tmp_path / 'payslips.zip')
+    summary = render_payslips(path, out, workers=2, chunk_rows=7)
+
+    assert summary['payslips'] == summary['pages'] == summary['files'] == 40 and summary['skipped'] == 1
+    assert summary['pages_per_second'] > 0
+    with zipfile.ZipFile(out) as archive:
+        names = archive.namelist()
+        assert names[0] == 'fluturas_E0001_2026-01.pdf' and len(set(names)) == 40
+        pdf = archive.read(names[0])
+    assert pdf.startswith(b'%PDF') and len(PAGE_RE.findall(pdf)) == 1
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith('.payslips-')]  # staging removed
+
+
+@needs_jspdf
+def test_merged_chunks_and_duplicate_names(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    write_results(path, 12)
+    out = tmp_path / 'merged'
+    summary = render_payslips(path, str(out), workers=3, chunk_rows=5, merged=True)
+    assert summary['files'] == 3 and summary['pages'] == 12
+    pages = [len(PAGE_RE.findall((out / f"fluturasi_{i:05d}.pdf").read_bytes())) for i in (1, 2, 3)]
+    assert pages == [5, 5, 2]
+
+    # The same employee and month twice: both payslips are kept
+    with open(path, encoding='utf-8') as f:
+        first_row = f.read().splitlines()[1]
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(first_row + '\n')
+    files = tmp_path / 'files'
+    render_payslips(path, str(files), workers=1, chunk_rows=50)
+    assert {'fluturas_E0001_2026-01.pdf', 'fluturas_E0001_2026-01-2.pdf'} <= {p.name for p in files.iterdir()}
@@ -0,0 +1,94 @@
+"""
+Closed-form mortgage engine (lib/real-estate-calculator.js) vs a month-by-month amortization.
+
+Run: python -m pytest -q tests
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from tests.test_salary_engine import ROOT
+
+NODE = shutil.which('node')
+pytestmark = pytest.mark.skipif(NODE is None, reason="node is not installed")
+
+TYPES = ('anuitate', 'rate_egale')
+RATES = (0.5, 3, 7.5, 12)
+TERMS = (1, 5, 13, 25, 30)
+LOANS = (10000, 123456.78)
+
+JS_RUN = """
+import { RealEstateCalculator } from './lib/real-estate-calculator.js';
+
+const [types, rates, terms, loans] = JSON.parse(process.argv[1]);
+const calculator = new RealEstateCalculator({});
+const mortgages = [];
+for (const type of types) for (const annualRate of rates) for (const years of terms) for (const loanAmount of loans) {
+    const res = calculator.simulateMortgage({ loanAmount, annualRate, years, type, fullSchedule: true });
+    mortgages.push({ type, annualRate, years, loanAmount, res });
+}
+const grids = types.map(type => calculator.evaluateScenarios({
+    propertyValue: 200000, rates, downPayments: loans.map(l => 200000 - l), terms, type }));
+const compare = calculator.compareBuyVsRent({ propertyValue: 150000, downPayment: 30000, mortgageRate: 7.5,
+    mortgageYears: 30, monthlyRentAlternative: 500 });
+console.log(JSON.stringify({ mortgages, grids, compare }));
+"""
+
+
+def amortize(loan, annual_rate, years, kind):
+    """Month-by-month schedule, as simulateMortgage computed it before the closed form"""
+    r = annual_rate / 100 / 12
+    n = years * 12
+    payment = loan * r * (1 + r) ** n / ((1 + r) ** n - 1) if kind == 'anuitate' else None
+    balance, total_interest, rows = loan, 0.0, []
+    for month in range(1, n + 1):
+        interest = balance * r
+        principal = payment - interest if kind == 'anuitate' else loan / n
+        balance -= principal
+        total_interest += interest
+        rows.append({'month': month, 'payment': principal + interest, 'principal': principal,
+                     'interest': interest, 'balance': max(0.0, balance)})
+    return rows, total_interest
+
+
+@pytest.fixture(scope='module')
+def js():
+    proc = subprocess.run([NODE, '--input-type=module', '-e', JS_RUN, json.dumps([TYPES, RATES, TERMS, LOANS])],
+                          capture_output=True, text=True, cwd=ROOT, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout)
+
+
+def test_closed_form_matches_monthly_schedule(js):
+    for case in js['mortgages']:
+        rows, total_interest = amortize(case['loanAmount'], case['annualRate'], case['years'], case['type'])
+        res = case['res']
+        assert len(res['schedule']) == len(rows)
+        for got, expected in zip(res['schedule'], rows):
+            for field, value in expected.items():
+                assert got[field] == pytest.approx(value, rel=1e-7, abs=1e-6), (case['type'], case['years'], field)
+        assert res['totalInterest'] == pytest.approx(total_interest, rel=1e-9)
+        assert res['totalPayment'] == pytest.approx(case['loanAmount'] + total_interest, rel=1e-9)
+
+
+def test_scenario_grid_matches_single_simulations(js):
+    singles = {(m['type'], m['annualRate'], m['years'], m['loanAmount']): m['res'] for m in js['mortgages']}
+    for kind, grid in zip(TYPES, js['grids']):
+        assert len(grid['scenarios']) == len(RATES) * len(TERMS) * len(LOANS)
+        for s in grid['scenarios']:
+            single = singles[kind, s['annualRate'], s['years'], s['loanAmount']]
+            for field in ('monthlyPayment', 'totalPayment', 'totalInterest', 'interestRatio'):
+                assert s[field] == pytest.approx(single[field], rel=1e-12), field
+        assert grid['cheapest']['totalPayment'] == min(s['totalPayment'] for s in grid['scenarios'])
+
+
+def test_buy_vs_rent_invested_value(js):
+    payment = js['compare']['mortgage']['monthlyPayment']
+    for row in js['compare']['comparison']:
+        value = 30000.0
+        for _ in range(row['year'] * 12):
+            value = value * (1 + 5 / 100 / 12) + max(0.0, payment - 500)
+        assert row['rent']['investedValue'] == pytest.approx(value, rel=1e-9)
@@ -0,0 +1,294 @@
+"""
+Differential + throughput suite for the salary engine.
+
+Python port (salary_engine.py) vs JS engine (lib/salary-engine.js, via node)
+vs the golden reports (validation_output_strict_v2.txt, deduction_final_test.txt),
+all on the mock rules of validate-salary.mjs. Results and calculations/sec per
+engine path land in test_reports/pytest/salary_engine.json.
+
+Run: python -m pytest -q tests
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+import warnings
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+
+from salary_engine import RESULT_FIELDS, SECTORS, SalaryCalculator, calculate_salary_results
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VALIDATE_SCRIPT = os.path.join(ROOT, 'validate-salary.mjs')
+GOLDEN_VALIDATION = os.path.join(ROOT, 'validation_output_strict_v2.txt')
+GOLDEN_DEDUCTION = os.path.join(ROOT, 'deduction_final_test.txt')
+JS_RUNNER = os.path.join(ROOT, 'tests', 'salary_engine_runner.mjs')
+REPORT_PATH = os.path.join(ROOT, 'test_reports', 'pytest', 'salary_engine.json')
+
+GROSS_GRID = list(range(1, 30001))
+NET_GRID = list(range(1, 20001))
+GRID_OPTIONS = {'isBasicFunction': True, 'mealVouchers': 40, 'voucherDays': 21}
+# Warn when a path drops below this fraction of the previous run's calculations/sec
+REGRESSION_RATIO = float(os.environ.get('SALARY_BENCH_REGRESSION_RATIO', '0.5'))
+
+NODE = shutil.which('node')
+needs_node = pytest.mark.skipif(NODE is None, reason="node is not installed")
+
+
+def load_mock_db(path: str = VALIDATE_SCRIPT) -> Dict[str, Any]:
+    """Parse the `const mockDb = {...};` literal of validate-salary.mjs (JS object -> JSON)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    match = re.search(r'const mockDb = (\{.*?\n\});', source, re.S)
+    literal = re.sub(r'//[^\n]*', '', match.group(1))
+    literal = re.sub(r'([{,]\s*)([A-Za-z_]\w*)\s*:', r'\1"\2":', literal)
+    literal = literal.replace("'", '"')
+    literal = re.sub(r',(\s*[}\]])', r'\1', literal)
+    return json.loads(literal)  # duplicate keys: last one wins, as in JS
+
+
+def parse_validation_report(path: str = GOLDEN_VALIDATION):
+    """Scenarios of the validate-salary.mjs report: (sector, gross, expected fields)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    scenarios = []
+    for block in re.split(r'^### Scenariu: ', text, flags=re.M)[1:]:
+        sector = block.split(' ', 1)[0].lower()
+        number = lambda label: float(re.search(label + r'\s*[:=]\s*(-?[\d.]+)', block).group(1))
+        scenarios.append((sector, number(r'- Brut'), {
+            'net': number(r'- Net Calculat'),
+            'cas': number(r'CAS'),
+            'cass': number(r'CASS'),
+            'incomeTax': number(r'IV'),
+            'cam': number(r'CAM'),
+            'personalDeduction': number(r'Ded\. Pers'),
+            'taxableIncome': number(r'Baza IV'),
+            'untaxedAmount': number(r'- Scutire 300'),
+            'reverseGross': number(r'-> Brut \?\)'),
+        }))
+    return scenarios
+
+
+def parse_deduction_report(path: str = GOLDEN_DEDUCTION):
+    """(gross, personal deduction, income tax) triples of the deduction report"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    return [(float(g), float(d), float(t)) for g, d, t in re.findall(
+        r'Salariu Brut: ([\d.]+) RON\s+Deducere Personală: ([\d.]+) RON\s+Impozit pe Venit: ([\d.]+) RON', text)]
+
+
+def previous_report() -> Dict[str, Any]:
+    try:
+        with open(REPORT_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+@pytest.fixture(scope='module')
+def report():
+    data = {'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'rules_source': 'validate-salary.mjs',
+            'gross_grid': [GROSS_GRID[0], GROSS_GRID[-1], len(GROSS_GRID)],
+            'net_grid': [NET_GRID[0], NET_GRID[-1], len(NET_GRID)],
+            'results': {}, 'throughput': {}}
+    previous = previous_report().get('throughput', {})
+    yield data
+
+    for path, rate in data['throughput'].items():
+        before = previous.get(path, {}).get('calcs_per_sec')
+        if before and rate['calcs_per_sec'] < before * REGRESSION_RATIO:
+            warnings.warn(f"{path}: {rate['calcs_per_sec']:.0f} calcs/s, previous run {before:.0f} calcs/s")
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def record(report, path: str, calculations: int, seconds: float):
+    report['throughput'][path] = {
+        'calculations': calculations,
+        'seconds': seconds,
+        'calcs_per_sec': calculations / seconds if seconds > 0 else None,
+    }
+
+
+@pytest.fixture(scope='module')
+def mock_db():
+    return load_mock_db()
+
+
+@pytest.fixture(scope='module')
+def rules(mock_db):
+    return {'salary': mock_db['salary']}
+
+
+@pytest.fixture(scope='module')
+def js_results(mock_db):
+    if NODE is None:
+        pytest.skip("node is not installed")
+    payload = json.dumps({'db': mock_db, 'grossGrid': GROSS_GRID, 'netGrid': NET_GRID,
+                          'sectors': list(SECTORS), 'options': GRID_OPTIONS})
+    proc = subprocess.run([NODE, JS_RUNNER], input=payload, capture_output=True, text=True,
+                          cwd=ROOT, timeout=600)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout)['sectors']
+
+
+def test_mock_rules_match_validate_script(mock_db):
+    salary = mock_db['salary']
+    assert mock_db['year'] == 2026
+    assert salary['minimum_salary'] == 4050
+    assert salary['personal_deduction_base'] == 810  # second (duplicate) key wins, like in JS
+    assert salary['untaxed_amount'] == 300
+
+
+@pytest.mark.parametrize('sector,gross,expected', parse_validation_report(),
+                         ids=lambda v: str(v) if not isinstance(v, dict) else '')
+def test_python_matches_golden_validation_report(rules, report, sector, gross, expected):
+    res = calculate_salary_results(np.array([gross]), sector, rules, isBasicFunction=True)
+    got = {field: float(res[field][0]) for field in expected if field != 'reverseGross'}
+    report['results'][f'golden {sector} {gross:g}'] = got
+    for field, value in got.items():
+        assert value == expected[field], f"{sector} {gross:g}: {field}"
+    # Reciprocity: the reverse gross of the report maps back to the same net
+    back = calculate_salary_results(np.array([expected['reverseGross']]), sector, rules, isBasicFunction=True)
+    assert abs(float(back['net'][0]) - expected['net']) < 1
+
+
+def test_python_matches_golden_deduction_report(rules):
+    cases = parse_deduction_report()
+    assert cases
+    for gross, deduction, tax in cases:
+        salary = dict(rules['salary'], personal_deduction_base=deduction, personal_deduction_percent=0)
+        res = SalaryCalculator({'salary': salary}).calculate_standard(np.array([gross]))
+        assert float(res['personalDeduction'][0]) == deduction
+        assert float(res['incomeTax'][0]) == tax
+
+
+@needs_node
+def test_js_validation_script_matches_golden_report():
+    proc = subprocess.run([NODE, VALIDATE_SCRIPT], capture_output=True, text=True, cwd=ROOT, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    with open(GOLDEN_VALIDATION, 'r', encoding='utf-8') as f:
+        assert proc.stdout == f.read()
+
+
+@pytest.mark.parametrize('sector', SECTORS)
+def test_gross_grid_python_vs_js(rules, js_results, report, sector):
+    started = time.perf_counter()
+    res = calculate_salary_results(np.array(GROSS_GRID, dtype=np.float64), sector, rules, **GRID_OPTIONS)
+    elapsed = time.perf_counter() - started
+    record(report, f'python brut-net {sector}', len(GROSS_GRID), elapsed)
+
+    js = js_results[sector]
+    seconds = js['seconds']
+    record(report, f'js brut-net {sector}', len(GROSS_GRID), seconds['js brut-net'])
+    record(report, f'js cost-net {sector}', len(GROSS_GRID), seconds['js cost-net'])
+
+    mismatches = {}
+    for field in RESULT_FIELDS:
+        diff = np.flatnonzero(res[field] != np.array(js['brutNet'][field], dtype=np.float64))
+        if diff.size:
+            mismatches[field] = [GROSS_GRID[i] for i in diff[:5]]
+    report['results'][f'brut-net {sector}'] = {'points': len(GROSS_GRID), 'mismatches': mismatches}
+    assert not mismatches
+
+
+@pytest.mark.parametrize('sector', SECTORS)
+def test_net_grid_inversion_vs_search(rules, js_results, report, sector):
+    js = js_results[sector]
+    record(report, f'js net-brut {sector}', len(NET_GRID), js['seconds']['js net-brut'])
+    record(report, f'js net-brut search {sector}', len(NET_GRID), js['seconds']['js net-brut search'])
+
+    target = np.array(NET_GRID, dtype=np.float64)
+    inverse_gross = np.array(js['netBrut']['gross'], dtype=np.float64)
+    inverse_net = np.array(js['netBrut']['net'], dtype=np.float64)
+    search_net = np.array(js['netBrutSearch']['net'], dtype=np.float64)
+
+    # The inversion hits the 1 RON tolerance wherever the search does, and is never further off
+    miss_inverse = np.abs(inverse_net - target)
+    miss_search = np.abs(search_net - target)
+    worse = np.flatnonzero(np.where(miss_search < 1, miss_inverse >= 1, miss_inverse > miss_search + 1e-9))
+
+    # The Python port agrees on the gross the JS inversion picked
+    python_net = calculate_salary_results(inverse_gross, sector, rules, **GRID_OPTIONS)['net']
+    disagree = np.flatnonzero(python_net != inverse_net)
+
+    report['results'][f'net-brut {sector}'] = {
+        'points': len(NET_GRID),
+        'within_1_ron': int(np.count_nonzero(miss_inverse < 1)),
+        'worse_than_search': [NET_GRID[i] for i in worse[:5]],
+        'python_disagrees': [NET_GRID[i] for i in disagree[:5]],
+    }
+    assert worse.size == 0
+    assert disagree.size == 0
+
+
+JS_WALK = """
+import { PiecewiseInverter } from './lib/net-gross-inverter.js';
+
+// Net 200 RON under the chord the segment was built on: the walk cannot close the gap
+const inverter = new PiecewiseInverter(gross => ({ gross, net: gross - 200 }), []);
+inverter.segments = [{ start: 1, end: 1000, fStart: 1, fEnd: 1000, slope: 1 }];
+inverter.envelope = [1000];
+console.log(JSON.stringify({ gaveUp: inverter.solve(500), steps: inverter.lastSteps, top: inverter.solve(5000) }));
+"""
+
+
+@needs_node
+def test_js_inverter_gives_up_when_the_walk_runs_out():
+    proc = subprocess.run([NODE, '--input-type=module', '-e', JS_WALK], capture_output=True, text=True,
+                          cwd=ROOT, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    out = json.loads(proc.stdout)
+    # null -> calculateNetToGrossBatch falls back to the binary search
+    assert out['gaveUp'] is None and out['steps'] > 64
+    # A target above the whole domain still gets its top (the walk reached seg.end)
+    assert out['top'] == {'gross': 1000, 'net': 800}
+
+
+JS_COMPILED = """
+import { SalaryCalculator, compileSalaryRules } from './lib/salary-engine.js';
+
+const rules = { year: 2026, effectiveDate: '2026-01-01', salary: { minimum_salary: 4050, cas_rate: 25, cass_rate: 10,
+    income_tax_rate: 10, cam_rate: 2.25, untaxed_amount: 300, personal_deduction_base: 810 } };
+// Aceeași versiune (an + dată), editată din admin
+const edited = { ...rules, salary: { ...rules.salary, cas_rate: 20 } };
+const compiled = compileSalaryRules(rules);
+// Admin form editing the same object in place, between two calculations
+function mutated() {
+    const live = { ...rules, salary: { ...rules.salary } };
+    const before = new SalaryCalculator(live);
+    live.salary.cas_rate = 20;
+    live.salary.minimum_salary = 4325;
+    const after = new SalaryCalculator(live);
+    return {
+        before: [before.calculateStandard(5000).cas, before.getRule('minimum_salary'),
+            before.calculateNetToGross(3000).gross === new SalaryCalculator(rules).calculateNetToGross(3000).gross],
+        after: [after.calculateStandard(5000).cas, after.getRule('minimum_salary'), after.compiled !== compiled]
+    };
+}
+console.log(JSON.stringify({
+    reused: compileSalaryRules(rules) === compiled && compileSalaryRules({ ...rules }) === compiled
+        && new SalaryCalculator(rules).compiled === compiled,
+    frozen: Object.isFrozen(compiled) && Object.isFrozen(compiled.standard),
+    cas: [new SalaryCalculator(rules).calculateStandard(5000).cas, new SalaryCalculator(edited).calculateStandard(5000).cas],
+    mutated: mutated(),
+}));
+"""
+
+
+@needs_node
+def test_js_compiled_rules_are_cached_per_version():
+    proc = subprocess.run([NODE, '--input-type=module', '-e', JS_COMPILED], capture_output=True, text=True,
+                          cwd=ROOT, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    out = json.loads(proc.stdout)
+    assert out['reused'] and out['frozen']
+    assert out['cas'] == [1250, 1000]
+    # In-place edits are not served from the cache, and a calculator keeps the rules it was built with
+    assert out['mutated'] == {'before': [1250, 4050, True], 'after': [1000, 4325, True]}
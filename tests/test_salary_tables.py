@@ -0,0 +1,72 @@
+"""
+Precomputed salary tables (salary_tables.py) vs the engine.
+
+Run: python -m pytest -q tests
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from salary_engine import SECTORS, calculate_salary_results
+from salary_tables import TABLE_FIELDS, SalaryTables, ensure_tables, rules_version
+from tests.test_salary_engine import load_mock_db
+
+GROSS_MAX = 40000
+
+
+@pytest.fixture(scope='module')
+def rules():
+    return load_mock_db()
+
+
+@pytest.fixture(scope='module')
+def tables_path(rules, tmp_path_factory):
+    return ensure_tables(rules, str(tmp_path_factory.mktemp('tables')), GROSS_MAX)
+
+
+def test_tables_rebuilt_when_rules_change_or_range_grows(rules, tables_path):
+    folder = os.path.dirname(tables_path)
+    mtime = os.path.getmtime(tables_path)
+    assert ensure_tables(rules, folder, GROSS_MAX) == tables_path
+    assert os.path.getmtime(tables_path) == mtime
+
+    # A smaller gross_max reuses the table; a larger one rebuilds the same file to cover it
+    smaller = ensure_tables(rules, folder, GROSS_MAX // 2)
+    assert smaller == tables_path and os.path.getmtime(tables_path) == mtime
+    bigger = os.path.join(folder, 'bigger')
+    os.makedirs(bigger)
+    small = ensure_tables(rules, bigger, 1000)
+    assert SalaryTables(small).gross_max == 1000
+    assert ensure_tables(rules, bigger, 2000) == small and SalaryTables(small).gross_max == 2000
+
+    changed = dict(rules, salary=dict(rules['salary'], cam_rate=2.5))
+    assert rules_version(changed)['hash'] != rules_version(rules)['hash']
+    assert ensure_tables(changed, folder, GROSS_MAX) != tables_path
+
+
+@pytest.mark.parametrize('sector', SECTORS)
+def test_lookup_matches_engine(rules, tables_path, sector):
+    tables = SalaryTables(tables_path)
+    gross = np.arange(GROSS_MAX + 1)
+    expected = calculate_salary_results(gross.astype(np.float64), sector, rules)
+    got = tables.lookup(sector, gross)
+    for field in TABLE_FIELDS:
+        np.testing.assert_array_equal(got[field], expected[field], err_msg=field)
+    assert tables.lookup(sector, 7500)['net'] == expected['net'][7500]
+    assert tables.lookup(sector, 7500.5) is None
+    assert tables.lookup(sector, GROSS_MAX + 1) is None
+
+
+@pytest.mark.parametrize('sector', SECTORS)
+def test_inverse_index(rules, tables_path, sector):
+    tables = SalaryTables(tables_path)
+    net = np.arange(1, 15001)
+    res = tables.net_to_gross(sector, net)
+    # Every net of the grid is within 1 RON, except the ones no gross produces (rounding gaps)
+    reachable = np.isin(net, calculate_salary_results(np.arange(GROSS_MAX + 1.0), sector, rules)['net'])
+    assert np.all(np.abs(res['net'] - net)[reachable] < 1)
+    minimum = tables.header['sectors'][sector]['minimum']
+    assert tables.net_to_gross(sector, int(tables.lookup(sector, minimum)['net']))['gross'] == minimum
+
@@ -0,0 +1,71 @@
+"""
+Sharded sitemap (lib/sitemap-shards.js) through the streaming checker (sitemap_check.py).
+
+Run: python -m pytest -q tests
+"""
+
+import os
+import shutil
+from datetime import date
+
+import pytest
+
+from sitemap_check import MAX_URLS, SitemapChecker, dir_opener, export_from_lib
+
+NODE = shutil.which('node')
+SHARD = '<url><loc>{loc}</loc><lastmod>{lastmod}</lastmod></url>'
+
+
+def write_sitemaps(folder, shards, index_lastmod='2026-01-01'):
+    """shards: {id: [(loc, lastmod), ...]}"""
+    os.makedirs(os.path.join(folder, 'sitemaps'), exist_ok=True)
+    with open(os.path.join(folder, 'sitemap.xml'), 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        for shard_id in shards:
+            f.write(f'<sitemap><loc>https://ecalc.ro/sitemaps/{shard_id}.xml</loc>'
+                    f'<lastmod>{index_lastmod}</lastmod></sitemap>\n')
+        f.write('</sitemapindex>\n')
+    for shard_id, urls in shards.items():
+        with open(os.path.join(folder, 'sitemaps', f'{shard_id}.xml'), 'w', encoding='utf-8') as f:
+            f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+            for loc, lastmod in urls:
+                f.write(SHARD.format(loc=loc, lastmod=lastmod) + '\n')
+            f.write('</urlset>\n')
+
+
+@pytest.mark.skipif(NODE is None, reason="node is not installed")
+def test_lib_sitemap_is_valid(tmp_path):
+    export_from_lib(str(tmp_path))
+    results = SitemapChecker(dir_opener(str(tmp_path))).run()
+    assert results['error_count'] == 0, results['errors']
+    assert results['stable']
+    ids = {os.path.basename(s['loc']) for s in results['shard_details']}
+    assert {'salarii-2026.xml', 'calculatoare-2026.xml', 'vreme-orase.xml', 'vreme-judete.xml'} <= ids
+
+
+def test_errors_are_reported(tmp_path):
+    write_sitemaps(str(tmp_path), {
+        'a': [('https://ecalc.ro/x', '2025-12-01'), ('https://ecalc.ro/x', '2025-12-01'),
+              ('http://ecalc.ro/y', '2025-12-01'), ('https://example.com/z', '2025-12-01')],
+        'b': [('https://ecalc.ro/w', '2026-13-01'), ('https://ecalc.ro/v', '2026-06-01')],
+    })
+    results = SitemapChecker(dir_opener(str(tmp_path)), today=date(2026, 3, 1)).run()
+    text = '\n'.join(results['errors'])
+    assert 'duplicate URL https://ecalc.ro/x' in text
+    assert 'not an absolute https URL' in text
+    assert 'unexpected host example.com' in text
+    assert "invalid lastmod '2026-13-01'" in text
+    assert 'lastmod 2026-06-01 is in the future' in text
+    assert 'after the shard lastmod 2026-01-01' in text
+
+
+def test_large_shard_is_streamed(tmp_path):
+    count = MAX_URLS + 10
+    write_sitemaps(str(tmp_path), {'big': ((f'https://ecalc.ro/p/{i}', '2025-01-01') for i in range(count))})
+    size = os.path.getsize(tmp_path / 'sitemaps' / 'big.xml')
+    results = SitemapChecker(dir_opener(str(tmp_path)), today=date(2026, 3, 1)).run()
+    assert results['urls'] == count
+    assert results['errors'] == [f"/sitemaps/big.xml: {count} URLs, more than {MAX_URLS}"]
+    # URLs are kept as 8-byte digests: peak stays well below the size of the shard
+    assert results['peak_memory_bytes'] < size
@@ -0,0 +1,101 @@
+import { SalaryCalculator } from './lib/salary-engine.js';
+
+// Cross-check: piecewise-linear inversion vs the original bisection search
+// Usage: node verify_net_to_gross.mjs [maxNet] [step]
+
+const rules2026 = {
+    salary: {
+        minimum_salary: 4050,
+        minimum_gross_construction: 4582,
+        minimum_gross_agriculture: 3436,
+        minimum_gross_it: 4050,
+        cas_rate: 25,
+        pilon2_rate: 4.75,
+        cass_rate: 10,
+        income_tax_rate: 10,
+        cam_rate: 2.25,
+        untaxed_amount: 300,
+        personal_deduction_base: 810,
+        personal_deduction_range: 2000,
+        it_threshold: 10000,
+        it_tax_exempt: false,
+        it_pilon2_optional: true,
+        construction_cas_rate: 21.25,
+        construction_tax_exempt: true,
+        construction_cass_exempt: false,
+        agriculture_cas_rate: 21.25,
+        agriculture_tax_exempt: true,
+        tax_exemption_threshold: 10000
+    }
+};
+
+const rules2025 = {
+    salary: { ...rules2026.salary, minimum_salary: 3700, minimum_gross_it: 3700, untaxed_amount: 200, it_tax_exempt: true }
+};
+
+const scenarios = [
+    ['2026', rules2026, {}],
+    ['2026 tichete', rules2026, { mealVouchers: 40, voucherDays: 21 }],
+    ['2026 non-basic', rules2026, { isBasicFunction: false }],
+    ['2025', rules2025, {}]
+];
+const sectors = ['standard', 'it', 'construction', 'agriculture'];
+
+const maxNet = Number(process.argv[2]) || 25000;
+const step = Number(process.argv[3]) || 1;
+const targets = [];
+for (let n = 1; n <= maxNet; n += step) targets.push(n);
+const costTargets = targets.map(n => n * 1.7 + 0.37);
+
+const time = fn => {
+    const t0 = performance.now();
+    const out = fn();
+    return [out, performance.now() - t0];
+};
+
+// Worse = the search hit the 1 RON tolerance and the inversion did not, or it is simply further off
+const isWorse = (fast, ref) => (ref < 1 ? fast >= 1 : fast > ref + 1e-9);
+
+let failures = 0;
+let tFast = 0, tSearch = 0, queries = 0;
+
+for (const [label, rules, options] of scenarios) {
+    for (const sector of sectors) {
+        const calc = new SalaryCalculator(rules);
+        const opts = { ...options, sector };
+
+        const [fast, dtFast] = time(() => calc.calculateNetToGrossBatch(targets, sector, opts));
+        const [ref, dtRef] = time(() => targets.map(n => calc._searchNetToGross(n, sector, opts)));
+        tFast += dtFast; tSearch += dtRef; queries += targets.length;
+
+        let worse = 0, sameGross = 0, maxGrossDelta = 0;
+        targets.forEach((n, i) => {
+            if (isWorse(Math.abs(fast[i].net - n), Math.abs(ref[i].net - n))) {
+                worse++;
+                if (worse <= 3) console.log(`   ❌ net ${n}: inversion ${fast[i].gross} (net ${fast[i].net}) vs search ${ref[i].gross} (net ${ref[i].net})`);
+            }
+            if (fast[i].gross === ref[i].gross) sameGross++;
+            else maxGrossDelta = Math.max(maxGrossDelta, Math.abs(fast[i].gross - ref[i].gross));
+        });
+
+        let costWorse = 0;
+        costTargets.forEach(c => {
+            const a = calc.calculateCostToNet(c, sector, opts);
+            const b = calc._searchCostToNet(c, sector, opts);
+            if (isWorse(Math.abs(a.totalCost - c), Math.abs(b.totalCost - c))) costWorse++;
+        });
+
+        failures += worse + costWorse;
+        const segments = calc.getNetToGrossInverter(sector, opts).segments.length;
+        const status = worse + costWorse === 0 ? '✅' : '❌';
+        console.log(`${status} ${label.padEnd(15)} ${sector.padEnd(13)} segments ${String(segments).padStart(3)} | ` +
+            `net->brut worse ${worse}, same gross ${(100 * sameGross / targets.length).toFixed(1)}%, max |Δgross| ${maxGrossDelta} | ` +
+            `cost->brut worse ${costWorse} | ${dtRef.toFixed(0)}ms -> ${dtFast.toFixed(0)}ms`);
+    }
+}
+
+console.log('-'.repeat(80));
+console.log(`📊 ${queries} net->brut queries: search ${(queries / tSearch * 1000).toFixed(0)}/s, ` +
+    `inversion ${(queries / tFast * 1000).toFixed(0)}/s (${(tSearch / tFast).toFixed(1)}x)`);
+console.log(failures === 0 ? '✅ Inversion never worse than the search' : `❌ ${failures} target(s) worse than the search`);
+process.exit(failures === 0 ? 0 : 1);